@@ -2,18 +2,25 @@
 Main FastAPI application for SatyaAI
 """
 from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from datetime import datetime
 import sys
 import os
+import time
 
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 # Import routers
 from api.routes import claims, images, search, reports, narratives, stats
-from api.models.schemas import HealthResponse, ErrorResponse
+from api.models.schemas import HealthResponse, ReadyResponse, ErrorResponse
+from core.narratives.narrative_registry import start_recompute_scheduler
+from core.utils.health import readiness, uptime
+from core.utils.metrics import HTTP_SECONDS, metrics_enabled, render_metrics
+from core.utils.tracing import root_span, parse_traceparent
+from core.utils.logger import get_logger
+from core.config import NARRATIVE_RECOMPUTE_INTERVAL
 
 # Create FastAPI app
 app = FastAPI(
@@ -24,6 +31,8 @@ app = FastAPI(
     redoc_url="/redoc"
 )
 
+log = get_logger("api")
+
 # CORS middleware - Allow all origins (restrict in production)
 app.add_middleware(
     CORSMiddleware,
@@ -34,6 +43,50 @@ app.add_middleware(
 )
 
 
+@app.middleware("http")
+async def trace_requests(request: Request, call_next):
+    """
+    Run each request in a root span (continuing an incoming W3C
+    traceparent) and return its trace ID in the X-Trace-Id header.
+    """
+    trace_id, parent_id = parse_traceparent(request.headers.get("traceparent"))
+    with root_span(f"{request.method} {request.url.path}", trace_id, parent_id,
+                   method=request.method, path=request.url.path) as s:
+        response = await call_next(request)
+        route = request.scope.get("route")
+        s.set_attributes(route=getattr(route, "path", "unmatched"), status_code=response.status_code)
+        log.info(f"{request.method} {request.url.path} -> {response.status_code}")
+    if s.trace_id:
+        response.headers["X-Trace-Id"] = s.trace_id
+    return response
+
+
+if metrics_enabled():
+    @app.middleware("http")
+    async def record_request_latency(request: Request, call_next):
+        """Observe request latency per route template (not raw path)"""
+        started = time.perf_counter()
+        status = 500
+        try:
+            response = await call_next(request)
+            status = response.status_code
+            return response
+        finally:
+            route = request.scope.get("route")
+            HTTP_SECONDS.labels(
+                request.method,
+                getattr(route, "path", "unmatched"),
+                status
+            ).observe(time.perf_counter() - started)
+
+
+@app.on_event("startup")
+async def start_background_jobs():
+    """Keep stored narrative strength/state/threat records up to date"""
+    if NARRATIVE_RECOMPUTE_INTERVAL > 0:
+        start_recompute_scheduler(NARRATIVE_RECOMPUTE_INTERVAL)
+
+
 # Global exception handler
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
@@ -71,6 +124,8 @@ async def root():
         },
         "endpoints": {
             "health": "GET /health",
+            "ready": "GET /ready",
+            "metrics": "GET /metrics",
             "stats": "GET /stats",
             "claims": {
                 "add": "POST /claims"
@@ -95,35 +150,53 @@ async def root():
 @app.get("/health", response_model=HealthResponse, tags=["Health"])
 async def health_check():
     """
-    Health check endpoint to verify system status.
-    
+    Liveness probe: answers as long as the process serves requests.
+
+    Constant-time - touches neither Qdrant nor the models. Use /ready
+    to check dependencies.
+    """
+    return {
+        "status": "healthy",
+        "uptime_seconds": round(uptime(), 3),
+        "timestamp": datetime.now().isoformat()
+    }
+
+
+@app.get("/ready", response_model=ReadyResponse, tags=["Health"])
+def readiness_check():
+    """
+    Readiness probe: models loaded and Qdrant answering.
+
     Returns:
-    - Status of the system
-    - Qdrant connection status
-    - Number of narratives
+    - Model load status
+    - Qdrant collection info and latency
+    - Cache and queue depths
+
+    Responds 503 until ready. Runs in the threadpool so a slow Qdrant
+    never blocks the event loop.
     """
-    try:
-        from core.narratives.narrative_explorer import get_all_narratives
-        
-        narratives = get_all_narratives(limit=1)
-        
-        return {
-            "status": "healthy",
-            "qdrant": "connected",
-            "narratives_count": len(narratives),
-            "timestamp": datetime.now().isoformat()
-        }
-    except Exception as e:
-        return JSONResponse(
-            status_code=503,
-            content={
-                "status": "unhealthy",
-                "qdrant": "disconnected",
-                "narratives_count": 0,
-                "error": str(e),
-                "timestamp": datetime.now().isoformat()
-            }
-        )
+    report = readiness()
+    body = {
+        "status": "ready" if report["ready"] else "not_ready",
+        "models": report["models"],
+        "qdrant": report["qdrant"],
+        "caches": report["caches"],
+        "queues": report["queues"],
+        "timestamp": datetime.now().isoformat()
+    }
+    if not report["ready"]:
+        return JSONResponse(status_code=503, content=body)
+    return body
+
+
+@app.get("/metrics", response_class=PlainTextResponse, tags=["Health"])
+async def metrics():
+    """
+    Stage, Qdrant and request latency histograms in the Prometheus text format.
+    """
+    if not metrics_enabled():
+        return PlainTextResponse("Metrics are disabled\n", status_code=404)
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
 
 
 if __name__ == "__main__":
@@ -2,7 +2,7 @@
 Pydantic schemas for API request/response validation
 """
 from pydantic import BaseModel, Field, validator
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Literal
 from datetime import datetime
 
 
@@ -11,6 +11,7 @@ class ClaimInput(BaseModel):
     claim: str = Field(..., min_length=10, max_length=5000)
     year: int = Field(..., ge=1900, le=2100)
     source: str = Field(..., min_length=1, max_length=100)
+    observed_at: Optional[datetime] = None  # When the claim was seen (defaults to ingest time)
     
     @validator('claim')
     def claim_must_not_be_empty(cls, v):
@@ -38,12 +39,29 @@ class SearchQuery(BaseModel):
     """Schema for search queries"""
     query: str = Field(..., min_length=3, max_length=1000)
     limit: Optional[int] = Field(5, ge=1, le=50)
+    year_from: Optional[int] = Field(None, ge=1900, le=2100)
+    year_to: Optional[int] = Field(None, ge=1900, le=2100)
+    sources: Optional[List[str]] = None
+    types: Optional[List[str]] = None
+    mode: Literal["dense", "sparse", "hybrid"] = "dense"
+    
+    @validator('year_to')
+    def year_range_must_be_ordered(cls, v, values):
+        year_from = values.get('year_from')
+        if v is not None and year_from is not None and v < year_from:
+            raise ValueError('year_to must not be earlier than year_from')
+        return v
     
     class Config:
         json_schema_extra = {
             "example": {
                 "query": "fake flood image",
-                "limit": 5
+                "limit": 5,
+                "year_from": 2020,
+                "year_to": 2024,
+                "sources": ["twitter", "whatsapp"],
+                "types": ["text"],
+                "mode": "hybrid"
             }
         }
 
@@ -57,10 +75,19 @@ class NarrativeResponse(BaseModel):
 
 
 class HealthResponse(BaseModel):
-    """Schema for health check response"""
+    """Schema for liveness check response"""
+    status: str
+    uptime_seconds: float
+    timestamp: str
+
+
+class ReadyResponse(BaseModel):
+    """Schema for readiness check response"""
     status: str
-    qdrant: str
-    narratives_count: int
+    models: Dict[str, bool]
+    qdrant: Dict[str, Any]
+    caches: Dict[str, int]
+    queues: Dict[str, int]
     timestamp: str
 
 
@@ -8,7 +8,8 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(
 
 from api.models.schemas import ClaimInput, NarrativeResponse
 from core.narratives.narrative_manager import process_new_claim
-from core.utils.validators import validate_claim_text, validate_year, validate_source
+from core.utils.validators import validate_claim_text, validate_year, validate_source, validate_timestamp
+from core.utils.tracing import span
 
 router = APIRouter(prefix="/claims", tags=["Claims"])
 
@@ -21,6 +22,7 @@ async def add_claim(claim_input: ClaimInput):
     - **claim**: The claim text (10-5000 characters)
     - **year**: Year of the claim (1900-2100)
     - **source**: Source platform (e.g., twitter, facebook)
+    - **observed_at**: Optional time the claim was seen (ISO 8601)
     
     Returns:
     - **narrative_id**: ID of the linked or newly created narrative
@@ -29,16 +31,19 @@ async def add_claim(claim_input: ClaimInput):
     """
     try:
         # Validate inputs
-        validated_claim = validate_claim_text(claim_input.claim)
-        validated_year = validate_year(claim_input.year)
-        validated_source = validate_source(claim_input.source)
+        with span("validate"):
+            validated_claim = validate_claim_text(claim_input.claim)
+            validated_year = validate_year(claim_input.year)
+            validated_source = validate_source(claim_input.source)
+            
+            metadata = {
+                "year": validated_year,
+                "source": validated_source
+            }
+            if claim_input.observed_at:
+                metadata["observed_at"] = validate_timestamp(claim_input.observed_at)
         
         # Process claim
-        metadata = {
-            "year": validated_year,
-            "source": validated_source
-        }
-        
         narrative_id = process_new_claim(validated_claim, metadata)
         
         return {
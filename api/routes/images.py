@@ -2,6 +2,7 @@
 Image-related API endpoints
 """
 from fastapi import APIRouter, HTTPException, UploadFile, File, Form
+from typing import Optional
 import shutil
 import sys
 import os
@@ -9,7 +10,8 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(
 
 from api.models.schemas import NarrativeResponse
 from core.narratives.narrative_manager import process_new_image
-from core.utils.validators import validate_year, validate_source, sanitize_filename
+from core.utils.validators import validate_year, validate_source, validate_timestamp, sanitize_filename
+from core.utils.tracing import span
 from core.config import UPLOAD_DIR
 
 router = APIRouter(prefix="/images", tags=["Images"])
@@ -19,7 +21,8 @@ router = APIRouter(prefix="/images", tags=["Images"])
 async def add_image(
     file: UploadFile = File(...),
     year: int = Form(...),
-    source: str = Form(...)
+    source: str = Form(...),
+    observed_at: Optional[str] = Form(None)
 ):
     """
     Upload and process an image.
@@ -27,34 +30,40 @@ async def add_image(
     - **file**: Image file (jpg, png, jpeg, webp)
     - **year**: Year the image was created/shared
     - **source**: Source platform
+    - **observed_at**: Optional time the image was seen (ISO 8601)
     
     Returns narrative information
     """
     try:
         # Validate inputs
-        validated_year = validate_year(year)
-        validated_source = validate_source(source)
-        
-        # Validate file type
-        allowed_types = {'image/jpeg', 'image/png', 'image/jpg', 'image/webp'}
-        if file.content_type not in allowed_types:
-            raise HTTPException(
-                status_code=400, 
-                detail=f"Invalid file type. Allowed: {allowed_types}"
-            )
+        with span("validate"):
+            validated_year = validate_year(year)
+            validated_source = validate_source(source)
+            validated_observed_at = validate_timestamp(observed_at) if observed_at else None
+            
+            # Validate file type
+            allowed_types = {'image/jpeg', 'image/png', 'image/jpg', 'image/webp'}
+            if file.content_type not in allowed_types:
+                raise HTTPException(
+                    status_code=400, 
+                    detail=f"Invalid file type. Allowed: {allowed_types}"
+                )
         
         # Save uploaded file
         filename = sanitize_filename(file.filename)
         filepath = UPLOAD_DIR / filename
         
-        with open(filepath, "wb") as buffer:
+        with span("save_upload") as s, open(filepath, "wb") as buffer:
             shutil.copyfileobj(file.file, buffer)
+            s.set_attribute("bytes", buffer.tell())
         
         # Process image
         metadata = {
             "year": validated_year,
             "source": validated_source
         }
+        if validated_observed_at:
+            metadata["observed_at"] = validated_observed_at
         
         narrative_id = process_new_image(str(filepath), metadata)
         
@@ -7,7 +7,12 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
-from core.narratives.narrative_explorer import get_all_narratives
+from core.narratives.snapshot_cache import get_narratives_snapshot
+from core.narratives.narrative_registry import get_narrative_registry
+from core.narratives.narrative_aliases import resolve_narrative_id
+
+# Stored by the background recompute job (see narrative_registry)
+RECORD_SUMMARY_FIELDS = ("state", "threat_level", "memory_strength", "strength")
 
 router = APIRouter(prefix="/narratives", tags=["Narratives"])
 
@@ -22,7 +27,8 @@ async def get_all_narratives_endpoint(limit: int = 1000) -> Dict[str, Any]:
     Returns summary of all narratives
     """
     try:
-        narratives = get_all_narratives(limit=limit)
+        narratives = get_narratives_snapshot(limit=limit)
+        records = get_narrative_registry().records()
         
         summary = {}
         for nid, memories in narratives.items():
@@ -36,6 +42,9 @@ async def get_all_narratives_endpoint(limit: int = 1000) -> Dict[str, Any]:
                 "sources": list(sources),
                 "modalities": list(set(m.get('type') for m in memories if m.get('type')))
             }
+            record = records.get(nid)
+            if record:
+                summary[nid].update({field: record.get(field) for field in RECORD_SUMMARY_FIELDS})
         
         return {
             "total_narratives": len(narratives),
@@ -51,12 +60,16 @@ async def get_narrative_detail(narrative_id: str) -> Dict[str, Any]:
     """
     Get detailed information about a specific narrative.
     
-    - **narrative_id**: The narrative ID to retrieve
+    - **narrative_id**: The narrative ID to retrieve (IDs merged by
+      re-clustering resolve to the narrative that absorbed them)
     
-    Returns all memories associated with this narrative
+    Returns all memories associated with this narrative, plus its stored
+    strength/state/threat record (null until the recompute job has run)
     """
     try:
-        all_narratives = get_all_narratives()
+        requested_id = narrative_id
+        narrative_id = resolve_narrative_id(narrative_id)
+        all_narratives = get_narratives_snapshot()
         
         if narrative_id not in all_narratives:
             raise HTTPException(status_code=404, detail="Narrative not found")
@@ -65,7 +78,9 @@ async def get_narrative_detail(narrative_id: str) -> Dict[str, Any]:
         
         return {
             "narrative_id": narrative_id,
+            "merged_from": requested_id if requested_id != narrative_id else None,
             "total_memories": len(memories),
+            "record": get_narrative_registry().get(narrative_id),
             "memories": memories
         }
         
@@ -19,11 +19,23 @@ async def search_claims_endpoint(query: SearchQuery):
     
     - **query**: Search query text
     - **limit**: Maximum number of results (1-50, default: 5)
+    - **year_from** / **year_to**: Optional inclusive year range
+    - **sources**: Optional list of source platforms
+    - **types**: Optional list of memory types
+    - **mode**: dense (default), sparse (exact terms) or hybrid (fused)
     
     Returns matching claims with similarity scores
     """
     try:
-        results = search_claims(query.query, limit=query.limit)
+        results = search_claims(
+            query.query,
+            limit=query.limit,
+            year_from=query.year_from,
+            year_to=query.year_to,
+            sources=query.sources,
+            types=query.types,
+            mode=query.mode
+        )
         
         search_results = [
             SearchResult(
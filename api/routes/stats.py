@@ -7,7 +7,8 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
-from core.narratives.narrative_explorer import get_all_narratives
+from core.narratives.snapshot_cache import get_narratives_snapshot
+from core.narratives.burst_engine import detect_recent_bursts
 
 router = APIRouter(prefix="/stats", tags=["Statistics"])
 
@@ -23,7 +24,7 @@ async def get_system_stats():
     - Average memories per narrative
     """
     try:
-        narratives = get_all_narratives()
+        narratives = get_narratives_snapshot()
         
         if not narratives:
             return {
@@ -57,4 +58,28 @@ async def get_system_stats():
         }
         
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/bursts")
+async def get_recent_bursts(resolution: str = "day"):
+    """
+    Get narratives bursting or resurfacing right now.
+    
+    - **resolution**: Bucket size (day, week or month)
+    
+    Returns burst events with onset time, strongest first
+    """
+    if resolution not in ("day", "week", "month"):
+        raise HTTPException(status_code=400, detail="resolution must be day, week or month")
+    
+    try:
+        events = detect_recent_bursts(resolution=resolution)
+        return {
+            "resolution": resolution,
+            "count": len(events),
+            "events": events
+        }
+        
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
@@ -18,6 +18,8 @@ def main():
     print(f"📚 Documentation (Swagger): http://localhost:8000/docs")
     print(f"📖 Documentation (ReDoc): http://localhost:8000/redoc")
     print(f"❤️  Health Check: http://localhost:8000/health")
+    print("🚦 Readiness: http://localhost:8000/ready")
+    print("📈 Metrics: http://localhost:8000/metrics")
     print(f"📊 Statistics: http://localhost:8000/stats")
     print("\n⌨️  Press Ctrl+C to stop the server\n")
     print("=" * 60)
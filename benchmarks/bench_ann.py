@@ -0,0 +1,319 @@
+"""
+Benchmark: ANN recall and latency across HNSW and quantization settings.
+
+Samples stored points (with vectors) from text_memory and image_memory,
+holds some out as queries (new claims/images arriving), and computes the
+exact top-k for each with a NumPy brute-force search. It then copies the
+rest into scratch collections with each HNSW m / ef_construct /
+quantization combination, queries them at each search-time hnsw_ef and
+reports per setting:
+
+- recall@k against the exact top-k
+- linking agreement: how often the ANN result makes the same narrative
+  assignment as exact search (link to the top hit's narrative when its
+  score clears the collection's similarity threshold, else new narrative)
+- query latency p50/p95/p99
+- estimated index memory per point
+
+and recommends the cheapest setting that keeps recall and agreement above
+the given floors. An empty or unreachable collection falls back to a
+synthetic corpus (see synthetic_corpus.py).
+
+Run it against a Qdrant server: local mode (QDRANT_PATH or no server)
+ignores HNSW and quantization and always searches exactly, so there it
+only exercises the harness. Scratch collections are named
+"<collection>__ann_eval" and dropped afterwards unless --keep is given.
+
+Usage:
+    python benchmarks/bench_ann.py --qdrant-url http://localhost:6333 --sample 20000
+    python benchmarks/bench_ann.py --qdrant-url http://localhost:6333 --m 8 16 --quantization none scalar
+    python benchmarks/bench_ann.py --synthetic 5000 --output bench_ann.json
+"""
+import argparse
+import itertools
+import json
+import statistics
+import sys
+import os
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from qdrant_client import QdrantClient
+from qdrant_client.http.models import (
+    Distance, VectorParams, PointStruct, HnswConfigDiff, OptimizersConfigDiff,
+    ScalarQuantization, ScalarQuantizationConfig, ScalarType,
+    BinaryQuantization, BinaryQuantizationConfig,
+    SearchParams, QuantizationSearchParams, CollectionStatus
+)
+from core.config import TEXT_SIMILARITY_THRESHOLD, IMAGE_SIMILARITY_THRESHOLD
+from synthetic_corpus import SyntheticCorpus, TEXT_COLLECTION, IMAGE_COLLECTION
+
+THRESHOLDS = {
+    TEXT_COLLECTION: TEXT_SIMILARITY_THRESHOLD,
+    IMAGE_COLLECTION: IMAGE_SIMILARITY_THRESHOLD,
+}
+
+# Stored bytes per vector dimension, relative to float32
+QUANTIZATION_BYTES = {"none": 4.0, "scalar": 1.0, "binary": 1 / 8}
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def quantization_config(mode):
+    if mode == "scalar":
+        return ScalarQuantization(scalar=ScalarQuantizationConfig(type=ScalarType.INT8, quantile=0.99, always_ram=True))
+    if mode == "binary":
+        return BinaryQuantization(binary=BinaryQuantizationConfig(always_ram=True))
+    return None
+
+
+def dense_vector(vector):
+    """Unnamed dense vector of a point (text_memory also holds a sparse one)"""
+    return vector.get("") if isinstance(vector, dict) else vector
+
+
+def sample_collection(client, collection, n_points):
+    """Up to n_points stored (vector, narrative_id) pairs, or None if unavailable"""
+    vectors, narratives, offset = [], [], None
+    try:
+        while len(vectors) < n_points:
+            points, offset = client.scroll(
+                collection_name=collection, limit=min(1000, n_points - len(vectors)),
+                offset=offset, with_payload=["narrative_id"], with_vectors=True
+            )
+            for p in points:
+                vector = dense_vector(p.vector)
+                if vector is not None:
+                    vectors.append(vector)
+                    narratives.append((p.payload or {}).get("narrative_id"))
+            if offset is None:
+                break
+    except Exception as e:
+        print(f"⚠️  Could not sample {collection}: {e}")
+        return None
+    if not vectors:
+        return None
+    return np.asarray(vectors, dtype=np.float32), narratives
+
+
+def synthetic_sample(collection, n_points, seed):
+    corpus = SyntheticCorpus(n_points, seed=seed)
+    vectors, narratives = [], []
+    for target, _, batch, payloads in corpus.batches(5000):
+        if target == collection:
+            vectors.append(batch)
+            narratives.extend(p["narrative_id"] for p in payloads)
+    return np.concatenate(vectors), narratives
+
+
+def exact_top_k(corpus, queries, k):
+    """Brute-force cosine top-k: (indices [q, k], scores [q, k]), best first"""
+    corpus = corpus / np.maximum(np.linalg.norm(corpus, axis=1, keepdims=True), 1e-12)
+    queries = queries / np.maximum(np.linalg.norm(queries, axis=1, keepdims=True), 1e-12)
+    k = min(k, corpus.shape[0])
+    indices, top_scores = [], []
+    for start in range(0, len(queries), 64):  # Bounds the score matrix for large samples
+        scores = queries[start:start + 64] @ corpus.T
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        values = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-values, axis=1)
+        indices.append(np.take_along_axis(top, order, axis=1))
+        top_scores.append(np.take_along_axis(values, order, axis=1))
+    return np.concatenate(indices), np.concatenate(top_scores)
+
+
+def linking_decision(score, narrative_id, threshold):
+    """Narrative a new memory would join (None: starts a new one)"""
+    return narrative_id if score is not None and score >= threshold else None
+
+
+def build_copy(client, name, vectors, m, ef_construct, quantization, timeout):
+    """Scratch collection with one setting; waits until the HNSW index is built"""
+    if client.collection_exists(name):
+        client.delete_collection(name)
+    client.create_collection(
+        collection_name=name,
+        vectors_config=VectorParams(size=vectors.shape[1], distance=Distance.COSINE),
+        # Tiny thresholds so even a small sample is indexed and searched via HNSW
+        hnsw_config=HnswConfigDiff(m=m, ef_construct=ef_construct, full_scan_threshold=10),
+        optimizers_config=OptimizersConfigDiff(indexing_threshold=10),
+        quantization_config=quantization_config(quantization)
+    )
+    for start in range(0, len(vectors), 1000):
+        batch = vectors[start:start + 1000]
+        client.upsert(name, points=[
+            PointStruct(id=start + i, vector=vector.tolist()) for i, vector in enumerate(batch)
+        ], wait=True)
+
+    started = time.perf_counter()
+    while client.get_collection(name).status != CollectionStatus.GREEN:
+        if time.perf_counter() - started > timeout:
+            print(f"⚠️  {name} still indexing after {timeout}s - measuring anyway")
+            break
+        time.sleep(0.5)
+    return round(time.perf_counter() - started, 3)
+
+
+def evaluate(client, name, queries, truth, truth_scores, narratives, threshold, k, hnsw_ef, quantization):
+    params = SearchParams(
+        hnsw_ef=hnsw_ef,
+        quantization=QuantizationSearchParams(rescore=True) if quantization != "none" else None
+    )
+    latencies, recall_hits, agree = [], 0, 0
+    for query, exact_ids, exact_scores in zip(queries, truth, truth_scores):
+        start = time.perf_counter()
+        points = client.query_points(
+            collection_name=name, query=query.tolist(), limit=k, search_params=params
+        ).points
+        latencies.append((time.perf_counter() - start) * 1000)
+
+        recall_hits += len({p.id for p in points} & set(exact_ids.tolist()))
+        exact = linking_decision(float(exact_scores[0]), narratives[exact_ids[0]], threshold)
+        approx = linking_decision(points[0].score, narratives[points[0].id], threshold) if points else None
+        agree += exact == approx
+
+    return {
+        f"recall@{k}": round(recall_hits / (len(queries) * min(k, truth.shape[1])), 4),
+        "linking_agreement": round(agree / len(queries), 4),
+        "latency_ms_p50": round(statistics.median(latencies), 3),
+        "latency_ms_p95": round(percentile(latencies, 95), 3),
+        "latency_ms_p99": round(percentile(latencies, 99), 3),
+    }
+
+
+def bytes_per_point(dim, m, quantization):
+    """Quantized vector (held in RAM) plus HNSW links at level 0"""
+    return round(dim * QUANTIZATION_BYTES[quantization] + 2 * m * 4, 1)
+
+
+def recommend(rows, min_recall, min_agreement, k):
+    passing = [
+        r for r in rows
+        if r[f"recall@{k}"] >= min_recall and r["linking_agreement"] >= min_agreement
+    ]
+    if not passing:
+        return None
+    return min(passing, key=lambda r: (r["bytes_per_point"], r["latency_ms_p50"]))
+
+
+def run_collection(client, collection, args):
+    sample = None if args.synthetic else sample_collection(client, collection, args.sample + args.queries)
+    source = "stored"
+    if sample is None or len(sample[0]) <= args.queries:
+        sample = synthetic_sample(collection, args.synthetic or args.sample + args.queries, args.seed)
+        source = "synthetic"
+    vectors, narratives = sample
+
+    rng = np.random.default_rng(args.seed)
+    order = rng.permutation(len(vectors))
+    query_rows, corpus_rows = order[:args.queries], order[args.queries:]
+    queries, corpus = vectors[query_rows], vectors[corpus_rows]
+    corpus_narratives = [narratives[i] for i in corpus_rows]
+
+    started = time.perf_counter()
+    truth, truth_scores = exact_top_k(corpus, queries, args.k)
+    brute_force_ms = (time.perf_counter() - started) * 1000 / len(queries)
+    print(f"⚡ {collection}: {len(corpus):,} {source} points, {len(queries)} queries, "
+          f"brute force {brute_force_ms:.2f} ms/query")
+
+    name = f"{collection}__ann_eval"
+    threshold = args.threshold if args.threshold is not None else THRESHOLDS[collection]
+    rows = []
+    try:
+        for m, ef_construct, quantization in itertools.product(args.m, args.ef_construct, args.quantization):
+            build_seconds = build_copy(client, name, corpus, m, ef_construct, quantization, args.index_timeout)
+            for hnsw_ef in args.hnsw_ef:
+                row = {
+                    "m": m, "ef_construct": ef_construct, "quantization": quantization, "hnsw_ef": hnsw_ef,
+                    "bytes_per_point": bytes_per_point(corpus.shape[1], m, quantization),
+                    "index_wait_seconds": build_seconds,
+                    **evaluate(client, name, queries, truth, truth_scores, corpus_narratives,
+                               threshold, args.k, hnsw_ef, quantization)
+                }
+                rows.append(row)
+                print(f"   m={m:<3} ef_construct={ef_construct:<4} {quantization:<6} hnsw_ef={hnsw_ef:<4} "
+                      f"recall@{args.k}={row[f'recall@{args.k}']:<6} agree={row['linking_agreement']:<6} "
+                      f"p50={row['latency_ms_p50']} ms")
+    finally:
+        if not args.keep and client.collection_exists(name):
+            client.delete_collection(name)
+
+    return {
+        "source": source,
+        "points": len(corpus),
+        "queries": len(queries),
+        "dim": corpus.shape[1],
+        "threshold": threshold,
+        "brute_force_ms_per_query": round(brute_force_ms, 3),
+        "settings": rows,
+        "recommended": recommend(rows, args.min_recall, args.min_agreement, args.k),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--qdrant-url", default=os.getenv("QDRANT_URL"),
+                        help="Qdrant server (default: QDRANT_URL; without one, in-memory local mode)")
+    parser.add_argument("--collections", nargs="+", default=[TEXT_COLLECTION, IMAGE_COLLECTION],
+                        choices=[TEXT_COLLECTION, IMAGE_COLLECTION])
+    parser.add_argument("--sample", type=int, default=10_000, help="Stored points to index")
+    parser.add_argument("--queries", type=int, default=200, help="Held-out query points")
+    parser.add_argument("--synthetic", type=int, help="Use N synthetic points instead of stored ones")
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--m", type=int, nargs="+", default=[8, 16, 32])
+    parser.add_argument("--ef-construct", type=int, nargs="+", default=[64, 128])
+    parser.add_argument("--hnsw-ef", type=int, nargs="+", default=[16, 32, 64, 128])
+    parser.add_argument("--quantization", nargs="+", default=["none", "scalar", "binary"],
+                        choices=list(QUANTIZATION_BYTES))
+    parser.add_argument("--threshold", type=float,
+                        help="Linking threshold to check agreement at (default: the config thresholds)")
+    parser.add_argument("--min-recall", type=float, default=0.98)
+    parser.add_argument("--min-agreement", type=float, default=0.995)
+    parser.add_argument("--index-timeout", type=float, default=300.0, help="Seconds to wait for indexing")
+    parser.add_argument("--keep", action="store_true", help="Keep the scratch collections")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    if args.qdrant_url:
+        client = QdrantClient(url=args.qdrant_url, api_key=os.getenv("QDRANT_API_KEY"))
+    else:
+        print("⚠️  No Qdrant server - local mode ignores HNSW and quantization (every setting is exact)")
+        client = QdrantClient(":memory:")
+        args.synthetic = args.synthetic or args.sample + args.queries
+
+    results = {
+        "qdrant": args.qdrant_url or ":memory:",
+        "k": args.k,
+        "min_recall": args.min_recall,
+        "min_agreement": args.min_agreement,
+        "collections": {c: run_collection(client, c, args) for c in args.collections}
+    }
+
+    print("=" * 60)
+    print(f"🔬 ANN evaluation ({results['qdrant']})")
+    print("=" * 60)
+    for collection, result in results["collections"].items():
+        best = result["recommended"]
+        if best is None:
+            print(f"{collection}: ❌ no setting reaches recall@{args.k} >= {args.min_recall} "
+                  f"and agreement >= {args.min_agreement}")
+            continue
+        print(f"{collection}: ✅ m={best['m']} ef_construct={best['ef_construct']} "
+              f"quantization={best['quantization']} hnsw_ef={best['hnsw_ef']} "
+              f"({best['bytes_per_point']} B/point, p50 {best['latency_ms_p50']} ms, "
+              f"recall@{args.k} {best[f'recall@{args.k}']}, agreement {best['linking_agreement']})")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n📁 Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+"""
+Benchmark: dense vs sparse vs hybrid claim search on recycled claims.
+
+Builds a synthetic corpus of claim families that share a topic but differ
+in the specific names, numbers and hashtags they recycle, then queries
+with reworded reposts of individual claims. Reports recall@k and query
+latency for each search mode against an in-memory Qdrant.
+
+Usage:
+    python benchmarks/bench_hybrid_search.py --docs 2000 --queries 200
+    python benchmarks/bench_hybrid_search.py --output bench_hybrid.json
+"""
+import argparse
+import json
+import random
+import statistics
+import sys
+import os
+import time
+import zlib
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from qdrant_client import QdrantClient
+from qdrant_client.http.models import (
+    Distance, VectorParams, PointStruct, SparseVector, SparseVectorParams,
+    Modifier, Prefetch, FusionQuery, Fusion
+)
+from core.embeddings.sparse_embedder import embed_sparse
+from core.config import (
+    TEXT_SPARSE_VECTOR, TEXT_EMBEDDING_MODEL, TEXT_EMBEDDING_DIM,
+    HYBRID_PREFETCH_MULTIPLIER
+)
+
+TOPICS = {
+    "flood": [
+        "{name} says {number} people died in the {place} flood #{tag}",
+        "Photo shows {place} underwater after {number}mm of rain #{tag}",
+        "{name} hid {number} flood deaths in {place} #{tag}",
+    ],
+    "vaccine": [
+        "{name} claims vaccine batch {number} caused infertility in {place} #{tag}",
+        "{number} children fell sick after vaccination in {place}, says {name} #{tag}",
+    ],
+    "election": [
+        "{name} found {number} fake votes in {place} #{tag}",
+        "Voting machines in {place} flipped {number} votes, claims {name} #{tag}",
+    ],
+}
+
+REPOST_FRAMES = [
+    "BREAKING: {claim}",
+    "Forwarded as received - {claim}",
+    "{claim} Share before they delete it!",
+    "Again going viral: {claim}",
+    "Is this true? {claim}",
+]
+
+FIRST = ["Ravi", "Anita", "Karan", "Meera", "Suresh", "Priya", "Arjun", "Neha", "Vikram", "Sunita"]
+LAST = ["Sharma", "Kulkarni", "Iyer", "Reddy", "Banerjee", "Patel", "Menon", "Chauhan", "Das", "Gill"]
+PLACES = ["Delhi", "Mumbai", "Chennai", "Patna", "Guwahati", "Kochi", "Surat", "Pune", "Bhopal", "Ranchi"]
+
+
+def make_corpus(n_docs, rng):
+    """Generate unique claims: shared topic templates, distinct entities"""
+    docs = []
+    for i in range(n_docs):
+        topic = rng.choice(list(TOPICS))
+        entities = {
+            "name": f"{rng.choice(FIRST)} {rng.choice(LAST)}",
+            "number": f"{rng.randint(100, 9999):,}",
+            "place": rng.choice(PLACES),
+            "tag": f"{topic.title()}Truth{rng.randint(1, 500)}"
+        }
+        claim = rng.choice(TOPICS[topic]).format(**entities)
+        docs.append({"id": i, "claim": claim, "topic": topic, "entities": entities})
+    return docs
+
+
+def make_queries(docs, n_queries, rng):
+    """
+    Recycled reposts: the names, numbers and hashtags of one claim are
+    reused word for word inside a reworded sentence of the same topic.
+    Ground truth is the original claim.
+    """
+    targets = rng.sample(docs, min(n_queries, len(docs)))
+    queries = []
+    for d in targets:
+        reworded = rng.choice(TOPICS[d["topic"]]).format(**d["entities"])
+        queries.append({
+            "target": d["id"],
+            "query": rng.choice(REPOST_FRAMES).format(claim=reworded)
+        })
+    return queries
+
+
+class ProxyDenseEncoder:
+    """Character trigram hashing + random projection (no model download)"""
+
+    def __init__(self, dim, seed=0):
+        self.dim = dim
+        self.projection = np.random.default_rng(seed).standard_normal((4096, dim)).astype(np.float32)
+
+    def encode(self, texts):
+        counts = np.zeros((len(texts), 4096), dtype=np.float32)
+        for row, text in enumerate(texts):
+            t = f"  {text.lower()}  "
+            for j in range(len(t) - 2):
+                counts[row, zlib.crc32(t[j:j + 3].encode()) % 4096] += 1
+        vecs = counts @ self.projection
+        return vecs / np.linalg.norm(vecs, axis=1, keepdims=True)
+
+
+def load_dense_encoder(force_proxy=False):
+    """Use the production text model when available"""
+    if not force_proxy:
+        try:
+            from sentence_transformers import SentenceTransformer
+            model = SentenceTransformer(TEXT_EMBEDDING_MODEL)
+            return model, TEXT_EMBEDDING_MODEL
+        except Exception as e:
+            print(f"⚠️  {TEXT_EMBEDDING_MODEL} unavailable ({e}); using proxy dense encoder")
+    return ProxyDenseEncoder(TEXT_EMBEDDING_DIM), "proxy-trigram-projection"
+
+
+def build_collection(client, docs, dense_vectors):
+    client.create_collection(
+        "bench_text",
+        vectors_config=VectorParams(size=dense_vectors.shape[1], distance=Distance.COSINE),
+        sparse_vectors_config={TEXT_SPARSE_VECTOR: SparseVectorParams(modifier=Modifier.IDF)}
+    )
+    batch = []
+    for doc, vec in zip(docs, dense_vectors):
+        batch.append(PointStruct(
+            id=doc["id"],
+            vector={"": vec.tolist(), TEXT_SPARSE_VECTOR: SparseVector(**embed_sparse(doc["claim"]))},
+            payload={"claim": doc["claim"]}
+        ))
+        if len(batch) == 256:
+            client.upsert("bench_text", points=batch)
+            batch = []
+    if batch:
+        client.upsert("bench_text", points=batch)
+
+
+def run_query(client, mode, dense, sparse, limit):
+    if mode == "dense":
+        return client.query_points("bench_text", query=dense, limit=limit).points
+    if mode == "sparse":
+        return client.query_points("bench_text", query=sparse, using=TEXT_SPARSE_VECTOR, limit=limit).points
+    candidates = limit * HYBRID_PREFETCH_MULTIPLIER
+    return client.query_points(
+        "bench_text",
+        prefetch=[
+            Prefetch(query=dense, limit=candidates),
+            Prefetch(query=sparse, using=TEXT_SPARSE_VECTOR, limit=candidates),
+        ],
+        query=FusionQuery(fusion=Fusion.RRF),
+        limit=limit
+    ).points
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--docs", type=int, default=2000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, nargs="+", default=[1, 5, 10])
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--proxy-dense", action="store_true", help="Skip the MiniLM model")
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    docs = make_corpus(args.docs, rng)
+    queries = make_queries(docs, args.queries, rng)
+
+    encoder, encoder_name = load_dense_encoder(args.proxy_dense)
+    doc_vectors = np.asarray(encoder.encode([d["claim"] for d in docs]))
+    query_vectors = np.asarray(encoder.encode([q["query"] for q in queries]))
+
+    client = QdrantClient(":memory:")
+    build_collection(client, docs, doc_vectors)
+
+    max_k = max(args.k)
+    results = {
+        "dense_encoder": encoder_name,
+        "docs": len(docs),
+        "queries": len(queries),
+        "modes": {}
+    }
+
+    for mode in ("dense", "sparse", "hybrid"):
+        hits = {k: 0 for k in args.k}
+        latencies = []
+        for q, qvec in zip(queries, query_vectors):
+            sparse = SparseVector(**embed_sparse(q["query"], query=True))
+            start = time.perf_counter()
+            points = run_query(client, mode, qvec.tolist(), sparse, max_k)
+            latencies.append((time.perf_counter() - start) * 1000)
+            ids = [p.id for p in points]
+            for k in args.k:
+                if q["target"] in ids[:k]:
+                    hits[k] += 1
+
+        results["modes"][mode] = {
+            **{f"recall@{k}": round(hits[k] / len(queries), 4) for k in args.k},
+            "latency_ms_p50": round(statistics.median(latencies), 3),
+            "latency_ms_p95": round(percentile(latencies, 95), 3),
+        }
+
+    print("=" * 60)
+    print(f"🔬 Hybrid search benchmark ({encoder_name})")
+    print(f"   {len(docs)} claims, {len(queries)} recycled-claim queries")
+    print("=" * 60)
+    for mode, row in results["modes"].items():
+        metrics = "  ".join(f"{key}={value}" for key, value in row.items())
+        print(f"{mode:>7}: {metrics}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n📁 Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+"""
+Benchmark: ingest, search, narrative scans, analytics and export at scale.
+
+Loads a synthetic corpus (see synthetic_corpus.py) into the real schema
+at each requested size and times the paths that grow with the corpus:
+
+- ingest: batched upserts and the memory event log, in points/s
+- search: dense ANN query latency (p50/p95/p99) and family hit rate
+- get_all_narratives: the default 1000-point scan and a full scan
+- analytics: NarrativeFrame build, trend detectors, narrative stats,
+  the time-bucket index fold and burst detection
+- export: all-narratives CSV and JSON
+
+Every size gets a fresh in-memory Qdrant unless --qdrant-url points at a
+server (needed for 1M points on most machines), or a fresh in-process
+exact NumPy store with --backend numpy. The server's text_memory
+and image_memory collections are dropped between sizes, so a non-empty
+server is refused unless --recreate is given.
+
+Usage:
+    python benchmarks/bench_scale.py --sizes 10000 100000
+    python benchmarks/bench_scale.py --sizes 10000 100000 --backend numpy
+    python benchmarks/bench_scale.py --sizes 1000000 --qdrant-url http://localhost:6333 --recreate
+    python benchmarks/bench_scale.py --embeddings claims.npy --output bench_scale.json
+"""
+import argparse
+import json
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import os
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from qdrant_client import QdrantClient
+from qdrant_client.http.models import PointStruct
+import core.qdrant.schema as schema
+from core.vectorstore import NumpyVectorStore
+import core.narratives.narrative_explorer as narrative_explorer
+import core.exports.csv_exporter as csv_exporter
+import core.exports.json_exporter as json_exporter
+from core.analytics.event_log import append_events
+from core.analytics.narrative_frame import NarrativeFrame
+from core.analytics.trend_detector import (
+    analyze_narrative_clusters, detect_viral_narratives,
+    compute_platform_risk_scores, detect_coordinated_campaigns
+)
+from core.narratives.narrative_intelligence import compute_all_narrative_stats
+from core.narratives.time_index import TimeBucketIndex
+from core.narratives.burst_engine import detect_recent_bursts
+from synthetic_corpus import SyntheticCorpus, TEXT_COLLECTION, IMAGE_COLLECTION
+
+COLLECTIONS = (TEXT_COLLECTION, IMAGE_COLLECTION, "video_memory")
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def latency_summary(latencies_ms):
+    return {
+        "p50_ms": round(statistics.median(latencies_ms), 3),
+        "p95_ms": round(percentile(latencies_ms, 95), 3),
+        "p99_ms": round(percentile(latencies_ms, 99), 3),
+        "max_ms": round(max(latencies_ms), 3),
+    }
+
+
+class Stopwatch:
+    """Collects named wall-clock timings in seconds"""
+
+    def __init__(self):
+        self.seconds = {}
+
+    def time(self, name, func, *args, **kwargs):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        self.seconds[name] = round(time.perf_counter() - start, 4)
+        return result
+
+
+def peak_rss_mb():
+    """Peak resident memory of this process (Linux reports KiB, macOS bytes)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)), timeout=5
+        ).stdout.strip() or None
+    except Exception:
+        return None
+
+
+def open_client(url, backend="qdrant"):
+    """Fresh in-memory store, or the Qdrant server with the benchmark collections dropped"""
+    if backend == "numpy":
+        return NumpyVectorStore()
+    if not url:
+        return QdrantClient(":memory:")
+    client = QdrantClient(url=url, api_key=os.getenv("QDRANT_API_KEY"))
+    for name in COLLECTIONS:
+        if client.collection_exists(name):
+            client.delete_collection(name)
+    return client
+
+
+def server_is_empty(url):
+    client = QdrantClient(url=url, api_key=os.getenv("QDRANT_API_KEY"))
+    return all(
+        not client.collection_exists(name) or not client.count(name, exact=True).count
+        for name in COLLECTIONS
+    )
+
+
+def ingest(client, corpus, batch_size, event_log):
+    """Upsert the corpus; returns (upsert seconds, event log seconds, points per collection)"""
+    upsert_seconds = log_seconds = 0.0
+    counts = {}
+    for collection, ids, vectors, payloads in corpus.batches(batch_size):
+        points = [
+            PointStruct(id=pid, vector=vector.tolist(), payload=payload)
+            for pid, vector, payload in zip(ids, vectors, payloads)
+        ]
+        start = time.perf_counter()
+        client.upsert(collection_name=collection, points=points, wait=True)
+        upsert_seconds += time.perf_counter() - start
+
+        start = time.perf_counter()
+        append_events(payloads, event_log, collection, ids)
+        log_seconds += time.perf_counter() - start
+        counts[collection] = counts.get(collection, 0) + len(points)
+    return upsert_seconds, log_seconds, counts
+
+
+def search(client, corpus, n_queries, limit):
+    """Dense query latency and how often the top hit is from the query's family"""
+    vectors, families = corpus.queries(n_queries)
+    latencies, hits = [], 0
+    for vector, narrative_id in zip(vectors, families):
+        start = time.perf_counter()
+        points = client.query_points(
+            collection_name=TEXT_COLLECTION, query=vector.tolist(), limit=limit, with_payload=True
+        ).points
+        latencies.append((time.perf_counter() - start) * 1000)
+        if points and points[0].payload.get("narrative_id") == narrative_id:
+            hits += 1
+    return {**latency_summary(latencies), "queries": n_queries, "top1_family_hit_rate": round(hits / n_queries, 4)}
+
+
+def run_size(size, args, workdir):
+    corpus = SyntheticCorpus(
+        size, seed=args.seed, mutation=args.mutation, embeddings=args.embeddings
+    )
+    client = open_client(args.qdrant_url, args.backend)
+    schema.store = client
+    narrative_explorer.store = client
+    schema.setup_collections()
+
+    event_log = workdir / f"events_{size}.jsonl"
+    upsert_s, log_s, counts = ingest(client, corpus, args.batch_size, event_log)
+    result = {
+        "points": size,
+        "families": corpus.n_families,
+        "collections": counts,
+        "ingest": {
+            "upsert_seconds": round(upsert_s, 3),
+            "upsert_points_per_second": round(size / upsert_s, 1),
+            "event_log_seconds": round(log_s, 3),
+            "event_log_points_per_second": round(size / log_s, 1) if log_s else None,
+        },
+        "search": search(client, corpus, args.queries, args.limit),
+    }
+
+    watch = Stopwatch()
+    watch.time("default_limit", narrative_explorer.get_all_narratives)
+    narratives = watch.time("full", narrative_explorer.get_all_narratives, limit=size)
+    result["get_all_narratives"] = {**watch.seconds, "narratives": len(narratives)}
+
+    watch = Stopwatch()
+    frame = watch.time("narrative_frame", NarrativeFrame.from_narratives, narratives)
+    watch.time("analyze_narrative_clusters", analyze_narrative_clusters, frame)
+    watch.time("detect_viral_narratives", detect_viral_narratives, frame)
+    watch.time("compute_platform_risk_scores", compute_platform_risk_scores, frame)
+    watch.time("detect_coordinated_campaigns", detect_coordinated_campaigns, frame)
+    watch.time("compute_all_narrative_stats", compute_all_narrative_stats, narratives)
+    index = TimeBucketIndex(event_log)
+    watch.time("time_index_fold", len, index)
+    watch.time("detect_recent_bursts", detect_recent_bursts, index, "month",
+               datetime(corpus.years[1], 12, 31, tzinfo=timezone.utc))
+    result["analytics_seconds"] = watch.seconds
+
+    watch = Stopwatch()
+    csv_path = watch.time("csv", csv_exporter.export_all_narratives_csv, narratives)
+    json_path = watch.time("json", json_exporter.export_all_narratives_json, narratives)
+    result["export_seconds"] = watch.seconds
+    result["export_bytes"] = {"csv": os.path.getsize(csv_path), "json": os.path.getsize(json_path)}
+
+    result["peak_rss_mb"] = peak_rss_mb()
+    if not args.qdrant_url or args.backend == "numpy":
+        client.close()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=5, help="Search result limit")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Points per upsert")
+    parser.add_argument("--mutation", type=float, default=0.3)
+    parser.add_argument("--embeddings", help="Cached .npy text embeddings for family vectors")
+    parser.add_argument("--backend", choices=["qdrant", "numpy"], default="qdrant",
+                        help="Vector store backend (numpy: exact in-process search)")
+    parser.add_argument("--qdrant-url", help="Benchmark against a Qdrant server")
+    parser.add_argument("--recreate", action="store_true",
+                        help="Allow dropping non-empty collections on --qdrant-url")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    if args.backend == "numpy":
+        args.qdrant_url = None
+    if args.qdrant_url and not args.recreate and not server_is_empty(args.qdrant_url):
+        print(f"❌ {args.qdrant_url} already holds memories - pass --recreate to drop them")
+        sys.exit(1)
+
+    results = {
+        "meta": {
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "backend": args.backend,
+            "qdrant": args.qdrant_url or ":memory:",
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "seed": args.seed,
+            "mutation": args.mutation,
+            "embeddings": args.embeddings,
+            "batch_size": args.batch_size,
+        },
+        "sizes": []
+    }
+
+    with tempfile.TemporaryDirectory(prefix="satyaai_bench_") as tmp:
+        workdir = Path(tmp)
+        # Exports land in the temp dir, not the project's exports/
+        csv_exporter.EXPORT_DIR = json_exporter.EXPORT_DIR = workdir
+        for size in args.sizes:
+            print(f"⚡ Benchmarking {size:,} points...")
+            results["sizes"].append(run_size(size, args, workdir))
+
+    print("=" * 60)
+    store_label = "numpy" if args.backend == "numpy" else results["meta"]["qdrant"]
+    print(f"🔬 Scale benchmark ({store_label})")
+    print("=" * 60)
+    for row in results["sizes"]:
+        print(f"{row['points']:>10,} points, {row['families']:,} families")
+        print(f"   ingest: {row['ingest']['upsert_points_per_second']:,.0f} points/s")
+        print(f"   search: p50={row['search']['p50_ms']} ms  p99={row['search']['p99_ms']} ms  "
+              f"top1={row['search']['top1_family_hit_rate']}")
+        scans = row["get_all_narratives"]
+        print(f"   get_all_narratives: default={scans['default_limit']} s  full={scans['full']} s")
+        print(f"   analytics: {sum(row['analytics_seconds'].values()):.3f} s  "
+              f"export: {sum(row['export_seconds'].values()):.3f} s  peak RSS: {row['peak_rss_mb']} MB")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n📁 Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,330 @@
+"""
+Load test: mixed API workloads against an in-process app and Qdrant.
+
+Starts the FastAPI app inside this process (httpx ASGI transport, no
+sockets) on an embedded Qdrant (":memory:" or a local directory), or on
+the in-process NumPy store with --backend numpy, so it runs on a laptop
+with no network. Workers drive a weighted mix of:
+
+- ingest:  POST /claims (mutated claims from synthetic narrative families)
+- search:  POST /search/claims
+- report:  POST /reports/trust
+- stats:   GET /stats
+- detail:  GET /narratives/{narrative_id}
+
+and the harness reports throughput, latency percentiles, status codes
+and error rates per endpoint. The database is seeded with --seed-claims
+claims first (not measured). Sidecar files (event log, phash index,
+registry, snapshot stamp) go to a temp directory, not qdrant_data/.
+
+With --stub-embedders the embedding models are replaced by deterministic
+bag-of-words / byte-hash vectors, which isolates the API, Qdrant and
+analytics cost from model inference (and needs no model download).
+
+The app serves requests on one event loop, like a single uvicorn worker:
+sync work inside async routes is measured as it would block in production.
+
+Usage:
+    python benchmarks/load_test.py --stub-embedders --requests 2000 --concurrency 16
+    python benchmarks/load_test.py --stub-embedders --mix ingest=1 search=3 --output load.json
+    python benchmarks/load_test.py --qdrant ./load_qdrant --seed-claims 1000
+    python benchmarks/load_test.py --stub-embedders --backend numpy
+"""
+import argparse
+import asyncio
+import io
+import json
+import logging
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import types
+import zlib
+from collections import Counter, defaultdict
+from contextlib import redirect_stdout
+from functools import lru_cache
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import httpx
+
+DEFAULT_MIX = {"ingest": 20, "search": 35, "report": 15, "stats": 10, "detail": 20}
+
+ENDPOINTS = {
+    "ingest": "POST /claims",
+    "search": "POST /search/claims",
+    "report": "POST /reports/trust",
+    "stats": "GET /stats",
+    "detail": "GET /narratives/{narrative_id}",
+}
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def parse_mix(items):
+    """ingest=20 search=35 ... -> {"ingest": 20, ...}"""
+    if not items:
+        return dict(DEFAULT_MIX)
+    mix = {}
+    for item in items:
+        name, _, weight = item.partition("=")
+        if name not in ENDPOINTS:
+            raise SystemExit(f"❌ Unknown workload {name!r} (choose from {', '.join(ENDPOINTS)})")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def install_stub_embedders(text_dim, image_dim):
+    """
+    Replace the embedding modules with deterministic stand-ins.
+
+    Text vectors are the normalized sum of one random vector per token, so
+    reworded claims stay close (like a real sentence model, only cruder).
+    Image vectors hash the file bytes.
+    """
+    @lru_cache(maxsize=100_000)
+    def token_vector(token):
+        return np.random.default_rng(zlib.crc32(token.encode())).standard_normal(text_dim)
+
+    def embed_text(text):
+        vector = sum(token_vector(token) for token in text.lower().split())
+        return (vector / max(np.linalg.norm(vector), 1e-12)).tolist()
+
+    def embed_image(image_path):
+        with open(image_path, "rb") as f:
+            seed = zlib.crc32(f.read())
+        vector = np.random.default_rng(seed).standard_normal(image_dim)
+        return (vector / np.linalg.norm(vector)).tolist()
+
+    for name, attr, func in (("text_embedder", "embed_text", embed_text),
+                             ("image_embedder", "embed_image", embed_image)):
+        module = types.ModuleType(f"core.embeddings.{name}")
+        setattr(module, attr, func)
+        module.model = "stub"  # Counts as loaded for /ready
+        sys.modules[module.__name__] = module
+
+
+def isolate_sidecar_files(workdir):
+    """Point every qdrant_data/ sidecar file at the temp dir (before other core imports)"""
+    import core.config as config
+
+    qdrant_dir = config.QDRANT_DIR
+    for name, value in list(vars(config).items()):
+        if isinstance(value, Path) and value.is_relative_to(qdrant_dir):
+            setattr(config, name, workdir / value.relative_to(qdrant_dir))
+    config.TRACING_FILE_PATH = workdir / "traces.jsonl"
+
+
+class Workload:
+    """Generates request arguments and remembers narratives it created"""
+
+    def __init__(self, seed, families):
+        from synthetic_corpus import SyntheticCorpus
+
+        self.rng = random.Random(seed)
+        self.np_rng = np.random.default_rng(seed)
+        self.corpus = SyntheticCorpus(families * 25, n_families=families, seed=seed)
+        self.narrative_ids = []
+
+    def claim(self):
+        family = int(self.np_rng.choice(self.corpus.n_families, p=self.corpus._family_p))
+        return self.corpus.family_claim(family, self.np_rng, mutate=True), family
+
+    def request(self, kind):
+        if kind == "ingest":
+            claim, family = self.claim()
+            return "POST", "/claims", {
+                "claim": claim,
+                "year": int(self.corpus.first_year[family]),
+                "source": self.rng.choice(self.corpus.platforms),
+            }
+        if kind in ("search", "report"):
+            path = "/search/claims" if kind == "search" else "/reports/trust"
+            return "POST", path, {"query": self.claim()[0], "limit": 5}
+        if kind == "stats":
+            return "GET", "/stats", None
+        return "GET", f"/narratives/{self.rng.choice(self.narrative_ids)}", None
+
+    def observe(self, kind, response):
+        if kind == "ingest" and response.status_code == 200:
+            self.narrative_ids.append(response.json()["narrative_id"])
+
+
+async def send(http, method, path, body):
+    if method == "GET":
+        return await http.get(path)
+    return await http.post(path, json=body)
+
+
+async def seed(http, workload, n_claims):
+    for _ in range(n_claims):
+        method, path, body = workload.request("ingest")
+        workload.observe("ingest", await send(http, method, path, body))
+
+
+async def run_workers(http, workload, mix, n_requests, concurrency, timeout):
+    kinds, weights = list(mix), list(mix.values())
+    samples = defaultdict(list)
+    statuses = defaultdict(Counter)
+    remaining = [n_requests]
+
+    async def worker():
+        while remaining[0] > 0:
+            remaining[0] -= 1
+            kind = workload.rng.choices(kinds, weights)[0]
+            if kind == "detail" and not workload.narrative_ids:
+                kind = "ingest"
+            method, path, body = workload.request(kind)
+            start = time.perf_counter()
+            try:
+                response = await asyncio.wait_for(send(http, method, path, body), timeout)
+                status = response.status_code
+                workload.observe(kind, response)
+            except asyncio.TimeoutError:
+                status = "timeout"
+            except Exception as e:
+                status = type(e).__name__
+            samples[kind].append((time.perf_counter() - start) * 1000)
+            statuses[kind][status] += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return samples, statuses, time.perf_counter() - start
+
+
+def summarize(samples, statuses, elapsed):
+    endpoints = {}
+    for kind in sorted(samples):
+        latencies = samples[kind]
+        errors = sum(n for status, n in statuses[kind].items() if status != 200)
+        endpoints[ENDPOINTS[kind]] = {
+            "requests": len(latencies),
+            "throughput_rps": round(len(latencies) / elapsed, 2),
+            "error_rate": round(errors / len(latencies), 4),
+            "latency_ms_p50": round(statistics.median(latencies), 2),
+            "latency_ms_p95": round(percentile(latencies, 95), 2),
+            "latency_ms_p99": round(percentile(latencies, 99), 2),
+            "latency_ms_max": round(max(latencies), 2),
+            "status_codes": {str(status): n for status, n in statuses[kind].items()},
+        }
+    total = sum(len(v) for v in samples.values())
+    errors = sum(n for counts in statuses.values() for status, n in counts.items() if status != 200)
+    every = [ms for v in samples.values() for ms in v]
+    overall = {
+        "requests": total,
+        "seconds": round(elapsed, 3),
+        "throughput_rps": round(total / elapsed, 2),
+        "error_rate": round(errors / total, 4) if total else 0.0,
+        "latency_ms_p50": round(statistics.median(every), 2) if every else None,
+        "latency_ms_p99": round(percentile(every, 99), 2) if every else None,
+    }
+    return overall, endpoints
+
+
+async def run(args):
+    from core.vectorstore import store
+    from core.qdrant.schema import setup_collections
+    from api.main import app
+
+    if not args.verbose:
+        logging.getLogger("SatyaAI").setLevel(logging.WARNING)  # Access log line per request
+    setup_collections()
+    workload = Workload(args.seed, args.families)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://satyaai.local") as http:
+        ready = await http.get("/ready")
+        if ready.status_code != 200:
+            print(f"⚠️  /ready answered {ready.status_code}: {ready.json().get('models')}")
+
+        # Per-request prints from the pipeline would dominate the output
+        with redirect_stdout(sys.stdout if args.verbose else io.StringIO()):
+            started = time.perf_counter()
+            await seed(http, workload, args.seed_claims)
+            seed_seconds = time.perf_counter() - started
+
+            samples, statuses, elapsed = await run_workers(
+                http, workload, args.mix, args.requests, args.concurrency, args.timeout
+            )
+    print(f"🆕 Seeded {args.seed_claims} claims in {seed_seconds:.1f}s "
+          f"({len(set(workload.narrative_ids))} narratives)")
+    store.close()  # Flush on-disk stores before interpreter shutdown
+
+    overall, endpoints = summarize(samples, statuses, elapsed)
+    return {
+        "config": {
+            "backend": args.backend,
+            "qdrant": args.qdrant,
+            "stub_embedders": args.stub_embedders,
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "seed_claims": args.seed_claims,
+            "seed_seconds": round(seed_seconds, 3),
+            "mix": args.mix,
+            "seed": args.seed,
+        },
+        "overall": overall,
+        "endpoints": endpoints,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--backend", choices=["qdrant", "numpy"], default="qdrant",
+                        help="Vector store backend (numpy: exact in-process search)")
+    parser.add_argument("--qdrant", default=":memory:",
+                        help="':memory:' or a local directory for the Qdrant (or numpy) data")
+    parser.add_argument("--stub-embedders", action="store_true", help="Skip the embedding models")
+    parser.add_argument("--requests", type=int, default=1000, help="Measured requests")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--mix", nargs="+", metavar="WORKLOAD=WEIGHT",
+                        help=f"Weights per workload (default: {DEFAULT_MIX})")
+    parser.add_argument("--seed-claims", type=int, default=200, help="Claims stored before measuring")
+    parser.add_argument("--families", type=int, default=50, help="Narrative families claims come from")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout (seconds)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--verbose", action="store_true", help="Keep pipeline prints and access logs")
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    args = parser.parse_args()
+    args.mix = parse_mix(args.mix)
+
+    # Must happen before anything imports core.vectorstore
+    os.environ["VECTOR_STORE_BACKEND"] = args.backend
+    os.environ["VECTOR_STORE_PATH"] = args.qdrant
+    os.environ["QDRANT_PATH"] = args.qdrant
+    os.environ.pop("QDRANT_URL", None)
+
+    with tempfile.TemporaryDirectory(prefix="satyaai_load_") as tmp:
+        isolate_sidecar_files(Path(tmp))
+        if args.stub_embedders:
+            from core.config import TEXT_EMBEDDING_DIM, IMAGE_EMBEDDING_DIM
+            install_stub_embedders(TEXT_EMBEDDING_DIM, IMAGE_EMBEDDING_DIM)
+        results = asyncio.run(run(args))
+
+    overall = results["overall"]
+    print("=" * 72)
+    print(f"🔬 Load test: {overall['requests']} requests, concurrency {args.concurrency}, "
+          f"{args.backend} {args.qdrant}{' (stub embedders)' if args.stub_embedders else ''}")
+    print(f"   {overall['throughput_rps']} req/s, p50={overall['latency_ms_p50']} ms  "
+          f"p99={overall['latency_ms_p99']} ms  errors={overall['error_rate']:.2%}")
+    print("=" * 72)
+    for endpoint, row in results["endpoints"].items():
+        print(f"{endpoint:<30} n={row['requests']:<6} {row['throughput_rps']:>8} req/s  "
+              f"p50={row['latency_ms_p50']:<8} p95={row['latency_ms_p95']:<8} "
+              f"p99={row['latency_ms_p99']:<8} errors={row['error_rate']:.2%}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n📁 Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
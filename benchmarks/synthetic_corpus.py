@@ -0,0 +1,288 @@
+"""
+Synthetic memory corpus for scale benchmarks.
+
+Generates narrative families the way misinformation recycles: each
+family has one base claim and one base vector per modality, and every
+member is a mutated copy (swapped names/places/numbers, a repost frame,
+vector noise) re-posted in some year on some platform. Family sizes are
+heavy-tailed, so a few narratives are huge and most are small.
+
+Payloads carry the same fields the memory stores write (type, claim,
+content_hash, phash, video_source, year, source, observed_at,
+ingested_at, ingest_seq, narrative_id), so the corpus can be upserted
+straight into the real collections and read back by the analytics.
+
+Vectors are random unit vectors by default. For realistic neighbourhoods,
+pass a cached .npy matrix of real embeddings (one row per base claim);
+family base vectors are then drawn from its rows.
+
+Usage:
+    from synthetic_corpus import SyntheticCorpus
+
+    corpus = SyntheticCorpus(100_000, seed=42)
+    for collection, ids, vectors, payloads in corpus.batches(1000):
+        ...
+"""
+import hashlib
+import sys
+import os
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from core.config import TEXT_EMBEDDING_DIM, IMAGE_EMBEDDING_DIM
+
+TEXT_COLLECTION = "text_memory"
+IMAGE_COLLECTION = "image_memory"  # Images and video frames (as store_video writes them)
+
+TEMPLATES = [
+    "{name} says {number} people died in the {place} flood #{tag}",
+    "Photo shows {place} underwater after {number}mm of rain #{tag}",
+    "{name} claims vaccine batch {number} caused infertility in {place} #{tag}",
+    "{number} children fell sick after vaccination in {place}, says {name} #{tag}",
+    "{name} found {number} fake votes in {place} #{tag}",
+    "Voting machines in {place} flipped {number} votes, claims {name} #{tag}",
+    "Video shows {name} distributing cash to {number} voters in {place} #{tag}",
+    "{place} temple collapsed, {number} trapped, says {name} #{tag}",
+]
+
+REPOST_FRAMES = [
+    "{claim}",
+    "BREAKING: {claim}",
+    "Forwarded as received - {claim}",
+    "{claim} Share before they delete it!",
+    "Again going viral: {claim}",
+]
+
+FIRST = ["Ravi", "Anita", "Karan", "Meera", "Suresh", "Priya", "Arjun", "Neha", "Vikram", "Sunita"]
+LAST = ["Sharma", "Kulkarni", "Iyer", "Reddy", "Banerjee", "Patel", "Menon", "Chauhan", "Das", "Gill"]
+PLACES = ["Delhi", "Mumbai", "Chennai", "Patna", "Guwahati", "Kochi", "Surat", "Pune", "Bhopal", "Ranchi"]
+
+# Share of memories per platform
+PLATFORMS = {
+    "twitter": 0.30,
+    "facebook": 0.25,
+    "whatsapp": 0.20,
+    "instagram": 0.10,
+    "youtube": 0.08,
+    "telegram": 0.07,
+}
+
+# Share of memories per modality (payload "type")
+MODALITIES = {
+    "text": 0.80,
+    "image": 0.15,
+    "video_frame": 0.05,
+}
+
+
+def _unit_rows(matrix):
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return (matrix / np.maximum(norms, 1e-12)).astype(np.float32)
+
+
+def _probabilities(weights):
+    names = list(weights)
+    p = np.asarray([weights[name] for name in names], dtype=np.float64)
+    return names, p / p.sum()
+
+
+class SyntheticCorpus:
+    """Deterministic corpus of mutated narrative families"""
+
+    def __init__(self, n_points, n_families=None, seed=42, mutation=0.3,
+                 years=(2014, 2025), year_spread=1.5, platforms=None, modalities=None,
+                 embeddings=None, text_dim=TEXT_EMBEDDING_DIM, image_dim=IMAGE_EMBEDDING_DIM,
+                 frames_per_video=5, family_skew=1.1):
+        """
+        Args:
+            n_points (int): Memories to generate
+            n_families (int): Narrative families (default: one per 25 memories)
+            seed (int): Seed for every random choice
+            mutation (float): Vector noise norm relative to the family vector
+                (member cosine ~ 1 / sqrt(1 + mutation^2)) and the chance of
+                swapping each entity in the claim text
+            years (tuple): First and last year a family can start in
+            year_spread (float): Mean years between a family's start and a
+                member's re-posting (exponential, so most are early)
+            platforms (dict): Platform -> share (default PLATFORMS)
+            modalities (dict): Payload type -> share (default MODALITIES)
+            embeddings: Path to a cached .npy matrix (or an array) of text
+                embeddings to draw family base vectors from
+            text_dim (int): Text vector size (ignored with embeddings)
+            image_dim (int): Image/frame vector size
+            frames_per_video (int): Consecutive frames stored per video
+            family_skew (float): Zipf exponent of family sizes
+        """
+        self.n_points = int(n_points)
+        self.n_families = int(n_families or max(1, self.n_points // 25))
+        self.seed = seed
+        self.mutation = float(mutation)
+        self.years = years
+        self.year_spread = float(year_spread)
+        self.platforms, self._platform_p = _probabilities(platforms or PLATFORMS)
+        self.modalities, self._modality_p = _probabilities(modalities or MODALITIES)
+        self.frames_per_video = max(1, int(frames_per_video))
+
+        rng = np.random.default_rng(seed)
+
+        if embeddings is not None:
+            cached = np.load(embeddings) if isinstance(embeddings, (str, os.PathLike)) else embeddings
+            cached = _unit_rows(np.asarray(cached, dtype=np.float32))
+            rows = rng.choice(len(cached), size=self.n_families, replace=len(cached) < self.n_families)
+            self.text_base = cached[rows]
+        else:
+            self.text_base = _unit_rows(rng.standard_normal((self.n_families, text_dim), dtype=np.float32))
+        self.image_base = _unit_rows(rng.standard_normal((self.n_families, image_dim), dtype=np.float32))
+        self.text_dim = self.text_base.shape[1]
+        self.image_dim = image_dim
+
+        ranks = np.arange(1, self.n_families + 1, dtype=np.float64)
+        weights = ranks ** -family_skew
+        self._family_p = weights / weights.sum()
+
+        self.first_year = rng.integers(years[0], years[1] + 1, size=self.n_families)
+        self.template = rng.integers(0, len(TEMPLATES), size=self.n_families)
+        # Base entities per family: first name, last name, place
+        self.entities = rng.integers(0, 10, size=(self.n_families, 3))
+        self.numbers = rng.integers(100, 10000, size=self.n_families)
+        self.phash = rng.integers(0, 2 ** 63, size=self.n_families, dtype=np.int64)
+
+    @staticmethod
+    def narrative_id(family):
+        return f"NAR_{int(family):08x}"
+
+    def family_claim(self, family, rng=None, mutate=False):
+        """Claim text of a family, optionally with entities swapped"""
+        first, last, place = self.entities[family]
+        number = int(self.numbers[family])
+        if mutate:
+            swap = rng.random(4) < self.mutation
+            first = rng.integers(0, 10) if swap[0] else first
+            place = rng.integers(0, 10) if swap[1] else place
+            number = int(rng.integers(100, 10000)) if swap[2] else number
+            frame = REPOST_FRAMES[rng.integers(0, len(REPOST_FRAMES))] if swap[3] else "{claim}"
+        else:
+            frame = "{claim}"
+        claim = TEMPLATES[self.template[family]].format(
+            name=f"{FIRST[first]} {LAST[last]}",
+            number=f"{number:,}",
+            place=PLACES[place],
+            tag=f"Truth{family % 997}"
+        )
+        return frame.format(claim=claim)
+
+    def _mutate(self, base, families, rng):
+        """Family vectors plus noise of norm ~ mutation"""
+        dim = base.shape[1]
+        noise = rng.standard_normal((len(families), dim), dtype=np.float32)
+        noise *= self.mutation / np.sqrt(dim)
+        return _unit_rows(base[families] + noise)
+
+    def _years(self, families, rng):
+        drift = np.floor(rng.exponential(self.year_spread, size=len(families))).astype(np.int64)
+        return np.minimum(self.first_year[families] + drift, self.years[1])
+
+    def _payloads(self, ids, families, modality, rng, ingested_at, seq):
+        years = self._years(families, rng)
+        platforms = rng.choice(len(self.platforms), size=len(ids), p=self._platform_p)
+        days = rng.integers(0, 365, size=len(ids))
+        seconds = rng.integers(0, 86400, size=len(ids))
+
+        payloads = []
+        for i, (pid, family) in enumerate(zip(ids, families)):
+            observed = (datetime(int(years[i]), 1, 1, tzinfo=timezone.utc)
+                        + timedelta(days=int(days[i]), seconds=int(seconds[i])))
+            payload = {
+                "type": modality,
+                "year": int(years[i]),
+                "source": self.platforms[platforms[i]],
+                "observed_at": observed.isoformat(),
+                "ingested_at": ingested_at,
+                "narrative_id": self.narrative_id(family),
+            }
+            if modality == "text":
+                claim = self.family_claim(family, rng, mutate=True)
+                payload["claim"] = claim
+                payload["content_hash"] = hashlib.sha256(claim.lower().encode()).hexdigest()
+            else:
+                flips = rng.binomial(64, min(0.5, self.mutation * 0.1))
+                mask = sum(1 << int(bit) for bit in rng.choice(64, size=flips, replace=False))
+                payload["phash"] = f"{int(self.phash[family]) ^ mask:016x}"
+                payload["content_hash"] = hashlib.sha256(f"{self.seed}:{pid}".encode()).hexdigest()
+                payload["path"] = f"synthetic/{payload['narrative_id']}/{pid}.jpg"
+            payload["ingest_seq"] = seq + i
+            payloads.append(payload)
+        return payloads
+
+    def batches(self, batch_size=1000):
+        """
+        Generate the corpus in upsert-sized batches.
+
+        Args:
+            batch_size (int): Memories per batch (split across collections)
+
+        Yields:
+            tuple: (collection, ids, vectors float32 [n, dim], payloads)
+        """
+        rng = np.random.default_rng(self.seed + 1)
+        ingested_at = datetime.now(timezone.utc).isoformat()
+        seq = 1
+        next_id = 1
+        video = 0
+
+        for start in range(0, self.n_points, batch_size):
+            size = min(batch_size, self.n_points - start)
+            families = rng.choice(self.n_families, size=size, p=self._family_p)
+            modality = rng.choice(len(self.modalities), size=size, p=self._modality_p)
+
+            for m, name in enumerate(self.modalities):
+                rows = families[modality == m]
+                if not len(rows):
+                    continue
+                ids = list(range(next_id, next_id + len(rows)))
+                next_id += len(rows)
+
+                if name == "text":
+                    collection = TEXT_COLLECTION
+                    vectors = self._mutate(self.text_base, rows, rng)
+                elif name == "video_frame":
+                    # Consecutive frames share a video (and its family):
+                    # one mutation per video, small jitter per frame
+                    owner = np.arange(len(rows)) // self.frames_per_video
+                    video_families = rows[::self.frames_per_video]
+                    rows = video_families[owner]
+                    video_vectors = self._mutate(self.image_base, video_families, rng)
+                    jitter = rng.standard_normal((len(rows), self.image_dim), dtype=np.float32)
+                    jitter *= 0.1 * self.mutation / np.sqrt(self.image_dim)
+                    collection = IMAGE_COLLECTION
+                    vectors = _unit_rows(video_vectors[owner] + jitter)
+                else:
+                    collection = IMAGE_COLLECTION
+                    vectors = self._mutate(self.image_base, rows, rng)
+
+                payloads = self._payloads(ids, rows, name, rng, ingested_at, seq)
+                seq += len(rows)
+                if name == "video_frame":
+                    for payload, o in zip(payloads, owner):
+                        payload["video_source"] = f"synthetic/video_{video + int(o)}.mp4"
+                    video += len(video_families)
+
+                yield collection, ids, vectors, payloads
+
+    def queries(self, n_queries, modality="text"):
+        """
+        Query vectors: fresh mutations of random families.
+
+        Args:
+            n_queries (int): Number of queries
+            modality (str): "text" or "image"
+
+        Returns:
+            tuple: (vectors float32 [n, dim], narrative_ids of the source families)
+        """
+        rng = np.random.default_rng(self.seed + 2)
+        families = rng.choice(self.n_families, size=n_queries, p=self._family_p)
+        base = self.text_base if modality == "text" else self.image_base
+        return self._mutate(base, families, rng), [self.narrative_id(f) for f in families]
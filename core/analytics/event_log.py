@@ -0,0 +1,213 @@
+"""
+Append-only log of stored memories.
+
+Every stored point appends one compact JSON line (point key, narrative,
+year, source, time) to a file next to the Qdrant data (so backups include
+it). Incremental indexes such as NarrativeAggregates and TimeBucketIndex
+fold this log into their own in-memory state. Each process tails the file,
+so memories stored by another worker become visible on the next read.
+
+Point IDs are deterministic, so storing the same item again overwrites its
+point but appends another event. Folds are last-write-wins per point key:
+the earlier event is retracted before the new one is applied.
+"""
+import json
+import os
+import threading
+from pathlib import Path
+from core.vectorstore import store, TEXT_COLLECTION, IMAGE_COLLECTION, VIDEO_COLLECTION
+from core.config import MEMORY_EVENT_LOG_PATH
+
+_EVENT_FIELDS = ["narrative_id", "year", "source", "observed_at", "ingested_at"]
+
+_append_lock = threading.Lock()
+
+
+def event_key(collection, point_id):
+    """Log key of a stored point"""
+    return f"{collection}/{point_id}"
+
+
+def memory_event(payload, collection=None, point_id=None):
+    """
+    Compact log entry for a stored memory.
+
+    Absent year/source keys stay absent (analytics treat a missing source
+    differently from an empty one). The time is observed_at when known,
+    else ingested_at. Events without a point (collection and ID) cannot be
+    superseded and always count as a new memory.
+    """
+    event = {"n": payload["narrative_id"]}
+    if collection is not None and point_id is not None:
+        event["k"] = event_key(collection, point_id)
+    if "year" in payload:
+        event["y"] = payload["year"]
+    if "source" in payload:
+        event["s"] = payload["source"]
+    timestamp = payload.get("observed_at") or payload.get("ingested_at")
+    if timestamp:
+        event["t"] = timestamp
+    return event
+
+
+def append_events(payloads, path=None, collection=None, point_ids=None):
+    """
+    Append events for stored payloads (those without a narrative are skipped).
+
+    Args:
+        payloads (list): Stored point payloads
+        path (str | Path): Log file (default: MEMORY_EVENT_LOG_PATH)
+        collection (str): Collection the points were stored in
+        point_ids (list): Point IDs aligned with payloads
+    """
+    if point_ids is None:
+        point_ids = [None] * len(payloads)
+    lines = [
+        json.dumps(memory_event(p, collection, pid)) + "\n"
+        for p, pid in zip(payloads, point_ids) if p.get("narrative_id")
+    ]
+    if not lines:
+        return
+
+    path = Path(path or MEMORY_EVENT_LOG_PATH)
+    with _append_lock:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write("".join(lines))
+
+
+def record_stored_memory(payload, collection=None, point_id=None):
+    """Ingest hook: log a stored memory for the incremental indexes"""
+    try:
+        append_events([payload], collection=collection, point_ids=[point_id])
+    except Exception as e:
+        print(f"⚠️  Could not log stored memory: {e}")
+
+
+class EventLogFold:
+    """Base for in-memory state folded from the memory event log"""
+
+    def __init__(self, path=None):
+        self.path = Path(path or MEMORY_EVENT_LOG_PATH)
+        self._lock = threading.Lock()
+        self._offset = 0
+        self._events = 0
+        self._inode = None
+        self._reset()
+
+    def _reset(self):
+        """Clear folded state (subclasses extend)"""
+        self._offset = 0
+        self._events = 0
+        self._points = {}  # Point key -> its latest event
+
+    def _apply(self, event):
+        """Fold one event (subclasses implement)"""
+        raise NotImplementedError
+
+    def _retract(self, event):
+        """Undo an event superseded by a later one for the same point (subclasses implement)"""
+        raise NotImplementedError
+
+    def _fold(self, event):
+        """Apply an event, last-write-wins per point key"""
+        key = event.get("k")
+        previous = self._points.pop(key, None) if key is not None else None
+        if previous is not None:
+            self._retract(previous)
+            self._events -= 1
+        self._apply(event)
+        self._events += 1
+        if key is not None:
+            self._points[key] = event
+
+    def __len__(self):
+        """Number of memories folded in (a re-stored point counts once)"""
+        with self._lock:
+            self._sync()
+            return self._events
+
+    def _sync(self):
+        """Fold lines appended since the last read (by any process)"""
+        try:
+            stat = self.path.stat()
+            size, inode = stat.st_size, stat.st_ino
+        except FileNotFoundError:
+            size, inode = 0, None
+
+        if size < self._offset or (self._inode is not None and inode != self._inode):
+            # File was replaced (rebuild or backup restore) - start over
+            self._reset()
+        self._inode = inode
+
+        if size == self._offset:
+            return
+
+        with open(self.path, "rb") as f:
+            f.seek(self._offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # Partially written line; pick it up next time
+                self._offset += len(line)
+                try:
+                    self._fold(json.loads(line))
+                except (ValueError, KeyError, TypeError):
+                    continue
+
+    def record(self, payload, collection=None, point_id=None):
+        """
+        Log a stored memory and fold it in.
+
+        Args:
+            payload (dict): Stored point payload (must carry narrative_id)
+            collection (str): Collection the point was stored in
+            point_id: Point ID (a later record for the same point replaces this one)
+        """
+        append_events([payload], self.path, collection, [point_id])
+        with self._lock:
+            self._sync()
+
+
+def rebuild_event_log(collections=(TEXT_COLLECTION, IMAGE_COLLECTION, VIDEO_COLLECTION)):
+    """
+    Rewrite the event log from the payloads stored in Qdrant.
+
+    Returns:
+        int: Number of memories logged
+    """
+    tmp_path = Path(str(MEMORY_EVENT_LOG_PATH) + ".tmp")
+    tmp_path.parent.mkdir(parents=True, exist_ok=True)
+    count = 0
+
+    with open(tmp_path, "w", encoding="utf-8") as out:
+        for collection in collections:
+            offset = None
+            while True:
+                try:
+                    points, offset = store.scroll(
+                        collection_name=collection,
+                        limit=1000,
+                        offset=offset,
+                        with_payload=_EVENT_FIELDS,
+                        with_vectors=False
+                    )
+                except Exception as e:
+                    print(f"⚠️  Could not scan {collection}: {e}")
+                    break
+
+                for p in points:
+                    payload = p.payload or {}
+                    if payload.get("narrative_id"):
+                        out.write(json.dumps(memory_event(payload, collection, p.id)) + "\n")
+                        count += 1
+
+                if offset is None:
+                    break
+
+    os.replace(tmp_path, MEMORY_EVENT_LOG_PATH)
+    print(f"✅ Memory event log rebuilt: {count} memories")
+    return count
+
+
+if __name__ == "__main__":
+    rebuild_event_log()
@@ -0,0 +1,256 @@
+"""
+Columnar in-memory frame of narrative memories.
+
+One row per memory with typed code columns, built once per scan and
+shared by every analysis. Categorical payload fields (narrative_id,
+source, type) are dictionary-encoded; the vocabularies keep first-seen
+order so group-by results come out in the same order as a row-by-row
+pass over the narrative dict would produce them.
+"""
+import numpy as np
+from core.vectorstore import store, TEXT_COLLECTION, IMAGE_COLLECTION, VIDEO_COLLECTION
+
+YEAR_MISSING = -1
+
+# Marks a payload key that is absent (as opposed to present with None)
+MISSING = type("Missing", (), {"__repr__": lambda self: "MISSING"})()
+
+_FRAME_FIELDS = ["narrative_id", "year", "source", "type"]
+
+
+class _Encoder:
+    """Assigns integer codes to values in first-seen order"""
+
+    def __init__(self):
+        self.codes = {}
+
+    @property
+    def values(self):
+        return list(self.codes)
+
+    def encode(self, value):
+        return self.codes.setdefault(value, len(self.codes))
+
+    def encode_all(self, values):
+        """Codes for an iterable of values as an int32 array"""
+        codes = self.codes
+        setdefault = codes.setdefault
+        return np.array([setdefault(v, len(codes)) for v in values], dtype=np.int32)
+
+
+def _parse_year(value):
+    """Year as int when the payload value is a truthy digit string/int"""
+    if value and str(value).isdigit():
+        return int(value)
+    return YEAR_MISSING
+
+
+def _claim_key(payload):
+    """Claim prefix used to count distinct wordings"""
+    claim = payload.get("claim")
+    return claim[:60] if claim else None
+
+
+def _year_lookup(year_values):
+    """Parsed year per raw year value (int16 unless a year does not fit)"""
+    parsed = [_parse_year(get_value(v)) for v in year_values]
+    dtype = np.int16 if all(p <= np.iinfo(np.int16).max for p in parsed) else np.int32
+    return np.array(parsed, dtype=dtype)
+
+
+class NarrativeFrame:
+    """
+    Typed columns, one row per memory:
+
+    - narrative (int32): index into `narrative_ids`
+    - year (int16): parsed year or YEAR_MISSING
+    - year_code (int32): index into `year_values` (raw payload value)
+    - source (int32): index into `source_values` (raw payload value)
+    - modality (int32): index into `modality_values` (raw payload value)
+    - claim (int32, optional): index into `claim_values` (first 60
+      characters of the claim, None when empty)
+    """
+
+    def __init__(self, narrative_ids, narrative, year_code, year_values,
+                 source, source_values, modality, modality_values,
+                 claim=None, claim_values=None):
+        self.narrative_ids = narrative_ids
+        self.narrative = narrative
+        self.year_code = year_code
+        self.year_values = year_values
+        self.year = _year_lookup(year_values)[year_code]
+        self.source = source
+        self.source_values = source_values
+        self.modality = modality
+        self.modality_values = modality_values
+        self.claim = claim
+        self.claim_values = claim_values
+
+    def __len__(self):
+        """Number of narratives (so `if not frame` mirrors `if not narratives`)"""
+        return len(self.narrative_ids)
+
+    @property
+    def n_rows(self):
+        return len(self.narrative)
+
+    @classmethod
+    def from_narratives(cls, narratives, with_claims=False):
+        """
+        Build a frame from a narrative_id -> list of payloads dict.
+
+        Args:
+            narratives (dict): Output of get_all_narratives()
+            with_claims (bool): Also encode claim prefixes (for mutation scores)
+
+        Returns:
+            NarrativeFrame
+        """
+        narrative_ids = list(narratives.keys())
+        years, sources, modalities = _Encoder(), _Encoder(), _Encoder()
+
+        narrative = np.repeat(
+            np.arange(len(narrative_ids), dtype=np.int32),
+            [len(v) for v in narratives.values()]
+        )
+        rows = [m for memories in narratives.values() for m in memories]
+        year = years.encode_all(m.get("year", MISSING) for m in rows)
+        source = sources.encode_all(m.get("source", MISSING) for m in rows)
+        modality = modalities.encode_all(m.get("type", MISSING) for m in rows)
+
+        claim, claims = None, None
+        if with_claims:
+            claims = _Encoder()
+            claim = claims.encode_all(_claim_key(m) for m in rows)
+            claims = claims.values
+
+        return cls(narrative_ids, narrative, year, years.values,
+                   source, sources.values, modality, modalities.values,
+                   claim, claims)
+
+    @classmethod
+    def from_qdrant(cls, collections=(TEXT_COLLECTION, IMAGE_COLLECTION, VIDEO_COLLECTION),
+                    batch_size=1000, with_claims=False):
+        """
+        Build a frame straight from a paginated scroll, fetching only the
+        payload fields the analyses use.
+
+        Args:
+            collections (tuple): Collections to scan
+            batch_size (int): Scroll page size
+            with_claims (bool): Also encode claim prefixes (for mutation scores)
+
+        Returns:
+            NarrativeFrame
+        """
+        narratives, years, sources, modalities = _Encoder(), _Encoder(), _Encoder(), _Encoder()
+        claims = _Encoder()
+        narrative, year, source, modality, claim = [], [], [], [], []
+        fields = _FRAME_FIELDS + ["claim"] if with_claims else _FRAME_FIELDS
+
+        for collection in collections:
+            offset = None
+            while True:
+                try:
+                    points, offset = store.scroll(
+                        collection_name=collection,
+                        limit=batch_size,
+                        offset=offset,
+                        with_payload=fields,
+                        with_vectors=False
+                    )
+                except Exception:
+                    break
+
+                for p in points:
+                    payload = p.payload or {}
+                    nid = payload.get("narrative_id")
+                    if not nid:
+                        continue
+                    narrative.append(narratives.encode(nid))
+                    year.append(years.encode(payload.get("year", MISSING)))
+                    source.append(sources.encode(payload.get("source", MISSING)))
+                    modality.append(modalities.encode(payload.get("type", MISSING)))
+                    if with_claims:
+                        claim.append(claims.encode(_claim_key(payload)))
+
+                if offset is None:
+                    break
+
+        return cls(
+            narratives.values,
+            np.asarray(narrative, dtype=np.int32),
+            np.asarray(year, dtype=np.int32),
+            years.values,
+            np.asarray(source, dtype=np.int32),
+            sources.values,
+            np.asarray(modality, dtype=np.int32),
+            modalities.values,
+            np.asarray(claim, dtype=np.int32) if with_claims else None,
+            claims.values if with_claims else None
+        )
+
+    # ------------------------------------------------------------------
+    # Helpers for group-bys
+    # ------------------------------------------------------------------
+
+    def narrative_sizes(self):
+        """Memories per narrative"""
+        return np.bincount(self.narrative, minlength=len(self.narrative_ids))
+
+    @staticmethod
+    def truthy(values):
+        """Boolean lookup of `bool(dict.get(key))` per vocabulary entry"""
+        return np.array([bool(get_value(v)) for v in values], dtype=bool)
+
+    @staticmethod
+    def remap(codes, values, key):
+        """
+        Re-encode a code column through a key function applied to its
+        vocabulary (O(vocabulary), not O(rows)).
+
+        Returns:
+            tuple: (new codes, new vocabulary in first-seen order)
+        """
+        encoder = _Encoder()
+        lookup = np.array([encoder.encode(key(v)) for v in values], dtype=np.int32)
+        if len(lookup) == 0:
+            return codes.copy(), encoder.values
+        return lookup[codes], encoder.values
+
+    def values_per_narrative(self, codes, values, mask=None):
+        """
+        Distinct vocabulary values per narrative.
+
+        Returns:
+            tuple: (bounds, values) where values[bounds[i]:bounds[i + 1]]
+                are narrative i's distinct values
+        """
+        narrative = self.narrative
+        if mask is not None:
+            narrative, codes = narrative[mask], codes[mask]
+        n_values = max(len(values), 1)
+        pairs = np.unique(narrative.astype(np.int64) * n_values + codes)
+        bounds = np.searchsorted(pairs // n_values, np.arange(len(self.narrative_ids) + 1))
+        lookup = np.empty(len(values), dtype=object)
+        for i, value in enumerate(values):
+            lookup[i] = value
+        return bounds, lookup[pairs % n_values]
+
+    def distinct_per_narrative(self, codes, n_values, mask=None):
+        """Number of distinct code values per narrative"""
+        narrative = self.narrative
+        if mask is not None:
+            narrative, codes = narrative[mask], codes[mask]
+        pairs = np.unique(narrative.astype(np.int64) * max(n_values, 1) + codes)
+        return np.bincount(pairs // max(n_values, 1), minlength=len(self.narrative_ids))
+
+
+def get_value(value):
+    """Payload value as `dict.get(key)` would return it"""
+    return None if value is MISSING else value
+
+
+def get_value_or(default):
+    """Payload value as `dict.get(key, default)` would return it"""
+    return lambda value: default if value is MISSING else value
@@ -0,0 +1,235 @@
+"""
+Content-similarity campaign detection.
+
+detect_coordinated_campaigns groups narratives that share a platform and
+year. This detector links narratives whose embedding centroids are close,
+regardless of where they were posted. Candidate pairs come from one
+k-nearest-neighbour query per centroid (batched through Qdrant), so the
+cost grows with narratives x k rather than narratives squared; the sparse
+similarity graph is then split into connected components.
+"""
+from collections import defaultdict
+import numpy as np
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+from qdrant_client.http.models import FieldCondition, Filter, MatchValue, QueryRequest
+from core.vectorstore import store, TEXT_COLLECTION
+from core.qdrant.schema import search_params
+from core.memory.content_hash import dense_vector
+from core.config import (
+    SIMILARITY_CAMPAIGN_NEIGHBORS,
+    SIMILARITY_CAMPAIGN_THRESHOLD,
+    SIMILARITY_CAMPAIGN_MIN_NARRATIVES
+)
+
+QUERY_BATCH_SIZE = 64     # Centroid queries per query_batch_points call
+NEIGHBOR_OVERFETCH = 4    # Memories fetched per wanted neighbour narrative
+
+
+def _normalize(vectors):
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def compute_narrative_centroids(collection=TEXT_COLLECTION, batch_size=512):
+    """
+    Mean unit embedding per narrative from a paginated scroll.
+
+    Args:
+        collection (str): Collection to scan
+        batch_size (int): Scroll page size
+
+    Returns:
+        tuple: (narrative_ids, centroids, info) where centroids is a unit
+            float32 matrix aligned with narrative_ids and info maps each
+            narrative to its memory count, platforms and years
+    """
+    index = {}
+    sums = []
+    info = defaultdict(lambda: {"count": 0, "platforms": set(), "years": set()})
+
+    offset = None
+    while True:
+        try:
+            points, offset = store.scroll(
+                collection_name=collection,
+                limit=batch_size,
+                offset=offset,
+                with_payload=["narrative_id", "source", "year"],
+                with_vectors=True
+            )
+        except Exception as e:
+            print(f"⚠️  Could not scan {collection}: {e}")
+            break
+
+        for p in points:
+            payload = p.payload or {}
+            nid = payload.get("narrative_id")
+            vector = dense_vector(p)
+            if not nid or vector is None:
+                continue
+
+            vector = np.asarray(vector, dtype=np.float32)
+            norm = np.linalg.norm(vector)
+            if norm == 0:
+                continue
+
+            if nid not in index:
+                index[nid] = len(sums)
+                sums.append(np.zeros_like(vector))
+            sums[index[nid]] += vector / norm
+
+            entry = info[nid]
+            entry["count"] += 1
+            if payload.get("source"):
+                entry["platforms"].add(payload["source"])
+            if payload.get("year"):
+                entry["years"].add(payload["year"])
+
+        if offset is None:
+            break
+
+    if not sums:
+        return [], np.zeros((0, 0), dtype=np.float32), {}
+
+    return list(index), _normalize(np.vstack(sums)), dict(info)
+
+
+def find_candidate_pairs(narrative_ids, centroids, collection=TEXT_COLLECTION,
+                         k=SIMILARITY_CAMPAIGN_NEIGHBORS):
+    """
+    Candidate narrative pairs from a kNN query per centroid.
+
+    Each centroid is searched against the stored memories of every other
+    narrative (its own members are filtered out, or a large narrative
+    would fill every slot with itself); hits are mapped to their
+    narratives and the first k distinct ones are kept.
+
+    Args:
+        narrative_ids (list): Narrative IDs aligned with centroids
+        centroids (np.ndarray): Unit centroid matrix
+        collection (str): Collection holding the memories
+        k (int): Neighbour narratives per narrative
+
+    Returns:
+        tuple: (rows, cols) index arrays with rows < cols, deduplicated
+    """
+    position = {nid: i for i, nid in enumerate(narrative_ids)}
+    params = search_params(collection)
+    rows, cols = [], []
+
+    for start in range(0, len(narrative_ids), QUERY_BATCH_SIZE):
+        batch = centroids[start:start + QUERY_BATCH_SIZE]
+        requests = [
+            QueryRequest(
+                query=vector.tolist(),
+                filter=Filter(must_not=[
+                    FieldCondition(key="narrative_id", match=MatchValue(value=nid))
+                ]),
+                limit=k * NEIGHBOR_OVERFETCH,
+                with_payload=["narrative_id"],
+                params=params
+            )
+            for nid, vector in zip(narrative_ids[start:start + QUERY_BATCH_SIZE], batch)
+        ]
+
+        try:
+            responses = store.query_batch_points(collection_name=collection, requests=requests)
+        except Exception as e:
+            print(f"⚠️  Batch neighbour query failed: {e}")
+            continue
+
+        for offset, response in enumerate(responses):
+            i = start + offset
+            found = set()
+            for hit in response.points:
+                j = position.get((hit.payload or {}).get("narrative_id"))
+                if j is None or j == i or j in found:
+                    continue
+                found.add(j)
+                rows.append(min(i, j))
+                cols.append(max(i, j))
+                if len(found) >= k:
+                    break
+
+    if not rows:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+    pairs = np.unique(np.column_stack([rows, cols]), axis=0)
+    return pairs[:, 0], pairs[:, 1]
+
+
+def campaign_cohesion(centroids):
+    """
+    Mean pairwise cosine similarity of unit centroids.
+
+    Computed from the norm of their sum, so it costs O(n) rather than
+    O(n^2): sum_ij <c_i, c_j> = |sum_i c_i|^2.
+    """
+    n = len(centroids)
+    if n < 2:
+        return 1.0
+    total = centroids.sum(axis=0)
+    return float((total @ total - n) / (n * (n - 1)))
+
+
+def detect_similarity_campaigns(collection=TEXT_COLLECTION,
+                                k=SIMILARITY_CAMPAIGN_NEIGHBORS,
+                                threshold=SIMILARITY_CAMPAIGN_THRESHOLD,
+                                min_narratives=SIMILARITY_CAMPAIGN_MIN_NARRATIVES):
+    """
+    Detect campaigns of narratives with near-identical content.
+
+    Args:
+        collection (str): Collection to analyse (text or image memories)
+        k (int): Neighbour narratives considered per narrative
+        threshold (float): Minimum centroid cosine similarity for a link
+        min_narratives (int): Minimum narratives per campaign
+
+    Returns:
+        list: Campaigns with narrative_ids, cohesion (mean pairwise centroid
+            similarity), platforms and years, most cohesive large ones first
+    """
+    narrative_ids, centroids, info = compute_narrative_centroids(collection)
+    n = len(narrative_ids)
+    if n < min_narratives:
+        return []
+
+    rows, cols = find_candidate_pairs(narrative_ids, centroids, collection, k)
+
+    # Exact centroid similarity for candidate pairs only
+    similarity = np.einsum("ij,ij->i", centroids[rows], centroids[cols])
+    keep = similarity >= threshold
+    rows, cols, similarity = rows[keep], cols[keep], similarity[keep]
+
+    graph = coo_matrix((np.ones(len(rows), dtype=np.int8), (rows, cols)), shape=(n, n))
+    n_components, labels = connected_components(graph, directed=False)
+
+    sizes = np.bincount(labels, minlength=n_components)
+    edge_labels = labels[rows]
+    link_sum = np.bincount(edge_labels, weights=similarity, minlength=n_components)
+    link_count = np.bincount(edge_labels, minlength=n_components)
+
+    order = np.argsort(labels, kind="stable")
+    bounds = np.concatenate([[0], np.cumsum(sizes)])
+
+    campaigns = []
+    for component in np.flatnonzero(sizes >= min_narratives):
+        members = order[bounds[component]:bounds[component + 1]]
+        cohesion = campaign_cohesion(centroids[members])
+        ids = [narrative_ids[i] for i in members]
+        platforms = set().union(*(info[nid]["platforms"] for nid in ids))
+        years = set().union(*(info[nid]["years"] for nid in ids))
+
+        campaigns.append({
+            'narrative_ids': ids,
+            'narrative_count': len(ids),
+            'memory_count': sum(info[nid]["count"] for nid in ids),
+            'cohesion': round(cohesion, 4),
+            'mean_link_similarity': round(float(link_sum[component] / link_count[component]), 4),
+            'platforms': sorted(platforms, key=str),
+            'years': sorted(years, key=str),
+            'coordination_score': round(len(ids) * 10 * cohesion, 2)
+        })
+
+    return sorted(campaigns, key=lambda x: x['coordination_score'], reverse=True)
@@ -0,0 +1,216 @@
+"""
+Incrementally maintained platform risk and campaign aggregates.
+
+compute_platform_risk_scores and detect_coordinated_campaigns rebuild
+their group-bys from the whole corpus. The aggregates here are folded
+from the memory event log instead (one event per stored memory, see
+event_log), so reading them costs O(platforms + campaigns). Counts are
+kept per narrative rather than as sets so that a re-stored point can be
+retracted before its newer event is applied.
+"""
+import threading
+from core.analytics.event_log import EventLogFold, rebuild_event_log
+from core.analytics.narrative_frame import NarrativeFrame
+from core.analytics.trend_detector import (
+    platform_risk_entry,
+    campaign_entry,
+    compute_platform_risk_scores,
+    detect_coordinated_campaigns
+)
+
+CAMPAIGN_MIN_NARRATIVES = 3  # Same threshold as detect_coordinated_campaigns
+
+
+class NarrativeAggregates(EventLogFold):
+    """Platform and (year, platform) aggregates folded from the memory event log"""
+
+    def _reset(self):
+        super()._reset()
+        # narrative_id -> count, raw source counts, platform counts
+        self._narratives = {}
+        # platform -> mentions per narrative, mention count, high-risk narrative set
+        self._platforms = {}
+        # (year, source) -> mentions per narrative; campaigns holds keys at threshold
+        self._groups = {}
+        self._campaigns = set()
+
+    @staticmethod
+    def _keys(event):
+        """(narrative_id, raw source, platform, campaign key or None) of an event"""
+        raw_source = event.get("s")
+        year = event.get("y")
+        return event["n"], raw_source, event.get("s", "unknown"), \
+            (year, raw_source) if year and raw_source else None
+
+    @staticmethod
+    def _add(counts, key, delta):
+        """Adjust a count, dropping it at zero; returns the new count"""
+        value = counts.get(key, 0) + delta
+        if value:
+            counts[key] = value
+        else:
+            counts.pop(key, None)
+        return value
+
+    def _apply(self, event):
+        """Fold one stored memory into the aggregates"""
+        self._update(event, 1)
+
+    def _retract(self, event):
+        """Remove a memory that was stored again (its newer event follows)"""
+        self._update(event, -1)
+
+    def _update(self, event, delta):
+        nid, raw_source, platform, group_key = self._keys(event)
+
+        narrative = self._narratives.setdefault(nid, {"count": 0, "sources": {}, "platforms": {}})
+        narrative["count"] += delta
+        self._add(narrative["sources"], raw_source, delta)
+        self._add(narrative["platforms"], platform, delta)
+
+        stats = self._platforms.setdefault(platform, {"narratives": {}, "mentions": 0, "high_risk": set()})
+        stats["mentions"] += delta
+        if not self._add(stats["narratives"], nid, delta):
+            stats["high_risk"].discard(nid)
+        if not stats["mentions"]:
+            del self._platforms[platform]
+
+        # A narrative is high risk on every platform it appeared on
+        high_risk = self._is_high_risk(narrative)
+        for name in narrative["platforms"]:
+            if high_risk:
+                self._platforms[name]["high_risk"].add(nid)
+            else:
+                self._platforms[name]["high_risk"].discard(nid)
+        if not narrative["count"]:
+            del self._narratives[nid]
+
+        if group_key is not None:
+            group = self._groups.setdefault(group_key, {})
+            self._add(group, nid, delta)
+            if len(group) >= CAMPAIGN_MIN_NARRATIVES:
+                self._campaigns.add(group_key)
+            else:
+                self._campaigns.discard(group_key)
+                if not group:
+                    del self._groups[group_key]
+
+    @staticmethod
+    def _is_high_risk(narrative):
+        return narrative["count"] >= 3 or len(narrative["sources"]) >= 2
+
+    def platform_risk_scores(self):
+        """
+        Platform risk scores from the running aggregates.
+
+        Returns:
+            dict: Same shape as compute_platform_risk_scores
+        """
+        with self._lock:
+            self._sync()
+            result = {
+                platform: platform_risk_entry(
+                    len(stats["narratives"]), stats["mentions"], len(stats["high_risk"])
+                )
+                for platform, stats in self._platforms.items()
+            }
+
+        return dict(sorted(result.items(), key=lambda x: x[1]['risk_score'], reverse=True))
+
+    def coordinated_campaigns(self):
+        """
+        Coordinated campaigns from the running aggregates.
+
+        Returns:
+            list: Same shape as detect_coordinated_campaigns
+        """
+        with self._lock:
+            self._sync()
+            campaigns = [
+                campaign_entry(year, platform, list(self._groups[(year, platform)]))
+                for year, platform in self._campaigns
+            ]
+
+        return sorted(campaigns, key=lambda x: x['coordination_score'], reverse=True)
+
+
+_aggregates = None
+_aggregates_lock = threading.Lock()
+
+
+def get_narrative_aggregates():
+    """Process-wide narrative aggregates"""
+    global _aggregates
+    with _aggregates_lock:
+        if _aggregates is None:
+            _aggregates = NarrativeAggregates()
+        return _aggregates
+
+
+def _campaign_sets(campaigns):
+    return {(c['year'], c['platform']): set(c['narrative_ids']) for c in campaigns}
+
+
+def check_consistency(aggregates=None, frame=None):
+    """
+    Compare the running aggregates against a full recompute.
+
+    Args:
+        aggregates (NarrativeAggregates): Defaults to the process-wide instance
+        frame (NarrativeFrame): Corpus to recompute from (defaults to a
+            full paginated scan of Qdrant)
+
+    Returns:
+        dict: consistent flag plus the platforms and (year, platform)
+            campaign keys whose values differ
+    """
+    if aggregates is None:
+        aggregates = get_narrative_aggregates()
+    if frame is None:
+        frame = NarrativeFrame.from_qdrant()
+
+    expected_platforms = compute_platform_risk_scores(frame)
+    actual_platforms = aggregates.platform_risk_scores()
+    platform_mismatches = sorted(
+        (name for name in set(expected_platforms) | set(actual_platforms)
+         if expected_platforms.get(name) != actual_platforms.get(name)),
+        key=str
+    )
+
+    expected_campaigns = _campaign_sets(detect_coordinated_campaigns(frame))
+    actual_campaigns = _campaign_sets(aggregates.coordinated_campaigns())
+    campaign_mismatches = sorted(
+        (key for key in set(expected_campaigns) | set(actual_campaigns)
+         if expected_campaigns.get(key) != actual_campaigns.get(key)),
+        key=str
+    )
+
+    return {
+        "consistent": not platform_mismatches and not campaign_mismatches,
+        "platform_mismatches": platform_mismatches,
+        "campaign_mismatches": campaign_mismatches
+    }
+
+
+def rebuild_aggregates():
+    """
+    Rewrite the memory event log from Qdrant (aggregates refold on next read).
+
+    Returns:
+        int: Number of memories recorded
+    """
+    return rebuild_event_log()
+
+
+if __name__ == "__main__":
+    import sys
+
+    if "--check" in sys.argv:
+        report = check_consistency()
+        if report["consistent"]:
+            print("✅ Narrative aggregates match a full recompute")
+        else:
+            print(f"❌ Platforms out of sync: {report['platform_mismatches']}")
+            print(f"❌ Campaigns out of sync: {report['campaign_mismatches']}")
+    else:
+        rebuild_aggregates()
@@ -1,8 +1,27 @@
 """
 Trend detection and analytics for narratives
+
+Every analysis accepts either the narrative dict from get_all_narratives()
+or a NarrativeFrame. Build the frame once and pass it to each function to
+avoid re-encoding the memories per analysis.
 """
-from collections import defaultdict
-from datetime import datetime, timedelta
+from datetime import datetime
+import numpy as np
+from core.analytics.narrative_frame import NarrativeFrame, get_value, get_value_or
+
+
+def as_frame(narratives):
+    """Columnar frame for a narrative dict (frames are passed through)"""
+    if isinstance(narratives, NarrativeFrame):
+        return narratives
+    return NarrativeFrame.from_narratives(narratives)
+
+
+def _unique_pairs(a, b, n_b):
+    """Distinct (a, b) code pairs, sorted by a then b"""
+    n_b = max(n_b, 1)
+    pairs = np.unique(a.astype(np.int64) * n_b + b)
+    return pairs // n_b, pairs % n_b
 
 
 def analyze_narrative_clusters(narratives):
@@ -10,12 +29,14 @@ def analyze_narrative_clusters(narratives):
     Analyze narrative ecosystem statistics.
     
     Args:
-        narratives: Dictionary of narrative_id -> list of memories
+        narratives: Dictionary of narrative_id -> list of memories, or a NarrativeFrame
         
     Returns:
         dict: Cluster statistics
     """
-    if not narratives:
+    frame = as_frame(narratives)
+
+    if not frame:
         return {
             'total_narratives': 0,
             'total_memories': 0,
@@ -25,31 +46,29 @@ def analyze_narrative_clusters(narratives):
             'yearly_activity': {}
         }
     
-    total_memories = sum(len(v) for v in narratives.values())
-    sizes = [len(v) for v in narratives.values()]
+    total_memories = frame.n_rows
+    sizes = frame.narrative_sizes()
     
     # Modality distribution
-    modality_dist = defaultdict(int)
-    for memories in narratives.values():
-        for m in memories:
-            modality = m.get('type', 'unknown')
-            modality_dist[modality] += 1
+    modality, modality_values = frame.remap(
+        frame.modality, frame.modality_values, get_value_or('unknown')
+    )
+    modality_counts = np.bincount(modality, minlength=len(modality_values))
+    modality_dist = {
+        value: int(count) for value, count in zip(modality_values, modality_counts)
+    }
     
     # Yearly activity
-    yearly = defaultdict(int)
-    for memories in narratives.values():
-        for m in memories:
-            year = m.get('year')
-            if year and str(year).isdigit():
-                yearly[int(year)] += 1
+    years, year_counts = np.unique(frame.year[frame.year >= 0], return_counts=True)
+    yearly = {int(y): int(c) for y, c in zip(years, year_counts)}
     
     return {
-        'total_narratives': len(narratives),
+        'total_narratives': len(frame),
         'total_memories': total_memories,
-        'avg_narrative_size': total_memories / len(narratives) if narratives else 0,
-        'largest_narrative': max(sizes) if sizes else 0,
-        'modality_distribution': dict(modality_dist),
-        'yearly_activity': dict(sorted(yearly.items()))
+        'avg_narrative_size': total_memories / len(frame),
+        'largest_narrative': int(sizes.max()) if sizes.size else 0,
+        'modality_distribution': modality_dist,
+        'yearly_activity': yearly
     }
 
 
@@ -58,142 +77,222 @@ def detect_viral_narratives(narratives, time_window_days=365):
     Detect narratives that went viral (rapid spread).
     
     Args:
-        narratives: Dictionary of narrative_id -> list of memories
+        narratives: Dictionary of narrative_id -> list of memories, or a NarrativeFrame
         time_window_days: Time window to check for virality
         
     Returns:
         list: List of viral narratives with metrics
     """
-    viral = []
+    frame = as_frame(narratives)
     current_year = datetime.now().year
     cutoff_year = current_year - (time_window_days // 365)
+    n = len(frame)
     
-    for nid, memories in narratives.items():
-        # Count recent vs total
-        recent = sum(1 for m in memories 
-                    if m.get('year') and int(m.get('year', 0)) >= cutoff_year)
-        total = len(memories)
-        
-        if total == 0:
-            continue
-        
-        # Velocity metric
-        velocity = recent / total if total > 0 else 0
-        
-        # Platform diversity
-        platforms = len(set(m.get('source') for m in memories if m.get('source')))
-        
-        # Risk score
-        risk_score = (velocity * 40) + (platforms * 15) + (min(recent, 10) * 5)
+    # Count recent vs total
+    recent = np.bincount(frame.narrative[frame.year >= cutoff_year], minlength=n)
+    total = frame.narrative_sizes()
+    
+    # Platform diversity
+    has_source = frame.truthy(frame.source_values)[frame.source]
+    platforms = frame.distinct_per_narrative(
+        frame.source, len(frame.source_values), mask=has_source
+    )
+    
+    return viral_entries(frame.narrative_ids, recent, total, platforms)
+
+
+def viral_entries(narrative_ids, recent, total, platforms):
+    """
+    Score and select viral narratives from per-narrative counts.
+    
+    Args:
+        narrative_ids: Narrative IDs aligned with the count arrays
+        recent: Mentions inside the time window
+        total: All mentions
+        platforms: Distinct platforms
         
-        if recent >= 3 and velocity > 0.3:  # At least 3 recent mentions and 30% velocity
-            viral.append({
-                'narrative_id': nid,
-                'recent_mentions': recent,
-                'total_mentions': total,
-                'velocity': velocity,
-                'platforms': platforms,
-                'risk_score': round(risk_score, 2)
-            })
+    Returns:
+        list: Viral narratives, highest risk first
+    """
+    recent, total, platforms = np.asarray(recent), np.asarray(total), np.asarray(platforms)
+    velocity = recent / np.maximum(total, 1)
+    
+    # Risk score
+    risk_score = (velocity * 40) + (platforms * 15) + (np.minimum(recent, 10) * 5)
+    
+    # At least 3 recent mentions and 30% velocity
+    selected = (total > 0) & (recent >= 3) & (velocity > 0.3)
+    
+    viral = [
+        {
+            'narrative_id': narrative_ids[i],
+            'recent_mentions': int(recent[i]),
+            'total_mentions': int(total[i]),
+            'velocity': float(velocity[i]),
+            'platforms': int(platforms[i]),
+            'risk_score': round(float(risk_score[i]), 2)
+        }
+        for i in np.flatnonzero(selected)
+    ]
     
     return sorted(viral, key=lambda x: x['risk_score'], reverse=True)
 
 
+def detect_viral_narratives_windowed(index=None, time_window_days=30, now=None):
+    """
+    Detect viral narratives over a sliding window of days.
+    
+    Uses the time bucket index (ingest/observed timestamps) instead of
+    years, so windows shorter than a year work and no memories are scanned.
+    
+    Args:
+        index: TimeBucketIndex (defaults to the process-wide index)
+        time_window_days: Window length in days
+        now: End of the window (default: current time)
+        
+    Returns:
+        list: Same shape as detect_viral_narratives
+    """
+    if index is None:
+        from core.narratives.time_index import get_time_bucket_index
+        index = get_time_bucket_index()
+    
+    narrative_ids, recent, total, platforms = index.windowed_velocity(time_window_days, now)
+    return viral_entries(narrative_ids, recent, total, platforms)
+
+
 def compute_platform_risk_scores(narratives):
     """
     Compute risk scores by platform.
     
     Args:
-        narratives: Dictionary of narrative_id -> list of memories
+        narratives: Dictionary of narrative_id -> list of memories, or a NarrativeFrame
         
     Returns:
         dict: Platform risk scores
     """
-    platform_stats = defaultdict(lambda: {
-        'narratives': set(),
-        'total_mentions': 0,
-        'high_risk_narratives': set()
-    })
+    frame = as_frame(narratives)
+    n = len(frame)
     
-    for nid, memories in narratives.items():
-        # Determine if narrative is high risk
-        is_high_risk = len(memories) >= 3 or len(set(m.get('source') for m in memories)) >= 2
-        
-        for m in memories:
-            source = m.get('source', 'unknown')
-            platform_stats[source]['narratives'].add(nid)
-            platform_stats[source]['total_mentions'] += 1
-            
-            if is_high_risk:
-                platform_stats[source]['high_risk_narratives'].add(nid)
-    
-    # Compute risk scores
-    result = {}
-    for platform, stats in platform_stats.items():
-        unique_narratives = len(stats['narratives'])
-        high_risk_count = len(stats['high_risk_narratives'])
-        total_mentions = stats['total_mentions']
-        
-        # Risk score formula
-        risk_score = (
-            unique_narratives * 10 +
-            high_risk_count * 25 +
-            min(total_mentions, 20) * 2
+    # Determine which narratives are high risk
+    source, source_values = frame.remap(frame.source, frame.source_values, get_value)
+    distinct_sources = frame.distinct_per_narrative(source, len(source_values))
+    is_high_risk = (frame.narrative_sizes() >= 3) | (distinct_sources >= 2)
+    
+    # Group memories by platform ('unknown' when the source key is absent)
+    platform, platforms = frame.remap(
+        frame.source, frame.source_values, get_value_or('unknown')
+    )
+    total_mentions = np.bincount(platform, minlength=len(platforms))
+    pair_platform, pair_narrative = _unique_pairs(platform, frame.narrative, n)
+    unique_narratives = np.bincount(pair_platform, minlength=len(platforms))
+    high_risk_count = np.bincount(
+        pair_platform[is_high_risk[pair_narrative]], minlength=len(platforms)
+    )
+    
+    result = {
+        name: platform_risk_entry(
+            int(unique_narratives[i]), int(total_mentions[i]), int(high_risk_count[i])
         )
-        
-        if risk_score >= 100:
-            risk_level = "CRITICAL"
-        elif risk_score >= 60:
-            risk_level = "HIGH"
-        elif risk_score >= 30:
-            risk_level = "MEDIUM"
-        else:
-            risk_level = "LOW"
-        
-        result[platform] = {
-            'unique_narratives': unique_narratives,
-            'total_mentions': total_mentions,
-            'high_risk_count': high_risk_count,
-            'risk_score': risk_score,
-            'risk_level': risk_level
-        }
+        for i, name in enumerate(platforms)
+    }
     
     return dict(sorted(result.items(), key=lambda x: x[1]['risk_score'], reverse=True))
 
 
+def platform_risk_entry(unique_narratives, total_mentions, high_risk_count):
+    """
+    Risk score and level for one platform's aggregates.
+    
+    Returns:
+        dict: Entry as returned per platform by compute_platform_risk_scores
+    """
+    # Risk score formula
+    risk_score = (
+        unique_narratives * 10 +
+        high_risk_count * 25 +
+        min(total_mentions, 20) * 2
+    )
+    
+    if risk_score >= 100:
+        risk_level = "CRITICAL"
+    elif risk_score >= 60:
+        risk_level = "HIGH"
+    elif risk_score >= 30:
+        risk_level = "MEDIUM"
+    else:
+        risk_level = "LOW"
+    
+    return {
+        'unique_narratives': unique_narratives,
+        'total_mentions': total_mentions,
+        'high_risk_count': high_risk_count,
+        'risk_score': risk_score,
+        'risk_level': risk_level
+    }
+
+
 def detect_coordinated_campaigns(narratives):
     """
     Detect potential coordinated campaigns (multiple narratives on same platform, same time).
     
     Args:
-        narratives: Dictionary of narrative_id -> list of memories
+        narratives: Dictionary of narrative_id -> list of memories, or a NarrativeFrame
         
     Returns:
         list: List of potential campaigns
     """
+    frame = as_frame(narratives)
+    
     # Group by year and platform
-    campaigns_map = defaultdict(lambda: defaultdict(set))
+    mask = (
+        frame.truthy(frame.year_values)[frame.year_code] &
+        frame.truthy(frame.source_values)[frame.source]
+    )
+    year_code = frame.year_code[mask]
+    source = frame.source[mask]
+    narrative = frame.narrative[mask]
     
-    for nid, memories in narratives.items():
-        for m in memories:
-            year = m.get('year')
-            source = m.get('source')
-            if year and source:
-                campaigns_map[year][source].add(nid)
+    n_sources = max(len(frame.source_values), 1)
+    group_key = year_code.astype(np.int64) * n_sources + source
+    groups, group_first, group = np.unique(group_key, return_index=True, return_inverse=True)
     
-    # Detect coordination
+    pair_group, pair_narrative = _unique_pairs(group, narrative, len(frame))
+    narrative_count = np.bincount(pair_group, minlength=len(groups))
+    bounds = np.searchsorted(pair_group, np.arange(len(groups) + 1))
+    
+    # Preserve first-seen order of years, then of platforms within a year
+    year_first = np.full(len(frame.year_values), -1, dtype=np.int64)
+    years, first = np.unique(year_code, return_index=True)
+    year_first[years] = first
+    order = np.lexsort((group_first, year_first[groups // n_sources]))
+    
+    # Detect coordination: 3+ narratives on same platform, same year
+    narrative_ids = np.array(frame.narrative_ids, dtype=object)
     campaigns = []
-    for year, platforms in campaigns_map.items():
-        for platform, narrative_ids in platforms.items():
-            if len(narrative_ids) >= 3:  # 3+ narratives on same platform, same year
-                coordination_score = len(narrative_ids) * 10
-                
-                campaigns.append({
-                    'year': year,
-                    'platform': platform,
-                    'narrative_count': len(narrative_ids),
-                    'narrative_ids': list(narrative_ids),
-                    'coordination_score': coordination_score
-                })
-    
-    return sorted(campaigns, key=lambda x: x['coordination_score'], reverse=True)
\ No newline at end of file
+    for g in order:
+        if narrative_count[g] < 3:
+            continue
+        campaigns.append(campaign_entry(
+            get_value(frame.year_values[groups[g] // n_sources]),
+            frame.source_values[groups[g] % n_sources],
+            narrative_ids[pair_narrative[bounds[g]:bounds[g + 1]]].tolist()
+        ))
+    
+    return sorted(campaigns, key=lambda x: x['coordination_score'], reverse=True)
+
+
+def campaign_entry(year, platform, narrative_ids):
+    """
+    Campaign record for narratives sharing a platform and year.
+    
+    Returns:
+        dict: Entry as returned by detect_coordinated_campaigns
+    """
+    return {
+        'year': year,
+        'platform': platform,
+        'narrative_count': len(narrative_ids),
+        'narrative_ids': list(narrative_ids),
+        'coordination_score': len(narrative_ids) * 10
+    }
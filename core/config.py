@@ -51,6 +51,92 @@ TEXT_COLLECTION = "text_memory"
 IMAGE_COLLECTION = "image_memory"
 VIDEO_COLLECTION = "video_memory"
 
+# Vector store backend (core/vectorstore): "qdrant" (QDRANT_URL / QDRANT_PATH)
+# or "numpy" (in-process exact search, no Qdrant needed - tests and small
+# deployments). The VECTOR_STORE_BACKEND / VECTOR_STORE_PATH environment
+# variables override these; a path of ":memory:" keeps the numpy store in RAM.
+VECTOR_STORE_BACKEND = "qdrant"
+VECTOR_STORE_PATH = QDRANT_DIR / "vector_store"  # numpy backend only; backed up with Qdrant data
+
+# Storage profiles: HNSW graph, vector/payload placement and quantization
+# per collection (applied by setup_collections; switch an existing
+# collection with `python -m core.qdrant.schema migrate <profile>`).
+# Quantized profiles search the compressed vectors and rescore the top
+# `oversampling * limit` candidates with the originals.
+STORAGE_PROFILES = {
+    # Everything in RAM, float32 - fastest, sized for up to a few million points
+    "ram-fast": {
+        "hnsw": {"m": 16, "ef_construct": 128, "on_disk": False},
+        "vectors_on_disk": False,
+        "payload_on_disk": False,
+        "quantization": None,
+        "optimizers": {"indexing_threshold": 20000},
+    },
+    # Originals on disk, int8 copies in RAM (4x smaller) for the graph walk
+    "balanced": {
+        "hnsw": {"m": 16, "ef_construct": 100, "on_disk": False},
+        "vectors_on_disk": True,
+        "payload_on_disk": True,
+        "quantization": {"type": "scalar", "quantile": 0.99, "always_ram": True},
+        "rescore": True,
+        "oversampling": 2.0,
+        "optimizers": {"indexing_threshold": 20000, "memmap_threshold": 20000},
+    },
+    # Tens of millions of points: graph and originals on disk, 1-bit
+    # copies in RAM (32x smaller), heavier rescoring to recover recall
+    "disk-heavy": {
+        "hnsw": {"m": 16, "ef_construct": 100, "on_disk": True},
+        "vectors_on_disk": True,
+        "payload_on_disk": True,
+        "quantization": {"type": "binary", "always_ram": True},
+        "rescore": True,
+        "oversampling": 3.0,
+        "optimizers": {"indexing_threshold": 50000, "memmap_threshold": 10000},
+    },
+}
+STORAGE_PROFILE = "ram-fast"     # Default for every collection
+COLLECTION_STORAGE_PROFILES = {  # Per-collection overrides, e.g. {"image_memory": "disk-heavy"}
+}
+
+# Sparse lexical vectors (hybrid claim search)
+TEXT_SPARSE_VECTOR = "bm25"   # Named sparse vector on text_memory
+BM25_K1 = 1.2                 # Term frequency saturation
+BM25_B = 0.75                 # Document length normalization
+BM25_AVG_DOC_LENGTH = 12      # Typical claim length in tokens
+
+# Point IDs derived from content + source metadata (UUIDv5) make
+# re-ingesting the same item an idempotent overwrite
+DETERMINISTIC_POINT_IDS = True
+
+# Perceptual hash prefilter (image reuse detection)
+PHASH_INDEX_PATH = QDRANT_DIR / "phash_index.jsonl"  # Backed up with Qdrant data
+PHASH_MAX_DISTANCE = 8  # Max Hamming distance (of 64 bits) for a near-duplicate
+
+# Append-only log of stored memories, folded by the incremental indexes
+# (platform/campaign aggregates, time buckets)
+MEMORY_EVENT_LOG_PATH = QDRANT_DIR / "memory_events.jsonl"  # Backed up with Qdrant data
+
+# Viral narrative detection window. Exact days when every memory carries a
+# timestamp (time index), otherwise rounded down to whole years
+VIRAL_WINDOW_DAYS = 365
+
+# Stored per-narrative strength/state/threat, refreshed by a background job
+NARRATIVE_REGISTRY_PATH = QDRANT_DIR / "narrative_registry.json"  # Backed up with Qdrant data
+NARRATIVE_RECOMPUTE_INTERVAL = 300  # Seconds between background refreshes (0 disables)
+
+# Process-wide narrative snapshot (get_all_narratives result) shared by
+# Streamlit reruns and API requests
+NARRATIVE_SNAPSHOT_TTL = 30  # Seconds before a snapshot is synced anyway
+NARRATIVE_SNAPSHOT_OVERLAP = 5  # Seconds of ingest_seq re-scanned per sync (clock skew, in-flight writes)
+NARRATIVE_SNAPSHOT_PAGE_SIZE = 256  # Points per delta scroll page
+NARRATIVE_SNAPSHOT_STAMP_PATH = QDRANT_DIR / "narrative_snapshot.stamp"  # None: per-process invalidation only
+
+# Burst / resurgence detection over time-bucketed counts
+BURST_BASELINE_BUCKETS = 14   # Trailing buckets forming the baseline
+BURST_LOOKBACK_BUCKETS = 7    # Recent buckets checked for burst onsets
+BURST_Z_THRESHOLD = 3.0       # Min z-score of a bucket against its baseline
+BURST_MIN_COUNT = 3           # Min mentions in a bucket to count as a burst
+
 # Backup settings
 MAX_BACKUPS = 10              # Keep last N backups
 AUTO_BACKUP_ENABLED = False   # Enable auto-backup
@@ -61,9 +147,25 @@ DEFAULT_FRAME_EXTRACTION_RATE = 60  # Extract 1 frame every N frames
 # Search settings
 DEFAULT_SEARCH_LIMIT = 10
 MAX_SEARCH_LIMIT = 50
+DEFAULT_TEXT_SEARCH_MODE = "dense"  # dense, sparse or hybrid
+HYBRID_PREFETCH_MULTIPLIER = 4      # Candidates per branch = limit * multiplier
 
 # Narrative clustering
 NARRATIVE_CLUSTER_THRESHOLD = 0.65  # Threshold for grouping into same narrative
+# Recluster threshold for CLIP image vectors: unrelated images score higher
+# than unrelated claims, so image pairs need the image linking threshold
+NARRATIVE_IMAGE_CLUSTER_THRESHOLD = IMAGE_SIMILARITY_THRESHOLD
+RECLUSTER_NEIGHBORS = 10            # kNN neighbours per memory in the recluster job
+RECLUSTER_BATCH_SIZE = 256          # Scroll page / batched query size
+NARRATIVE_ALIASES_PATH = QDRANT_DIR / "narrative_aliases.json"  # Merged ID -> current ID
+
+# Content-similarity campaign detection
+SIMILARITY_CAMPAIGN_NEIGHBORS = 10        # kNN candidates per narrative centroid
+SIMILARITY_CAMPAIGN_THRESHOLD = 0.8       # Minimum centroid cosine similarity to link
+SIMILARITY_CAMPAIGN_MIN_NARRATIVES = 3    # Narratives needed to call it a campaign
+
+# Narrative drift timelines (from stored vectors)
+DRIFT_CACHE_SIZE = 256  # Narratives whose timelines are kept in memory
 
 # Risk calculation weights
 RISK_WEIGHTS = {
@@ -79,6 +181,16 @@ DORMANT_THRESHOLD_YEARS = 2  # Years of inactivity before marking as dormant
 ACTIVE_MEMORY_THRESHOLD = 5  # Minimum memories to be considered actively spreading
 RESURFACING_MIN_GAP = 1      # Minimum gap (years) to count as resurfacing
 
-# Logging
+# Metrics (/metrics, Prometheus text format)
+METRICS_ENABLED = True  # False: instrumentation is a no-op and /metrics returns 404
+METRICS_LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Tracing spans (core/utils/tracing.py)
+TRACING_ENABLED = True          # False: spans are a no-op and logs carry no trace ID
+TRACING_EXPORTER = None         # "stdout", "file" or None (trace IDs in logs only)
+TRACING_FILE_PATH = DATA_DIR / "traces.jsonl"
+TRACING_OPENTELEMETRY = False   # Export through the OpenTelemetry SDK when installed
+
+# Logging (trace_id / span_id are "-" outside a traced request)
 LOG_LEVEL = "INFO"
-LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
\ No newline at end of file
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - [trace=%(trace_id)s] %(message)s'
\ No newline at end of file
@@ -1,6 +1,8 @@
 from sentence_transformers import SentenceTransformer
 from PIL import Image
 import streamlit as st
+from core.utils.metrics import timed
+from core.utils.tracing import traced
 
 @st.cache_resource
 def load_model():
@@ -8,6 +10,8 @@ def load_model():
 
 model = load_model()
 
+@traced("embed_image")
+@timed("embed_image")
 def embed_image(image_path):
     image = Image.open(image_path).convert("RGB")
     vector = model.encode(image)
@@ -0,0 +1,67 @@
+"""
+64-bit perceptual image hashing (pHash).
+
+Recompressed, resized or lightly edited copies of an image produce hashes
+within a small Hamming distance of each other, which lets reused visuals
+be matched without running CLIP.
+"""
+import numpy as np
+from PIL import Image
+
+HASH_SIZE = 8           # 8x8 low-frequency block -> 64 bits
+_SAMPLE_SIZE = 32       # Image is reduced to 32x32 before the DCT
+
+
+def _dct_matrix(n):
+    """Orthonormal DCT-II basis matrix"""
+    k = np.arange(n)[:, None]
+    i = np.arange(n)[None, :]
+    m = np.cos(np.pi * (2 * i + 1) * k / (2 * n)) * np.sqrt(2.0 / n)
+    m[0, :] = np.sqrt(1.0 / n)
+    return m
+
+
+_DCT = _dct_matrix(_SAMPLE_SIZE)
+
+
+def phash(image):
+    """
+    Compute a 64-bit perceptual hash.
+
+    Args:
+        image (str | Path | PIL.Image.Image): Image or path to an image
+
+    Returns:
+        int: Unsigned 64-bit hash
+    """
+    if not isinstance(image, Image.Image):
+        image = Image.open(image)
+
+    gray = image.convert("L").resize((_SAMPLE_SIZE, _SAMPLE_SIZE), Image.LANCZOS)
+    pixels = np.asarray(gray, dtype=np.float64)
+
+    dct = _DCT @ pixels @ _DCT.T
+    low = dct[:HASH_SIZE, :HASH_SIZE].flatten()
+
+    # Median excludes the DC term so overall brightness does not dominate
+    bits = low > np.median(low[1:])
+
+    value = 0
+    for bit in bits:
+        value = (value << 1) | int(bit)
+    return value
+
+
+def hamming_distance(a, b):
+    """Number of differing bits between two hashes"""
+    return (a ^ b).bit_count()
+
+
+def phash_to_hex(value):
+    """Fixed-width hex form stored in Qdrant payloads"""
+    return f"{value:016x}"
+
+
+def phash_from_hex(value):
+    """Parse a payload hex hash"""
+    return int(value, 16)
@@ -0,0 +1,73 @@
+"""
+Sparse lexical term weights (BM25-style) for claim text.
+
+Runs locally without a model. Terms are hashed to stable integer ids and
+weighted with the BM25 term-frequency component; the IDF half of BM25 is
+applied server-side by Qdrant (Modifier.IDF on the sparse vector).
+"""
+import re
+import zlib
+from collections import Counter
+from core.config import BM25_K1, BM25_B, BM25_AVG_DOC_LENGTH
+
+# Words, numbers (incl. 4,312 / 3.5) and hashtags/mentions are kept intact
+TOKEN_PATTERN = re.compile(r"[#@]?\w+(?:[.,]\d+)*")
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has",
+    "in", "is", "it", "its", "of", "on", "or", "that", "the", "this", "to",
+    "was", "were", "will", "with"
+}
+
+
+def tokenize(text):
+    """
+    Split text into lexical terms.
+
+    Args:
+        text (str): Claim text
+
+    Returns:
+        list: Lowercased terms with stopwords removed
+    """
+    if not text:
+        return []
+    tokens = TOKEN_PATTERN.findall(str(text).lower())
+    return [t for t in tokens if t not in STOPWORDS]
+
+
+def term_id(term):
+    """Stable 31-bit id for a term (independent of PYTHONHASHSEED)"""
+    return zlib.crc32(term.encode("utf-8")) & 0x7FFFFFFF
+
+
+def embed_sparse(text, query=False):
+    """
+    Compute a sparse lexical vector for text.
+
+    Args:
+        text (str): Claim or query text
+        query (bool): Query vectors use unit weights; documents use BM25 TF
+
+    Returns:
+        dict: {"indices": [...], "values": [...]} sorted by index
+    """
+    counts = Counter(tokenize(text))
+    doc_length = sum(counts.values())
+    norm = BM25_K1 * (1 - BM25_B + BM25_B * doc_length / BM25_AVG_DOC_LENGTH)
+
+    weights = {}
+    for term, tf in counts.items():
+        if query:
+            weight = 1.0
+        else:
+            weight = tf * (BM25_K1 + 1) / (tf + norm)
+        idx = term_id(term)
+        # Hash collisions inside one text are merged
+        weights[idx] = weights.get(idx, 0.0) + weight
+
+    indices = sorted(weights)
+    return {
+        "indices": indices,
+        "values": [round(weights[i], 6) for i in indices]
+    }
@@ -1,5 +1,7 @@
 from sentence_transformers import SentenceTransformer
 import streamlit as st
+from core.utils.metrics import timed
+from core.utils.tracing import traced
 
 @st.cache_resource
 def load_model():
@@ -7,5 +9,7 @@ def load_model():
 
 model = load_model()
 
+@traced("embed_text")
+@timed("embed_text")
 def embed_text(text):
     return model.encode(text).tolist()
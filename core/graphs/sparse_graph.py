@@ -0,0 +1,261 @@
+"""
+Compact narrative graph on SciPy sparse matrices.
+
+build_graph creates a NetworkX node per memory; here memories are folded
+into weighted edges instead:
+
+- narratives x platforms incidence (weight = memories on that platform)
+- narratives x narratives similarity edges (weight = centroid cosine)
+
+Nodes are integer indices into `narrative_ids` and `platforms`, so the
+graph costs a few arrays regardless of how many memories it summarizes.
+"""
+import numpy as np
+from scipy import sparse
+from scipy.sparse.csgraph import connected_components
+from core.analytics.narrative_frame import NarrativeFrame, get_value
+from core.config import SIMILARITY_CAMPAIGN_NEIGHBORS, SIMILARITY_CAMPAIGN_THRESHOLD
+
+
+class SparseNarrativeGraph:
+    """Narrative/platform graph stored as sparse matrices"""
+
+    def __init__(self, narrative_ids, platforms, incidence, memory_counts, similarity=None):
+        self.narrative_ids = list(narrative_ids)
+        self.platforms = list(platforms)
+        self.incidence = sparse.csr_matrix(incidence)
+        self.memory_counts = np.asarray(memory_counts)
+        n = len(self.narrative_ids)
+        self.similarity = (
+            sparse.csr_matrix(similarity) if similarity is not None
+            else sparse.csr_matrix((n, n), dtype=np.float32)
+        )
+
+    @property
+    def n_narratives(self):
+        return len(self.narrative_ids)
+
+    @property
+    def n_platforms(self):
+        return len(self.platforms)
+
+    @classmethod
+    def from_narratives(cls, narratives):
+        """
+        Build the graph from a narrative dict or NarrativeFrame.
+
+        Memories without a source only count towards their narrative.
+
+        Returns:
+            SparseNarrativeGraph
+        """
+        if isinstance(narratives, NarrativeFrame):
+            frame = narratives
+        else:
+            frame = NarrativeFrame.from_narratives(narratives)
+
+        platform_codes, platforms = frame.remap(frame.source, frame.source_values, get_value)
+        truthy = np.array([bool(p) for p in platforms], dtype=bool)
+
+        # Re-index platforms so only real sources become nodes
+        keep = np.flatnonzero(truthy)
+        new_index = np.full(len(platforms), -1, dtype=np.int64)
+        new_index[keep] = np.arange(len(keep))
+        columns = new_index[platform_codes] if len(platforms) else np.zeros(0, dtype=np.int64)
+        has_platform = columns >= 0
+
+        incidence = sparse.coo_matrix(
+            (
+                np.ones(int(has_platform.sum()), dtype=np.float32),
+                (frame.narrative[has_platform], columns[has_platform])
+            ),
+            shape=(len(frame), len(keep))
+        ).tocsr()  # Duplicate (narrative, platform) entries are summed
+
+        return cls(
+            frame.narrative_ids,
+            [platforms[i] for i in keep],
+            incidence,
+            frame.narrative_sizes()
+        )
+
+    def add_similarity_edges(self, rows, cols, weights):
+        """
+        Add undirected narrative-narrative edges.
+
+        Args:
+            rows (np.ndarray): Narrative indices
+            cols (np.ndarray): Narrative indices
+            weights (np.ndarray): Edge weights (e.g. centroid cosine)
+        """
+        n = self.n_narratives
+        edges = sparse.coo_matrix(
+            (np.asarray(weights, dtype=np.float32), (rows, cols)), shape=(n, n)
+        ).tocsr()
+        edges = edges.maximum(edges.T)
+        self.similarity = self.similarity.maximum(edges).tocsr()
+        self.similarity.setdiag(0)
+        self.similarity.eliminate_zeros()
+
+    def add_content_similarity(self, collection=None, k=SIMILARITY_CAMPAIGN_NEIGHBORS,
+                               threshold=SIMILARITY_CAMPAIGN_THRESHOLD):
+        """
+        Add similarity edges between narratives with close embedding
+        centroids (kNN candidates through Qdrant, see similarity_campaigns).
+
+        Returns:
+            int: Number of undirected edges added
+        """
+        from core.analytics.similarity_campaigns import (
+            compute_narrative_centroids, find_candidate_pairs
+        )
+        from core.config import TEXT_COLLECTION
+
+        collection = collection or TEXT_COLLECTION
+        ids, centroids, _ = compute_narrative_centroids(collection)
+        rows, cols = find_candidate_pairs(ids, centroids, collection, k)
+        weights = np.einsum("ij,ij->i", centroids[rows], centroids[cols])
+        keep = weights >= threshold
+
+        # Map centroid order onto this graph's narrative order
+        position = {nid: i for i, nid in enumerate(self.narrative_ids)}
+        mapping = np.array([position.get(nid, -1) for nid in ids], dtype=np.int64)
+        rows, cols, weights = mapping[rows[keep]], mapping[cols[keep]], weights[keep]
+        known = (rows >= 0) & (cols >= 0)
+
+        self.add_similarity_edges(rows[known], cols[known], weights[known])
+        return int(known.sum())
+
+    # ------------------------------------------------------------------
+    # Projections and whole-graph views
+    # ------------------------------------------------------------------
+
+    def project_narratives(self, weighted=False):
+        """
+        Narrative x narrative projection of the platform incidence.
+
+        Args:
+            weighted (bool): Weight by memory counts (sum over shared
+                platforms of count_i * count_j); otherwise count shared platforms
+
+        Returns:
+            scipy.sparse.csr_matrix: Symmetric, zero diagonal
+        """
+        b = self.incidence if weighted else (self.incidence > 0).astype(np.float32)
+        projection = (b @ b.T).tocsr()
+        projection.setdiag(0)
+        projection.eliminate_zeros()
+        return projection
+
+    def project_platforms(self, weighted=False):
+        """
+        Platform x platform projection (platforms sharing narratives).
+
+        Returns:
+            scipy.sparse.csr_matrix: Symmetric, zero diagonal
+        """
+        b = self.incidence if weighted else (self.incidence > 0).astype(np.float32)
+        projection = (b.T @ b).tocsr()
+        projection.setdiag(0)
+        projection.eliminate_zeros()
+        return projection
+
+    def adjacency(self, include_similarity=True):
+        """
+        Full undirected adjacency over narratives followed by platforms.
+
+        Returns:
+            scipy.sparse.csr_matrix: (n_narratives + n_platforms) square matrix
+        """
+        n, m = self.n_narratives, self.n_platforms
+        top_left = self.similarity if include_similarity else sparse.csr_matrix((n, n))
+        return sparse.bmat(
+            [[top_left, self.incidence], [self.incidence.T, sparse.csr_matrix((m, m))]],
+            format="csr",
+            dtype=np.float32
+        )
+
+    def connected_components(self, include_similarity=True):
+        """
+        Connected components over narratives, platforms and similarity edges.
+
+        Returns:
+            tuple: (n_components, narrative_labels, platform_labels)
+        """
+        n_components, labels = connected_components(
+            self.adjacency(include_similarity), directed=False
+        )
+        return n_components, labels[:self.n_narratives], labels[self.n_narratives:]
+
+    def pagerank(self, alpha=0.85, tol=1e-6, max_iter=100, include_similarity=True):
+        """
+        Weighted PageRank by power iteration on the sparse adjacency.
+
+        Dangling nodes redistribute their rank uniformly (as networkx does).
+
+        Returns:
+            tuple: (narrative_scores, platform_scores) arrays summing to 1 together
+        """
+        a = self.adjacency(include_similarity)
+        n = a.shape[0]
+        if n == 0:
+            return np.zeros(0), np.zeros(0)
+
+        out_degree = np.asarray(a.sum(axis=1)).ravel()
+        dangling = out_degree == 0
+        inverse = np.divide(1.0, out_degree, out=np.zeros(n), where=~dangling)
+        transition = (sparse.diags(inverse) @ a).T.tocsr()
+
+        rank = np.full(n, 1.0 / n)
+        for _ in range(max_iter):
+            previous = rank
+            rank = alpha * (transition @ rank + previous[dangling].sum() / n) + (1 - alpha) / n
+            if np.abs(rank - previous).sum() < n * tol:
+                break
+
+        return rank[:self.n_narratives], rank[self.n_narratives:]
+
+    def to_networkx(self, narrative_ids=None, max_nodes=5000):
+        """
+        Export a subgraph to NetworkX (for drawing or ad-hoc analysis).
+
+        Args:
+            narrative_ids (list): Narratives to include (default: all);
+                their platforms and the similarity edges among them come along
+            max_nodes (int): Refuse to build larger graphs
+
+        Returns:
+            networkx.Graph
+        """
+        import networkx as nx
+
+        if narrative_ids is None:
+            rows = np.arange(self.n_narratives)
+        else:
+            position = {nid: i for i, nid in enumerate(self.narrative_ids)}
+            rows = np.array([position[nid] for nid in narrative_ids if nid in position], dtype=np.int64)
+
+        sub = self.incidence[rows]
+        platform_cols = np.unique(sub.indices)
+        if len(rows) + len(platform_cols) > max_nodes:
+            raise ValueError(
+                f"Subgraph has {len(rows) + len(platform_cols)} nodes (max {max_nodes})"
+            )
+
+        G = nx.Graph()
+        for i in rows:
+            G.add_node(self.narrative_ids[i], type="narrative", memories=int(self.memory_counts[i]))
+        for j in platform_cols:
+            G.add_node(self.platforms[j], type="platform")
+
+        sub = sub.tocoo()
+        for r, c, w in zip(sub.row, sub.col, sub.data):
+            G.add_edge(self.narrative_ids[rows[r]], self.platforms[c], weight=float(w), type="posted")
+
+        similar = self.similarity[rows][:, rows].tocoo()
+        for r, c, w in zip(similar.row, similar.col, similar.data):
+            if r < c:
+                G.add_edge(self.narrative_ids[rows[r]], self.narrative_ids[rows[c]],
+                           weight=float(w), type="similar")
+
+        return G
@@ -0,0 +1,166 @@
+"""
+Content hashing for exact-repeat detection.
+
+Claims are hashed after normalization (case, whitespace, punctuation) and
+images by their raw bytes. The hash is stored as an indexed keyword
+payload (`content_hash`) so an exact repeat can be found with a filter
+lookup before any model runs.
+"""
+import hashlib
+import re
+import unicodedata
+import uuid
+from qdrant_client.http.models import FieldCondition, Filter, MatchValue
+from core.vectorstore import store
+from core.utils.timestamps import to_utc_iso
+from core.utils.metrics import timed, qdrant_timer
+from core.config import DETERMINISTIC_POINT_IDS
+
+# Namespace for UUIDv5 point IDs - changing it re-keys every memory
+POINT_ID_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, "satyaai/memory-point")
+
+# Metadata that distinguishes two sightings of the same content
+POINT_IDENTITY_FIELDS = ("type", "source", "year", "video_source")
+
+# Only part of the identity when set, so IDs of points stored without
+# them are unchanged
+OPTIONAL_IDENTITY_FIELDS = ("observed_at",)
+
+_PUNCTUATION = re.compile(r"[^\w\s#@]")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_claim_text(text):
+    """
+    Normalize claim text so trivial reposts hash identically.
+
+    Args:
+        text (str): Claim text
+
+    Returns:
+        str: Lowercased text without punctuation and with single spaces
+    """
+    text = unicodedata.normalize("NFKC", str(text or "")).lower()
+    text = _PUNCTUATION.sub(" ", text)
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def claim_content_hash(text):
+    """SHA-256 of the normalized claim text"""
+    return hashlib.sha256(normalize_claim_text(text).encode("utf-8")).hexdigest()
+
+
+def file_content_hash(path, chunk_size=1 << 20):
+    """SHA-256 of a file's bytes"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def deterministic_point_id(content_hash, metadata):
+    """
+    Derive a stable point ID from content and source metadata.
+
+    The same content seen again on the same platform in the same year
+    (and at the same observed_at time, when given) maps to the same
+    UUIDv5, so retried requests, replayed messages and resumed bulk
+    imports overwrite the existing point instead of adding a duplicate
+    memory.
+
+    Args:
+        content_hash (str): Hash from claim_content_hash / file_content_hash
+        metadata (dict): Point payload metadata
+
+    Returns:
+        str: UUID string
+    """
+    parts = [content_hash]
+    parts.extend(f"{field}={metadata.get(field, '')}" for field in POINT_IDENTITY_FIELDS)
+    for field in OPTIONAL_IDENTITY_FIELDS:
+        if metadata.get(field):
+            parts.append(f"{field}={_identity_timestamp(metadata[field])}")
+    return str(uuid.uuid5(POINT_ID_NAMESPACE, "|".join(parts)))
+
+
+def _identity_timestamp(value):
+    """Timestamps compare in their stored form regardless of input format"""
+    try:
+        return to_utc_iso(value)
+    except (ValueError, TypeError, OverflowError, OSError):
+        return str(value)
+
+
+def new_point_id(content_hash, metadata):
+    """Point ID for a new memory, deterministic unless disabled in config"""
+    if DETERMINISTIC_POINT_IDS:
+        return deterministic_point_id(content_hash, metadata)
+    return str(uuid.uuid4())
+
+
+@timed("find_by_content_hash")
+def find_by_content_hash(collection, content_hash, with_vectors=True):
+    """
+    Look up a stored point by content hash.
+
+    Args:
+        collection (str): Collection name
+        content_hash (str): Hash from claim_content_hash / file_content_hash
+        with_vectors (bool): Also return the stored vector
+
+    Returns:
+        Record | None: First matching point, or None
+    """
+    try:
+        with qdrant_timer("scroll", collection):
+            points, _ = store.scroll(
+                collection_name=collection,
+                scroll_filter=Filter(must=[
+                    FieldCondition(key="content_hash", match=MatchValue(value=content_hash))
+                ]),
+                limit=1,
+                with_payload=True,
+                with_vectors=with_vectors
+            )
+    except Exception as e:
+        print(f"⚠️  Content hash lookup failed: {e}")
+        return None
+
+    return points[0] if points else None
+
+
+def dense_vector(record):
+    """Extract the default dense vector from a stored point"""
+    vector = record.vector
+    if isinstance(vector, dict):
+        return vector.get("")
+    return vector
+
+
+@timed("find_point")
+def find_point(collection, point_id, with_vectors=False):
+    """
+    Look up a stored point by ID.
+
+    Args:
+        collection (str): Collection name
+        point_id (str): Point ID (e.g. from new_point_id)
+        with_vectors (bool): Also return the stored vector
+
+    Returns:
+        Record | None: The point, or None
+    """
+    try:
+        with qdrant_timer("retrieve", collection):
+            points = store.retrieve(
+                collection_name=collection,
+                ids=[point_id],
+                with_payload=True,
+                with_vectors=with_vectors
+            )
+    except Exception as e:
+        print(f"⚠️  Point lookup failed: {e}")
+        return None
+
+    return points[0] if points else None
@@ -1,33 +1,54 @@
-from core.qdrant.client import client
+from core.vectorstore import store, IMAGE_COLLECTION
+from core.qdrant.filters import build_search_filter
+from core.qdrant.schema import search_params
 from core.embeddings.image_embedder import embed_image
+from core.embeddings.perceptual_hash import phash
+from core.memory.phash_index import find_near_duplicates
+from core.utils.metrics import timed, qdrant_timer
+from core.utils.tracing import span
 
 
-def search_images(image_path, limit=5):
+@timed("search_images")
+def search_images(image_path, limit=5, year_from=None, year_to=None, sources=None, types=None,
+                  use_phash=True):
     """
     Search for similar images in memory.
     
+    Near-duplicates (recompressed, resized, lightly edited copies) are
+    answered from the perceptual hash index; CLIP only runs when there
+    is no hash match.
+    
     Args:
         image_path (str): Path to the image file
         limit (int): Maximum number of results
+        year_from (int): Only match memories from this year onwards
+        year_to (int): Only match memories up to this year
+        sources (list): Only match memories from these platforms
+        types (list): Only match these memory types (image, video_frame)
+        use_phash (bool): Try the perceptual hash index before CLIP
         
     Returns:
         list: List of search results with score and payload
     """
+    query_filter = build_search_filter(year_from, year_to, sources, types)
+
+    if use_phash:
+        duplicates = find_near_duplicates(
+            phash(image_path), IMAGE_COLLECTION, query_filter=query_filter, limit=limit
+        )
+        if duplicates:
+            return duplicates
+
     vector = embed_image(image_path)
 
-    try:
-        # Try newer API first (query_points)
-        results = client.query_points(
-            collection_name="image_memory",
+    with span("ann_search", collection=IMAGE_COLLECTION, limit=limit) as s, \
+            qdrant_timer("query", IMAGE_COLLECTION):
+        results = store.query_points(
+            collection_name=IMAGE_COLLECTION,
             query=vector,
-            limit=limit
-        )
-        return results.points
-    except AttributeError:
-        # Fall back to older API (search)
-        results = client.search(
-            collection_name="image_memory",
-            query_vector=vector,
-            limit=limit
+            query_filter=query_filter,
+            limit=limit,
+            search_params=search_params(IMAGE_COLLECTION)
         )
-        return results
\ No newline at end of file
+        s.set_attribute("result_count", len(results.points))
+    return results.points
@@ -1,25 +1,53 @@
-import uuid
 from qdrant_client.http.models import PointStruct
-from core.qdrant.client import client, IMAGE_COLLECTION
+from core.vectorstore import store, IMAGE_COLLECTION
 from core.embeddings.image_embedder import embed_image
+from core.embeddings.perceptual_hash import phash, phash_to_hex
+from core.memory.content_hash import file_content_hash, new_point_id
+from core.memory.phash_index import get_phash_index
+from core.analytics.event_log import record_stored_memory
+from core.utils.timestamps import utc_now, to_utc_iso, next_ingest_seq
+from core.utils.metrics import timed, qdrant_timer
+from core.utils.tracing import span
 
 
-def store_image(image_path, metadata):
-    vector = embed_image(image_path)
+@timed("store_image")
+def store_image(image_path, metadata, vector=None, point_id=None, image_hash=None, content_hash=None):
+    # A precomputed vector (e.g. reused from an exact repeat) skips the model
+    if vector is None:
+        vector = embed_image(image_path)
 
-    client.upsert(
-        collection_name=IMAGE_COLLECTION,
-        points=[
-            PointStruct(
-                id=str(uuid.uuid4()),
-                vector=vector,
-                payload={
-                    "type": "image",
-                    "path": image_path,
-                    **metadata
-                }
-            )
-        ]
-    )
+    # Hashes the caller already computed for its lookups are not recomputed
+    if image_hash is None:
+        image_hash = phash(image_path)
+    if content_hash is None:
+        content_hash = file_content_hash(image_path)
+    payload = {
+        "type": "image",
+        "path": image_path,
+        "content_hash": content_hash,
+        "phash": phash_to_hex(image_hash),
+        "ingested_at": to_utc_iso(utc_now()),
+        **metadata
+    }
+    if payload.get("observed_at"):
+        payload["observed_at"] = to_utc_iso(payload["observed_at"])
+    # Set last so copied metadata can never carry an older sequence
+    payload["ingest_seq"] = next_ingest_seq()
+    point_id = point_id or new_point_id(content_hash, payload)
+
+    with span("upsert", collection=IMAGE_COLLECTION, batch_size=1), qdrant_timer("upsert", IMAGE_COLLECTION):
+        store.upsert(
+            collection_name=IMAGE_COLLECTION,
+            points=[
+                PointStruct(
+                    id=point_id,
+                    vector=vector,
+                    payload=payload
+                )
+            ]
+        )
+
+    get_phash_index().add(image_hash, point_id, IMAGE_COLLECTION, metadata.get("narrative_id"))
+    record_stored_memory(payload, IMAGE_COLLECTION, point_id)
 
     print("✅ Image stored in image memory")
@@ -0,0 +1,330 @@
+"""
+Hamming-searchable index of image perceptual hashes.
+
+Hashes live in a BK-tree in memory and in an append-only JSONL file next
+to the Qdrant data (so backups include it). Each process tails the file,
+so hashes written by another worker become visible on the next query.
+"""
+import json
+import os
+import threading
+from pathlib import Path
+from qdrant_client.http.models import Filter, HasIdCondition, ScoredPoint
+from core.vectorstore import store, IMAGE_COLLECTION, VIDEO_COLLECTION
+from core.embeddings.perceptual_hash import (
+    phash, hamming_distance, phash_to_hex, phash_from_hex
+)
+from core.utils.metrics import timed, qdrant_timer
+from core.config import PHASH_INDEX_PATH, PHASH_MAX_DISTANCE
+
+
+class BKTree:
+    """Burkhard-Keller tree over integer hashes with the Hamming metric"""
+
+    def __init__(self):
+        # Node layout: [hash, items, {distance: child}]
+        self._root = None
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def add(self, value, item):
+        """Insert an item under a hash"""
+        self._size += 1
+
+        if self._root is None:
+            self._root = [value, [item], {}]
+            return
+
+        node = self._root
+        while True:
+            d = hamming_distance(value, node[0])
+            if d == 0:
+                node[1].append(item)
+                return
+            child = node[2].get(d)
+            if child is None:
+                node[2][d] = [value, [item], {}]
+                return
+            node = child
+
+    def search(self, value, max_distance):
+        """
+        Find all items within max_distance of a hash.
+
+        Returns:
+            list: (distance, item) tuples, closest first
+        """
+        if self._root is None:
+            return []
+
+        results = []
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            d = hamming_distance(value, node[0])
+            if d <= max_distance:
+                results.extend((d, item) for item in node[1])
+            # Triangle inequality: only subtrees in [d - r, d + r] can match
+            low, high = d - max_distance, d + max_distance
+            for dist, child in node[2].items():
+                if low <= dist <= high:
+                    stack.append(child)
+
+        results.sort(key=lambda r: r[0])
+        return results
+
+
+class PerceptualHashIndex:
+    """BK-tree of image hashes persisted as an append-only JSONL log"""
+
+    def __init__(self, path=PHASH_INDEX_PATH):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._inode = None
+        self._reset()
+
+    def _reset(self):
+        """Clear the loaded hashes"""
+        self._tree = BKTree()
+        self._offset = 0
+
+    def __len__(self):
+        with self._lock:
+            self._sync()
+            return len(self._tree)
+
+    def _sync(self):
+        """Load lines appended since the last read (by any process)"""
+        try:
+            stat = self.path.stat()
+            size, inode = stat.st_size, stat.st_ino
+        except FileNotFoundError:
+            size, inode = 0, None
+
+        if size < self._offset or (self._inode is not None and inode != self._inode):
+            # File was replaced (rebuild or backup restore) - start over
+            self._reset()
+        self._inode = inode
+
+        if size == self._offset:
+            return
+
+        with open(self.path, "rb") as f:
+            f.seek(self._offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # Partially written line; pick it up next time
+                self._offset += len(line)
+                try:
+                    entry = json.loads(line)
+                    self._tree.add(
+                        phash_from_hex(entry["h"]),
+                        (entry["id"], entry["c"], entry.get("n"))
+                    )
+                except (ValueError, KeyError):
+                    continue
+
+    def add(self, value, point_id, collection, narrative_id=None):
+        """
+        Record the hash of a stored image point.
+
+        Args:
+            value (int): 64-bit perceptual hash
+            point_id (str): Qdrant point ID
+            collection (str): Collection the point was stored in
+            narrative_id (str): Narrative the point belongs to
+        """
+        line = json.dumps({
+            "h": phash_to_hex(value),
+            "id": str(point_id),
+            "c": collection,
+            "n": narrative_id
+        }) + "\n"
+
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+            self._sync()
+
+    def reset(self):
+        """Drop the in-memory tree; the next query reloads the file"""
+        with self._lock:
+            self._inode = None
+            self._reset()
+
+    def query(self, value, collection=None, max_distance=PHASH_MAX_DISTANCE):
+        """
+        Find near-duplicate images.
+
+        Args:
+            value (int): 64-bit perceptual hash
+            collection (str): Restrict to one collection
+            max_distance (int): Maximum Hamming distance
+
+        Returns:
+            list: Dicts with distance, point_id, collection and narrative_id,
+                closest first, one entry per point
+        """
+        with self._lock:
+            self._sync()
+            hits = self._tree.search(value, max_distance)
+
+        results = []
+        seen = set()
+        for distance, (point_id, coll, narrative_id) in hits:
+            if collection and coll != collection:
+                continue
+            if point_id in seen:
+                continue
+            seen.add(point_id)
+            results.append({
+                "distance": distance,
+                "point_id": point_id,
+                "collection": coll,
+                "narrative_id": narrative_id
+            })
+        return results
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_phash_index():
+    """Process-wide perceptual hash index"""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = PerceptualHashIndex()
+        return _index
+
+
+def phash_similarity(distance):
+    """Map a Hamming distance to a 0-1 similarity score"""
+    return 1 - distance / 64
+
+
+@timed("find_near_duplicates")
+def find_near_duplicates(value, collection, query_filter=None, limit=10, with_vectors=False):
+    """
+    Resolve index hits to stored Qdrant points.
+
+    Args:
+        value (int): 64-bit perceptual hash of the query image
+        collection (str): Collection to search
+        query_filter (Filter): Optional search filter (see build_search_filter)
+        limit (int): Maximum number of results
+        with_vectors (bool): Also return stored vectors
+
+    Returns:
+        list: ScoredPoint results scored by hash similarity, best first
+    """
+    hits = get_phash_index().query(value, collection=collection)
+    if not hits:
+        return []
+
+    distances = {h["point_id"]: h["distance"] for h in hits}
+    conditions = [HasIdCondition(has_id=list(distances))]
+    if query_filter is not None:
+        conditions.extend(query_filter.must or [])
+
+    try:
+        with qdrant_timer("scroll", collection):
+            points, _ = store.scroll(
+                collection_name=collection,
+                scroll_filter=Filter(must=conditions),
+                limit=len(distances),
+                with_payload=True,
+                with_vectors=with_vectors
+            )
+    except Exception as e:
+        print(f"⚠️  Near-duplicate lookup failed: {e}")
+        return []
+
+    results = [
+        ScoredPoint(
+            id=p.id,
+            version=0,
+            score=phash_similarity(distances[str(p.id)]),
+            payload=p.payload,
+            vector=p.vector
+        )
+        for p in points
+    ]
+    results.sort(key=lambda r: r.score, reverse=True)
+    return results[:limit]
+
+
+def rebuild_phash_index(collections=(IMAGE_COLLECTION, VIDEO_COLLECTION), backfill=True):
+    """
+    Rebuild the index file from the `phash` payloads stored in Qdrant.
+
+    Args:
+        collections (tuple): Collections to scan
+        backfill (bool): Compute and store hashes for points that predate
+            perceptual hashing (requires the image file at `path`)
+
+    Returns:
+        int: Number of points indexed
+    """
+    tmp_path = Path(str(PHASH_INDEX_PATH) + ".tmp")
+    tmp_path.parent.mkdir(parents=True, exist_ok=True)
+    count = 0
+
+    with open(tmp_path, "w", encoding="utf-8") as out:
+        for collection in collections:
+            offset = None
+            while True:
+                try:
+                    points, offset = store.scroll(
+                        collection_name=collection,
+                        limit=256,
+                        offset=offset,
+                        with_payload=True,
+                        with_vectors=False
+                    )
+                except Exception as e:
+                    print(f"⚠️  Could not scan {collection}: {e}")
+                    break
+
+                for p in points:
+                    payload = p.payload or {}
+                    value = payload.get("phash")
+
+                    if value is None and backfill and os.path.exists(payload.get("path", "")):
+                        try:
+                            value = phash_to_hex(phash(payload["path"]))
+                            store.set_payload(
+                                collection_name=collection,
+                                payload={"phash": value},
+                                points=[p.id]
+                            )
+                        except Exception as e:
+                            print(f"⚠️  Could not hash {payload.get('path')}: {e}")
+                            value = None
+
+                    if value is None:
+                        continue
+
+                    out.write(json.dumps({
+                        "h": value,
+                        "id": str(p.id),
+                        "c": collection,
+                        "n": payload.get("narrative_id")
+                    }) + "\n")
+                    count += 1
+
+                if offset is None:
+                    break
+
+    os.replace(tmp_path, PHASH_INDEX_PATH)
+    get_phash_index().reset()
+    print(f"✅ Perceptual hash index rebuilt: {count} images")
+    return count
+
+
+if __name__ == "__main__":
+    rebuild_phash_index()
@@ -1,33 +1,91 @@
-from core.qdrant.client import client
+from qdrant_client.http.models import Fusion, FusionQuery, Prefetch, SparseVector
+from core.vectorstore import store, TEXT_COLLECTION
+from core.qdrant.filters import build_search_filter
+from core.qdrant.schema import has_sparse_vector, search_params
 from core.embeddings.text_embedder import embed_text
+from core.embeddings.sparse_embedder import embed_sparse
+from core.utils.metrics import timed, qdrant_timer
+from core.utils.tracing import span
+from core.config import (
+    TEXT_SPARSE_VECTOR, DEFAULT_TEXT_SEARCH_MODE, HYBRID_PREFETCH_MULTIPLIER
+)
 
+SEARCH_MODES = ("dense", "sparse", "hybrid")
 
-def search_claims(query, limit=5):
+
+@timed("search_claims")
+def search_claims(query, limit=5, year_from=None, year_to=None, sources=None, types=None,
+                  mode=DEFAULT_TEXT_SEARCH_MODE):
     """
     Search for similar claims in memory.
     
     Args:
         query (str): Search query text
         limit (int): Maximum number of results
+        year_from (int): Only match memories from this year onwards
+        year_to (int): Only match memories up to this year
+        sources (list): Only match memories from these platforms
+        types (list): Only match these memory types
+        mode (str): "dense" (MiniLM cosine), "sparse" (BM25 terms) or
+            "hybrid" (both, fused server-side with reciprocal rank fusion).
+            Sparse and hybrid scores are rank-based, not cosine similarities.
         
     Returns:
         list: List of search results with score and payload
     """
+    if mode not in SEARCH_MODES:
+        raise ValueError(f"Unknown search mode: {mode}. Use one of {SEARCH_MODES}")
+
+    query_filter = build_search_filter(year_from, year_to, sources, types)
+
+    if mode != "dense":
+        if has_sparse_vector(TEXT_COLLECTION):
+            return _search_lexical(query, limit, query_filter, mode)
+        print(f"⚠️  {TEXT_COLLECTION} has no sparse vector, falling back to dense search")
+
     vector = embed_text(query)
 
-    try:
-        # Try newer API first (query_points)
-        results = client.query_points(
-            collection_name="text_memory",
+    with span("ann_search", collection=TEXT_COLLECTION, limit=limit) as s, \
+            qdrant_timer("query", TEXT_COLLECTION):
+        results = store.query_points(
+            collection_name=TEXT_COLLECTION,
             query=vector,
-            limit=limit
+            query_filter=query_filter,
+            limit=limit,
+            search_params=search_params(TEXT_COLLECTION)
         )
-        return results.points
-    except AttributeError:
-        # Fall back to older API (search)
-        results = client.search(
-            collection_name="text_memory",
-            query_vector=vector,
+        s.set_attribute("result_count", len(results.points))
+    return results.points
+
+
+def _search_lexical(query, limit, query_filter, mode):
+    """Run a sparse-only or hybrid (dense + sparse, RRF-fused) query"""
+    sparse = SparseVector(**embed_sparse(query, query=True))
+
+    if mode == "sparse":
+        with span("ann_search", collection=TEXT_COLLECTION, mode=mode, limit=limit), \
+                qdrant_timer("query_sparse", TEXT_COLLECTION):
+            return store.query_points(
+                collection_name=TEXT_COLLECTION,
+                query=sparse,
+                using=TEXT_SPARSE_VECTOR,
+                query_filter=query_filter,
+                limit=limit
+            ).points
+
+    candidates = limit * HYBRID_PREFETCH_MULTIPLIER
+    prefetch = [
+        Prefetch(query=embed_text(query), filter=query_filter, limit=candidates,
+                 params=search_params(TEXT_COLLECTION)),
+        Prefetch(query=sparse, using=TEXT_SPARSE_VECTOR, filter=query_filter, limit=candidates),
+    ]
+    with span("ann_search", collection=TEXT_COLLECTION, mode=mode, limit=limit), \
+            qdrant_timer("query_hybrid", TEXT_COLLECTION):
+        results = store.query_points(
+            collection_name=TEXT_COLLECTION,
+            prefetch=prefetch,
+            query=FusionQuery(fusion=Fusion.RRF),
+            query_filter=query_filter,
             limit=limit
         )
-        return results
\ No newline at end of file
+    return results.points
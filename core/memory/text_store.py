@@ -1,25 +1,56 @@
-import uuid
-from qdrant_client.http.models import PointStruct
-from core.qdrant.client import client, TEXT_COLLECTION
+from qdrant_client.http.models import PointStruct, SparseVector
+from core.vectorstore import store, TEXT_COLLECTION
+from core.qdrant.schema import has_sparse_vector
 from core.embeddings.text_embedder import embed_text
+from core.embeddings.sparse_embedder import embed_sparse
+from core.memory.content_hash import claim_content_hash, new_point_id
+from core.analytics.event_log import record_stored_memory
+from core.utils.timestamps import utc_now, to_utc_iso, next_ingest_seq
+from core.utils.metrics import timed, qdrant_timer
+from core.utils.tracing import span
+from core.config import TEXT_SPARSE_VECTOR
 
 
-def store_claim(text, metadata: dict):
-    vector = embed_text(text)
+@timed("store_claim")
+def store_claim(text, metadata: dict, vector=None, point_id=None):
+    # A precomputed vector (e.g. reused from an exact repeat) skips the model
+    if vector is None:
+        vector = embed_text(text)
 
-    client.upsert(
-        collection_name=TEXT_COLLECTION,
-        points=[
-            PointStruct(
-                id=str(uuid.uuid4()),
-                vector=vector,
-                payload={
-                    "type": "text",
-                    "claim": text,
-                    **metadata
-                }
-            )
-        ]
-    )
+    # Write the lexical vector alongside the dense one when the
+    # collection supports it (hybrid search)
+    if has_sparse_vector(TEXT_COLLECTION):
+        vector = {
+            "": vector,
+            TEXT_SPARSE_VECTOR: SparseVector(**embed_sparse(text))
+        }
+
+    content_hash = claim_content_hash(text)
+    payload = {
+        "type": "text",
+        "claim": text,
+        "content_hash": content_hash,
+        "ingested_at": to_utc_iso(utc_now()),
+        **metadata
+    }
+    if payload.get("observed_at"):
+        payload["observed_at"] = to_utc_iso(payload["observed_at"])
+    # Set last so copied metadata can never carry an older sequence
+    payload["ingest_seq"] = next_ingest_seq()
+    point_id = point_id or new_point_id(content_hash, payload)
+
+    with span("upsert", collection=TEXT_COLLECTION, batch_size=1), qdrant_timer("upsert", TEXT_COLLECTION):
+        store.upsert(
+            collection_name=TEXT_COLLECTION,
+            points=[
+                PointStruct(
+                    id=point_id,
+                    vector=vector,
+                    payload=payload
+                )
+            ]
+        )
+
+    record_stored_memory(payload, TEXT_COLLECTION, point_id)
 
     print("✅ Claim stored in text memory")
@@ -1,36 +1,62 @@
 """
 Video memory search operations
 """
-from core.qdrant.client import client
+from core.vectorstore import store, IMAGE_COLLECTION
+from core.qdrant.filters import build_search_filter
+from core.qdrant.schema import search_params
 from core.embeddings.image_embedder import embed_image
+from core.embeddings.perceptual_hash import phash
+from core.memory.phash_index import find_near_duplicates
+from core.utils.metrics import timed, qdrant_timer
+from core.utils.tracing import span
 
+VIDEO_FRAME_TYPE = "video_frame"  # Payload type store_video gives frames
 
-def search_video_frames(frame_path, limit=5):
+
+@timed("search_video_frames")
+def search_video_frames(frame_path, limit=5, year_from=None, year_to=None, sources=None, types=None,
+                        use_phash=True):
     """
     Search for similar video frames in memory.
     
+    store_video writes frames (and their perceptual hashes) to image
+    memory as type "video_frame", so both the hash lookup and the CLIP
+    fallback search image memory scoped to that type.
+    
     Args:
         frame_path (str): Path to the frame image
         limit (int): Maximum number of results
+        year_from (int): Only match memories from this year onwards
+        year_to (int): Only match memories up to this year
+        sources (list): Only match memories from these platforms
+        types (list): Only match these memory types (only "video_frame"
+            can match)
+        use_phash (bool): Try the perceptual hash index before CLIP
         
     Returns:
         list: List of matching points with scores
     """
+    if types and VIDEO_FRAME_TYPE not in ([types] if isinstance(types, str) else list(types)):
+        return []  # Frames are never stored under another type
+    query_filter = build_search_filter(year_from, year_to, sources, [VIDEO_FRAME_TYPE])
+
+    if use_phash:
+        duplicates = find_near_duplicates(
+            phash(frame_path), IMAGE_COLLECTION, query_filter=query_filter, limit=limit
+        )
+        if duplicates:
+            return duplicates
+
     vector = embed_image(frame_path)
 
-    try:
-        # Try newer API first (query_points)
-        results = client.query_points(
-            collection_name="video_memory",
+    with span("ann_search", collection=IMAGE_COLLECTION, limit=limit) as s, \
+            qdrant_timer("query", IMAGE_COLLECTION):
+        results = store.query_points(
+            collection_name=IMAGE_COLLECTION,
             query=vector,
-            limit=limit
-        )
-        return results.points
-    except AttributeError:
-        # Fall back to older API (search)
-        results = client.search(
-            collection_name="video_memory",
-            query_vector=vector,
-            limit=limit
+            query_filter=query_filter,
+            limit=limit,
+            search_params=search_params(IMAGE_COLLECTION)
         )
-        return results
\ No newline at end of file
+        s.set_attribute("result_count", len(results.points))
+    return results.points
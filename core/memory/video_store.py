@@ -1,9 +1,16 @@
 from core.embeddings.video_processor import extract_frames
 from core.memory.image_store import store_image
+from core.utils.metrics import timed
+from core.utils.tracing import traced, span, set_attributes
 
 
+@traced("store_video")
+@timed("store_video")
 def store_video(video_path, metadata):
-    frames = extract_frames(video_path)
+    with span("extract_frames") as s:
+        frames = extract_frames(video_path)
+        s.set_attribute("frame_count", len(frames))
+    set_attributes(batch_size=len(frames))
 
     for f in frames:
         store_image(f, {
@@ -0,0 +1,238 @@
+"""
+Burst and resurgence detection over time-bucketed narrative counts.
+
+calculate_resurgence and compute_narrative_state look at year spans, so
+a narrative that spikes this week goes unnoticed. Here every bucket of
+every narrative is scored against its own trailing baseline in one
+vectorized pass over the narratives x buckets matrix from the time index:
+
+    z = (count - baseline mean) / max(baseline std, 1)
+
+Runs of buckets above the z threshold become events with an onset time:
+
+- burst:      spike over an already active baseline
+- resurgence: spike after a quiet baseline, with earlier history
+- emergence:  spike of a narrative never seen before
+"""
+import threading
+import numpy as np
+from core.narratives.time_index import bucket_of, bucket_start, get_time_bucket_index
+from core.utils.timestamps import utc_now
+from core.config import (
+    BURST_BASELINE_BUCKETS,
+    BURST_LOOKBACK_BUCKETS,
+    BURST_Z_THRESHOLD,
+    BURST_MIN_COUNT
+)
+
+
+def burst_scores(counts, baseline=BURST_BASELINE_BUCKETS):
+    """
+    Z-score of every bucket against its trailing baseline.
+
+    Baseline sums come from cumulative sums, so the cost is
+    O(narratives x buckets) whatever the baseline length.
+
+    Args:
+        counts (np.ndarray): (n_narratives, n_buckets) counts
+        baseline (int): Trailing buckets in the baseline
+
+    Returns:
+        tuple: (z, baseline_mean, baseline_sum, cumulative) arrays; z is 0
+            where a bucket has no baseline yet, cumulative[:, t] is the
+            count before bucket t
+    """
+    counts = np.asarray(counts, dtype=np.float64)
+    n, b = counts.shape
+
+    cumulative = np.zeros((n, b + 1))
+    np.cumsum(counts, axis=1, out=cumulative[:, 1:])
+    cumulative_sq = np.zeros((n, b + 1))
+    np.cumsum(counts ** 2, axis=1, out=cumulative_sq[:, 1:])
+
+    end = np.arange(b)
+    start = np.maximum(end - baseline, 0)
+    length = np.maximum(end - start, 1)
+
+    window_sum = cumulative[:, end] - cumulative[:, start]
+    mean = window_sum / length
+    variance = (cumulative_sq[:, end] - cumulative_sq[:, start]) / length - mean ** 2
+    std = np.sqrt(np.maximum(variance, 0))
+
+    # The std floor keeps a quiet narrative's first mentions from scoring infinity
+    z = (counts - mean) / np.maximum(std, 1.0)
+    z[:, end == start] = 0.0
+    return z, mean, window_sum, cumulative
+
+
+def detect_bursts(counts, baseline=BURST_BASELINE_BUCKETS, z_threshold=BURST_Z_THRESHOLD,
+                  min_count=BURST_MIN_COUNT, prior=None):
+    """
+    Burst runs in a narratives x buckets count matrix.
+
+    Args:
+        counts (np.ndarray): (n_narratives, n_buckets) counts
+        baseline (int): Trailing buckets in the baseline
+        z_threshold (float): Min z-score of a burst bucket
+        min_count (int): Min count of a burst bucket
+        prior (np.ndarray): Mentions per narrative before the first bucket
+            (separates resurgence from emergence)
+
+    Returns:
+        list: Events with row, onset/end (exclusive) bucket positions,
+            peak position, peak count, z-score, mentions, baseline mean and kind
+    """
+    counts = np.asarray(counts)
+    n, b = counts.shape
+    if n == 0 or b == 0:
+        return []
+
+    z, mean, window_sum, cumulative = burst_scores(counts, baseline)
+    burst = (z >= z_threshold) & (counts >= min_count)
+
+    padded = np.zeros((n, b + 2), dtype=np.int8)
+    padded[:, 1:-1] = burst
+    change = np.diff(padded, axis=1)
+    rows, onsets = np.nonzero(change == 1)
+    _, ends = np.nonzero(change == -1)  # Row-major order pairs each run's onset and end
+
+    prior = np.zeros(n) if prior is None else np.asarray(prior, dtype=np.float64)
+    history = cumulative[rows, np.maximum(onsets - baseline, 0)] + prior[rows]
+    quiet = window_sum[rows, onsets] == 0
+
+    events = []
+    for row, onset, end, seen_before, was_quiet in zip(
+        rows.tolist(), onsets.tolist(), ends.tolist(), history > 0, quiet
+    ):
+        peak = onset + int(np.argmax(counts[row, onset:end]))
+        if not was_quiet:
+            kind = "burst"
+        elif seen_before:
+            kind = "resurgence"
+        else:
+            kind = "emergence"
+
+        events.append({
+            "row": row,
+            "onset": onset,
+            "end": end,
+            "peak": peak,
+            "peak_count": int(counts[row, peak]),
+            "z_score": round(float(z[row, peak]), 2),
+            "mentions": int(cumulative[row, end] - cumulative[row, onset]),
+            "baseline_mean": round(float(mean[row, onset]), 3),
+            "kind": kind
+        })
+
+    return events
+
+
+def detect_recent_bursts(index=None, resolution="day", now=None,
+                         baseline=BURST_BASELINE_BUCKETS, lookback=BURST_LOOKBACK_BUCKETS,
+                         z_threshold=BURST_Z_THRESHOLD, min_count=BURST_MIN_COUNT):
+    """
+    Bursts whose onset falls in the last `lookback` buckets.
+
+    Only the baseline + lookback buckets are read, and only narratives with
+    enough recent mentions are scored, so this is cheap enough to run after
+    every ingest batch.
+
+    Args:
+        index (TimeBucketIndex): Defaults to the process-wide index
+        resolution (str): "day", "week" or "month"
+        now: End of the scanned range (default: current time)
+        baseline (int): Trailing buckets in the baseline
+        lookback (int): Recent buckets checked for onsets
+
+    Returns:
+        list: Events (narrative_id, kind, onset, peak, z_score, ...),
+            strongest first
+    """
+    if index is None:
+        index = get_time_bucket_index()
+
+    last = bucket_of(now if now is not None else utc_now(), resolution)
+    first = last - baseline - lookback + 1
+    narrative_ids, buckets, counts = index.matrix(resolution, first, last)
+    if not narrative_ids:
+        return []
+
+    totals = index.totals()[:len(narrative_ids)]
+    prior = np.maximum(totals - counts.sum(axis=1), 0)
+
+    active = np.flatnonzero(counts[:, -lookback:].max(axis=1) >= min_count)
+    events = detect_bursts(counts[active], baseline, z_threshold, min_count, prior[active])
+
+    recent = []
+    for event in events:
+        if event["onset"] < len(buckets) - lookback:
+            continue  # Started before the lookback (reported by an earlier check)
+        recent.append({
+            "narrative_id": narrative_ids[active[event["row"]]],
+            "kind": event["kind"],
+            "resolution": resolution,
+            "onset_bucket": int(buckets[event["onset"]]),
+            "onset": bucket_start(int(buckets[event["onset"]]), resolution).isoformat(),
+            "peak": bucket_start(int(buckets[event["peak"]]), resolution).isoformat(),
+            "peak_count": event["peak_count"],
+            "z_score": event["z_score"],
+            "mentions": event["mentions"],
+            "baseline_mean": event["baseline_mean"],
+            "ongoing": event["end"] == len(buckets)
+        })
+
+    return sorted(recent, key=lambda x: x["z_score"], reverse=True)
+
+
+class BurstMonitor:
+    """Reports each burst once across repeated checks (e.g. after every ingest batch)"""
+
+    def __init__(self, index=None, resolution="day"):
+        self.index = index
+        self.resolution = resolution
+        self._reported = set()
+        self._lock = threading.Lock()
+
+    def check(self, now=None):
+        """
+        Detect recent bursts and return the ones not reported before.
+
+        Returns:
+            list: New events (see detect_recent_bursts)
+        """
+        events = detect_recent_bursts(self.index, self.resolution, now)
+
+        with self._lock:
+            new = []
+            for event in events:
+                key = (event["narrative_id"], event["onset_bucket"])
+                if key not in self._reported:
+                    self._reported.add(key)
+                    new.append(event)
+
+        for event in new:
+            print(f"⚡ {event['kind'].capitalize()}: {event['narrative_id']} "
+                  f"since {event['onset'][:10]} (z={event['z_score']})")
+        return new
+
+
+_monitor = None
+_monitor_lock = threading.Lock()
+
+
+def get_burst_monitor():
+    """Process-wide burst monitor"""
+    global _monitor
+    with _monitor_lock:
+        if _monitor is None:
+            _monitor = BurstMonitor()
+        return _monitor
+
+
+def check_bursts():
+    """Post-ingest hook: report new bursts (never raises)"""
+    try:
+        return get_burst_monitor().check()
+    except Exception as e:
+        print(f"⚠️  Burst check failed: {e}")
+        return []
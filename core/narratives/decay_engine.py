@@ -1,4 +1,5 @@
 from datetime import datetime
+import numpy as np
 
 def compute_memory_strength(memories, stats):
 
@@ -18,3 +19,14 @@ def compute_memory_strength(memories, stats):
         strength -= 3  # decay
 
     return max(1, strength)
+
+
+def compute_memory_strength_batch(counts, lifespan, resurfacing, last_seen):
+    """Vectorized compute_memory_strength (last_seen <= 0 means unknown)"""
+
+    strength = counts + lifespan + np.where(resurfacing, 5, 0)
+
+    now_year = datetime.now().year
+    decayed = (last_seen > 0) & (now_year - last_seen >= 3)
+
+    return np.maximum(1, strength - np.where(decayed, 3, 0))
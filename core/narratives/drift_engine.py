@@ -0,0 +1,194 @@
+"""
+Narrative drift timelines from stored claim vectors.
+
+compute_drift in narrative_evolution re-encodes texts on every call.
+Here the vectors already stored in text_memory are read back and drift
+is computed for every member at once:
+
+- drift_from_origin: 1 - cos(first member, member)
+- drift_from_last:   1 - cos(previous member, member)
+
+Timelines are cached per narrative and reused until the narrative's
+version (member count and highest member ingest_seq) changes, so no
+model is involved at all.
+"""
+import threading
+from collections import OrderedDict
+import numpy as np
+from qdrant_client.http.models import Direction, FieldCondition, Filter, MatchValue, OrderBy
+from core.vectorstore import store, TEXT_COLLECTION
+from core.memory.content_hash import dense_vector
+from core.config import DRIFT_CACHE_SIZE
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _narrative_filter(narrative_id):
+    return Filter(must=[
+        FieldCondition(key="narrative_id", match=MatchValue(value=narrative_id))
+    ])
+
+
+def narrative_version(narrative_id, collection=TEXT_COLLECTION):
+    """
+    Version of a narrative's members: (count, highest ingest_seq).
+
+    Every store (including a re-store that overwrites a member and can
+    reorder it) raises the highest ingest_seq; members merged in by a
+    recluster keep their sequence numbers but change the count.
+    """
+    count = store.count(
+        collection_name=collection,
+        count_filter=_narrative_filter(narrative_id),
+        exact=True
+    ).count
+    latest, _ = store.scroll(
+        collection_name=collection,
+        scroll_filter=_narrative_filter(narrative_id),
+        limit=1,
+        with_payload=["ingest_seq"],
+        with_vectors=False,
+        order_by=OrderBy(key="ingest_seq", direction=Direction.DESC)
+    )
+    return count, (latest[0].payload or {}).get("ingest_seq") if latest else None
+
+
+def _member_order(payload):
+    """Chronological order: year, then ingest time when recorded"""
+    year = payload.get("year")
+    year = int(year) if year and str(year).isdigit() else float("inf")
+    return (year, str(payload.get("ingested_at", "")))
+
+
+def fetch_members(narrative_id, collection=TEXT_COLLECTION, batch_size=256):
+    """
+    Read a narrative's stored members with their vectors.
+
+    Returns:
+        tuple: (points, vectors) in chronological order; vectors is an
+            (n, dim) float32 matrix
+    """
+    members = []
+    offset = None
+    while True:
+        points, offset = store.scroll(
+            collection_name=collection,
+            scroll_filter=_narrative_filter(narrative_id),
+            limit=batch_size,
+            offset=offset,
+            with_payload=True,
+            with_vectors=True
+        )
+        members.extend(p for p in points if dense_vector(p) is not None)
+        if offset is None:
+            break
+
+    members.sort(key=lambda p: _member_order(p.payload or {}))
+    if not members:
+        return [], np.zeros((0, 0), dtype=np.float32)
+
+    vectors = np.asarray([dense_vector(p) for p in members], dtype=np.float32)
+    return members, vectors
+
+
+def compute_drift_series(vectors):
+    """
+    Vectorized drift for a chronologically ordered vector matrix.
+
+    Returns:
+        tuple: (drift_from_origin, drift_from_last) arrays; the first
+            step drift is NaN (no previous member)
+    """
+    if len(vectors) == 0:
+        return np.zeros(0), np.zeros(0)
+
+    unit = vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+    from_origin = 1 - unit @ unit[0]
+    from_last = np.empty(len(unit))
+    from_last[0] = np.nan
+    from_last[1:] = 1 - np.einsum("ij,ij->i", unit[1:], unit[:-1])
+    return from_origin, from_last
+
+
+def build_drift_timeline(narrative_id, collection=TEXT_COLLECTION):
+    """
+    Drift timeline for every member of a narrative (uncached).
+
+    Returns:
+        dict: narrative_id, members, timeline entries and summary
+    """
+    members, vectors = fetch_members(narrative_id, collection)
+    from_origin, from_last = compute_drift_series(vectors)
+
+    timeline = []
+    for i, p in enumerate(members):
+        payload = p.payload or {}
+        timeline.append({
+            "point_id": str(p.id),
+            "claim": payload.get("claim"),
+            "year": payload.get("year"),
+            "source": payload.get("source"),
+            "drift_from_origin": round(float(from_origin[i]), 3),
+            "drift_from_last": None if i == 0 else round(float(from_last[i]), 3)
+        })
+
+    steps = from_last[1:]
+    return {
+        "narrative_id": narrative_id,
+        "members": len(members),
+        "timeline": timeline,
+        "summary": {
+            "max_drift_from_origin": round(float(from_origin.max()), 3) if len(members) else 0.0,
+            "final_drift_from_origin": round(float(from_origin[-1]), 3) if len(members) else 0.0,
+            "mean_step_drift": round(float(steps.mean()), 3) if len(steps) else 0.0,
+            "max_step_drift": round(float(steps.max()), 3) if len(steps) else 0.0
+        }
+    }
+
+
+def get_drift_timeline(narrative_id, collection=TEXT_COLLECTION):
+    """
+    Cached drift timeline for a narrative.
+
+    A count query and a one-point ordered scroll check the narrative's
+    version; the timeline is only rebuilt when members were added,
+    re-stored or merged in since it was cached.
+
+    Args:
+        narrative_id (str): Narrative ID
+        collection (str): Collection holding the claim vectors
+
+    Returns:
+        dict: See build_drift_timeline
+    """
+    key = (collection, narrative_id)
+    version = narrative_version(narrative_id, collection)
+
+    with _cache_lock:
+        cached = _cache.get(key)
+        if cached and cached[0] == version:
+            _cache.move_to_end(key)
+            return cached[1]
+
+    timeline = build_drift_timeline(narrative_id, collection)
+
+    with _cache_lock:
+        _cache[key] = (version, timeline)
+        _cache.move_to_end(key)
+        while len(_cache) > DRIFT_CACHE_SIZE:
+            _cache.popitem(last=False)
+
+    return timeline
+
+
+def clear_drift_cache():
+    """Drop all cached timelines"""
+    with _cache_lock:
+        _cache.clear()
+
+
+def drift_cache_size():
+    """Number of cached timelines"""
+    with _cache_lock:
+        return len(_cache)
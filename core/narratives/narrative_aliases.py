@@ -0,0 +1,97 @@
+"""
+Narrative ID aliases left behind by re-clustering.
+
+When the recluster job merges narratives, the absorbed IDs are mapped to
+the surviving one so links, exports and bookmarks that still carry an old
+ID keep resolving. The map is a JSON file next to the Qdrant data and is
+reloaded whenever another process rewrites it.
+"""
+import json
+import os
+import threading
+from pathlib import Path
+from core.config import NARRATIVE_ALIASES_PATH
+
+
+class NarrativeAliases:
+    """old narrative_id -> current narrative_id"""
+
+    def __init__(self, path=NARRATIVE_ALIASES_PATH):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._mtime = None
+        self._aliases = {}
+
+    def _load(self):
+        try:
+            mtime = self.path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return
+        if mtime == self._mtime:
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self._aliases = json.load(f)
+            self._mtime = mtime
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Could not read narrative aliases: {e}")
+
+    def mapping(self):
+        """Current alias map"""
+        with self._lock:
+            self._load()
+            return dict(self._aliases)
+
+    def resolve(self, narrative_id):
+        """Current ID of a narrative (unchanged if it was never merged)"""
+        with self._lock:
+            self._load()
+            return self._aliases.get(narrative_id, narrative_id)
+
+    def add(self, merges):
+        """
+        Record merges and keep every alias pointing at a live ID.
+
+        Args:
+            merges (dict): absorbed narrative_id -> surviving narrative_id
+        """
+        with self._lock:
+            self._load()
+            aliases = dict(self._aliases)
+            aliases.update(merges)
+            # Collapse chains (A -> B from an earlier run, B -> C now)
+            for old in aliases:
+                target, seen = aliases[old], {old}
+                while target in aliases and target not in seen:
+                    seen.add(target)
+                    target = aliases[target]
+                aliases[old] = target
+            aliases = {old: new for old, new in aliases.items() if old != new}
+
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = Path(str(self.path) + ".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(aliases, f)
+            os.replace(tmp_path, self.path)
+            self._aliases = aliases
+            self._mtime = self.path.stat().st_mtime_ns
+
+
+_aliases = None
+_aliases_lock = threading.Lock()
+
+
+def get_narrative_aliases():
+    """Process-wide alias map"""
+    global _aliases
+    with _aliases_lock:
+        if _aliases is None:
+            _aliases = NarrativeAliases()
+        return _aliases
+
+
+def resolve_narrative_id(narrative_id):
+    """Current ID for a possibly merged narrative ID"""
+    if not narrative_id:
+        return narrative_id
+    return get_narrative_aliases().resolve(narrative_id)
@@ -1,12 +1,15 @@
 from collections import defaultdict
-from core.qdrant.client import client, TEXT_COLLECTION, IMAGE_COLLECTION, VIDEO_COLLECTION
+from core.vectorstore import store, TEXT_COLLECTION, IMAGE_COLLECTION, VIDEO_COLLECTION
+from core.utils.metrics import timed, qdrant_timer
 
+@timed("get_all_narratives")
 def get_all_narratives(limit=1000):
     narratives = defaultdict(list)
 
     for collection in [TEXT_COLLECTION, IMAGE_COLLECTION, VIDEO_COLLECTION]:
         try:
-            points, _ = client.scroll(collection_name=collection, limit=limit)
+            with qdrant_timer("scroll", collection):
+                points, _ = store.scroll(collection_name=collection, limit=limit)
         except:
             continue
 
@@ -1,9 +1,11 @@
 """
 Narrative intelligence and statistical computation
 """
-from core.narratives.temporal_engine import compute_temporal_patterns
-from core.narratives.state_engine import compute_narrative_state
-from core.narratives.decay_engine import compute_memory_strength
+import numpy as np
+from core.analytics.narrative_frame import NarrativeFrame, YEAR_MISSING
+from core.narratives.temporal_engine import compute_temporal_patterns_batch
+from core.narratives.state_engine import compute_narrative_state_batch
+from core.narratives.decay_engine import compute_memory_strength_batch
 from core.config import CRITICAL_THREAT_SCORE, HIGH_THREAT_SCORE, MEDIUM_THREAT_SCORE
 
 
@@ -17,100 +19,125 @@ def compute_narrative_stats(memories):
     Returns:
         dict: Complete narrative statistics including threat assessment
     """
-    years = []
-    sources = set()
-    modalities = set()
-    claims = set()
+    return compute_all_narrative_stats({0: memories})[0]
 
-    for m in memories:
-        if m.get("year") and str(m.get("year")).isdigit():
-            years.append(int(m["year"]))
-        if m.get("source"):
-            sources.add(m["source"])
-        if m.get("type"):
-            modalities.add(m["type"])
-        if m.get("claim"):
-            claims.add(m["claim"][:60])
 
-    first_seen = min(years) if years else None
-    last_seen = max(years) if years else None
-    lifespan = last_seen - first_seen if first_seen and last_seen else 0
-
-    resurfacing = lifespan >= 1 and len(memories) >= 3
-    mutation_score = len(claims)
-
-    base_stats = {
-        "first_seen": first_seen,
-        "last_seen": last_seen,
-        "lifespan": lifespan,
-        "sources": list(sources),
-        "modalities": list(modalities),
-        "mutation_score": mutation_score,
-        "resurfacing": resurfacing
-    }
-
-    # Compute temporal patterns
-    temporal = compute_temporal_patterns(memories)
+def compute_all_narrative_stats(narratives, include_temporal_patterns=True):
+    """
+    Compute statistics for every narrative in one vectorized pass.
     
-    # Compute memory strength
-    memory_strength = compute_memory_strength(memories, base_stats)
+    Args:
+        narratives: Dictionary of narrative_id -> list of memories, or a
+            NarrativeFrame built with with_claims=True
+        include_temporal_patterns (bool): Also build the per-narrative
+            activity_years / resurfacing_gaps lists (ranking views can skip them)
+        
+    Returns:
+        dict: narrative_id -> statistics (as returned by compute_narrative_stats;
+            temporal_patterns is None when not requested)
+    """
+    if isinstance(narratives, NarrativeFrame):
+        frame = narratives
+    else:
+        frame = NarrativeFrame.from_narratives(narratives, with_claims=True)
     
-    # Compute narrative state
-    state = compute_narrative_state(memories, base_stats)
+    if frame.claim is None:
+        raise ValueError("NarrativeFrame must be built with with_claims=True")
     
-    # 🆕 COMPUTE THREAT LEVEL
-    threat_score = 0
+    n = len(frame)
+    counts = frame.narrative_sizes()
     
-    # Resurfacing increases threat
-    if resurfacing:
-        threat_score += 30
+    # Years, sorted per narrative
+    dated = frame.year >= 0
+    temporal, bounds, years = compute_temporal_patterns_batch(
+        frame.narrative[dated], frame.year[dated], n,
+        include_patterns=include_temporal_patterns
+    )
+    has_years = np.diff(bounds) > 0
+    padded = np.append(years, YEAR_MISSING)
+    first_seen = np.where(has_years, padded[bounds[:-1]], YEAR_MISSING)
+    last_seen = np.where(has_years, padded[bounds[1:] - 1], YEAR_MISSING)
+    lifespan = np.where(first_seen > 0, last_seen - first_seen, 0)
     
-    # Multiple sources indicate spread
-    if len(sources) >= 4:
-        threat_score += 30
-    elif len(sources) >= 3:
-        threat_score += 20
-    elif len(sources) >= 2:
-        threat_score += 10
+    resurfacing = (lifespan >= 1) & (counts >= 3)
     
-    # High mutation indicates evolution
-    if mutation_score >= 5:
-        threat_score += 25
-    elif mutation_score >= 3:
-        threat_score += 15
+    # Distinct sources, modalities and claim wordings
+    source_bounds, sources = frame.values_per_narrative(
+        frame.source, frame.source_values,
+        mask=frame.truthy(frame.source_values)[frame.source]
+    )
+    modality_bounds, modalities = frame.values_per_narrative(
+        frame.modality, frame.modality_values,
+        mask=frame.truthy(frame.modality_values)[frame.modality]
+    )
+    source_count = np.diff(source_bounds)
+    mutation_score = frame.distinct_per_narrative(
+        frame.claim, len(frame.claim_values),
+        mask=frame.truthy(frame.claim_values)[frame.claim]
+    )
     
-    # Long lifespan shows persistence
-    if lifespan >= 3:
-        threat_score += 25
-    elif lifespan >= 2:
-        threat_score += 15
-    elif lifespan >= 1:
-        threat_score += 10
+    memory_strength = compute_memory_strength_batch(counts, lifespan, resurfacing, last_seen)
+    state = compute_narrative_state_batch(counts, first_seen, last_seen, resurfacing)
     
-    # Determine threat level
-    if threat_score >= CRITICAL_THREAT_SCORE:
-        threat_level = "CRITICAL"
-    elif threat_score >= HIGH_THREAT_SCORE:
-        threat_level = "HIGH"
-    elif threat_score >= MEDIUM_THREAT_SCORE:
-        threat_level = "MEDIUM"
-    else:
-        threat_level = "LOW"
+    # Threat score: resurfacing, spread, mutation and persistence
+    threat_score = (
+        np.where(resurfacing, 30, 0) +
+        np.select([source_count >= 4, source_count >= 3, source_count >= 2], [30, 20, 10], 0) +
+        np.select([mutation_score >= 5, mutation_score >= 3], [25, 15], 0) +
+        np.select([lifespan >= 3, lifespan >= 2, lifespan >= 1], [25, 15, 10], 0)
+    )
+    threat_level = np.select(
+        [
+            threat_score >= CRITICAL_THREAT_SCORE,
+            threat_score >= HIGH_THREAT_SCORE,
+            threat_score >= MEDIUM_THREAT_SCORE
+        ],
+        ["CRITICAL", "HIGH", "MEDIUM"],
+        default="LOW"
+    ).tolist()
     
-    # 🆕 COMPUTE NARRATIVE STRENGTH (0-100)
-    strength = min(100, (
-        len(memories) * 10 +           # Frequency
-        len(sources) * 15 +             # Platform diversity
-        lifespan * 10 +                 # Persistence
-        (30 if resurfacing else 0)      # Resurfacing bonus
+    # Narrative strength (0-100)
+    strength = np.minimum(100, (
+        counts * 10 +                       # Frequency
+        source_count * 15 +                 # Platform diversity
+        lifespan * 10 +                     # Persistence
+        np.where(resurfacing, 30, 0)        # Resurfacing bonus
     ))
-
-    return {
-        **base_stats,
-        "temporal_patterns": temporal,
-        "memory_strength": memory_strength,
-        "state": state,
-        "threat_level": threat_level,      # ✅ Added
-        "threat_score": threat_score,      # ✅ Added
-        "strength": strength               # ✅ Added
-    }
\ No newline at end of file
+    
+    # Convert once; per-narrative slicing of Python lists is cheap
+    columns = zip(
+        frame.narrative_ids,
+        np.where(has_years, first_seen, -1).tolist(),
+        last_seen.tolist(),
+        lifespan.tolist(),
+        mutation_score.tolist(),
+        resurfacing.tolist(),
+        memory_strength.tolist(),
+        threat_score.tolist(),
+        strength.tolist(),
+        source_bounds[:-1].tolist(), source_bounds[1:].tolist(),
+        modality_bounds[:-1].tolist(), modality_bounds[1:].tolist(),
+        temporal if include_temporal_patterns else [None] * n, state, threat_level
+    )
+    sources, modalities = sources.tolist(), modalities.tolist()
+    
+    results = {}
+    for (nid, first, last, life, mutation, resurf, mem_strength, threat, strong,
+         s_start, s_end, m_start, m_end, patterns, nstate, level) in columns:
+        results[nid] = {
+            "first_seen": first if first >= 0 else None,
+            "last_seen": last if first >= 0 else None,
+            "lifespan": life,
+            "sources": sources[s_start:s_end],
+            "modalities": modalities[m_start:m_end],
+            "mutation_score": mutation,
+            "resurfacing": resurf,
+            "temporal_patterns": patterns,
+            "memory_strength": mem_strength,
+            "state": nstate,
+            "threat_level": level,
+            "threat_score": threat,
+            "strength": strong
+        }
+    
+    return results
@@ -6,7 +6,19 @@ from core.memory.text_search import search_claims
 from core.memory.text_store import store_claim
 from core.memory.image_store import store_image
 from core.memory.image_search import search_images
-from core.config import TEXT_SIMILARITY_THRESHOLD, IMAGE_SIMILARITY_THRESHOLD
+from core.memory.content_hash import (
+    claim_content_hash, file_content_hash, find_by_content_hash, find_point, dense_vector,
+    deterministic_point_id
+)
+from core.memory.phash_index import find_near_duplicates
+from core.narratives.narrative_aliases import resolve_narrative_id
+from core.narratives.snapshot_cache import invalidate_narratives_snapshot
+from core.embeddings.perceptual_hash import phash
+from core.utils.tracing import traced, span, set_attributes
+from core.config import (
+    TEXT_COLLECTION, IMAGE_COLLECTION, TEXT_SIMILARITY_THRESHOLD, IMAGE_SIMILARITY_THRESHOLD,
+    DETERMINISTIC_POINT_IDS
+)
 
 
 def _new_narrative_id():
@@ -14,6 +26,18 @@ def _new_narrative_id():
     return "NAR_" + str(uuid.uuid4())[:8]
 
 
+def _top_score(results):
+    return round(results[0].score, 4) if results else None
+
+
+def _find_replay(collection, content_hash, metadata):
+    """The point this exact item was already stored as, or None"""
+    if not DETERMINISTIC_POINT_IDS:
+        return None  # Random IDs: every store is a new point
+    return find_point(collection, deterministic_point_id(content_hash, metadata))
+
+
+@traced("process_new_claim")
 def process_new_claim(claim_text, metadata):
     """
     Process a new text claim.
@@ -26,29 +50,63 @@ def process_new_claim(claim_text, metadata):
     Returns:
         str: Narrative ID
     """
+    # Exact repeat (modulo case/whitespace/punctuation): link without
+    # running the embedding model or an ANN search
+    set_attributes(text_length=len(claim_text), source=metadata.get("source"))
+    with span("exact_repeat_lookup") as s:
+        content_hash = claim_content_hash(claim_text)
+        replay = _find_replay(TEXT_COLLECTION, content_hash, {**metadata, "type": "text"})
+        existing = replay or find_by_content_hash(TEXT_COLLECTION, content_hash)
+        s.set_attribute("hit", existing is not None)
+    if existing and existing.payload.get("narrative_id"):
+        narrative_id = resolve_narrative_id(existing.payload["narrative_id"])
+        if replay is not None:
+            # Replay of an already stored item - nothing to write
+            metadata.update(narrative_id=narrative_id, reinforced=existing.payload.get("reinforced", False))
+            set_attributes(outcome="replay", narrative_id=narrative_id)
+            print(f"↩️  Already stored in narrative: {narrative_id}")
+            return narrative_id
+        metadata["reinforced"] = True
+        metadata["narrative_id"] = narrative_id
+        metadata["type"] = "text"
+        set_attributes(outcome="exact_repeat", narrative_id=narrative_id)
+        print(f"⚡ Exact repeat of narrative: {narrative_id}")
+        with span("store", collection=TEXT_COLLECTION):
+            store_claim(claim_text, metadata, vector=dense_vector(existing))
+            invalidate_narratives_snapshot()
+        return narrative_id
+
     # Search for similar claims
-    results = search_claims(claim_text, limit=3)
+    with span("similarity_search", limit=3) as s:
+        results = search_claims(claim_text, limit=3)
+        s.set_attributes(result_count=len(results), top_score=_top_score(results))
 
-    if results and results[0].score >= TEXT_SIMILARITY_THRESHOLD:
-        # Link to existing narrative
-        narrative_id = results[0].payload.get("narrative_id", _new_narrative_id())
-        metadata["reinforced"] = True
-        print(f"🔁 Reinforced narrative: {narrative_id}")
-    else:
-        # Create new narrative
-        narrative_id = _new_narrative_id()
-        metadata["reinforced"] = False
-        metadata["created_at"] = str(uuid.uuid1())
-        print(f"🆕 New narrative created: {narrative_id}")
+    with span("narrative_assignment", threshold=TEXT_SIMILARITY_THRESHOLD) as s:
+        if results and results[0].score >= TEXT_SIMILARITY_THRESHOLD:
+            # Link to existing narrative (hits written mid-recluster may carry a merged ID)
+            narrative_id = resolve_narrative_id(results[0].payload.get("narrative_id")) or _new_narrative_id()
+            metadata["reinforced"] = True
+            print(f"🔁 Reinforced narrative: {narrative_id}")
+        else:
+            # Create new narrative
+            narrative_id = _new_narrative_id()
+            metadata["reinforced"] = False
+            metadata["created_at"] = str(uuid.uuid1())
+            print(f"🆕 New narrative created: {narrative_id}")
+        s.set_attribute("reinforced", metadata["reinforced"])
+    set_attributes(outcome="reinforced" if metadata["reinforced"] else "new", narrative_id=narrative_id)
 
     # Store the claim
     metadata["narrative_id"] = narrative_id
     metadata["type"] = "text"
-    store_claim(claim_text, metadata)
+    with span("store", collection=TEXT_COLLECTION):
+        store_claim(claim_text, metadata)
+        invalidate_narratives_snapshot()
 
     return narrative_id
 
 
+@traced("process_new_image")
 def process_new_image(image_path, metadata):
     """
     Process a new image.
@@ -61,23 +119,76 @@ def process_new_image(image_path, metadata):
     Returns:
         str: Narrative ID
     """
-    # Search for similar images
-    results = search_images(image_path, limit=3)
+    # Byte-identical re-upload: link without running CLIP
+    set_attributes(source=metadata.get("source"))
+    with span("exact_repeat_lookup") as s:
+        content_hash = file_content_hash(image_path)
+        replay = _find_replay(IMAGE_COLLECTION, content_hash, {**metadata, "type": "image"})
+        existing = replay or find_by_content_hash(IMAGE_COLLECTION, content_hash)
+        s.set_attribute("hit", existing is not None)
+    if existing and existing.payload.get("narrative_id"):
+        narrative_id = resolve_narrative_id(existing.payload["narrative_id"])
+        if replay is not None:
+            # Replay of an already stored item - nothing to write
+            metadata.update(narrative_id=narrative_id, reinforced=existing.payload.get("reinforced", False))
+            set_attributes(outcome="replay", narrative_id=narrative_id)
+            print(f"↩️  Already stored in visual narrative: {narrative_id}")
+            return narrative_id
+        metadata["reinforced"] = True
+        metadata["narrative_id"] = narrative_id
+        metadata["type"] = "image"
+        set_attributes(outcome="exact_repeat", narrative_id=narrative_id)
+        print(f"⚡ Exact repeat of visual narrative: {narrative_id}")
+        with span("store", collection=IMAGE_COLLECTION):
+            store_image(image_path, metadata, vector=dense_vector(existing), content_hash=content_hash)
+            invalidate_narratives_snapshot()
+        return narrative_id
 
-    if results and results[0].score >= IMAGE_SIMILARITY_THRESHOLD:
-        # Link to existing narrative
-        narrative_id = results[0].payload.get("narrative_id", _new_narrative_id())
+    # Near-duplicate (recompressed/resized copy): link via the perceptual
+    # hash index and reuse the matched image's CLIP vector
+    with span("near_duplicate_lookup") as s:
+        image_hash = phash(image_path)
+        duplicates = find_near_duplicates(image_hash, IMAGE_COLLECTION, limit=1, with_vectors=True)
+        s.set_attributes(result_count=len(duplicates), top_score=_top_score(duplicates))
+    if duplicates and duplicates[0].payload.get("narrative_id"):
+        narrative_id = resolve_narrative_id(duplicates[0].payload["narrative_id"])
         metadata["reinforced"] = True
-        print(f"🔁 Visual narrative reinforced: {narrative_id}")
-    else:
-        # Create new narrative
-        narrative_id = _new_narrative_id()
-        metadata["reinforced"] = False
-        print(f"🆕 New visual narrative created: {narrative_id}")
+        metadata["narrative_id"] = narrative_id
+        metadata["type"] = "image"
+        set_attributes(outcome="near_duplicate", narrative_id=narrative_id)
+        print(f"⚡ Near-duplicate of visual narrative: {narrative_id}")
+        with span("store", collection=IMAGE_COLLECTION):
+            store_image(
+                image_path, metadata, vector=dense_vector(duplicates[0]),
+                image_hash=image_hash, content_hash=content_hash
+            )
+            invalidate_narratives_snapshot()
+        return narrative_id
+
+    # Search for similar images
+    with span("similarity_search", limit=3) as s:
+        results = search_images(image_path, limit=3, use_phash=False)
+        s.set_attributes(result_count=len(results), top_score=_top_score(results))
+
+    with span("narrative_assignment", threshold=IMAGE_SIMILARITY_THRESHOLD) as s:
+        if results and results[0].score >= IMAGE_SIMILARITY_THRESHOLD:
+            # Link to existing narrative (hits written mid-recluster may carry a merged ID)
+            narrative_id = resolve_narrative_id(results[0].payload.get("narrative_id")) or _new_narrative_id()
+            metadata["reinforced"] = True
+            print(f"🔁 Visual narrative reinforced: {narrative_id}")
+        else:
+            # Create new narrative
+            narrative_id = _new_narrative_id()
+            metadata["reinforced"] = False
+            print(f"🆕 New visual narrative created: {narrative_id}")
+        s.set_attribute("reinforced", metadata["reinforced"])
+    set_attributes(outcome="reinforced" if metadata["reinforced"] else "new", narrative_id=narrative_id)
 
     # Store the image
     metadata["narrative_id"] = narrative_id
     metadata["type"] = "image"
-    store_image(image_path, metadata)
+    with span("store", collection=IMAGE_COLLECTION):
+        store_image(image_path, metadata, image_hash=image_hash, content_hash=content_hash)
+        invalidate_narratives_snapshot()
 
     return narrative_id
\ No newline at end of file
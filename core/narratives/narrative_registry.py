@@ -0,0 +1,366 @@
+"""
+Stored narrative records (strength, state and threat level).
+
+compute_memory_strength and compute_narrative_state depend on the current
+year, so read paths recomputed them from every memory on every request.
+Their inputs only change when a memory is added or the calendar year
+rolls over, so a background job keeps the results on a narrative record
+instead:
+
+- narratives touched since the last run (found by tailing the memory
+  event log from the saved offset) are recomputed from their memories
+- when the year changes, narratives whose dormancy gap crossed a state or
+  decay boundary are updated from the stored record alone
+
+Read paths then look records up by narrative ID.
+"""
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+import numpy as np
+from qdrant_client.http.models import FieldCondition, Filter, MatchAny
+from core.analytics.event_log import EventLogFold
+from core.narratives.narrative_intelligence import compute_all_narrative_stats
+from core.narratives.state_engine import compute_narrative_state_batch
+from core.narratives.decay_engine import compute_memory_strength_batch
+from core.vectorstore import store, TEXT_COLLECTION, IMAGE_COLLECTION, VIDEO_COLLECTION
+from core.utils.file_lock import file_lock
+from core.utils.timestamps import utc_now, to_utc_iso
+from core.config import NARRATIVE_REGISTRY_PATH, NARRATIVE_RECOMPUTE_INTERVAL, MEMORY_EVENT_LOG_PATH
+
+RECORD_FIELDS = (
+    "memory_count", "first_seen", "last_seen", "lifespan", "resurfacing",
+    "memory_strength", "state", "threat_level", "threat_score", "strength"
+)
+
+# Dormancy gaps (current year - last_seen) where state or decay change
+DORMANCY_BOUNDARIES = (2, 3)
+
+_MEMBER_FIELDS = ["narrative_id", "year", "source", "type", "claim"]
+
+
+class _TouchedNarratives(EventLogFold):
+    """Narratives in the event log after a saved offset"""
+
+    def __init__(self, path=None, offset=0, inode=None):
+        super().__init__(path)
+        self._offset = offset
+        self._inode = inode
+        self.restarted = False
+
+    def _reset(self):
+        super()._reset()
+        self.touched = set()
+        self.restarted = True  # Log replaced: everything is touched
+
+    def _apply(self, event):
+        self.touched.add(event["n"])
+
+    def _retract(self, event):
+        # The overwritten point's narrative needs a recompute too
+        self.touched.add(event["n"])
+
+    def collect(self):
+        """Touched narratives, log offset and inode reached, and whether the log restarted"""
+        with self._lock:
+            self._sync()
+            return self.touched, self._offset, self._inode, self.restarted
+
+
+class NarrativeRegistry:
+    """Narrative records persisted as one JSON file"""
+
+    def __init__(self, path=NARRATIVE_REGISTRY_PATH):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._mtime = None
+        self._data = self._empty()
+
+    @staticmethod
+    def _empty():
+        return {"computed_year": None, "log_offset": 0, "log_inode": None,
+                "updated_at": None, "narratives": {}}
+
+    def _load(self):
+        """Reload when another process saved a newer file"""
+        try:
+            mtime = self.path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return
+        if mtime == self._mtime:
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self._data = json.load(f)
+            self._mtime = mtime
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Could not read narrative registry: {e}")
+
+    def snapshot(self):
+        """Registry contents (computed_year, log_offset, narratives)"""
+        with self._lock:
+            self._load()
+            return self._data
+
+    def get(self, narrative_id):
+        """Stored record of a narrative, or None"""
+        return self.snapshot()["narratives"].get(narrative_id)
+
+    def records(self):
+        """All stored records by narrative ID"""
+        return self.snapshot()["narratives"]
+
+    def save(self, data):
+        """Atomically replace the registry"""
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = Path(str(self.path) + ".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+            self._data = data
+            self._mtime = self.path.stat().st_mtime_ns
+
+
+def make_record(stats, memory_count):
+    """Registry record from compute_narrative_stats output"""
+    record = {field: stats[field] for field in RECORD_FIELDS if field in stats}
+    record["memory_count"] = memory_count
+    return record
+
+
+def fetch_narrative_members(narrative_ids, collections=(TEXT_COLLECTION, IMAGE_COLLECTION, VIDEO_COLLECTION),
+                            batch_size=1000):
+    """
+    Memories of the given narratives (only the fields the stats use).
+
+    Returns:
+        dict: narrative_id -> list of payloads
+
+    Raises:
+        Exception: Scroll errors propagate - a partial result would look
+            like deleted narratives to the caller
+    """
+    members = {}
+    ids = list(narrative_ids)
+    for start in range(0, len(ids), batch_size):
+        chunk = ids[start:start + batch_size]
+        scroll_filter = Filter(must=[
+            FieldCondition(key="narrative_id", match=MatchAny(any=chunk))
+        ])
+        for collection in collections:
+            if not store.collection_exists(collection):
+                continue  # Never created: no members there
+            offset = None
+            while True:
+                points, offset = store.scroll(
+                    collection_name=collection,
+                    scroll_filter=scroll_filter,
+                    limit=batch_size,
+                    offset=offset,
+                    with_payload=_MEMBER_FIELDS,
+                    with_vectors=False
+                )
+
+                for p in points:
+                    payload = p.payload or {}
+                    members.setdefault(payload.get("narrative_id"), []).append(payload)
+
+                if offset is None:
+                    break
+
+    return members
+
+
+def _crossed_boundary(last_seen, old_year, new_year):
+    """Whether the dormancy gap passed a boundary between two years"""
+    if not last_seen or old_year is None:
+        return old_year != new_year
+    return any(
+        (old_year - last_seen >= gap) != (new_year - last_seen >= gap)
+        for gap in DORMANCY_BOUNDARIES
+    )
+
+
+def refresh_boundary_records(records, narrative_ids):
+    """
+    Recompute year-dependent fields from stored records alone.
+
+    Args:
+        records (dict): narrative_id -> record (updated in place)
+        narrative_ids (list): Narratives to update
+    """
+    if not narrative_ids:
+        return
+
+    rows = [records[nid] for nid in narrative_ids]
+    counts = np.array([r["memory_count"] for r in rows])
+    first_seen = np.array([r["first_seen"] or -1 for r in rows])
+    last_seen = np.array([r["last_seen"] or -1 for r in rows])
+    lifespan = np.array([r["lifespan"] for r in rows])
+    resurfacing = np.array([r["resurfacing"] for r in rows], dtype=bool)
+
+    strength = compute_memory_strength_batch(counts, lifespan, resurfacing, last_seen).tolist()
+    states = compute_narrative_state_batch(counts, first_seen, last_seen, resurfacing)
+    for record, mem_strength, state in zip(rows, strength, states):
+        record["memory_strength"] = mem_strength
+        record["state"] = state
+
+
+def refresh_narrative_records(registry=None, event_log_path=None, blocking=True):
+    """
+    Bring stored narrative records up to date.
+
+    Runs under an exclusive lock on the registry file, so only one process
+    (API worker, UI, CLI) refreshes at a time; the others reload the saved
+    file. Nothing is saved when reading memories fails, so the next run
+    retries from the same log offset.
+
+    Args:
+        registry (NarrativeRegistry): Defaults to the process-wide registry
+        event_log_path: Memory event log to tail (default from config)
+        blocking (bool): Wait for a refresh running in another process;
+            otherwise skip this one
+
+    Returns:
+        dict | None: Counts of recomputed, boundary-updated and removed
+            narratives (None when skipped because another process holds the lock)
+
+    Raises:
+        Exception: If narrative members cannot be read
+    """
+    if registry is None:
+        registry = get_narrative_registry()
+
+    with file_lock(Path(str(registry.path) + ".lock"), blocking=blocking) as held:
+        if not held:
+            return None
+        return _refresh_locked(registry, event_log_path)
+
+
+def _refresh_locked(registry, event_log_path):
+    data = registry.snapshot()
+    records = dict(data["narratives"])
+    now_year = datetime.now().year
+
+    touched, offset, inode, restarted = _TouchedNarratives(
+        event_log_path, data.get("log_offset", 0), data.get("log_inode")
+    ).collect()
+    if restarted:
+        # The log was rebuilt: recompute everything it mentions and drop the rest
+        touched = set(touched) | set(records)
+
+    # Touched narratives: full stats from their memories
+    members = fetch_narrative_members(touched) if touched else {}
+    stats = compute_all_narrative_stats(
+        {nid: members[nid] for nid in touched if nid in members},
+        include_temporal_patterns=False
+    )
+    removed = 0
+    for nid in touched:
+        if nid in stats:
+            records[nid] = make_record(stats[nid], len(members[nid]))
+        elif records.pop(nid, None) is not None:
+            removed += 1
+
+    # Untouched narratives whose dormancy gap crossed a boundary this year
+    old_year = data.get("computed_year")
+    boundary = [
+        nid for nid, record in records.items()
+        if nid not in touched and _crossed_boundary(record.get("last_seen"), old_year, now_year)
+    ]
+    for nid in boundary:
+        records[nid] = dict(records[nid])  # Don't mutate the snapshot readers hold
+    refresh_boundary_records(records, boundary)
+
+    registry.save({
+        "computed_year": now_year,
+        "log_offset": offset,
+        "log_inode": inode,
+        "updated_at": to_utc_iso(utc_now()),
+        "narratives": records
+    })
+
+    return {"recomputed": len(stats), "boundary": len(boundary), "removed": removed, "total": len(records)}
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_narrative_registry():
+    """Process-wide narrative registry"""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = NarrativeRegistry()
+        return _registry
+
+
+def get_narrative_record(narrative_id):
+    """Stored strength/state/threat record of a narrative (None until computed)"""
+    return get_narrative_registry().get(narrative_id)
+
+
+def recompute_backlog(registry=None, event_log_path=None):
+    """
+    Event log bytes the records have not caught up with yet.
+
+    Args:
+        registry (NarrativeRegistry): Defaults to the process-wide registry
+        event_log_path: Memory event log (default from config)
+
+    Returns:
+        int: Unprocessed bytes (the whole log after a rebuild)
+    """
+    if registry is None:
+        registry = get_narrative_registry()
+    try:
+        stat = Path(event_log_path or MEMORY_EVENT_LOG_PATH).stat()
+    except FileNotFoundError:
+        return 0
+
+    data = registry.snapshot()
+    offset = data.get("log_offset", 0)
+    if data.get("log_inode") != stat.st_ino or offset > stat.st_size:
+        offset = 0
+    return stat.st_size - offset
+
+
+_scheduler = None
+
+
+def start_recompute_scheduler(interval=NARRATIVE_RECOMPUTE_INTERVAL):
+    """
+    Refresh narrative records every `interval` seconds in a daemon thread.
+
+    Returns:
+        threading.Event: Set it to stop the scheduler
+    """
+    global _scheduler
+    if _scheduler is not None:
+        return _scheduler
+
+    stop = threading.Event()
+
+    def run():
+        while not stop.is_set():
+            try:
+                # Another process refreshing right now is enough
+                refresh_narrative_records(blocking=False)
+            except Exception as e:
+                print(f"⚠️  Narrative recompute failed: {e}")
+            stop.wait(interval)
+
+    threading.Thread(target=run, name="narrative-recompute", daemon=True).start()
+    _scheduler = stop
+    return stop
+
+
+if __name__ == "__main__":
+    summary = refresh_narrative_records()
+    print(f"✅ Narrative records refreshed: {summary['recomputed']} recomputed, "
+          f"{summary['boundary']} crossed a dormancy boundary, {summary['removed']} removed "
+          f"({summary['total']} total)")
@@ -0,0 +1,251 @@
+"""
+Offline re-clustering of narrative IDs.
+
+process_new_claim / process_new_image link each item to the first
+narrative above the similarity threshold, so the same story can end up
+under several NAR_ IDs depending on arrival order. This job repairs that:
+
+1. every stored vector is read with a paginated scroll
+2. each page runs one batched kNN query (score >= the collection's
+   threshold: NARRATIVE_CLUSTER_THRESHOLD for text,
+   NARRATIVE_IMAGE_CLUSTER_THRESHOLD for CLIP images)
+3. narratives linked by any such pair are merged (connected components
+   over narratives, so existing narratives are never split)
+4. absorbed IDs are rewritten in bulk with set_payload and recorded in
+   the alias map, so old IDs keep resolving (if a rewrite fails, nothing
+   is recorded and the job should be rerun)
+
+Run it from the command line (--dry-run prints the plan only):
+
+    python -m core.narratives.recluster [--dry-run]
+"""
+from collections import defaultdict
+import numpy as np
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+from qdrant_client.http.models import FieldCondition, Filter, MatchAny, QueryRequest
+from core.vectorstore import store, TEXT_COLLECTION, IMAGE_COLLECTION
+from core.qdrant.schema import search_params
+from core.memory.content_hash import dense_vector
+from core.analytics.event_log import rebuild_event_log
+from core.narratives.narrative_aliases import get_narrative_aliases
+from core.narratives.snapshot_cache import invalidate_narratives_snapshot
+from core.config import (
+    NARRATIVE_CLUSTER_THRESHOLD, NARRATIVE_IMAGE_CLUSTER_THRESHOLD,
+    RECLUSTER_NEIGHBORS, RECLUSTER_BATCH_SIZE
+)
+
+SET_PAYLOAD_CHUNK = 1000  # Old IDs per set_payload filter
+
+# Linking threshold per collection (text and CLIP similarities differ in scale)
+CLUSTER_THRESHOLDS = {
+    TEXT_COLLECTION: NARRATIVE_CLUSTER_THRESHOLD,
+    IMAGE_COLLECTION: NARRATIVE_IMAGE_CLUSTER_THRESHOLD,
+}
+
+
+def collect_link_edges(collection, index, sizes, k=RECLUSTER_NEIGHBORS,
+                       threshold=NARRATIVE_CLUSTER_THRESHOLD, batch_size=RECLUSTER_BATCH_SIZE):
+    """
+    Narrative pairs linked by at least one close memory pair.
+
+    Args:
+        collection (str): Collection to scan
+        index (dict): narrative_id -> position (extended in place)
+        sizes (dict): narrative_id -> memory count (updated in place)
+        k (int): Neighbours per memory
+        threshold (float): Minimum similarity of a linking pair
+        batch_size (int): Scroll page and query batch size
+
+    Returns:
+        tuple: (rows, cols) narrative position arrays (may repeat)
+    """
+    rows, cols = [], []
+    offset = None
+    while True:
+        try:
+            points, offset = store.scroll(
+                collection_name=collection,
+                limit=batch_size,
+                offset=offset,
+                with_payload=["narrative_id"],
+                with_vectors=True
+            )
+        except Exception as e:
+            print(f"⚠️  Could not scan {collection}: {e}")
+            break
+
+        page = []
+        for p in points:
+            nid = (p.payload or {}).get("narrative_id")
+            vector = dense_vector(p)
+            if nid and vector is not None:
+                index.setdefault(nid, len(index))
+                sizes[nid] += 1
+                page.append((p.id, nid, vector))
+
+        if page:
+            params = search_params(collection)
+            requests = [
+                QueryRequest(
+                    query=list(vector),
+                    limit=k + 1,  # The point itself comes back too
+                    score_threshold=threshold,
+                    with_payload=["narrative_id"],
+                    params=params
+                )
+                for _, _, vector in page
+            ]
+            try:
+                responses = store.query_batch_points(collection_name=collection, requests=requests)
+            except Exception as e:
+                print(f"⚠️  Batch neighbour query failed: {e}")
+                responses = []
+
+            for (point_id, nid, _), response in zip(page, responses):
+                i = index[nid]
+                for hit in response.points:
+                    other = (hit.payload or {}).get("narrative_id")
+                    if not other or other == nid or hit.id == point_id:
+                        continue
+                    rows.append(i)
+                    cols.append(index.setdefault(other, len(index)))
+
+        if offset is None:
+            break
+
+    return np.asarray(rows, dtype=np.int64), np.asarray(cols, dtype=np.int64)
+
+
+def plan_merges(narrative_ids, sizes, rows, cols):
+    """
+    Merge plan from narrative link edges.
+
+    Each connected component keeps the ID of its largest narrative (ties
+    go to the smallest ID, so reruns are stable).
+
+    Returns:
+        dict: absorbed narrative_id -> surviving narrative_id
+    """
+    n = len(narrative_ids)
+    if n == 0:
+        return {}
+
+    graph = coo_matrix((np.ones(len(rows), dtype=np.int8), (rows, cols)), shape=(n, n))
+    _, labels = connected_components(graph, directed=False)
+
+    survivors = {}
+    merges = {}
+    for i in sorted(range(n), key=lambda i: (labels[i], -sizes[narrative_ids[i]], narrative_ids[i])):
+        label, nid = labels[i], narrative_ids[i]
+        if label in survivors:
+            merges[nid] = survivors[label]
+        else:
+            survivors[label] = nid
+    return merges
+
+
+def apply_merges(merges, collections=(TEXT_COLLECTION, IMAGE_COLLECTION)):
+    """
+    Rewrite narrative_id on every memory of the absorbed narratives.
+
+    One filtered set_payload call per surviving narrative and chunk of
+    absorbed IDs, so no point IDs are read back. Stops at the first failed
+    call; rewrites already applied are kept, and a rerun picks up the rest.
+
+    Returns:
+        bool: Whether every rewrite succeeded
+    """
+    absorbed = defaultdict(list)
+    for old, new in merges.items():
+        absorbed[new].append(old)
+
+    for new, olds in absorbed.items():
+        for start in range(0, len(olds), SET_PAYLOAD_CHUNK):
+            selector = Filter(must=[
+                FieldCondition(key="narrative_id", match=MatchAny(any=olds[start:start + SET_PAYLOAD_CHUNK]))
+            ])
+            for collection in collections:
+                try:
+                    store.set_payload(
+                        collection_name=collection,
+                        payload={"narrative_id": new},
+                        points=selector,
+                        wait=True
+                    )
+                except Exception as e:
+                    print(f"❌ Could not rewrite narratives in {collection}: {e}")
+                    return False
+    return True
+
+
+def recluster_narratives(collections=(TEXT_COLLECTION, IMAGE_COLLECTION),
+                         k=RECLUSTER_NEIGHBORS, threshold=None, dry_run=False, aliases=None):
+    """
+    Merge fragmented narratives across the given collections.
+
+    Args:
+        collections (tuple): Collections to scan and rewrite
+        k (int): Neighbours per memory
+        threshold (float): Minimum similarity of a linking pair in every
+            collection (default: CLUSTER_THRESHOLDS per collection)
+        dry_run (bool): Only return the plan
+        aliases (NarrativeAliases): Alias map to extend (default: process-wide)
+
+    Returns:
+        dict: memories, narratives before/after, the merges planned and
+            whether they were applied (False on a dry run or a failed rewrite)
+    """
+    index = {}
+    sizes = defaultdict(int)
+    all_rows, all_cols = [], []
+    for collection in collections:
+        collection_threshold = threshold if threshold is not None else CLUSTER_THRESHOLDS.get(
+            collection, NARRATIVE_CLUSTER_THRESHOLD
+        )
+        rows, cols = collect_link_edges(collection, index, sizes, k, collection_threshold)
+        all_rows.append(rows)
+        all_cols.append(cols)
+
+    narrative_ids = list(index)
+    merges = plan_merges(
+        narrative_ids, sizes,
+        np.concatenate(all_rows or [np.zeros(0, dtype=np.int64)]),
+        np.concatenate(all_cols or [np.zeros(0, dtype=np.int64)])
+    )
+
+    applied = False
+    if merges and not dry_run:
+        applied = apply_merges(merges, collections)
+        if applied:
+            if aliases is None:
+                aliases = get_narrative_aliases()
+            aliases.add(merges)
+
+            # Narrative IDs changed under the incremental indexes: rebuild their log
+            rebuild_event_log()
+        # Some payloads may have changed even when a later rewrite failed
+        invalidate_narratives_snapshot(full=True)
+
+    return {
+        "memories": int(sum(sizes.values())),
+        "narratives_before": len(narrative_ids),
+        "narratives_after": len(narrative_ids) - len(merges),
+        "merged": len(merges),
+        "merges": merges,
+        "applied": applied
+    }
+
+
+if __name__ == "__main__":
+    import sys
+
+    dry_run = "--dry-run" in sys.argv
+    summary = recluster_narratives(dry_run=dry_run)
+    if summary["merged"] and not dry_run and not summary["applied"]:
+        print("❌ Recluster stopped on a failed rewrite; no aliases recorded. Rerun the job.")
+        sys.exit(1)
+    verb = "would merge" if dry_run else "merged"
+    print(f"✅ Recluster {verb} {summary['merged']} narratives: "
+          f"{summary['narratives_before']} -> {summary['narratives_after']} "
+          f"({summary['memories']} memories)")
@@ -0,0 +1,326 @@
+"""
+Process-wide cache of the narrative snapshot.
+
+Streamlit reruns the whole script on every widget interaction and each
+API request used to rescan all collections through get_all_narratives.
+The snapshot is now loaded once and reused until:
+
+- its TTL expires,
+- a write goes through narrative_manager (invalidate_narratives_snapshot), or
+- another process invalidated it, which it signals by touching a stamp
+  file next to the Qdrant data (one stat() per read).
+
+A stale snapshot is brought up to date with a delta sync: every point
+carries an indexed ingest_seq, so one range-filtered scroll per collection
+returns only the points written since the last sync, which are merged in
+(replacing earlier versions of the same point). Refresh cost follows the
+number of new writes, not the corpus size. Jobs that rewrite existing
+payloads (recluster) ask for a full reload instead; across processes
+that request is the stamp file's content changing.
+
+Snapshots are shared between callers and must be treated as read-only.
+"""
+import os
+import threading
+import time
+from pathlib import Path
+from qdrant_client.http.models import FieldCondition, Filter, Range
+from core.vectorstore import store, TEXT_COLLECTION, IMAGE_COLLECTION, VIDEO_COLLECTION
+from core.utils.metrics import timed, qdrant_timer
+from core.config import (
+    NARRATIVE_SNAPSHOT_TTL,
+    NARRATIVE_SNAPSHOT_STAMP_PATH,
+    NARRATIVE_SNAPSHOT_OVERLAP,
+    NARRATIVE_SNAPSHOT_PAGE_SIZE
+)
+
+SNAPSHOT_COLLECTIONS = (TEXT_COLLECTION, IMAGE_COLLECTION, VIDEO_COLLECTION)
+
+
+class _Snapshot:
+    """One limit's narratives plus the bookkeeping delta syncs need"""
+
+    def __init__(self, token):
+        self.narratives = {}  # narrative_id -> list of payloads (shared, read-only)
+        self.points = {}  # (collection, point_id) -> (narrative_id, payload)
+        self.watermark = 0  # Highest ingest_seq merged so far
+        self.token = token  # Stamp content when loaded (changes on full invalidation)
+        self.stamp = None
+        self.synced_at = 0.0
+        self.dirty = False
+
+    def is_fresh(self, stamp, ttl):
+        return (not self.dirty and self.stamp == stamp
+                and time.monotonic() - self.synced_at < ttl)
+
+
+def _scroll(collection, limit, scroll_filter=None, offset=None):
+    with qdrant_timer("scroll", collection):
+        return store.scroll(
+            collection_name=collection,
+            scroll_filter=scroll_filter,
+            limit=limit,
+            offset=offset,
+            with_payload=True,
+            with_vectors=False
+        )
+
+
+def _merge(snapshot, collection, points):
+    """
+    Merge points into a snapshot without touching lists readers may hold.
+
+    Returns:
+        int: Points added or replaced
+    """
+    narratives = None
+    copied = set()
+
+    def writable(nid):
+        nonlocal narratives
+        if narratives is None:
+            narratives = dict(snapshot.narratives)
+        if nid not in copied:
+            narratives[nid] = list(narratives.get(nid, ()))
+            copied.add(nid)
+        return narratives[nid]
+
+    merged = 0
+    for p in points:
+        payload = p.payload or {}
+        seq = payload.get("ingest_seq")
+        if isinstance(seq, int):
+            snapshot.watermark = max(snapshot.watermark, seq)
+
+        key = (collection, p.id)
+        previous = snapshot.points.get(key)
+        if previous is not None:
+            old_nid, old_payload = previous
+            if old_payload.get("ingest_seq") == seq and old_nid == payload.get("narrative_id"):
+                continue  # Already merged (overlap window)
+            if old_nid:
+                members = writable(old_nid)
+                for i, member in enumerate(members):
+                    if member is old_payload:
+                        del members[i]
+                        break
+
+        nid = payload.get("narrative_id")
+        if nid:
+            writable(nid).append(payload)
+        snapshot.points[key] = (nid, payload)
+        merged += 1
+
+    if narratives is not None:
+        for nid in copied:
+            if not narratives[nid]:
+                del narratives[nid]  # Every member moved to another narrative
+        snapshot.narratives = narratives
+    return merged
+
+
+@timed("snapshot_load")
+def load_snapshot(limit, token=None, collections=SNAPSHOT_COLLECTIONS):
+    """
+    Full load: the first `limit` points of each collection, as get_all_narratives.
+
+    Args:
+        limit (int): Records per collection
+        token (str): Stamp content at load time
+        collections (tuple): Collections to read
+
+    Returns:
+        _Snapshot: Loaded snapshot
+    """
+    snapshot = _Snapshot(token)
+    # Points written while the pages are read are picked up by the next sync
+    snapshot.watermark = time.time_ns()
+    for collection in collections:
+        try:
+            points, _ = _scroll(collection, limit)
+        except Exception:
+            continue
+        _merge(snapshot, collection, points)
+    return snapshot
+
+
+@timed("snapshot_sync")
+def sync_snapshot(snapshot, overlap=NARRATIVE_SNAPSHOT_OVERLAP,
+                  page_size=NARRATIVE_SNAPSHOT_PAGE_SIZE, collections=SNAPSHOT_COLLECTIONS):
+    """
+    Delta sync: merge points whose ingest_seq is past the watermark.
+
+    The last `overlap` seconds are re-scanned so writes from processes with
+    a slightly slower clock, or still in flight at the last sync, are not
+    missed; points already merged are skipped.
+
+    Args:
+        snapshot (_Snapshot): Snapshot to update in place
+        overlap (float): Seconds re-scanned below the watermark
+        page_size (int): Points per scroll page
+        collections (tuple): Collections to read
+
+    Returns:
+        int: Points added or replaced
+    """
+    after = snapshot.watermark - int(overlap * 1_000_000_000)
+    newer = Filter(must=[FieldCondition(key="ingest_seq", range=Range(gt=after))])
+
+    merged = 0
+    for collection in collections:
+        offset = None
+        while True:
+            try:
+                points, offset = _scroll(collection, page_size, newer, offset)
+            except Exception as e:
+                print(f"⚠️  Could not sync snapshot from {collection}: {e}")
+                break
+            merged += _merge(snapshot, collection, points)
+            if offset is None:
+                break
+    return merged
+
+
+class NarrativeSnapshotCache:
+    """get_all_narratives results per limit, kept current with delta syncs"""
+
+    def __init__(self, ttl=NARRATIVE_SNAPSHOT_TTL, stamp_path=NARRATIVE_SNAPSHOT_STAMP_PATH,
+                 overlap=NARRATIVE_SNAPSHOT_OVERLAP, collections=SNAPSHOT_COLLECTIONS):
+        self.ttl = ttl
+        self.overlap = overlap
+        self.stamp_path = Path(stamp_path) if stamp_path else None
+        self.collections = collections
+        self._lock = threading.Lock()  # Guards _entries and counters
+        self._refresh_lock = threading.Lock()  # One load/sync at a time
+        self._entries = {}  # limit -> _Snapshot
+        self._generation = 0  # Bumped by every invalidate()
+        self._full_generation = 0  # Bumped by invalidate(full=True)
+        self.hits = 0
+        self.syncs = 0
+        self.full_loads = 0
+
+    def _stamp(self):
+        if self.stamp_path is None:
+            return None
+        try:
+            return self.stamp_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def _token(self):
+        if self.stamp_path is None:
+            return None
+        try:
+            return self.stamp_path.read_text(encoding="utf-8")
+        except OSError:
+            return ""  # Same as a stamp only ever touched by delta invalidations
+
+    def get(self, limit=1000):
+        """
+        Current narrative snapshot.
+
+        Args:
+            limit (int): Records per collection in the initial load
+                (as for get_all_narratives; later writes are all merged)
+
+        Returns:
+            dict: narrative_id -> list of memory payloads (read-only)
+        """
+        stamp = self._stamp()
+        with self._lock:
+            snapshot = self._entries.get(limit)
+            if snapshot is not None and snapshot.is_fresh(stamp, self.ttl):
+                self.hits += 1
+                return snapshot.narratives
+
+        with self._refresh_lock:
+            with self._lock:
+                snapshot = self._entries.get(limit)
+                if snapshot is not None and snapshot.is_fresh(stamp, self.ttl):
+                    self.hits += 1
+                    return snapshot.narratives
+                generation, full_generation = self._generation, self._full_generation
+
+            token = self._token()
+            if snapshot is None or snapshot.token != token:
+                snapshot = load_snapshot(limit, token, self.collections)
+                full = True
+            else:
+                sync_snapshot(snapshot, self.overlap, collections=self.collections)
+                full = False
+            snapshot.stamp = stamp
+            snapshot.synced_at = time.monotonic()
+
+            with self._lock:
+                if full:
+                    self.full_loads += 1
+                else:
+                    self.syncs += 1
+                # A sync racing a later invalidation leaves the snapshot dirty;
+                # a load racing a full invalidation is not kept at all
+                snapshot.dirty = generation != self._generation
+                if full_generation == self._full_generation:
+                    self._entries[limit] = snapshot
+                else:
+                    self._entries.pop(limit, None)
+            return snapshot.narratives
+
+    def invalidate(self, full=False):
+        """
+        Mark snapshots stale here and, through the stamp file, in other processes.
+
+        Args:
+            full (bool): Reload from scratch instead of syncing (existing
+                payloads were rewritten, e.g. by the recluster job)
+        """
+        with self._lock:
+            self._generation += 1
+            if full:
+                self._full_generation += 1
+                self._entries.clear()
+            for snapshot in self._entries.values():
+                snapshot.dirty = True
+
+        if self.stamp_path is not None:
+            try:
+                self.stamp_path.parent.mkdir(parents=True, exist_ok=True)
+                if full or not self.stamp_path.exists():
+                    tmp_path = Path(str(self.stamp_path) + ".tmp")
+                    tmp_path.write_text(str(time.time_ns()) if full else "", encoding="utf-8")
+                    os.replace(tmp_path, self.stamp_path)
+                # Set the mtime explicitly so it moves even on coarse-grained filesystems
+                now = time.time_ns()
+                os.utime(self.stamp_path, ns=(now, now))
+            except OSError as e:
+                print(f"⚠️  Could not update snapshot stamp: {e}")
+
+    def size(self):
+        """Number of cached snapshots"""
+        with self._lock:
+            return len(self._entries)
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_snapshot_cache():
+    """Process-wide snapshot cache"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = NarrativeSnapshotCache()
+        return _cache
+
+
+def get_narratives_snapshot(limit=1000):
+    """Cached, delta-synced get_all_narratives(limit)"""
+    return get_snapshot_cache().get(limit)
+
+
+def invalidate_narratives_snapshot(full=False):
+    """Call after writing memories so readers see them (never raises)"""
+    try:
+        get_snapshot_cache().invalidate(full=full)
+    except Exception as e:
+        print(f"⚠️  Could not invalidate narrative snapshot: {e}")
@@ -1,4 +1,5 @@
 from datetime import datetime
+import numpy as np
 
 def compute_narrative_state(memories, stats):
 
@@ -24,3 +25,22 @@ def compute_narrative_state(memories, stats):
         return "ACTIVE"
 
     return "ACTIVE"
+
+
+def compute_narrative_state_batch(counts, first_seen, last_seen, resurfacing):
+    """Vectorized compute_narrative_state (years <= 0 mean unknown)"""
+
+    now_year = datetime.now().year
+    dormant_gap = now_year - last_seen
+
+    states = np.select(
+        [
+            first_seen <= 0,
+            counts == 1,
+            (dormant_gap >= 2) & resurfacing,
+            dormant_gap >= 2
+        ],
+        ["NEW", "NEW", "RESURFACED", "DORMANT"],
+        default="ACTIVE"
+    )
+    return states.tolist()
@@ -1,3 +1,6 @@
+import numpy as np
+
+
 def compute_temporal_patterns(memories):
 
     years = sorted([
@@ -20,3 +23,51 @@ def compute_temporal_patterns(memories):
         "resurfacing_gaps": gaps,
         "seasonal": seasonal
     }
+
+
+def compute_temporal_patterns_batch(narrative, years, n_narratives, include_patterns=True):
+    """
+    Temporal patterns for many narratives at once.
+
+    Args:
+        narrative (np.ndarray): Narrative index of each dated memory
+        years (np.ndarray): Year of each dated memory
+        n_narratives (int): Number of narratives
+        include_patterns (bool): Build the pattern dicts (otherwise
+            patterns is None and only the sorted years are returned)
+
+    Returns:
+        tuple: (patterns, bounds, sorted_years) where patterns[i] matches
+            compute_temporal_patterns for narrative i and
+            sorted_years[bounds[i]:bounds[i + 1]] are its years
+    """
+    order = np.lexsort((years, narrative))
+    narrative = narrative[order]
+    years = years[order].astype(np.int64)
+    bounds = np.searchsorted(narrative, np.arange(n_narratives + 1))
+
+    if not include_patterns:
+        return None, bounds, years
+
+    # gaps[j] is years[j + 1] - years[j]; only valid inside one narrative
+    gaps = np.diff(years)
+    same = narrative[1:] == narrative[:-1]
+    seasonal = np.bincount(narrative[1:][same & (gaps >= 1)], minlength=n_narratives) > 0
+
+    year_list, gap_list = years.tolist(), gaps.tolist()
+    patterns = []
+    for i, (start, end) in enumerate(zip(bounds[:-1].tolist(), bounds[1:].tolist())):
+        if end - start < 2:
+            patterns.append({
+                "activity_years": year_list[start:end],
+                "resurfacing_gaps": [],
+                "seasonal": False
+            })
+            continue
+        patterns.append({
+            "activity_years": year_list[start:end],
+            "resurfacing_gaps": gap_list[start:end - 1],
+            "seasonal": bool(seasonal[i])
+        })
+
+    return patterns, bounds, years
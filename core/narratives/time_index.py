@@ -0,0 +1,272 @@
+"""
+Time-bucketed mention counts per narrative.
+
+Narrative analytics bucket memories by integer year, which hides bursts
+within a year. This index folds the memory event log into day, week and
+month counts per narrative (using observed_at, else ingested_at), so
+velocity over any window costs O(buckets) instead of a corpus scan.
+
+Bucket numbers:
+- day:   days since 1970-01-01
+- week:  ISO weeks (starting Monday) since the week of 1970-01-01
+- month: year * 12 + month - 1
+"""
+import threading
+from functools import lru_cache
+from datetime import datetime, timedelta, timezone
+import numpy as np
+from core.analytics.event_log import EventLogFold
+from core.utils.timestamps import parse_timestamp, utc_now
+
+RESOLUTIONS = ("day", "week", "month")
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def bucket_of(timestamp, resolution="day"):
+    """
+    Bucket number of a timestamp.
+
+    Args:
+        timestamp: datetime, ISO 8601 string or Unix epoch seconds
+        resolution (str): "day", "week" or "month"
+
+    Returns:
+        int: Bucket number
+    """
+    if resolution not in RESOLUTIONS:
+        raise ValueError(f"Unknown resolution: {resolution}")
+    return _all_buckets(parse_timestamp(timestamp))[RESOLUTIONS.index(resolution)]
+
+
+def _all_buckets(dt):
+    """(day, week, month) buckets of an aware UTC datetime"""
+    days = (dt - _EPOCH).days
+    # 1970-01-01 was a Thursday, so weeks are offset by 3 days
+    return days, (days + 3) // 7, dt.year * 12 + dt.month - 1
+
+
+@lru_cache(maxsize=4096)
+def _date_buckets(date_text):
+    return _all_buckets(datetime.fromisoformat(date_text).replace(tzinfo=timezone.utc))
+
+
+def _event_buckets(timestamp):
+    """Buckets of a logged timestamp (stored UTC strings only need their date)"""
+    if timestamp.endswith("Z"):
+        return _date_buckets(timestamp[:10])
+    return _all_buckets(parse_timestamp(timestamp))
+
+
+def bucket_start(bucket, resolution="day"):
+    """First instant (UTC) of a bucket"""
+    if resolution == "month":
+        return datetime(bucket // 12, bucket % 12 + 1, 1, tzinfo=timezone.utc)
+    if resolution == "day":
+        return _EPOCH + timedelta(days=int(bucket))
+    if resolution == "week":
+        return _EPOCH + timedelta(days=int(bucket) * 7 - 3)
+    raise ValueError(f"Unknown resolution: {resolution}")
+
+
+class TimeBucketIndex(EventLogFold):
+    """Day/week/month mention counts per narrative, folded from the event log"""
+
+    def _reset(self):
+        super()._reset()
+        # resolution -> narrative_id -> {bucket: count}
+        self._buckets = {resolution: {} for resolution in RESOLUTIONS}
+        # resolution -> narrative_id -> latest bucket (skips quiet narratives)
+        self._latest = {resolution: {} for resolution in RESOLUTIONS}
+        # narrative_id -> all mentions (timed or not), mentions per platform
+        self._totals = {}
+        self._platforms = {}
+        self._untimed = 0
+
+    def _apply(self, event):
+        """Fold one stored memory into the bucket counts"""
+        self._update(event, 1)
+
+    def _retract(self, event):
+        """Remove a memory that was stored again (its newer event follows)"""
+        self._update(event, -1)
+
+    def _update(self, event, delta):
+        nid = event["n"]
+        timestamp = event.get("t")
+        buckets = _event_buckets(timestamp) if timestamp else None
+
+        self._totals[nid] = self._totals.get(nid, 0) + delta
+        platforms = self._platforms.setdefault(nid, {})
+        if event.get("s"):
+            platforms[event["s"]] = platforms.get(event["s"], 0) + delta
+            if not platforms[event["s"]]:
+                del platforms[event["s"]]
+
+        if buckets is None:
+            self._untimed += delta
+        else:
+            for resolution, bucket in zip(RESOLUTIONS, buckets):
+                counts = self._buckets[resolution].setdefault(nid, {})
+                counts[bucket] = counts.get(bucket, 0) + delta
+                if not counts[bucket]:
+                    del counts[bucket]
+                # Latest bucket only moves forward: a stale value after a
+                # retraction just means a quiet narrative is not skipped
+                latest = self._latest[resolution]
+                if delta > 0 and bucket > latest.get(nid, bucket - 1):
+                    latest[nid] = bucket
+
+        if not self._totals[nid]:
+            del self._totals[nid], self._platforms[nid]
+            for resolution in RESOLUTIONS:
+                self._buckets[resolution].pop(nid, None)
+                self._latest[resolution].pop(nid, None)
+
+    @property
+    def untimed(self):
+        """Memories logged without any timestamp (stored before timestamps existed)"""
+        with self._lock:
+            self._sync()
+            return self._untimed
+
+    def narrative_ids(self):
+        """Narratives seen so far, in first-seen order"""
+        with self._lock:
+            self._sync()
+            return list(self._totals)
+
+    def totals(self):
+        """All mentions per narrative (timed or not), aligned with narrative_ids()"""
+        with self._lock:
+            self._sync()
+            return np.fromiter(self._totals.values(), dtype=np.int64, count=len(self._totals))
+
+    def window_count(self, narrative_id, start, end, resolution="day"):
+        """
+        Mentions of a narrative in the buckets covering [start, end].
+
+        Args:
+            narrative_id (str): Narrative ID
+            start: Window start (datetime, ISO string or epoch)
+            end: Window end
+            resolution (str): Bucket size
+
+        Returns:
+            int: Mention count
+        """
+        first, last = bucket_of(start, resolution), bucket_of(end, resolution)
+        with self._lock:
+            self._sync()
+            counts = self._buckets[resolution].get(narrative_id, {})
+            return sum(c for b, c in counts.items() if first <= b <= last)
+
+    def series(self, narrative_id, resolution="day"):
+        """
+        Dense count series for one narrative.
+
+        Returns:
+            tuple: (buckets, counts) arrays covering first to last bucket,
+                with zeros for quiet buckets
+        """
+        with self._lock:
+            self._sync()
+            counts = dict(self._buckets[resolution].get(narrative_id, {}))
+
+        if not counts:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+        first = min(counts)
+        buckets = np.arange(first, max(counts) + 1, dtype=np.int64)
+        series = np.zeros(len(buckets), dtype=np.int64)
+        series[np.fromiter(counts, dtype=np.int64, count=len(counts)) - first] = list(counts.values())
+        return buckets, series
+
+    def matrix(self, resolution="day", first=None, last=None):
+        """
+        Narratives x buckets count matrix.
+
+        Args:
+            resolution (str): Bucket size
+            first (int): First bucket (default: earliest seen)
+            last (int): Last bucket (default: latest seen)
+
+        Returns:
+            tuple: (narrative_ids, buckets, counts) where counts is an
+                (n_narratives, n_buckets) int matrix; narratives without
+                timed mentions get zero rows
+        """
+        with self._lock:
+            self._sync()
+            narrative_ids = list(self._totals)
+            per_narrative = self._buckets[resolution]
+            latest = self._latest[resolution]
+            rows, cols, values = [], [], []
+            for i, nid in enumerate(narrative_ids):
+                counts = per_narrative.get(nid)
+                if counts and (first is None or latest[nid] >= first):
+                    rows.extend([i] * len(counts))
+                    cols.extend(counts)
+                    values.extend(counts.values())
+
+        rows = np.asarray(rows, dtype=np.int64)
+        cols = np.asarray(cols, dtype=np.int64)
+        values = np.asarray(values, dtype=np.int64)
+
+        if first is None:
+            first = int(cols.min()) if len(cols) else 0
+        if last is None:
+            last = int(cols.max()) if len(cols) else first - 1
+
+        buckets = np.arange(first, last + 1, dtype=np.int64)
+        counts = np.zeros((len(narrative_ids), len(buckets)), dtype=np.int64)
+        inside = (cols >= first) & (cols <= last)
+        np.add.at(counts, (rows[inside], cols[inside] - first), values[inside])
+        return narrative_ids, buckets, counts
+
+    def windowed_velocity(self, window_days=30, now=None):
+        """
+        Recent mentions per narrative over a sliding window of days.
+
+        Args:
+            window_days (int): Window length ending at `now` (inclusive of today)
+            now: End of the window (default: current time)
+
+        Returns:
+            tuple: (narrative_ids, recent, total, platforms) with recent
+                mentions in the window, all mentions and distinct platforms
+                as aligned int arrays
+        """
+        today = bucket_of(now if now is not None else utc_now(), "day")
+        first = today - window_days + 1
+
+        with self._lock:
+            self._sync()
+            narrative_ids = list(self._totals)
+            days, latest = self._buckets["day"], self._latest["day"]
+            recent = np.fromiter(
+                (sum(c for b, c in days[nid].items() if first <= b <= today)
+                 if latest.get(nid, first - 1) >= first else 0
+                 for nid in narrative_ids),
+                dtype=np.int64, count=len(narrative_ids)
+            )
+            total = np.fromiter(self._totals.values(), dtype=np.int64, count=len(narrative_ids))
+            platforms = np.fromiter(
+                (len(p) for p in self._platforms.values()),
+                dtype=np.int64, count=len(narrative_ids)
+            )
+
+        return narrative_ids, recent, total, platforms
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_time_bucket_index():
+    """Process-wide time bucket index"""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = TimeBucketIndex()
+        return _index
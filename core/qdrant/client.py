@@ -1,12 +1,17 @@
 import os
 from qdrant_client import QdrantClient
+from core.config import TEXT_COLLECTION, IMAGE_COLLECTION, VIDEO_COLLECTION  # noqa: F401 (re-exported)
 
-client = QdrantClient(
-    url=os.getenv("QDRANT_URL"),
-    api_key=os.getenv("QDRANT_API_KEY"),
-)
+# QDRANT_PATH runs Qdrant in-process instead of connecting to a server:
+# a directory for on-disk local mode, or ":memory:" (tests, load tests)
+_local_path = os.getenv("QDRANT_PATH")
 
-# Collection names
-TEXT_COLLECTION = "text_memory"
-IMAGE_COLLECTION = "image_memory"
-VIDEO_COLLECTION = "video_memory"
+if _local_path == ":memory:":
+    client = QdrantClient(":memory:")
+elif _local_path:
+    client = QdrantClient(path=_local_path)
+else:
+    client = QdrantClient(
+        url=os.getenv("QDRANT_URL"),
+        api_key=os.getenv("QDRANT_API_KEY"),
+    )
@@ -0,0 +1,62 @@
+"""
+Qdrant filter construction for memory search
+"""
+from qdrant_client.http.models import FieldCondition, Filter, MatchAny, Range
+
+
+def _as_list(values):
+    """Accept a single value or an iterable of values."""
+    if values is None:
+        return []
+    if isinstance(values, str):
+        return [values]
+    return list(values)
+
+
+def build_search_filter(year_from=None, year_to=None, sources=None, types=None):
+    """
+    Build a Qdrant filter for scoping a vector search.
+
+    The conditions are evaluated by Qdrant inside the index, so the
+    search returns the top matches *within* the scope instead of
+    post-filtering a fixed-size result list in Python.
+
+    Args:
+        year_from (int): Earliest year to include (inclusive)
+        year_to (int): Latest year to include (inclusive)
+        sources (str | list): Source platform(s) to include
+        types (str | list): Memory type(s) to include (text, image, video_frame)
+
+    Returns:
+        Filter | None: Qdrant filter, or None when no scoping was requested
+    """
+    conditions = []
+
+    if year_from is not None or year_to is not None:
+        conditions.append(
+            FieldCondition(
+                key="year",
+                range=Range(
+                    gte=int(year_from) if year_from is not None else None,
+                    lte=int(year_to) if year_to is not None else None
+                )
+            )
+        )
+
+    # Sources are stored lowercased by validate_source
+    source_list = [str(s).strip().lower() for s in _as_list(sources) if s]
+    if source_list:
+        conditions.append(
+            FieldCondition(key="source", match=MatchAny(any=source_list))
+        )
+
+    type_list = [str(t).strip() for t in _as_list(types) if t]
+    if type_list:
+        conditions.append(
+            FieldCondition(key="type", match=MatchAny(any=type_list))
+        )
+
+    if not conditions:
+        return None
+
+    return Filter(must=conditions)
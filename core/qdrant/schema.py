@@ -1,35 +1,209 @@
-from qdrant_client.http.models import Distance, VectorParams
-from core.qdrant.client import client
+import argparse
+from qdrant_client.http.models import (
+    Distance, VectorParams, VectorParamsDiff, PayloadSchemaType, SparseVectorParams, Modifier,
+    HnswConfigDiff, OptimizersConfigDiff, CollectionParamsDiff, Disabled,
+    ScalarQuantization, ScalarQuantizationConfig, ScalarType,
+    BinaryQuantization, BinaryQuantizationConfig,
+    SearchParams, QuantizationSearchParams
+)
+from core.vectorstore import store, TEXT_COLLECTION, IMAGE_COLLECTION, VIDEO_COLLECTION
+from core.config import (
+    TEXT_SPARSE_VECTOR, TEXT_EMBEDDING_DIM, IMAGE_EMBEDDING_DIM,
+    STORAGE_PROFILES, STORAGE_PROFILE, COLLECTION_STORAGE_PROFILES
+)
+
+# Dense vector size per collection
+COLLECTION_DIMS = {
+    TEXT_COLLECTION: TEXT_EMBEDDING_DIM,    # MiniLM
+    IMAGE_COLLECTION: IMAGE_EMBEDDING_DIM,  # CLIP
+    VIDEO_COLLECTION: IMAGE_EMBEDDING_DIM,  # CLIP frames
+}
+
+# Payload fields used by search filters - indexed so that filtering
+# happens inside the HNSW traversal instead of a full payload scan
+PAYLOAD_INDEXES = {
+    "year": PayloadSchemaType.INTEGER,
+    "source": PayloadSchemaType.KEYWORD,
+    "type": PayloadSchemaType.KEYWORD,
+    "content_hash": PayloadSchemaType.KEYWORD,  # Exact-repeat lookups
+    "narrative_id": PayloadSchemaType.KEYWORD,  # Per-narrative member scans
+    "ingested_at": PayloadSchemaType.DATETIME,  # When the point was stored
+    "observed_at": PayloadSchemaType.DATETIME,  # When the item was seen in the wild
+    "ingest_seq": PayloadSchemaType.INTEGER,    # Delta sync of the narrative snapshot
+}
+
+# Named sparse vectors per collection (IDF is applied server-side)
+SPARSE_VECTORS = {
+    TEXT_COLLECTION: {TEXT_SPARSE_VECTOR: SparseVectorParams(modifier=Modifier.IDF)},
+}
+
+_sparse_support = {}
+
+
+def has_sparse_vector(name, vector_name=TEXT_SPARSE_VECTOR):
+    """
+    Check whether a collection was created with a named sparse vector.
+
+    Collections created before hybrid search was added only hold the dense
+    vector; the result is cached per process.
+    """
+    key = (name, vector_name)
+    if key not in _sparse_support:
+        try:
+            info = store.get_collection(name)
+            sparse = info.config.params.sparse_vectors or {}
+            _sparse_support[key] = vector_name in sparse
+        except Exception:
+            return False
+    return _sparse_support[key]
+
+
+def setup_payload_indexes(name):
+    """Create payload indexes for a collection (safe to re-run)"""
+    for field, schema in PAYLOAD_INDEXES.items():
+        try:
+            store.create_payload_index(
+                collection_name=name,
+                field_name=field,
+                field_schema=schema
+            )
+        except Exception as e:
+            print(f"⚠️  Could not index {name}.{field}: {e}")
+
+
+def get_storage_profile(name=None, profile=None):
+    """
+    Settings of a storage profile.
+
+    Args:
+        name (str): Collection whose configured profile to use
+        profile (str): Profile name (overrides the collection's)
+
+    Returns:
+        tuple: (profile name, settings dict from STORAGE_PROFILES)
+    """
+    profile = profile or COLLECTION_STORAGE_PROFILES.get(name, STORAGE_PROFILE)
+    if profile not in STORAGE_PROFILES:
+        raise ValueError(f"Unknown storage profile: {profile}. Use one of {tuple(STORAGE_PROFILES)}")
+    return profile, STORAGE_PROFILES[profile]
+
+
+def quantization_config(settings):
+    """Qdrant quantization config for a profile, or None for float32 only"""
+    quantization = settings.get("quantization")
+    if not quantization:
+        return None
+    if quantization["type"] == "scalar":
+        return ScalarQuantization(scalar=ScalarQuantizationConfig(
+            type=ScalarType.INT8,
+            quantile=quantization.get("quantile"),
+            always_ram=quantization.get("always_ram")
+        ))
+    if quantization["type"] == "binary":
+        return BinaryQuantization(binary=BinaryQuantizationConfig(always_ram=quantization.get("always_ram")))
+    raise ValueError(f"Unknown quantization type: {quantization['type']}")
+
+
+def search_params(name):
+    """
+    Search-time parameters for a collection's storage profile.
+
+    Quantized profiles rescore the oversampled candidates with the
+    original vectors; unquantized ones need no parameters (None).
+    """
+    _, settings = get_storage_profile(name)
+    if not settings.get("quantization"):
+        return None
+    return SearchParams(quantization=QuantizationSearchParams(
+        rescore=settings.get("rescore", True),
+        oversampling=settings.get("oversampling")
+    ))
 
 
 def setup_collections():
     """Setup Qdrant collections with proper error handling"""
-    
-    collections = {
-        "text_memory": 384,     # MiniLM
-        "image_memory": 512,    # CLIP
-        "video_memory": 512     # CLIP frames
-    }
-
-    for name, size in collections.items():
+
+    for name, size in COLLECTION_DIMS.items():
         try:
             # Try to get collection info
-            client.get_collection(name)
+            store.get_collection(name)
             print(f"✓ Collection already exists: {name}")
+            if name in SPARSE_VECTORS and not has_sparse_vector(name):
+                print(f"ℹ️  {name} has no sparse vector - recreate it to enable hybrid search")
         except Exception:
             # Collection doesn't exist, create it
             try:
-                client.create_collection(
+                profile, settings = get_storage_profile(name)
+                store.create_collection(
                     collection_name=name,
                     vectors_config=VectorParams(
                         size=size,
-                        distance=Distance.COSINE
-                    )
+                        distance=Distance.COSINE,
+                        on_disk=settings["vectors_on_disk"]
+                    ),
+                    sparse_vectors_config=SPARSE_VECTORS.get(name),
+                    hnsw_config=HnswConfigDiff(**settings["hnsw"]),
+                    optimizers_config=OptimizersConfigDiff(**settings["optimizers"]),
+                    quantization_config=quantization_config(settings),
+                    on_disk_payload=settings["payload_on_disk"]
                 )
-                print(f"✅ Created collection: {name}")
+                print(f"✅ Created collection: {name} ({profile})")
             except Exception as e:
                 print(f"❌ Error creating {name}: {e}")
+                continue
+
+        setup_payload_indexes(name)
+
+
+def migrate_collection(name, profile):
+    """
+    Switch an existing collection to another storage profile in place.
+
+    Qdrant rebuilds the HNSW graph and quantized copies in the background
+    and keeps serving queries meanwhile (collection status is yellow until
+    done). Payload placement only changes for newly written segments.
+    Local mode ignores these settings. Set COLLECTION_STORAGE_PROFILES (or
+    STORAGE_PROFILE) to match afterwards so searches use the new profile's
+    rescoring.
+
+    Args:
+        name (str): Collection name
+        profile (str): Target profile in STORAGE_PROFILES
+
+    Returns:
+        bool: True if Qdrant accepted the update
+    """
+    profile, settings = get_storage_profile(profile=profile)
+    try:
+        store.update_collection(
+            collection_name=name,
+            vectors_config={"": VectorParamsDiff(on_disk=settings["vectors_on_disk"])},
+            hnsw_config=HnswConfigDiff(**settings["hnsw"]),
+            optimizers_config=OptimizersConfigDiff(**settings["optimizers"]),
+            quantization_config=quantization_config(settings) or Disabled.DISABLED,
+            collection_params=CollectionParamsDiff(on_disk_payload=settings["payload_on_disk"])
+        )
+    except Exception as e:
+        print(f"❌ Could not migrate {name} to {profile}: {e}")
+        return False
+
+    print(f"✅ Migrating {name} to {profile} (Qdrant re-indexes in the background)")
+    return True
 
 
 if __name__ == "__main__":
-    setup_collections()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Create collections or switch their storage profile")
+    commands = parser.add_subparsers(dest="command")
+    commands.add_parser("setup", help="Create missing collections (default)")
+    migrate = commands.add_parser("migrate", help="Move collections to another storage profile")
+    migrate.add_argument("profile", choices=list(STORAGE_PROFILES))
+    migrate.add_argument("collections", nargs="*", default=list(COLLECTION_DIMS),
+                         help="Collections to migrate (default: all)")
+    args = parser.parse_args()
+
+    if args.command == "migrate":
+        for collection in args.collections:
+            migrate_collection(collection, args.profile)
+        print("ℹ️  Update COLLECTION_STORAGE_PROFILES in core/config.py to match")
+    else:
+        setup_collections()
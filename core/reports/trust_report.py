@@ -1,13 +1,23 @@
 from core.memory.text_search import search_claims
 from core.narratives.narrative_intelligence import compute_narrative_stats
 from core.reports.evidence_engine import compute_evidence_strength
+from core.utils.metrics import timed, stage_timer
+from core.utils.tracing import traced, span, set_attributes
 
 
+@traced("generate_trust_report")
+@timed("generate_trust_report")
 def generate_trust_report(query):
 
-    results = search_claims(query, limit=10)
+    with span("similarity_search", limit=10) as s:
+        results = search_claims(query, limit=10)
+        s.set_attributes(
+            result_count=len(results),
+            top_score=round(results[0].score, 4) if results else None
+        )
 
     if not results:
+        set_attributes(status="no_history")
         return {
             "status": "no_history",
             "message": "No similar claims found in memory."
@@ -41,7 +51,9 @@ def generate_trust_report(query):
         key=lambda x: int(x["year"]) if x["year"] and str(x["year"]).isdigit() else 0
     )
 
-    stats = compute_narrative_stats(memories)
+    with span("narrative_stats", memory_count=len(memories)), stage_timer("narrative_stats"):
+        stats = compute_narrative_stats(memories)
+    set_attributes(status="history_found", narrative_id=narrative_id, threat_level=stats["threat_level"])
 
     evidence = compute_evidence_strength(stats)
 
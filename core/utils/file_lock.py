@@ -0,0 +1,63 @@
+"""
+Exclusive locks shared between processes.
+
+The API workers, the Streamlit UI and CLI jobs all write files under
+qdrant_data/. An advisory flock on a sidecar ".lock" file serializes
+those writers (backups skip *.lock files). Where fcntl is unavailable
+(Windows) the lock only serializes threads of the current process.
+"""
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+_process_locks = {}
+_process_locks_guard = threading.Lock()
+
+
+def _process_lock(path):
+    with _process_locks_guard:
+        return _process_locks.setdefault(str(path), threading.Lock())
+
+
+@contextmanager
+def file_lock(path, blocking=True):
+    """
+    Hold an exclusive lock on a lock file (created if missing).
+
+    Not reentrant: taking the same lock twice in one thread deadlocks
+    (or fails, when not blocking).
+
+    Args:
+        path (str | Path): Lock file
+        blocking (bool): Wait for the lock; otherwise give up at once
+
+    Yields:
+        bool: Whether the lock is held (always True when blocking)
+    """
+    path = Path(path)
+    if fcntl is None:
+        lock = _process_lock(path)
+        acquired = lock.acquire(blocking)
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                lock.release()
+        return
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a+b") as f:
+        try:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+        except BlockingIOError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
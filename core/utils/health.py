@@ -0,0 +1,107 @@
+"""
+Liveness and readiness checks.
+
+Liveness (/health) must stay constant-time because load balancers probe
+it every few seconds, so it touches neither Qdrant nor the models.
+Readiness (/ready) does the real checks, each cheap and side-effect free:
+
+- models count as loaded only if their modules were already imported
+  (checking never triggers a model load)
+- Qdrant gets one collection-info call per collection
+- cache and queue depths come from in-memory structures and one stat()
+"""
+import sys
+import time
+from core.vectorstore import store, TEXT_COLLECTION, IMAGE_COLLECTION, VIDEO_COLLECTION
+
+# Embedding modules load their model at import time
+MODEL_MODULES = {
+    "text": "core.embeddings.text_embedder",
+    "image": "core.embeddings.image_embedder",
+}
+
+_started = time.monotonic()
+
+
+def uptime():
+    """Seconds since this process imported the module"""
+    return time.monotonic() - _started
+
+
+def model_status():
+    """
+    Which embedding models are loaded in this process.
+
+    Returns:
+        dict: model name -> bool
+    """
+    return {
+        name: getattr(sys.modules.get(module), "model", None) is not None
+        for name, module in MODEL_MODULES.items()
+    }
+
+
+def qdrant_status(collections=(TEXT_COLLECTION, IMAGE_COLLECTION, VIDEO_COLLECTION)):
+    """
+    Ask Qdrant for collection info.
+
+    Args:
+        collections (tuple): Collections that must exist
+
+    Returns:
+        dict: connected flag, per-collection status/points, latency and error
+    """
+    started = time.perf_counter()
+    result = {"connected": True, "collections": {}}
+    for name in collections:
+        try:
+            info = store.get_collection(name)
+            status = getattr(info.status, "value", info.status)
+            result["collections"][name] = {"status": str(status), "points": info.points_count}
+        except Exception as e:
+            result["connected"] = False
+            result["collections"][name] = {"status": "unavailable"}
+            result["error"] = str(e)
+    result["latency_ms"] = round((time.perf_counter() - started) * 1000, 2)
+    return result
+
+
+def cache_depths():
+    """Entries held by the in-process caches"""
+    from core.narratives.snapshot_cache import get_snapshot_cache
+    from core.narratives.drift_engine import drift_cache_size
+
+    return {
+        "narrative_snapshots": get_snapshot_cache().size(),
+        "drift_timelines": drift_cache_size(),
+    }
+
+
+def queue_depths():
+    """Work waiting for the background jobs"""
+    from core.narratives.narrative_registry import recompute_backlog
+
+    try:
+        backlog = recompute_backlog()
+    except Exception as e:
+        print(f"⚠️  Could not read recompute backlog: {e}")
+        backlog = -1
+    return {"narrative_recompute_bytes": backlog}
+
+
+def readiness():
+    """
+    Full readiness report.
+
+    Returns:
+        dict: ready flag, models, qdrant, caches and queues
+    """
+    models = model_status()
+    qdrant = qdrant_status()
+    return {
+        "ready": all(models.values()) and qdrant["connected"],
+        "models": models,
+        "qdrant": qdrant,
+        "caches": cache_depths(),
+        "queues": queue_depths(),
+    }
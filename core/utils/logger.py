@@ -0,0 +1,52 @@
+"""
+Application logging with trace context.
+
+Every record passing through the SatyaAI handler gets trace_id and
+span_id attributes from the active tracing span ("-" outside one), so
+LOG_FORMAT can print them and log lines from one request can be joined
+with its exported spans.
+"""
+import logging
+from core.utils.tracing import current_span
+from core.config import LOG_LEVEL, LOG_FORMAT
+
+ROOT_LOGGER = "SatyaAI"
+
+
+class TraceContextFilter(logging.Filter):
+    """Adds trace_id / span_id of the active span to log records"""
+
+    def filter(self, record):
+        active = current_span()
+        record.trace_id = getattr(active, "trace_id", None) or "-"
+        record.span_id = getattr(active, "span_id", None) or "-"
+        return True
+
+
+def setup_logging(level=LOG_LEVEL, fmt=LOG_FORMAT):
+    """
+    Attach a trace-aware handler to the SatyaAI logger (safe to call twice).
+
+    Returns:
+        logging.Logger: The SatyaAI logger
+    """
+    logger = logging.getLogger(ROOT_LOGGER)
+    if not any(isinstance(f, TraceContextFilter) for h in logger.handlers for f in h.filters):
+        handler = logging.StreamHandler()
+        handler.addFilter(TraceContextFilter())
+        handler.setFormatter(logging.Formatter(fmt))
+        logger.addHandler(handler)
+        logger.propagate = False
+    logger.setLevel(level)
+    return logger
+
+
+def get_logger(name=None):
+    """
+    Logger under the SatyaAI namespace with trace context.
+
+    Args:
+        name (str): Child name, e.g. "api" -> "SatyaAI.api"
+    """
+    setup_logging()
+    return logging.getLogger(f"{ROOT_LOGGER}.{name}" if name else ROOT_LOGGER)
@@ -0,0 +1,296 @@
+"""
+In-process metrics registry (counters and histograms).
+
+Rendered in the Prometheus text exposition format on the API's /metrics
+endpoint, so any Prometheus-compatible scraper can collect it without
+extra dependencies. Instrument code with the helpers at the bottom:
+
+    @timed("embed_text")
+    def embed_text(text): ...
+
+    with qdrant_timer("query", TEXT_COLLECTION):
+        store.query_points(...)
+
+With METRICS_ENABLED = False, timed() returns the function unchanged and
+the timers return a shared no-op context manager, so disabled metrics add
+nothing to decorated functions and an empty `with` to timed blocks.
+"""
+import threading
+import time
+from bisect import bisect_left
+from contextlib import nullcontext
+from functools import wraps
+from core.config import METRICS_ENABLED, METRICS_LATENCY_BUCKETS
+
+_NOOP = nullcontext()
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    """Base for labelled metrics; children are created once per label set"""
+
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._children = {}
+
+    def labels(self, *values):
+        """Child metric for one set of label values"""
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}")
+        values = tuple(str(v) for v in values)
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def _samples(self):
+        raise NotImplementedError
+
+    def render(self):
+        """Exposition-format lines for this metric"""
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples())
+        return lines
+
+
+class _CounterChild:
+    __slots__ = ("_lock", "value")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.value = 0.0
+
+    def inc(self, amount=1):
+        with self._lock:
+            self.value += amount
+
+
+class Counter(_Metric):
+    """Monotonically increasing count"""
+
+    kind = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount=1):
+        """Increment the unlabelled counter"""
+        self.labels().inc(amount)
+
+    def _samples(self):
+        for values, child in sorted(self._children.items()):
+            yield f"{self.name}{_format_labels(self.labelnames, values)} {_format_value(child.value)}"
+
+
+class _HistogramChild:
+    __slots__ = ("_lock", "_bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds):
+        self._lock = threading.Lock()
+        self._bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # Last slot: above every bound
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        i = bisect_left(self._bounds, value)
+        with self._lock:
+            self.counts[i] += 1
+            self.sum += value
+            self.count += 1
+
+
+class Histogram(_Metric):
+    """Observations counted into cumulative buckets"""
+
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=METRICS_LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(float(b) for b in buckets))
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value):
+        """Observe a value on the unlabelled histogram"""
+        self.labels().observe(value)
+
+    def _samples(self):
+        for values, child in sorted(self._children.items()):
+            with child._lock:
+                counts, total, count = list(child.counts), child.sum, child.count
+            cumulative = 0
+            for bound, n in zip(self.buckets + (float("inf"),), counts):
+                cumulative += n
+                le = (("le", _format_value(bound)),)
+                yield f"{self.name}_bucket{_format_labels(self.labelnames, values, le)} {cumulative}"
+            labels = _format_labels(self.labelnames, values)
+            yield f"{self.name}_sum{labels} {_format_value(total)}"
+            yield f"{self.name}_count{labels} {count}"
+
+
+class MetricsRegistry:
+    """Named metrics, rendered together"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics = {}
+
+    def _get_or_create(self, cls, name, documentation, labelnames, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = cls(name, documentation, labelnames, **kwargs)
+                self._metrics[name] = metric
+            elif not isinstance(metric, cls) or metric.labelnames != tuple(labelnames):
+                raise ValueError(f"Metric {name} already registered with a different type or labels")
+            return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        """Get or create a counter"""
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def histogram(self, name, documentation, labelnames=(), buckets=METRICS_LATENCY_BUCKETS):
+        """Get or create a histogram"""
+        return self._get_or_create(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def render(self):
+        """
+        All metrics in the Prometheus text exposition format.
+
+        Returns:
+            str: Exposition text (ends with a newline)
+        """
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda m: m.name)
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n" if lines else ""
+
+
+REGISTRY = MetricsRegistry()
+
+STAGE_SECONDS = REGISTRY.histogram(
+    "satyaai_stage_duration_seconds",
+    "Time spent per pipeline stage (embedding, search, store, scans, reports)",
+    ("stage",)
+)
+STAGE_ERRORS = REGISTRY.counter(
+    "satyaai_stage_errors_total",
+    "Pipeline stage calls that raised",
+    ("stage",)
+)
+QDRANT_SECONDS = REGISTRY.histogram(
+    "satyaai_qdrant_duration_seconds",
+    "Time spent in Qdrant calls",
+    ("operation", "collection")
+)
+HTTP_SECONDS = REGISTRY.histogram(
+    "satyaai_http_request_duration_seconds",
+    "API request latency by route",
+    ("method", "route", "status")
+)
+
+
+class _Timer:
+    """Context manager observing elapsed seconds on a histogram child"""
+
+    __slots__ = ("_child", "_errors", "_started")
+
+    def __init__(self, child, errors=None):
+        self._child = child
+        self._errors = errors
+
+    def __enter__(self):
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._child.observe(time.perf_counter() - self._started)
+        if exc_type is not None and self._errors is not None:
+            self._errors.inc()
+        return False
+
+
+def metrics_enabled():
+    """Whether instrumentation records anything"""
+    return METRICS_ENABLED
+
+
+def timed(stage):
+    """
+    Decorator recording a function's latency (and errors) as a stage.
+
+    Args:
+        stage (str): Stage label, usually the function name
+
+    Returns:
+        callable: Decorator (identity when metrics are disabled)
+    """
+    def decorator(func):
+        if not METRICS_ENABLED:
+            return func
+
+        child = STAGE_SECONDS.labels(stage)
+        errors = STAGE_ERRORS.labels(stage)
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            except Exception:
+                errors.inc()
+                raise
+            finally:
+                child.observe(time.perf_counter() - started)
+        return wrapper
+    return decorator
+
+
+def stage_timer(stage):
+    """Context manager timing a block as a stage"""
+    if not METRICS_ENABLED:
+        return _NOOP
+    return _Timer(STAGE_SECONDS.labels(stage), STAGE_ERRORS.labels(stage))
+
+
+def qdrant_timer(operation, collection):
+    """Context manager timing one Qdrant call"""
+    if not METRICS_ENABLED:
+        return _NOOP
+    return _Timer(QDRANT_SECONDS.labels(operation, collection))
+
+
+def render_metrics():
+    """Exposition text of the process-wide registry"""
+    return REGISTRY.render()
@@ -0,0 +1,72 @@
+"""
+UTC timestamp helpers for point payloads.
+
+Timestamps are stored as RFC 3339 strings in UTC ("2024-05-01T12:00:00Z"),
+which Qdrant's datetime payload index understands. Every point also gets an
+integer ingest_seq so readers can fetch "everything written since" with
+one indexed range filter.
+"""
+import threading
+import time
+from datetime import datetime, timezone
+
+_seq_lock = threading.Lock()
+_last_seq = 0
+
+
+def utc_now():
+    """Current time as an aware UTC datetime"""
+    return datetime.now(timezone.utc)
+
+
+def parse_timestamp(value):
+    """
+    Parse a timestamp into an aware UTC datetime.
+
+    Args:
+        value: datetime, ISO 8601 string or Unix epoch seconds
+            (naive values are taken as UTC)
+
+    Returns:
+        datetime: Aware UTC datetime
+
+    Raises:
+        ValueError: If the value cannot be parsed
+    """
+    if isinstance(value, datetime):
+        dt = value
+    elif isinstance(value, (int, float)) and not isinstance(value, bool):
+        dt = datetime.fromtimestamp(value, tz=timezone.utc)
+    elif isinstance(value, str) and value.strip():
+        text = value.strip()
+        if text.endswith(("Z", "z")):
+            text = text[:-1] + "+00:00"
+        dt = datetime.fromisoformat(text)
+    else:
+        raise ValueError(f"Invalid timestamp: {value!r}")
+
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
+
+
+def to_utc_iso(value):
+    """Normalize a timestamp to the stored RFC 3339 UTC form"""
+    return parse_timestamp(value).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+def next_ingest_seq():
+    """
+    Ingest sequence number for a new point.
+
+    Nanoseconds since the epoch, strictly increasing within the process.
+    Writers in other processes share the clock, so sequences are ordered
+    across processes up to clock skew (readers re-scan a short overlap).
+
+    Returns:
+        int: Sequence number
+    """
+    global _last_seq
+    with _seq_lock:
+        _last_seq = max(time.time_ns(), _last_seq + 1)
+        return _last_seq
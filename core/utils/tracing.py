@@ -0,0 +1,358 @@
+"""
+Lightweight tracing spans.
+
+Spans nest through a ContextVar, so the active span follows the request
+across function calls (and into FastAPI's threadpool, which copies the
+context). Open one around a stage and attach what explains its cost:
+
+    with span("ann_search", collection=TEXT_COLLECTION, limit=3) as s:
+        results = store.query_points(...)
+        s.set_attribute("result_count", len(results.points))
+
+    @traced("process_new_claim")
+    def process_new_claim(...): ...
+
+Finished spans go to TRACING_EXPORTER ("stdout", "file" or None). With
+TRACING_OPENTELEMETRY and the opentelemetry SDK installed, spans are
+mirrored into OpenTelemetry and written by its console exporter to the
+same target instead; without the SDK the built-in JSON lines are used.
+Trace IDs are available to log records either way (see core.utils.logger).
+
+With TRACING_ENABLED = False, traced() returns the function unchanged
+and span() hands out a shared no-op span.
+"""
+import json
+import logging
+import random
+import sys
+import threading
+import time
+from contextvars import ContextVar
+from functools import wraps
+from core.config import (
+    TRACING_ENABLED,
+    TRACING_EXPORTER,
+    TRACING_FILE_PATH,
+    TRACING_OPENTELEMETRY
+)
+
+log = logging.getLogger("SatyaAI.tracing")
+
+_current = ContextVar("satyaai_span", default=None)
+
+
+def _new_id(bits):
+    return f"{random.getrandbits(bits):0{bits // 4}x}"
+
+
+class Span:
+    """One timed stage of a trace"""
+
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "attributes",
+                 "start_ns", "end_ns", "status", "error", "_otel")
+
+    def __init__(self, name, trace_id=None, parent_id=None, attributes=None):
+        self.name = name
+        self.trace_id = trace_id or _new_id(128)
+        self.span_id = _new_id(64)
+        self.parent_id = parent_id
+        self.attributes = dict(attributes or {})
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.status = "ok"
+        self.error = None
+        self._otel = None
+
+    def set_attribute(self, key, value):
+        """Attach one attribute (numbers, strings, bools)"""
+        self.attributes[key] = value
+        if self._otel is not None:
+            self._otel.set_attribute(key, value)
+
+    def set_attributes(self, **attributes):
+        """Attach several attributes"""
+        for key, value in attributes.items():
+            self.set_attribute(key, value)
+
+    @property
+    def duration_ms(self):
+        end = self.end_ns if self.end_ns is not None else time.time_ns()
+        return (end - self.start_ns) / 1e6
+
+    def to_dict(self):
+        """JSON-serializable form (one exported line)"""
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_ns": self.start_ns,
+            "duration_ms": round(self.duration_ms, 3),
+            "status": self.status,
+            "error": self.error,
+            "attributes": self.attributes,
+        }
+
+
+class _NoopSpan:
+    """Stand-in when tracing is disabled"""
+
+    name = trace_id = span_id = parent_id = error = None
+    status = "ok"
+    attributes = {}
+
+    def set_attribute(self, key, value):
+        pass
+
+    def set_attributes(self, **attributes):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class JsonLinesExporter:
+    """Writes finished spans as JSON lines to a stream or file"""
+
+    def __init__(self, stream=None, path=None):
+        self._lock = threading.Lock()
+        self._stream = stream
+        self._path = path
+
+    def export(self, span):
+        line = json.dumps(span.to_dict(), default=str)
+        with self._lock:
+            if self._stream is None:
+                self._path.parent.mkdir(parents=True, exist_ok=True)
+                self._stream = open(self._path, "a", encoding="utf-8", buffering=1)
+            self._stream.write(line + "\n")
+
+
+class CollectingExporter:
+    """Keeps finished spans in memory (tests, load harnesses)"""
+
+    def __init__(self):
+        self.spans = []
+
+    def export(self, span):
+        self.spans.append(span)
+
+
+def _exporter_stream():
+    if TRACING_EXPORTER == "stdout":
+        return sys.stdout
+    TRACING_FILE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    return open(TRACING_FILE_PATH, "a", encoding="utf-8", buffering=1)
+
+
+def _setup_opentelemetry():
+    """OpenTelemetry tracer writing to the configured target, or None"""
+    try:
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import ConsoleSpanExporter, SimpleSpanProcessor
+    except ImportError:
+        print("⚠️  opentelemetry-sdk not installed - using the built-in span exporter")
+        return None
+
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(ConsoleSpanExporter(out=_exporter_stream())))
+    return provider.get_tracer("satyaai")
+
+
+def _default_exporter():
+    if not TRACING_ENABLED or TRACING_EXPORTER is None:
+        return None
+    if TRACING_EXPORTER == "stdout":
+        return JsonLinesExporter(stream=sys.stdout)
+    if TRACING_EXPORTER == "file":
+        return JsonLinesExporter(path=TRACING_FILE_PATH)
+    print(f"⚠️  Unknown TRACING_EXPORTER {TRACING_EXPORTER!r} - spans are not exported")
+    return None
+
+
+_exporter = _default_exporter()
+_otel_tracer = (
+    _setup_opentelemetry() if TRACING_ENABLED and TRACING_OPENTELEMETRY and TRACING_EXPORTER else None
+)
+
+
+def set_exporter(exporter):
+    """
+    Replace the span exporter.
+
+    Args:
+        exporter: Object with export(span), or None to stop exporting
+
+    Returns:
+        The previous exporter
+    """
+    global _exporter
+    previous, _exporter = _exporter, exporter
+    return previous
+
+
+def current_span():
+    """Active span, or None outside any span"""
+    return _current.get()
+
+
+def current_trace_id():
+    """Trace ID of the active span, or None"""
+    active = _current.get()
+    return active.trace_id if active is not None else None
+
+
+def set_attributes(**attributes):
+    """Attach attributes to the active span (no-op outside a span)"""
+    active = _current.get()
+    if active is not None:
+        active.set_attributes(**attributes)
+
+
+def _start_otel(span, parent):
+    from opentelemetry import trace
+
+    if parent is not None and parent._otel is not None:
+        context = trace.set_span_in_context(parent._otel)
+    elif span.parent_id is not None:
+        # Remote parent (traceparent header)
+        remote = trace.NonRecordingSpan(trace.SpanContext(
+            trace_id=int(span.trace_id, 16),
+            span_id=int(span.parent_id, 16),
+            is_remote=True,
+            trace_flags=trace.TraceFlags(trace.TraceFlags.SAMPLED)
+        ))
+        context = trace.set_span_in_context(remote)
+    else:
+        context = None
+
+    otel = _otel_tracer.start_span(span.name, context=context, attributes=span.attributes,
+                                   start_time=span.start_ns)
+    ids = otel.get_span_context()
+    span.trace_id = f"{ids.trace_id:032x}"
+    span.span_id = f"{ids.span_id:016x}"
+    span._otel = otel
+
+
+def _end_otel(span):
+    from opentelemetry.trace import Status, StatusCode
+
+    if span.status == "error":
+        span._otel.set_status(Status(StatusCode.ERROR, span.error))
+    span._otel.end(end_time=span.end_ns)
+
+
+class _SpanContext:
+    """Context manager that activates a span and exports it on exit"""
+
+    __slots__ = ("_span", "_token")
+
+    def __init__(self, name, attributes, trace_id=None, parent_id=None):
+        parent = _current.get()
+        if parent is not None and trace_id is None:
+            trace_id, parent_id = parent.trace_id, parent.span_id
+        self._span = Span(name, trace_id, parent_id, attributes)
+        if _otel_tracer is not None:
+            _start_otel(self._span, parent)
+        self._token = None
+
+    def __enter__(self):
+        self._token = _current.set(self._span)
+        return self._span
+
+    def __exit__(self, exc_type, exc, tb):
+        s = self._span
+        s.end_ns = time.time_ns()
+        if exc_type is not None:
+            s.status = "error"
+            s.error = f"{exc_type.__name__}: {exc}"
+            log.warning(f"Span {s.name} failed after {s.duration_ms:.1f} ms: {s.error}")
+        _current.reset(self._token)
+
+        try:
+            if s._otel is not None:
+                _end_otel(s)
+            elif _exporter is not None:
+                _exporter.export(s)
+        except Exception as e:
+            print(f"⚠️  Could not export span {s.name}: {e}")
+        return False
+
+
+def span(name, **attributes):
+    """
+    Open a span (child of the active one, else the root of a new trace).
+
+    Args:
+        name (str): Stage name
+        **attributes: Initial attributes
+
+    Returns:
+        Context manager yielding the Span
+    """
+    if not TRACING_ENABLED:
+        return _NOOP_SPAN
+    return _SpanContext(name, attributes)
+
+
+def root_span(name, trace_id=None, parent_id=None, **attributes):
+    """
+    Open a span that starts (or continues) a trace, ignoring any active span.
+
+    Args:
+        name (str): Span name, e.g. "POST /claims"
+        trace_id (str): Incoming 32-hex trace ID to continue
+        parent_id (str): Incoming 16-hex parent span ID
+        **attributes: Initial attributes
+    """
+    if not TRACING_ENABLED:
+        return _NOOP_SPAN
+    return _SpanContext(name, attributes, trace_id or _new_id(128), parent_id)
+
+
+def traced(name=None):
+    """
+    Decorator running a function inside a span.
+
+    Args:
+        name (str): Span name (default: the function name)
+
+    Returns:
+        callable: Decorator (identity when tracing is disabled)
+    """
+    def decorator(func):
+        if not TRACING_ENABLED:
+            return func
+        span_name = name or func.__name__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with _SpanContext(span_name, {}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def parse_traceparent(header):
+    """
+    Trace and parent span ID from a W3C traceparent header.
+
+    Returns:
+        tuple: (trace_id, parent_id), or (None, None) if absent or malformed
+    """
+    parts = (header or "").strip().split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None, None
+    try:
+        int(parts[1], 16), int(parts[2], 16)
+    except ValueError:
+        return None, None
+    if set(parts[1]) == {"0"} or set(parts[2]) == {"0"}:
+        return None, None
+    return parts[1].lower(), parts[2].lower()
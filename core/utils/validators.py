@@ -4,6 +4,7 @@ Input validation utilities
 import re
 from datetime import datetime
 from pathlib import Path
+from core.utils.timestamps import to_utc_iso
 from core.config import (
     ALLOWED_IMAGE_EXTENSIONS, 
     ALLOWED_VIDEO_EXTENSIONS,
@@ -86,6 +87,30 @@ def validate_source(source):
     return source.strip().lower()[:100]
 
 
+def validate_timestamp(value):
+    """
+    Validate an observed-at timestamp.
+    
+    Args:
+        value: datetime, ISO 8601 string or Unix epoch seconds
+        
+    Returns:
+        str: RFC 3339 UTC timestamp
+        
+    Raises:
+        ValidationError: If the timestamp is invalid or in the future
+    """
+    try:
+        timestamp = to_utc_iso(value)
+    except (ValueError, TypeError, OverflowError, OSError):
+        raise ValidationError(f"Invalid timestamp format: {value}")
+    
+    if timestamp > to_utc_iso(datetime.now().timestamp() + 86400):
+        raise ValidationError("Timestamp cannot be in the future")
+    
+    return timestamp
+
+
 def validate_file_upload(file_path, file_type='image'):
     """
     Validate uploaded file.
@@ -179,9 +204,16 @@ def validate_metadata(metadata):
     if 'source' in metadata and metadata['source']:
         clean_metadata['source'] = validate_source(metadata['source'])
     
+    # Validate observed-at timestamp if present
+    if metadata.get('observed_at'):
+        try:
+            clean_metadata['observed_at'] = validate_timestamp(metadata['observed_at'])
+        except ValidationError:
+            pass  # Skip invalid timestamp
+    
     # Copy other safe fields
     safe_fields = ['type', 'narrative_id', 'reinforced', 'created_at', 
-                   'path', 'video_source']
+                   'ingested_at', 'path', 'video_source']
     
     for field in safe_fields:
         if field in metadata:
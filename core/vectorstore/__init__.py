@@ -0,0 +1,53 @@
+"""
+Pluggable vector store
+
+Everything that reads or writes memories goes through `store`, picked by
+VECTOR_STORE_BACKEND: "qdrant" wraps the configured QdrantClient, "numpy"
+runs exact search in-process (see numpy_store.py).
+
+    from core.vectorstore import store, TEXT_COLLECTION
+    store.query_points(collection_name=TEXT_COLLECTION, query=vector, limit=5)
+"""
+import os
+from core.config import (
+    VECTOR_STORE_BACKEND, VECTOR_STORE_PATH,
+    TEXT_COLLECTION, IMAGE_COLLECTION, VIDEO_COLLECTION
+)
+from core.vectorstore.base import VectorStore
+from core.vectorstore.numpy_store import NumpyVectorStore
+from core.vectorstore.qdrant_store import QdrantVectorStore
+
+BACKENDS = ("qdrant", "numpy")
+
+
+def create_vector_store(backend=None, path=None):
+    """
+    Create a vector store.
+
+    Args:
+        backend (str): "qdrant" or "numpy" (default: VECTOR_STORE_BACKEND,
+            overridable with the environment variable of the same name)
+        path (str | Path): numpy backend directory (default:
+            VECTOR_STORE_PATH); ":memory:" keeps it in RAM
+
+    Returns:
+        VectorStore: The store
+    """
+    backend = backend or os.getenv("VECTOR_STORE_BACKEND") or VECTOR_STORE_BACKEND
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown vector store backend: {backend}. Use one of {BACKENDS}")
+
+    if backend == "qdrant":
+        return QdrantVectorStore()
+
+    path = path or os.getenv("VECTOR_STORE_PATH") or VECTOR_STORE_PATH
+    return NumpyVectorStore(None if str(path) == ":memory:" else path)
+
+
+# Process-wide store
+store = create_vector_store()
+
+__all__ = [
+    "VectorStore", "QdrantVectorStore", "NumpyVectorStore", "create_vector_store", "store",
+    "TEXT_COLLECTION", "IMAGE_COLLECTION", "VIDEO_COLLECTION",
+]
@@ -0,0 +1,107 @@
+"""
+Vector store interface used by the memory, narrative and analytics code
+
+Method names, arguments and return types follow qdrant-client, so a raw
+QdrantClient satisfies the interface too (tests patch one in) and the
+filters built with qdrant_client models work against every backend.
+"""
+from abc import ABC, abstractmethod
+
+
+class VectorStore(ABC):
+    """Collections of dense vectors with JSON payloads"""
+
+    # ====== SEARCH ======
+
+    @abstractmethod
+    def query_points(self, collection_name, query=None, query_filter=None, limit=10,
+                     score_threshold=None, with_payload=True, with_vectors=False, **kwargs):
+        """
+        Nearest neighbours of one query vector.
+
+        Returns:
+            QueryResponse: `.points` is a list of ScoredPoint, best first
+        """
+
+    @abstractmethod
+    def query_batch_points(self, collection_name, requests, **kwargs):
+        """
+        Run several QueryRequests against one collection.
+
+        Returns:
+            list: One QueryResponse per request, in order
+        """
+
+    # ====== READ ======
+
+    @abstractmethod
+    def scroll(self, collection_name, scroll_filter=None, limit=10, offset=None,
+               with_payload=True, with_vectors=False, **kwargs):
+        """
+        Page through the points matching a filter.
+
+        Returns:
+            tuple: (list of Record, offset of the next page or None)
+        """
+
+    @abstractmethod
+    def retrieve(self, collection_name, ids, with_payload=True, with_vectors=False, **kwargs):
+        """Points by ID (missing IDs are skipped)"""
+
+    @abstractmethod
+    def count(self, collection_name, count_filter=None, exact=True, **kwargs):
+        """
+        Number of points matching a filter.
+
+        Returns:
+            CountResult: `.count`
+        """
+
+    # ====== WRITE ======
+
+    @abstractmethod
+    def upsert(self, collection_name, points, wait=True, **kwargs):
+        """Insert or overwrite PointStructs (or a Batch)"""
+
+    @abstractmethod
+    def set_payload(self, collection_name, payload, points=None, wait=True, **kwargs):
+        """
+        Merge payload keys into points.
+
+        Args:
+            points: List of IDs, PointIdsList, Filter or FilterSelector
+        """
+
+    # ====== COLLECTIONS ======
+
+    @abstractmethod
+    def create_collection(self, collection_name, vectors_config, **kwargs):
+        """Create a collection (storage settings the backend lacks are ignored)"""
+
+    @abstractmethod
+    def collection_exists(self, collection_name):
+        """Whether a collection exists"""
+
+    @abstractmethod
+    def get_collection(self, collection_name):
+        """
+        Collection info (`.status`, `.points_count`, `.config.params`).
+
+        Raises:
+            Exception: If the collection does not exist
+        """
+
+    @abstractmethod
+    def delete_collection(self, collection_name, **kwargs):
+        """Drop a collection and its points"""
+
+    @abstractmethod
+    def create_payload_index(self, collection_name, field_name, field_schema=None, **kwargs):
+        """Index a payload field for filtering"""
+
+    @abstractmethod
+    def update_collection(self, collection_name, **kwargs):
+        """Change storage settings of an existing collection"""
+
+    def close(self):
+        """Flush and release resources"""
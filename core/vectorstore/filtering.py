@@ -0,0 +1,210 @@
+"""
+Qdrant payload filters evaluated in Python (in-process vector store)
+
+Covers the conditions the memory code builds: nested must / should /
+must_not, FieldCondition with MatchValue, MatchAny, MatchExcept, MatchText,
+Range and DatetimeRange, HasIdCondition, IsEmptyCondition and
+IsNullCondition. As in Qdrant, dotted keys walk nested objects and a
+condition on an array field matches if any element matches.
+"""
+import uuid
+from qdrant_client.http import models
+from core.utils.timestamps import parse_timestamp
+
+
+def normalize_id(point_id):
+    """
+    Canonical form of a point ID (unsigned int or UUID string).
+
+    Raises:
+        ValueError: If the ID is neither
+    """
+    if isinstance(point_id, uuid.UUID):
+        return str(point_id)
+    if isinstance(point_id, str):
+        return str(uuid.UUID(point_id))
+    if isinstance(point_id, bool) or int(point_id) != point_id or point_id < 0:
+        raise ValueError(f"Invalid point ID: {point_id!r}")
+    return int(point_id)
+
+
+def payload_values(payload, key):
+    """Values stored under a (dotted) key, arrays flattened; [] if absent"""
+    current = [payload]
+    for part in key.replace("[]", "").split("."):
+        found = []
+        for item in current:
+            if isinstance(item, dict) and part in item:
+                value = item[part]
+                found.extend(value if isinstance(value, list) else [value])
+        current = found
+    return current
+
+
+def _hashable(value):
+    try:
+        hash(value)
+        return True
+    except TypeError:
+        return False
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _range_check(bounds, convert):
+    """Predicate for one value against gt/gte/lt/lte bounds"""
+    checks = []
+    if bounds.gt is not None:
+        gt = convert(bounds.gt)
+        checks.append(lambda v: v > gt)
+    if bounds.gte is not None:
+        gte = convert(bounds.gte)
+        checks.append(lambda v: v >= gte)
+    if bounds.lt is not None:
+        lt = convert(bounds.lt)
+        checks.append(lambda v: v < lt)
+    if bounds.lte is not None:
+        lte = convert(bounds.lte)
+        checks.append(lambda v: v <= lte)
+    return lambda v: all(check(v) for check in checks)
+
+
+def _field_condition(condition):
+    key = condition.key
+    match = condition.match
+
+    if isinstance(match, models.MatchValue):
+        expected = match.value
+        return lambda pid, payload: expected in payload_values(payload, key)
+    if isinstance(match, models.MatchAny):
+        allowed = set(match.any)
+        return lambda pid, payload: any(
+            _hashable(v) and v in allowed for v in payload_values(payload, key)
+        )
+    if isinstance(match, models.MatchExcept):
+        excluded = set(match.except_)
+        return lambda pid, payload: any(
+            not _hashable(v) or v not in excluded for v in payload_values(payload, key)
+        )
+    if isinstance(match, models.MatchText):
+        text = match.text
+        return lambda pid, payload: any(
+            isinstance(v, str) and text in v for v in payload_values(payload, key)
+        )
+    if match is not None:
+        raise ValueError(f"Unsupported match on {key}: {type(match).__name__}")
+
+    if isinstance(condition.range, models.DatetimeRange):
+        check = _range_check(condition.range, parse_timestamp)
+
+        def in_datetime_range(pid, payload):
+            for value in payload_values(payload, key):
+                try:
+                    if check(parse_timestamp(value)):
+                        return True
+                except ValueError:
+                    continue
+            return False
+        return in_datetime_range
+    if condition.range is not None:
+        check = _range_check(condition.range, float)
+        return lambda pid, payload: any(
+            _is_number(v) and check(v) for v in payload_values(payload, key)
+        )
+
+    raise ValueError(f"Unsupported condition on {key}")
+
+
+def _condition(condition):
+    if isinstance(condition, models.Filter):
+        return compile_filter(condition)
+    if isinstance(condition, models.FieldCondition):
+        return _field_condition(condition)
+    if isinstance(condition, models.HasIdCondition):
+        ids = {normalize_id(pid) for pid in condition.has_id}
+        return lambda pid, payload: pid in ids
+    if isinstance(condition, models.IsEmptyCondition):
+        key = condition.is_empty.key
+        return lambda pid, payload: not [v for v in payload_values(payload, key) if v is not None]
+    if isinstance(condition, models.IsNullCondition):
+        key = condition.is_null.key
+        return lambda pid, payload: None in payload_values(payload, key)
+    raise ValueError(f"Unsupported filter condition: {type(condition).__name__}")
+
+
+def _conditions(conditions):
+    if conditions is None:
+        return []
+    if not isinstance(conditions, list):
+        conditions = [conditions]
+    return [_condition(c) for c in conditions]
+
+
+def compile_filter(query_filter):
+    """
+    Compile a Qdrant Filter into a predicate.
+
+    Args:
+        query_filter (Filter | None): Filter to compile
+
+    Returns:
+        callable: predicate(point_id, payload) -> bool (None matches all)
+
+    Raises:
+        ValueError: For conditions this store cannot evaluate
+    """
+    if query_filter is None:
+        return lambda pid, payload: True
+    if query_filter.min_should is not None:
+        raise ValueError("min_should filters are not supported")
+
+    must = _conditions(query_filter.must)
+    should = _conditions(query_filter.should)
+    must_not = _conditions(query_filter.must_not)
+
+    def predicate(pid, payload):
+        return (
+            all(check(pid, payload) for check in must)
+            and (not should or any(check(pid, payload) for check in should))
+            and not any(check(pid, payload) for check in must_not)
+        )
+    return predicate
+
+
+def indexed_candidates(query_filter, indexes):
+    """
+    Narrow a filter's candidates with keyword payload indexes.
+
+    Uses top-level `must` conditions matching an indexed field by value;
+    the full predicate must still be applied to the result.
+
+    Args:
+        query_filter (Filter | None): Filter being evaluated
+        indexes (dict): field -> {value: set of rows}
+
+    Returns:
+        set | None: Candidate rows, or None when no index applies
+    """
+    if query_filter is None or not query_filter.must:
+        return None
+    must = query_filter.must if isinstance(query_filter.must, list) else [query_filter.must]
+
+    candidates = None
+    for condition in must:
+        if not isinstance(condition, models.FieldCondition) or condition.key not in indexes:
+            continue
+        index = indexes[condition.key]
+        if isinstance(condition.match, models.MatchValue):
+            values = [condition.match.value]
+        elif isinstance(condition.match, models.MatchAny):
+            values = condition.match.any
+        else:
+            continue
+        rows = set()
+        for value in values:
+            if _hashable(value):
+                rows |= index.get(value, set())
+        candidates = rows if candidates is None else candidates & rows
+    return candidates
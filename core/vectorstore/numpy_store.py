@@ -0,0 +1,634 @@
+"""
+In-process vector store with exact search over a NumPy matrix
+
+Each collection keeps its vectors in one preallocated float32 matrix that
+doubles when full, so upserts are amortized O(1) and a search is a single
+matrix product over the filled rows - exact results, no ANN recall loss.
+With a path, the matrix is a memory-mapped file and payloads go to an
+append-only JSON lines log that is replayed on open:
+
+    <path>/<collection>/meta.json       vector size, distance, indexed fields
+    <path>/<collection>/vectors.f32     capacity x size float32 (memmap)
+    <path>/<collection>/points.jsonl    upserts and payload updates
+
+Arguments and results follow qdrant-client (Filter, QueryRequest,
+ScoredPoint, Record, ...), so the memory code runs unchanged. Limits:
+Cosine and Dot distances, the default dense vector only (collections
+report no sparse vectors, so hybrid search falls back to dense), no
+prefetch/fusion queries, scroll order_by only sorts by numeric fields
+(no start_from), and storage profiles are ignored. Keyword and
+integer payload indexes become in-memory inverted indexes; other filters
+scan the payloads. Scroll offsets are row positions, opaque to callers.
+
+Several processes (API workers, the UI, CLI jobs) can share a path:
+writes take an flock on <collection>/points.lock and first replay log
+entries other processes appended, so rows are never assigned twice, and
+every call catches up with the log tail before it runs. Collections are
+created and deleted under <path>/collections.lock; a collection deleted by
+another process stays visible here until reopened.
+
+Search cost grows linearly with the collection, so this suits tests and
+small deployments (up to a few hundred thousand points).
+"""
+import copy
+import json
+import os
+import shutil
+import threading
+from contextlib import nullcontext
+from pathlib import Path
+import numpy as np
+from qdrant_client.http import models
+from core.vectorstore.base import VectorStore
+from core.vectorstore.filtering import (
+    compile_filter, indexed_candidates, normalize_id, payload_values
+)
+from core.utils.file_lock import file_lock
+
+INITIAL_CAPACITY = 1024  # Rows preallocated per collection
+SUPPORTED_DISTANCES = (models.Distance.COSINE, models.Distance.DOT)
+
+# Payload schemas kept as value -> rows indexes (used for must-match filters)
+INDEXED_SCHEMAS = {
+    models.PayloadSchemaType.KEYWORD, models.PayloadSchemaType.INTEGER,
+    models.PayloadSchemaType.UUID, models.PayloadSchemaType.BOOL,
+}
+
+
+def _dense(vector):
+    """The default dense vector of a point (named sparse vectors are dropped)"""
+    if isinstance(vector, dict):
+        if "" not in vector:
+            raise ValueError("Only the default (unnamed) dense vector is supported")
+        vector = vector[""]
+    return vector
+
+
+def _index_values(payload, field):
+    for value in payload_values(payload, field):
+        try:
+            hash(value)
+        except TypeError:
+            continue
+        yield value
+
+
+class _Collection:
+    """Vectors, payloads and payload indexes of one collection"""
+
+    def __init__(self, size, distance, directory=None):
+        self.size = size
+        self.distance = models.Distance(distance)
+        self.directory = Path(directory) if directory else None
+        self.ids = []        # row -> point ID
+        self.payloads = []   # row -> payload
+        self.rows = {}       # point ID -> row
+        self.indexes = {}    # field -> {value: set of rows}
+        self.vectors = None
+        self._log = None
+        self._log_offset = 0  # Log bytes replayed (or written) by this process
+
+    # ====== PERSISTENCE ======
+
+    @classmethod
+    def create(cls, size, distance, directory=None):
+        collection = cls(size, distance, directory)
+        if directory is None:
+            collection.vectors = np.zeros((INITIAL_CAPACITY, size), dtype=np.float32)
+            return collection
+
+        collection.directory.mkdir(parents=True, exist_ok=True)
+        with open(collection._vectors_path, "wb") as f:
+            f.truncate(INITIAL_CAPACITY * size * 4)
+        collection._write_meta()
+        collection._open_files()
+        return collection
+
+    @classmethod
+    def load(cls, directory):
+        """Reopen a persisted collection, replaying its point log"""
+        directory = Path(directory)
+        meta = json.loads((directory / "meta.json").read_text(encoding="utf-8"))
+        collection = cls(meta["size"], meta["distance"], directory)
+        for field in meta.get("indexes", []):
+            collection.indexes[field] = {}
+
+        collection._open_files()
+        collection.refresh()
+        return collection
+
+    def refresh(self):
+        """Replay log entries appended by other processes since the last call"""
+        if self.directory is None:
+            return
+        try:
+            size = os.path.getsize(self._log_path)
+        except FileNotFoundError:
+            return  # Deleted by another process
+        if size <= self._log_offset:
+            return
+
+        with open(self._log_path, "rb") as f:
+            f.seek(self._log_offset)
+            data = f.read(size - self._log_offset)
+        data = data[:data.rfind(b"\n") + 1]  # A partial line is still being written (or torn)
+        for line in data.decode("utf-8").splitlines():
+            if line.strip():
+                self._replay(json.loads(line))
+        self._log_offset += len(data)
+
+        if len(self.ids) > self.vectors.shape[0]:
+            self._map_vectors()  # Another process grew the matrix
+
+    def _locked(self):
+        """Exclusive lock held by whichever process is writing this collection"""
+        if self.directory is None:
+            return nullcontext(True)
+        return file_lock(self.directory / "points.lock")
+
+    @property
+    def _vectors_path(self):
+        return self.directory / "vectors.f32"
+
+    @property
+    def _log_path(self):
+        return self.directory / "points.jsonl"
+
+    def _write_meta(self):
+        meta = {"size": self.size, "distance": self.distance.value, "indexes": sorted(self.indexes)}
+        tmp = self.directory / "meta.json.tmp"
+        tmp.write_text(json.dumps(meta), encoding="utf-8")
+        os.replace(tmp, self.directory / "meta.json")
+
+    def _map_vectors(self):
+        capacity = os.path.getsize(self._vectors_path) // (self.size * 4)
+        self.vectors = np.memmap(self._vectors_path, dtype=np.float32, mode="r+",
+                                 shape=(capacity, self.size))
+
+    def _open_files(self):
+        self._map_vectors()
+        self._log = open(self._log_path, "a", encoding="utf-8")
+
+    def _append_log(self, entries):
+        """Append log entries (call with the collection lock held, after refresh)"""
+        if self._log is None:
+            return
+        if os.path.getsize(self._log_path) != self._log_offset:
+            # Drop a write torn by a crash so new entries start on a fresh line
+            os.truncate(self._log_path, self._log_offset)
+        data = "".join(json.dumps(entry) + "\n" for entry in entries)
+        self._log.write(data)
+        self._log.flush()
+        self._log_offset += len(data.encode("utf-8"))
+
+    def _replay(self, entry):
+        if "id" in entry:
+            self._store_payload(entry["r"], entry["id"], entry["p"])
+        else:
+            self._merge_payload(entry["rows"], entry["s"])
+
+    def close(self):
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+        if isinstance(self.vectors, np.memmap):
+            self.vectors.flush()
+        self.vectors = None
+
+    # ====== WRITES ======
+
+    def _reserve(self, rows):
+        """Grow the matrix (doubling) to hold at least `rows` rows"""
+        capacity = self.vectors.shape[0]
+        if rows <= capacity:
+            return
+        capacity = max(rows, capacity * 2)
+
+        if self.directory is None:
+            grown = np.zeros((capacity, self.size), dtype=np.float32)
+            grown[:len(self.ids)] = self.vectors[:len(self.ids)]
+            self.vectors = grown
+            return
+
+        self.vectors.flush()
+        self.vectors = None  # Unmap before resizing the file
+        with open(self._vectors_path, "r+b") as f:
+            # Another process may have grown the file further; never shrink it
+            if f.seek(0, os.SEEK_END) < capacity * self.size * 4:
+                f.truncate(capacity * self.size * 4)
+        self._map_vectors()
+
+    def _normalize(self, vectors):
+        if self.distance != models.Distance.COSINE:
+            return vectors
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        return vectors / np.where(norms == 0, 1, norms)
+
+    def _index(self, row):
+        for field, index in self.indexes.items():
+            for value in _index_values(self.payloads[row], field):
+                index.setdefault(value, set()).add(row)
+
+    def _unindex(self, row):
+        for field, index in self.indexes.items():
+            for value in _index_values(self.payloads[row], field):
+                index.get(value, set()).discard(row)
+
+    def _store_payload(self, row, point_id, payload):
+        if row == len(self.ids):
+            self.ids.append(point_id)
+            self.payloads.append({})
+            self.rows[point_id] = row
+        else:
+            self._unindex(row)
+        self.payloads[row] = copy.deepcopy(payload or {})
+        self._index(row)
+
+    def _merge_payload(self, rows, patch):
+        for row in rows:
+            self._unindex(row)
+            self.payloads[row].update(copy.deepcopy(patch))
+            self._index(row)
+
+    def upsert(self, items):
+        """Insert or overwrite (id, vector, payload) tuples"""
+        items = [(normalize_id(pid), _dense(vector), payload) for pid, vector, payload in items]
+        if not items:
+            return
+        vectors = np.asarray([vector for _, vector, _ in items], dtype=np.float32)
+        if vectors.ndim != 2 or vectors.shape[1] != self.size:
+            raise ValueError(f"Expected {self.size}-dim vectors, got shape {vectors.shape}")
+        vectors = self._normalize(vectors)
+
+        with self._locked():
+            # Rows other processes assigned since the last read must not be reused
+            self.refresh()
+            entries = []
+            for (point_id, _, payload), vector in zip(items, vectors):
+                row = self.rows.get(point_id, len(self.ids))
+                self._reserve(row + 1)
+                # Shared mapping: readers see the vector once the log entry lands
+                self.vectors[row] = vector
+                self._store_payload(row, point_id, payload)
+                entries.append({"r": row, "id": point_id, "p": payload or {}})
+            self._append_log(entries)
+
+    def set_payload(self, rows, patch):
+        """Merge payload keys into rows"""
+        rows = sorted(set(rows))
+        if not rows:
+            return
+        with self._locked():
+            self.refresh()
+            self._merge_payload(rows, patch)
+            self._append_log([{"rows": rows, "s": patch}])
+
+    def create_index(self, field):
+        if field in self.indexes:
+            return
+        self.indexes[field] = {}
+        for row in range(len(self.ids)):
+            self._index(row)
+        if self.directory is not None:
+            self._write_meta()
+
+    # ====== READS ======
+
+    def matching_rows(self, query_filter):
+        """Rows passing a filter, ascending (None: every row)"""
+        if query_filter is None:
+            return None
+        predicate = compile_filter(query_filter)
+        candidates = indexed_candidates(query_filter, self.indexes)
+        rows = range(len(self.ids)) if candidates is None else sorted(candidates)
+        return np.fromiter(
+            (row for row in rows if predicate(self.ids[row], self.payloads[row])), dtype=np.int64
+        )
+
+    def rows_for(self, points):
+        """Rows selected by IDs, a PointIdsList, a Filter or a FilterSelector"""
+        if isinstance(points, models.FilterSelector):
+            points = points.filter
+        if isinstance(points, models.Filter):
+            return self.matching_rows(points).tolist()
+        if isinstance(points, models.PointIdsList):
+            points = points.points
+        rows = []
+        for point_id in points:
+            point_id = normalize_id(point_id)
+            if point_id not in self.rows:
+                raise ValueError(f"No point with id {point_id} found")
+            rows.append(self.rows[point_id])
+        return rows
+
+    def prepare_query(self, query):
+        if isinstance(query, models.NearestQuery):
+            query = query.nearest
+        if not isinstance(query, (list, tuple, np.ndarray)):
+            raise ValueError(f"Only dense vector queries are supported, got {type(query).__name__}")
+        vector = np.asarray(query, dtype=np.float32)
+        if vector.shape != (self.size,):
+            raise ValueError(f"Expected a {self.size}-dim query vector, got shape {vector.shape}")
+        return self._normalize(vector)
+
+    def top(self, rows, scores, limit, offset=0, score_threshold=None):
+        """
+        Best (row, score) pairs, score descending then row ascending.
+
+        Args:
+            rows (ndarray): Candidate rows
+            scores (ndarray): Score of each candidate row
+        """
+        if score_threshold is not None:
+            keep = scores >= score_threshold
+            rows, scores = rows[keep], scores[keep]
+        k = min((offset or 0) + limit, len(rows))
+        if k <= 0:
+            return []
+        best = np.argpartition(-scores, k - 1)[:k] if k < len(rows) else np.arange(len(rows))
+        best = best[np.lexsort((rows[best], -scores[best]))][offset or 0:]
+        return [(int(rows[i]), float(scores[i])) for i in best]
+
+    def payload(self, row, with_payload):
+        """Payload of a row as selected by with_payload"""
+        payload = self.payloads[row]
+        if with_payload is True:
+            return dict(payload)
+        if not with_payload:
+            return None
+        if isinstance(with_payload, models.PayloadSelectorExclude):
+            return {k: v for k, v in payload.items() if k not in with_payload.exclude}
+        keys = with_payload.include if isinstance(with_payload, models.PayloadSelectorInclude) else with_payload
+        return {k: payload[k] for k in keys if k in payload}
+
+    def vector(self, row, with_vectors):
+        return self.vectors[row].tolist() if with_vectors else None
+
+    def scored_point(self, row, score, with_payload, with_vectors):
+        return models.ScoredPoint.model_construct(
+            id=self.ids[row], version=0, score=score,
+            payload=self.payload(row, with_payload), vector=self.vector(row, with_vectors)
+        )
+
+    def record(self, row, with_payload, with_vectors):
+        return models.Record.model_construct(
+            id=self.ids[row], payload=self.payload(row, with_payload),
+            vector=self.vector(row, with_vectors)
+        )
+
+
+class NumpyVectorStore(VectorStore):
+    """Exact in-process vector store (see module docstring)"""
+
+    def __init__(self, path=None):
+        """
+        Args:
+            path (str | Path): Directory for memory-mapped persistence
+                (None keeps everything in RAM)
+        """
+        self.path = Path(path) if path else None
+        self._collections = {}
+        self._lock = threading.RLock()
+        self._operation_id = 0
+
+        if self.path is not None:
+            self.path.mkdir(parents=True, exist_ok=True)
+            for directory in sorted(self.path.iterdir()):
+                if (directory / "meta.json").exists():
+                    self._collections[directory.name] = _Collection.load(directory)
+
+    def _find(self, collection_name):
+        """A collection caught up with other processes' writes, or None"""
+        collection = self._collections.get(collection_name)
+        if collection is None and self.path is not None:
+            directory = self.path / collection_name
+            if (directory / "meta.json").exists():
+                # Created by another process
+                collection = self._collections[collection_name] = _Collection.load(directory)
+        if collection is not None:
+            collection.refresh()
+        return collection
+
+    def _get(self, collection_name):
+        collection = self._find(collection_name)
+        if collection is None:
+            raise ValueError(f"Collection {collection_name} not found")
+        return collection
+
+    def _collections_locked(self):
+        """Exclusive lock for creating and deleting collections on disk"""
+        if self.path is None:
+            return nullcontext(True)
+        return file_lock(self.path / "collections.lock")
+
+    def _completed(self):
+        self._operation_id += 1
+        return models.UpdateResult(operation_id=self._operation_id, status=models.UpdateStatus.COMPLETED)
+
+    @staticmethod
+    def _check_query(using=None, prefetch=None, **kwargs):
+        if using or prefetch:
+            raise ValueError("Only the default dense vector can be queried (no named vectors or prefetch)")
+
+    # ====== SEARCH ======
+
+    def query_points(self, collection_name, query=None, query_filter=None, limit=10,
+                     score_threshold=None, with_payload=True, with_vectors=False,
+                     offset=0, using=None, prefetch=None, search_params=None, **kwargs):
+        self._check_query(using, prefetch)
+        with self._lock:
+            collection = self._get(collection_name)
+            vector = collection.prepare_query(query)
+            rows = collection.matching_rows(query_filter)
+            if rows is None:
+                rows = np.arange(len(collection.ids))
+                scores = collection.vectors[:len(rows)] @ vector
+            else:
+                scores = collection.vectors[rows] @ vector if len(rows) else np.empty(0, np.float32)
+
+            points = [
+                collection.scored_point(row, score, with_payload, with_vectors)
+                for row, score in collection.top(rows, scores, limit, offset, score_threshold)
+            ]
+        return models.QueryResponse(points=points)
+
+    def query_batch_points(self, collection_name, requests, **kwargs):
+        with self._lock:
+            collection = self._get(collection_name)
+            if not requests:
+                return []
+            for request in requests:
+                self._check_query(request.using, request.prefetch)
+            queries = np.stack([collection.prepare_query(request.query) for request in requests])
+            size = len(collection.ids)
+            # One matrix product for the whole batch: (rows x dim) @ (dim x requests)
+            all_scores = collection.vectors[:size] @ queries.T
+
+            responses = []
+            for j, request in enumerate(requests):
+                rows = collection.matching_rows(request.filter)
+                if rows is None:
+                    rows = np.arange(size)
+                with_payload = True if request.with_payload is None else request.with_payload
+                hits = collection.top(rows, all_scores[rows, j], request.limit or 10,
+                                      request.offset, request.score_threshold)
+                responses.append(models.QueryResponse(points=[
+                    collection.scored_point(row, score, with_payload, request.with_vector)
+                    for row, score in hits
+                ]))
+        return responses
+
+    # ====== READ ======
+
+    def scroll(self, collection_name, scroll_filter=None, limit=10, offset=None,
+               with_payload=True, with_vectors=False, order_by=None, **kwargs):
+        if order_by is not None:
+            return self._scroll_ordered(collection_name, scroll_filter, limit, with_payload,
+                                        with_vectors, order_by)
+        start = int(offset or 0)
+        with self._lock:
+            collection = self._get(collection_name)
+            rows = collection.matching_rows(scroll_filter)
+            if rows is None:
+                page = list(range(start, min(start + limit + 1, len(collection.ids))))
+            else:
+                page = rows[np.searchsorted(rows, start):][:limit + 1].tolist()
+
+            records = [collection.record(row, with_payload, with_vectors) for row in page[:limit]]
+        return records, (page[limit] if len(page) > limit else None)
+
+    def _scroll_ordered(self, collection_name, scroll_filter, limit, with_payload, with_vectors, order_by):
+        """Scroll sorted by a numeric payload field (as Qdrant: no next page offset)"""
+        if isinstance(order_by, str):
+            order_by = models.OrderBy(key=order_by)
+        if order_by.start_from is not None:
+            raise ValueError("order_by start_from is not supported")
+        descending = order_by.direction == models.Direction.DESC
+        with self._lock:
+            collection = self._get(collection_name)
+            rows = collection.matching_rows(scroll_filter)
+            keyed = []
+            for row in range(len(collection.ids)) if rows is None else rows.tolist():
+                values = [
+                    v for v in payload_values(collection.payloads[row], order_by.key)
+                    if isinstance(v, (int, float)) and not isinstance(v, bool)
+                ]
+                if values:  # Points without the field are left out
+                    keyed.append((max(values) if descending else min(values), row))
+            keyed.sort(key=lambda item: (-item[0] if descending else item[0], item[1]))
+            records = [collection.record(row, with_payload, with_vectors) for _, row in keyed[:limit]]
+        return records, None
+
+    def retrieve(self, collection_name, ids, with_payload=True, with_vectors=False, **kwargs):
+        with self._lock:
+            collection = self._get(collection_name)
+            records = []
+            for point_id in ids:
+                row = collection.rows.get(normalize_id(point_id))
+                if row is not None:
+                    records.append(collection.record(row, with_payload, with_vectors))
+        return records
+
+    def count(self, collection_name, count_filter=None, exact=True, **kwargs):
+        with self._lock:
+            collection = self._get(collection_name)
+            rows = collection.matching_rows(count_filter)
+            return models.CountResult(count=len(collection.ids) if rows is None else len(rows))
+
+    # ====== WRITE ======
+
+    def upsert(self, collection_name, points, wait=True, **kwargs):
+        if isinstance(points, models.Batch):
+            items = zip(points.ids, points.vectors, points.payloads or [None] * len(points.ids))
+        else:
+            items = ((point.id, point.vector, point.payload) for point in points)
+        with self._lock:
+            self._get(collection_name).upsert(items)
+            return self._completed()
+
+    def set_payload(self, collection_name, payload, points=None, wait=True, key=None, **kwargs):
+        if key is not None:
+            raise ValueError("Nested set_payload (key=...) is not supported")
+        with self._lock:
+            collection = self._get(collection_name)
+            collection.set_payload(collection.rows_for(points or []), payload)
+            return self._completed()
+
+    # ====== COLLECTIONS ======
+
+    def create_collection(self, collection_name, vectors_config, sparse_vectors_config=None, **kwargs):
+        if isinstance(vectors_config, dict):
+            if list(vectors_config) != [""]:
+                raise ValueError("Only the default (unnamed) dense vector is supported")
+            vectors_config = vectors_config[""]
+        if vectors_config.distance not in SUPPORTED_DISTANCES:
+            raise ValueError(f"Unsupported distance: {vectors_config.distance}")
+
+        with self._lock, self._collections_locked():
+            if self._find(collection_name) is not None:
+                raise ValueError(f"Collection {collection_name} already exists!")
+            directory = self.path / collection_name if self.path is not None else None
+            self._collections[collection_name] = _Collection.create(
+                vectors_config.size, vectors_config.distance, directory
+            )
+        return True
+
+    def collection_exists(self, collection_name):
+        with self._lock:
+            return self._find(collection_name) is not None
+
+    def get_collection(self, collection_name):
+        with self._lock:
+            collection = self._get(collection_name)
+            size = len(collection.ids)
+            return models.CollectionInfo.model_construct(
+                status=models.CollectionStatus.GREEN,
+                optimizer_status=models.OptimizersStatusOneOf.OK,
+                points_count=size,
+                indexed_vectors_count=size,
+                segments_count=1,
+                config=models.CollectionConfig.model_construct(
+                    params=models.CollectionParams.model_construct(
+                        vectors=models.VectorParams(size=collection.size, distance=collection.distance),
+                        sparse_vectors=None,
+                    )
+                ),
+                payload_schema={},
+            )
+
+    def get_collections(self):
+        with self._lock:
+            return models.CollectionsResponse(collections=[
+                models.CollectionDescription(name=name) for name in sorted(self._collections)
+            ])
+
+    def delete_collection(self, collection_name, **kwargs):
+        with self._lock, self._collections_locked():
+            self._find(collection_name)
+            collection = self._collections.pop(collection_name, None)
+            if collection is None:
+                return False
+            collection.close()
+            if collection.directory is not None:
+                shutil.rmtree(collection.directory, ignore_errors=True)
+        return True
+
+    def create_payload_index(self, collection_name, field_name, field_schema=None, **kwargs):
+        schema = getattr(field_schema, "type", field_schema)
+        with self._lock:
+            collection = self._get(collection_name)
+            if schema in INDEXED_SCHEMAS:
+                collection.create_index(field_name)
+            return self._completed()
+
+    def update_collection(self, collection_name, **kwargs):
+        # HNSW, quantization and on-disk settings have no equivalent here
+        with self._lock:
+            self._get(collection_name)
+        return True
+
+    def close(self):
+        with self._lock:
+            for collection in self._collections.values():
+                collection.close()
+            self._collections = {}
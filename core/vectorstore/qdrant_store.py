@@ -0,0 +1,82 @@
+"""
+Vector store backed by a Qdrant client (server, local path or in-memory)
+"""
+from core.vectorstore.base import VectorStore
+
+
+class QdrantVectorStore(VectorStore):
+    """Delegates every call to a QdrantClient"""
+
+    def __init__(self, client=None):
+        """
+        Args:
+            client (QdrantClient): Client to wrap (default: the one
+                configured in core.qdrant.client from QDRANT_URL / QDRANT_PATH)
+        """
+        if client is None:
+            from core.qdrant.client import client
+        self.client = client
+
+    def query_points(self, collection_name, query=None, query_filter=None, limit=10,
+                     score_threshold=None, with_payload=True, with_vectors=False, **kwargs):
+        return self.client.query_points(
+            collection_name=collection_name, query=query, query_filter=query_filter, limit=limit,
+            score_threshold=score_threshold, with_payload=with_payload, with_vectors=with_vectors,
+            **kwargs
+        )
+
+    def query_batch_points(self, collection_name, requests, **kwargs):
+        return self.client.query_batch_points(collection_name=collection_name, requests=requests, **kwargs)
+
+    def scroll(self, collection_name, scroll_filter=None, limit=10, offset=None,
+               with_payload=True, with_vectors=False, **kwargs):
+        return self.client.scroll(
+            collection_name=collection_name, scroll_filter=scroll_filter, limit=limit, offset=offset,
+            with_payload=with_payload, with_vectors=with_vectors, **kwargs
+        )
+
+    def retrieve(self, collection_name, ids, with_payload=True, with_vectors=False, **kwargs):
+        return self.client.retrieve(
+            collection_name=collection_name, ids=ids,
+            with_payload=with_payload, with_vectors=with_vectors, **kwargs
+        )
+
+    def count(self, collection_name, count_filter=None, exact=True, **kwargs):
+        return self.client.count(collection_name=collection_name, count_filter=count_filter, exact=exact, **kwargs)
+
+    def upsert(self, collection_name, points, wait=True, **kwargs):
+        return self.client.upsert(collection_name=collection_name, points=points, wait=wait, **kwargs)
+
+    def set_payload(self, collection_name, payload, points=None, wait=True, **kwargs):
+        return self.client.set_payload(
+            collection_name=collection_name, payload=payload, points=points, wait=wait, **kwargs
+        )
+
+    def create_collection(self, collection_name, vectors_config, **kwargs):
+        return self.client.create_collection(collection_name=collection_name, vectors_config=vectors_config, **kwargs)
+
+    def collection_exists(self, collection_name):
+        return self.client.collection_exists(collection_name)
+
+    def get_collection(self, collection_name):
+        return self.client.get_collection(collection_name)
+
+    def delete_collection(self, collection_name, **kwargs):
+        return self.client.delete_collection(collection_name, **kwargs)
+
+    def create_payload_index(self, collection_name, field_name, field_schema=None, **kwargs):
+        return self.client.create_payload_index(
+            collection_name=collection_name, field_name=field_name, field_schema=field_schema, **kwargs
+        )
+
+    def update_collection(self, collection_name, **kwargs):
+        return self.client.update_collection(collection_name=collection_name, **kwargs)
+
+    def close(self):
+        self.client.close()
+
+    def __getattr__(self, name):
+        # Anything outside the interface (snapshots, aliases, ...) goes straight to Qdrant
+        if name == "client":
+            raise AttributeError(name)
+        return getattr(self.client, name)
@@ -8,6 +8,7 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from core.narratives.narrative_manager import process_new_claim
+from core.narratives.burst_engine import check_bursts
 
 demo_claims = [
     ("Fake image shows massive Delhi flood", 2020, "facebook"),
@@ -33,6 +34,8 @@ for idx, (claim, year, source) in enumerate(demo_claims, 1):
     except Exception as e:
         print(f"{idx}. ❌ Error: {e}")
 
+check_bursts()
+
 print("=" * 60)
 print("✅ Demo dataset loaded successfully!")
 print(f"📊 Total claims added: {len(demo_claims)}")
@@ -9,6 +9,35 @@ from pathlib import Path
 # Add parent directory to path
 sys.path.append(str(Path(__file__).parent.parent))
 
+from qdrant_client import QdrantClient
+from qdrant_client.http.models import Distance, VectorParams
+
+MEMORY_COLLECTIONS = ("text_memory", "image_memory", "video_memory")
+
+
+@pytest.fixture
+def memory_store(monkeypatch):
+    """
+    Factory for an in-memory vector store patched in as modules' `store`.
+
+    memory_store(module, ...) creates the memory collections (2-d cosine
+    vectors) on a fresh QdrantClient(":memory:") and returns it. Pass
+    `client` to wrap or replace it, and `collections` (names, or a dict of
+    name -> vector size) to change what is created.
+    """
+    def factory(*modules, client=None, collections=MEMORY_COLLECTIONS, size=2):
+        if client is None:
+            client = QdrantClient(":memory:")
+        if not isinstance(collections, dict):
+            collections = dict.fromkeys(collections, size)
+        for name, dim in collections.items():
+            client.create_collection(name, vectors_config=VectorParams(size=dim, distance=Distance.COSINE))
+        for module in modules:
+            monkeypatch.setattr(module, "store", client)
+        return client
+
+    return factory
+
 @pytest.fixture
 def sample_claim():
     """Sample claim for testing"""
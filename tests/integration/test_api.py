@@ -36,6 +36,16 @@ class TestAPIEndpoints:
         data = response.json()
         assert data["status"] == "healthy"
     
+    def test_readiness_check(self, api_available):
+        """Test readiness endpoint reports models, Qdrant and depths"""
+        response = requests.get(f"{BASE_URL}/ready")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["status"] == "ready"
+        assert all(data["models"].values())
+        assert data["qdrant"]["connected"]
+        assert "narrative_snapshots" in data["caches"]
+    
     def test_add_claim(self, api_available):
         """Test adding a claim"""
         payload = {
@@ -0,0 +1,115 @@
+"""
+Test burst and resurgence detection
+"""
+from datetime import datetime, timedelta, timezone
+import numpy as np
+import pytest
+from core.narratives.burst_engine import (
+    BurstMonitor,
+    burst_scores,
+    detect_bursts,
+    detect_recent_bursts
+)
+from core.narratives.time_index import TimeBucketIndex
+
+NOW = datetime(2024, 6, 15, 12, 0, tzinfo=timezone.utc)
+
+
+def reference_z(series, baseline):
+    """Per-bucket z-score computed the slow way"""
+    z = np.zeros(len(series))
+    for t in range(1, len(series)):
+        window = np.asarray(series[max(0, t - baseline):t], dtype=float)
+        z[t] = (series[t] - window.mean()) / max(window.std(), 1.0)
+    return z
+
+
+@pytest.fixture
+def index(tmp_path):
+    return TimeBucketIndex(tmp_path / "events.jsonl")
+
+
+def record_daily(index, narrative_id, daily_counts, end=NOW):
+    """Record counts for consecutive days ending at `end`"""
+    for offset, count in enumerate(reversed(daily_counts)):
+        when = (end - timedelta(days=offset)).isoformat()
+        for _ in range(count):
+            index.record({"narrative_id": narrative_id, "source": "twitter", "ingested_at": when})
+
+
+class TestBurstScores:
+    """Test vectorized scoring"""
+
+    def test_matches_reference(self):
+        """Test z-scores equal a per-bucket loop for every narrative"""
+        rng = np.random.default_rng(0)
+        counts = rng.poisson(2, size=(20, 40))
+        z, _, _, _ = burst_scores(counts, baseline=7)
+        for row in range(len(counts)):
+            assert np.allclose(z[row], reference_z(counts[row], 7))
+
+
+class TestDetectBursts:
+    """Test event extraction"""
+
+    def test_burst_over_active_baseline(self):
+        """Test a spike over steady activity is a burst with its onset"""
+        series = [2, 3, 2, 2, 3, 2, 2, 3, 2, 15, 20, 2, 2]
+        events = detect_bursts(np.array([series]), baseline=7)
+        assert len(events) == 1
+        event = events[0]
+        assert (event["onset"], event["end"], event["peak"]) == (9, 11, 10)
+        assert event["mentions"] == 35
+        assert event["kind"] == "burst"
+
+    def test_resurgence_and_emergence(self):
+        """Test quiet baselines separate resurgence from emergence"""
+        dormant = [5, 4, 0, 0, 0, 0, 0, 0, 0, 0, 6]
+        new = [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 6]
+        events = detect_bursts(np.array([dormant, new]), baseline=5)
+        kinds = {e["row"]: e["kind"] for e in events}
+        assert kinds == {0: "resurgence", 1: "emergence"}
+
+    def test_prior_history(self):
+        """Test mentions before the matrix make a quiet spike a resurgence"""
+        counts = np.array([[0, 0, 0, 0, 0, 6]])
+        assert detect_bursts(counts, baseline=3)[0]["kind"] == "emergence"
+        assert detect_bursts(counts, baseline=3, prior=[4])[0]["kind"] == "resurgence"
+
+    def test_min_count(self):
+        """Test tiny counts never burst"""
+        assert detect_bursts(np.array([[0, 0, 0, 0, 2]]), baseline=3, min_count=3) == []
+
+    def test_empty(self):
+        """Test empty matrices"""
+        assert detect_bursts(np.zeros((0, 5))) == []
+
+
+class TestRecentBursts:
+    """Test detection over the time index"""
+
+    def test_detects_this_week(self, index):
+        """Test a spike in the last days is reported with its onset day"""
+        record_daily(index, "NAR_spike", [1] * 20 + [9, 12])
+        record_daily(index, "NAR_steady", [2] * 22)
+
+        events = detect_recent_bursts(index, now=NOW, baseline=14, lookback=7)
+        assert [e["narrative_id"] for e in events] == ["NAR_spike"]
+        assert events[0]["onset"].startswith((NOW - timedelta(days=1)).date().isoformat())
+        assert events[0]["ongoing"]
+
+    def test_resurgence_after_dormancy(self, index):
+        """Test a narrative quiet for weeks resurfaces"""
+        index.record({"narrative_id": "NAR_old", "ingested_at": "2023-01-01T00:00:00Z"})
+        record_daily(index, "NAR_old", [5])
+
+        events = detect_recent_bursts(index, now=NOW)
+        assert events[0]["kind"] == "resurgence"
+
+    def test_monitor_reports_once(self, index):
+        """Test repeated checks after each batch only report new bursts"""
+        monitor = BurstMonitor(index)
+        record_daily(index, "NAR_1", [6])
+        assert len(monitor.check(now=NOW)) == 1
+        record_daily(index, "NAR_1", [3])
+        assert monitor.check(now=NOW) == []
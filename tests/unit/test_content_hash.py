@@ -0,0 +1,128 @@
+"""
+Test content hashing for exact-repeat detection
+"""
+import pytest
+from qdrant_client import QdrantClient
+from qdrant_client.http.models import Distance, PointStruct, VectorParams
+import core.memory.content_hash as content_hash
+from core.memory.content_hash import (
+    normalize_claim_text,
+    claim_content_hash,
+    file_content_hash,
+    find_by_content_hash,
+    find_point,
+    dense_vector,
+    deterministic_point_id
+)
+
+
+class TestClaimHashing:
+    """Test claim normalization and hashing"""
+
+    def test_normalization(self):
+        """Test case, whitespace and punctuation are ignored"""
+        assert normalize_claim_text("  Old FLOOD photo!!  reshared... ") == "old flood photo reshared"
+
+    def test_trivial_reposts_hash_equal(self):
+        """Test reposts differing only in formatting share a hash"""
+        assert claim_content_hash("Vaccine causes infertility!") == \
+            claim_content_hash("vaccine   causes infertility")
+
+    def test_different_claims_hash_differently(self):
+        """Test that changed wording changes the hash"""
+        assert claim_content_hash("Vaccine causes infertility") != \
+            claim_content_hash("Vaccine causes autism")
+
+    def test_hashtags_are_kept(self):
+        """Test hashtags are part of the normalized text"""
+        assert "#delhifloods" in normalize_claim_text("#DelhiFloods again")
+
+
+class TestDeterministicPointIds:
+    """Test UUIDv5 point IDs"""
+
+    def test_same_item_same_id(self):
+        """Test re-ingesting the same item yields the same ID"""
+        h = claim_content_hash("Old flood photo reshared")
+        meta = {"type": "text", "source": "twitter", "year": 2022}
+        assert deterministic_point_id(h, meta) == deterministic_point_id(h, dict(meta))
+
+    def test_source_and_year_distinguish_sightings(self):
+        """Test the same claim on another platform or year is a new memory"""
+        h = claim_content_hash("Old flood photo reshared")
+        base = deterministic_point_id(h, {"type": "text", "source": "twitter", "year": 2022})
+        assert base != deterministic_point_id(h, {"type": "text", "source": "facebook", "year": 2022})
+        assert base != deterministic_point_id(h, {"type": "text", "source": "twitter", "year": 2023})
+
+    def test_observed_at_only_when_set(self):
+        """Test observed_at distinguishes sightings without re-keying old points"""
+        h = claim_content_hash("Old flood photo reshared")
+        meta = {"type": "text", "source": "twitter", "year": 2022}
+        base = deterministic_point_id(h, meta)
+        assert base == deterministic_point_id(h, {**meta, "observed_at": None})
+        seen = deterministic_point_id(h, {**meta, "observed_at": "2022-05-01T10:00:00Z"})
+        assert seen != base
+        assert seen == deterministic_point_id(h, {**meta, "observed_at": "2022-05-01T12:00:00+02:00"})
+
+    def test_id_is_valid_uuid(self):
+        """Test IDs are accepted by Qdrant as UUIDs"""
+        import uuid
+        value = deterministic_point_id("abc", {})
+        assert uuid.UUID(value).version == 5
+
+
+class TestFileHashing:
+    """Test byte-level file hashing"""
+
+    def test_identical_bytes(self, tmp_path):
+        """Test identical files hash equally"""
+        a, b = tmp_path / "a.jpg", tmp_path / "b.jpg"
+        a.write_bytes(b"\xff\xd8 same image bytes")
+        b.write_bytes(b"\xff\xd8 same image bytes")
+        assert file_content_hash(a) == file_content_hash(b)
+
+    def test_different_bytes(self, tmp_path):
+        """Test changed bytes change the hash"""
+        a, b = tmp_path / "a.jpg", tmp_path / "b.jpg"
+        a.write_bytes(b"one")
+        b.write_bytes(b"two")
+        assert file_content_hash(a) != file_content_hash(b)
+
+
+class TestHashLookup:
+    """Test lookups against a local in-memory Qdrant"""
+
+    @pytest.fixture
+    def local_client(self, monkeypatch):
+        client = QdrantClient(":memory:")
+        client.create_collection(
+            "text_memory",
+            vectors_config=VectorParams(size=2, distance=Distance.COSINE)
+        )
+        client.upsert("text_memory", points=[
+            PointStruct(id=1, vector=[0.6, 0.8], payload={
+                "narrative_id": "NAR_test0001",
+                "content_hash": claim_content_hash("Old flood photo reshared")
+            })
+        ])
+        monkeypatch.setattr(content_hash, "store", client)
+        return client
+
+    def test_finds_exact_repeat_with_vector(self, local_client):
+        """Test an exact repeat resolves to its narrative and vector"""
+        record = find_by_content_hash("text_memory", claim_content_hash("OLD flood photo, reshared!"))
+        assert record.payload["narrative_id"] == "NAR_test0001"
+        assert dense_vector(record) == pytest.approx([0.6, 0.8])
+
+    def test_miss_returns_none(self, local_client):
+        """Test unknown content is not matched"""
+        assert find_by_content_hash("text_memory", claim_content_hash("brand new claim")) is None
+
+    def test_find_point_by_id(self, local_client):
+        """Test a point is looked up by its own ID, not by any hash match"""
+        point_id = deterministic_point_id(claim_content_hash("Old flood photo reshared"), {"source": "x"})
+        local_client.upsert("text_memory", points=[
+            PointStruct(id=point_id, vector=[0.8, 0.6], payload={"narrative_id": "NAR_test0002"})
+        ])
+        assert find_point("text_memory", point_id).payload["narrative_id"] == "NAR_test0002"
+        assert find_point("text_memory", deterministic_point_id("other", {})) is None
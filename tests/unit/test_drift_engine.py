@@ -0,0 +1,92 @@
+"""
+Test drift timelines computed from stored vectors
+"""
+import numpy as np
+import pytest
+from qdrant_client.http.models import PointStruct
+import core.narratives.drift_engine as drift_engine
+from core.narratives.drift_engine import (
+    compute_drift_series,
+    get_drift_timeline,
+    clear_drift_cache
+)
+
+
+@pytest.fixture
+def local_client(memory_store):
+    client = memory_store(drift_engine, collections=("text_memory",))
+    # Members inserted out of chronological order
+    client.upsert("text_memory", points=[
+        PointStruct(id=1, vector=[0.0, 1.0], payload={"narrative_id": "N", "year": 2024, "claim": "c"}),
+        PointStruct(id=2, vector=[1.0, 0.0], payload={"narrative_id": "N", "year": 2020, "claim": "a"}),
+        PointStruct(id=3, vector=[1.0, 1.0], payload={"narrative_id": "N", "year": 2022, "claim": "b"}),
+        PointStruct(id=4, vector=[0.0, 1.0], payload={"narrative_id": "OTHER", "year": 2022}),
+    ])
+    clear_drift_cache()
+    yield client
+    clear_drift_cache()
+
+
+class TestDriftSeries:
+    """Test vectorized drift math"""
+
+    def test_matches_pairwise_cosine(self):
+        """Test against per-pair cosine distance"""
+        rng = np.random.default_rng(0)
+        vectors = rng.standard_normal((50, 16))
+        from_origin, from_last = compute_drift_series(vectors)
+
+        def cos(a, b):
+            return a @ b / (np.linalg.norm(a) * np.linalg.norm(b))
+
+        assert from_origin[0] == pytest.approx(0.0, abs=1e-9)
+        assert np.isnan(from_last[0])
+        for i in range(1, 50):
+            assert from_origin[i] == pytest.approx(1 - cos(vectors[0], vectors[i]))
+            assert from_last[i] == pytest.approx(1 - cos(vectors[i - 1], vectors[i]))
+
+
+class TestDriftTimeline:
+    """Test timelines read from Qdrant"""
+
+    def test_chronological_timeline(self, local_client):
+        """Test members are ordered by year and drift is computed per member"""
+        result = get_drift_timeline("N")
+
+        assert result["members"] == 3
+        assert [t["claim"] for t in result["timeline"]] == ["a", "b", "c"]
+        assert result["timeline"][0]["drift_from_last"] is None
+        assert result["timeline"][1]["drift_from_origin"] == pytest.approx(0.293, abs=1e-3)
+        assert result["timeline"][2]["drift_from_origin"] == pytest.approx(1.0, abs=1e-3)
+        assert result["summary"]["max_step_drift"] == pytest.approx(0.293, abs=1e-3)
+
+    def test_cached_until_version_changes(self, local_client, monkeypatch):
+        """Test the cache is reused and refreshed when a member is added"""
+        first = get_drift_timeline("N")
+
+        scrolls = []  # with_vectors of each scroll; only a rebuild reads vectors
+        original_scroll = local_client.scroll
+        monkeypatch.setattr(local_client, "scroll",
+                            lambda **kw: scrolls.append(kw.get("with_vectors")) or original_scroll(**kw))
+
+        assert get_drift_timeline("N") is first
+        assert True not in scrolls
+
+        local_client.upsert("text_memory", points=[
+            PointStruct(id=5, vector=[1.0, 0.0], payload={"narrative_id": "N", "year": 2025, "claim": "d"})
+        ])
+        refreshed = get_drift_timeline("N")
+        assert refreshed["members"] == 4
+        assert True in scrolls
+
+    def test_restore_with_same_count_refreshes(self, local_client):
+        """Test a re-stored member (same count, newer ingest_seq) rebuilds the timeline"""
+        assert [t["claim"] for t in get_drift_timeline("N")["timeline"]] == ["a", "b", "c"]
+
+        local_client.upsert("text_memory", points=[
+            PointStruct(id=2, vector=[1.0, 0.0],
+                        payload={"narrative_id": "N", "year": 2026, "claim": "a", "ingest_seq": 7})
+        ])
+        refreshed = get_drift_timeline("N")
+        assert refreshed["members"] == 3
+        assert [t["claim"] for t in refreshed["timeline"]] == ["b", "c", "a"]
@@ -0,0 +1,74 @@
+"""
+Test search filter construction
+"""
+import pytest
+from qdrant_client import QdrantClient
+from qdrant_client.http.models import Distance, PointStruct, VectorParams
+from core.qdrant.filters import build_search_filter
+
+
+class TestBuildSearchFilter:
+    """Test filter compilation"""
+
+    def test_no_filters_returns_none(self):
+        """Test that an unscoped search gets no filter"""
+        assert build_search_filter() is None
+        assert build_search_filter(sources=[], types=[]) is None
+
+    def test_year_range(self):
+        """Test year range becomes a single range condition"""
+        f = build_search_filter(year_from=2020, year_to=2023)
+        assert len(f.must) == 1
+        assert f.must[0].key == "year"
+        assert f.must[0].range.gte == 2020
+        assert f.must[0].range.lte == 2023
+
+    def test_open_ended_year_range(self):
+        """Test only one bound is set"""
+        f = build_search_filter(year_from=2021)
+        assert f.must[0].range.gte == 2021
+        assert f.must[0].range.lte is None
+
+    def test_sources_are_normalized(self):
+        """Test sources match the lowercased stored values"""
+        f = build_search_filter(sources=["Twitter", " WhatsApp "])
+        assert f.must[0].key == "source"
+        assert f.must[0].match.any == ["twitter", "whatsapp"]
+
+    def test_single_type_string(self):
+        """Test a bare string is accepted for types"""
+        f = build_search_filter(types="image")
+        assert f.must[0].key == "type"
+        assert f.must[0].match.any == ["image"]
+
+    def test_combined_conditions(self):
+        """Test all conditions are combined with AND"""
+        f = build_search_filter(2020, 2024, ["twitter"], ["text"])
+        assert [c.key for c in f.must] == ["year", "source", "type"]
+
+
+class TestFilteredSearch:
+    """Test filters against a local in-memory Qdrant"""
+
+    @pytest.fixture
+    def local_client(self):
+        client = QdrantClient(":memory:")
+        client.create_collection(
+            "text_memory",
+            vectors_config=VectorParams(size=2, distance=Distance.COSINE)
+        )
+        client.upsert("text_memory", points=[
+            PointStruct(id=1, vector=[1.0, 0.0], payload={"year": 2019, "source": "twitter", "type": "text"}),
+            PointStruct(id=2, vector=[0.9, 0.1], payload={"year": 2022, "source": "facebook", "type": "text"}),
+            PointStruct(id=3, vector=[0.8, 0.2], payload={"year": 2023, "source": "twitter", "type": "text"}),
+        ])
+        return client
+
+    def test_filter_finds_matches_beyond_unfiltered_top_k(self, local_client):
+        """Test that scoped search returns in-scope matches the top-1 would miss"""
+        f = build_search_filter(year_from=2021, sources=["twitter"])
+        points = local_client.query_points(
+            "text_memory", query=[1.0, 0.0], query_filter=f, limit=1
+        ).points
+
+        assert [p.id for p in points] == [3]
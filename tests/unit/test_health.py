@@ -0,0 +1,78 @@
+"""
+Test liveness/readiness checks
+"""
+import sys
+import types
+import pytest
+import core.utils.health as health
+from core.analytics.event_log import append_events
+from core.narratives.narrative_registry import NarrativeRegistry, recompute_backlog
+
+
+@pytest.fixture
+def local_client(memory_store):
+    return memory_store(health)
+
+
+@pytest.fixture
+def loaded_models(monkeypatch):
+    for module in health.MODEL_MODULES.values():
+        monkeypatch.setitem(sys.modules, module, types.SimpleNamespace(model=object()))
+
+
+class TestModelStatus:
+    """Test model detection never loads a model"""
+
+    def test_not_imported(self, monkeypatch):
+        """Test models not imported yet are reported unloaded"""
+        for module in health.MODEL_MODULES.values():
+            monkeypatch.delitem(sys.modules, module, raising=False)
+        assert health.model_status() == {"text": False, "image": False}
+        assert not any(module in sys.modules for module in health.MODEL_MODULES.values())
+
+    def test_loaded(self, loaded_models):
+        """Test imported modules with a model are reported loaded"""
+        assert health.model_status() == {"text": True, "image": True}
+
+
+class TestReadiness:
+    """Test the readiness report"""
+
+    def test_ready(self, local_client, loaded_models):
+        """Test ready when models are loaded and collections answer"""
+        report = health.readiness()
+        assert report["ready"]
+        assert report["qdrant"]["collections"]["text_memory"]["points"] == 0
+        assert set(report["caches"]) == {"narrative_snapshots", "drift_timelines"}
+        assert "narrative_recompute_bytes" in report["queues"]
+
+    def test_missing_collection(self, local_client, loaded_models):
+        """Test a missing collection makes the service not ready"""
+        local_client.delete_collection("video_memory")
+        report = health.readiness()
+        assert not report["ready"]
+        assert report["qdrant"]["collections"]["video_memory"]["status"] == "unavailable"
+
+    def test_models_loading(self, local_client, monkeypatch):
+        """Test not ready while a model module is still importing"""
+        for module in health.MODEL_MODULES.values():
+            monkeypatch.setitem(sys.modules, module, types.SimpleNamespace())
+        assert not health.readiness()["ready"]
+
+
+class TestRecomputeBacklog:
+    """Test the recompute queue depth"""
+
+    def test_backlog(self, tmp_path):
+        """Test unprocessed log bytes until the registry catches up"""
+        log_path = tmp_path / "events.jsonl"
+        registry = NarrativeRegistry(tmp_path / "registry.json")
+        assert recompute_backlog(registry, log_path) == 0
+
+        append_events([{"narrative_id": "NAR_a", "year": 2024}], log_path)
+        size = log_path.stat().st_size
+        assert recompute_backlog(registry, log_path) == size
+
+        data = registry.snapshot()
+        registry.save({**data, "log_offset": size, "log_inode": log_path.stat().st_ino})
+        assert recompute_backlog(registry, log_path) == 0
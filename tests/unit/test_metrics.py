@@ -0,0 +1,99 @@
+"""
+Test the metrics registry and its Prometheus text output
+"""
+import pytest
+import core.utils.metrics as metrics
+from core.utils.metrics import MetricsRegistry
+
+
+@pytest.fixture
+def registry():
+    return MetricsRegistry()
+
+
+class TestRegistry:
+    """Test counters, histograms and rendering"""
+
+    def test_counter(self, registry):
+        """Test labelled counters render one sample per label set"""
+        calls = registry.counter("calls_total", "Calls", ("stage",))
+        calls.labels("embed").inc()
+        calls.labels("embed").inc(2)
+        calls.labels("search").inc()
+
+        text = registry.render()
+        assert "# TYPE calls_total counter" in text
+        assert 'calls_total{stage="embed"} 3' in text
+        assert 'calls_total{stage="search"} 1' in text
+
+    def test_histogram_buckets(self, registry):
+        """Test buckets are cumulative and end with +Inf"""
+        latency = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 2.0):
+            latency.observe(value)
+
+        lines = registry.render().splitlines()
+        assert 'latency_seconds_bucket{le="0.1"} 2' in lines
+        assert 'latency_seconds_bucket{le="1"} 3' in lines
+        assert 'latency_seconds_bucket{le="+Inf"} 4' in lines
+        assert "latency_seconds_count 4" in lines
+        assert "latency_seconds_sum 2.65" in lines
+
+    def test_label_escaping(self, registry):
+        """Test quotes, backslashes and newlines are escaped"""
+        registry.counter("c_total", "C", ("route",)).labels('a"b\\c\nd').inc()
+        assert 'c_total{route="a\\"b\\\\c\\nd"} 1' in registry.render()
+
+    def test_get_or_create(self, registry):
+        """Test re-registering returns the same metric and conflicts raise"""
+        first = registry.counter("x_total", "X", ("a",))
+        assert registry.counter("x_total", "X", ("a",)) is first
+        with pytest.raises(ValueError):
+            registry.histogram("x_total", "X", ("a",))
+        with pytest.raises(ValueError):
+            first.labels("1", "2")
+
+
+class TestInstrumentation:
+    """Test the timing helpers"""
+
+    def test_timed_records_latency_and_errors(self):
+        """Test decorated calls are observed and failures counted"""
+        @metrics.timed("test_stage")
+        def work(fail=False):
+            if fail:
+                raise RuntimeError("boom")
+            return 42
+
+        child = metrics.STAGE_SECONDS.labels("test_stage")
+        errors = metrics.STAGE_ERRORS.labels("test_stage")
+        before, failed = child.count, errors.value
+
+        assert work() == 42
+        with pytest.raises(RuntimeError):
+            work(fail=True)
+
+        assert child.count == before + 2
+        assert errors.value == failed + 1
+        assert 'satyaai_stage_duration_seconds_count{stage="test_stage"}' in metrics.render_metrics()
+
+    def test_qdrant_timer(self):
+        """Test Qdrant calls are observed per operation and collection"""
+        child = metrics.QDRANT_SECONDS.labels("scroll", "test_memory")
+        before = child.count
+        with metrics.qdrant_timer("scroll", "test_memory"):
+            pass
+        assert child.count == before + 1
+
+    def test_disabled_is_noop(self, monkeypatch):
+        """Test disabled metrics leave functions untouched"""
+        monkeypatch.setattr(metrics, "METRICS_ENABLED", False)
+
+        def work():
+            return 1
+
+        assert metrics.timed("disabled_stage")(work) is work
+        assert metrics.stage_timer("disabled_stage") is metrics.stage_timer("other")
+        with metrics.qdrant_timer("scroll", "test_memory"):
+            pass
+        assert "disabled_stage" not in metrics.render_metrics()
@@ -1,8 +1,51 @@
 """
 Test narrative intelligence computations
 """
+import random
 import pytest
-from core.narratives.narrative_intelligence import compute_narrative_stats
+from core.narratives.narrative_intelligence import (
+    compute_narrative_stats,
+    compute_all_narrative_stats
+)
+from core.narratives.temporal_engine import compute_temporal_patterns
+from core.narratives.state_engine import compute_narrative_state
+from core.narratives.decay_engine import compute_memory_strength
+from core.config import CRITICAL_THREAT_SCORE, HIGH_THREAT_SCORE, MEDIUM_THREAT_SCORE
+
+
+def reference_stats(memories):
+    """Row-by-row statistics for one narrative"""
+    years = [int(m["year"]) for m in memories if m.get("year") and str(m.get("year")).isdigit()]
+    sources = {m["source"] for m in memories if m.get("source")}
+    modalities = {m["type"] for m in memories if m.get("type")}
+    claims = {m["claim"][:60] for m in memories if m.get("claim")}
+
+    first_seen = min(years) if years else None
+    last_seen = max(years) if years else None
+    lifespan = last_seen - first_seen if first_seen and last_seen else 0
+    resurfacing = lifespan >= 1 and len(memories) >= 3
+    base = {
+        "first_seen": first_seen, "last_seen": last_seen, "lifespan": lifespan,
+        "sources": sources, "modalities": modalities,
+        "mutation_score": len(claims), "resurfacing": resurfacing
+    }
+
+    threat = (30 if resurfacing else 0)
+    threat += 30 if len(sources) >= 4 else 20 if len(sources) >= 3 else 10 if len(sources) >= 2 else 0
+    threat += 25 if len(claims) >= 5 else 15 if len(claims) >= 3 else 0
+    threat += 25 if lifespan >= 3 else 15 if lifespan >= 2 else 10 if lifespan >= 1 else 0
+    level = ("CRITICAL" if threat >= CRITICAL_THREAT_SCORE else "HIGH" if threat >= HIGH_THREAT_SCORE
+             else "MEDIUM" if threat >= MEDIUM_THREAT_SCORE else "LOW")
+
+    return {
+        **base,
+        "temporal_patterns": compute_temporal_patterns(memories),
+        "memory_strength": compute_memory_strength(memories, base),
+        "state": compute_narrative_state(memories, base),
+        "threat_level": level,
+        "threat_score": threat,
+        "strength": min(100, len(memories) * 10 + len(sources) * 15 + lifespan * 10 + (30 if resurfacing else 0))
+    }
 
 
 class TestNarrativeStats:
@@ -258,4 +301,44 @@ class TestStrengthCalculation:
         ]
         stats = compute_narrative_stats(massive_memories)
         
-        assert stats["strength"] <= 100
\ No newline at end of file
+        assert stats["strength"] <= 100
+
+
+class TestAllNarrativeStats:
+    """Test the batch statistics against per-narrative logic"""
+    
+    @pytest.mark.parametrize("seed", [0, 1, 2])
+    def test_matches_reference(self, seed):
+        """Test every narrative's statistics match the row-by-row result"""
+        rng = random.Random(seed)
+        years = [2015, 2019, 2021, 2023, 2024, 2025, "2022", None, "", "n/a"]
+        narratives = {
+            f"narr_{i}": [
+                {
+                    "year": rng.choice(years),
+                    "source": rng.choice(["twitter", "facebook", "whatsapp", "telegram", "x", None]),
+                    "type": rng.choice(["text", "image", "video_frame", None]),
+                    "claim": rng.choice(["", None, f"claim {rng.randint(0, 6)} " * 12])
+                }
+                for _ in range(rng.randint(1, 10))
+            ]
+            for i in range(80)
+        }
+        
+        results = compute_all_narrative_stats(narratives)
+        
+        assert list(results) == list(narratives)
+        for nid, memories in narratives.items():
+            stats = results[nid]
+            stats["sources"] = set(stats["sources"])
+            stats["modalities"] = set(stats["modalities"])
+            assert stats == reference_stats(memories)
+    
+    def test_single_wrapper(self, sample_memories):
+        """Test the single-narrative function matches the batch result"""
+        batch = compute_all_narrative_stats({"n": sample_memories})["n"]
+        assert compute_narrative_stats(sample_memories) == batch
+    
+    def test_empty_corpus(self):
+        """Test with no narratives"""
+        assert compute_all_narrative_stats({}) == {}
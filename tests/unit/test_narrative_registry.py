@@ -0,0 +1,155 @@
+"""
+Test stored narrative records and their incremental recompute
+"""
+import itertools
+import pytest
+from qdrant_client.http.models import PointStruct
+import core.narratives.narrative_registry as narrative_registry
+from core.analytics.event_log import append_events
+from core.utils.file_lock import file_lock
+from core.narratives.narrative_intelligence import compute_narrative_stats
+from core.narratives.narrative_registry import (
+    NarrativeRegistry,
+    refresh_narrative_records,
+    _crossed_boundary
+)
+
+_ids = itertools.count(1)
+
+
+@pytest.fixture
+def local_client(memory_store):
+    return memory_store(narrative_registry)
+
+
+@pytest.fixture
+def registry(tmp_path):
+    return NarrativeRegistry(tmp_path / "registry.json")
+
+
+@pytest.fixture
+def log_path(tmp_path):
+    return tmp_path / "events.jsonl"
+
+
+def store(client, log_path, payloads, collection="text_memory"):
+    """Store points and log them, as the store path does"""
+    client.upsert(collection, points=[
+        PointStruct(id=next(_ids), vector=[1.0, 0.0], payload=p) for p in payloads
+    ])
+    append_events(payloads, log_path)
+
+
+def memories(narrative_id, years, source="twitter"):
+    return [
+        {"narrative_id": narrative_id, "year": y, "source": source, "type": "text", "claim": f"claim {y}"}
+        for y in years
+    ]
+
+
+class TestNarrativeRecords:
+    """Test records match a full recompute"""
+
+    def test_records_match_stats(self, local_client, registry, log_path):
+        """Test stored fields equal compute_narrative_stats"""
+        a = memories("NAR_a", [2019, 2020, 2023])
+        b = memories("NAR_b", [2024], source="facebook")
+        store(local_client, log_path, a + b)
+
+        summary = refresh_narrative_records(registry, log_path)
+        assert summary["recomputed"] == 2
+
+        for nid, members in (("NAR_a", a), ("NAR_b", b)):
+            record = registry.get(nid)
+            stats = compute_narrative_stats(members)
+            for field in ("state", "threat_level", "memory_strength", "strength", "first_seen"):
+                assert record[field] == stats[field]
+            assert record["memory_count"] == len(members)
+
+    def test_only_touched_recomputed(self, local_client, registry, log_path):
+        """Test a second run only recomputes narratives with new memories"""
+        store(local_client, log_path, memories("NAR_a", [2020]) + memories("NAR_b", [2021]))
+        refresh_narrative_records(registry, log_path)
+
+        store(local_client, log_path, memories("NAR_a", [2022, 2023]))
+        summary = refresh_narrative_records(registry, log_path)
+        assert summary["recomputed"] == 1
+        assert registry.get("NAR_a")["memory_count"] == 3
+
+        assert refresh_narrative_records(registry, log_path)["recomputed"] == 0
+
+    def test_year_rollover(self, local_client, registry, log_path):
+        """Test records crossing a dormancy boundary are updated without a scan"""
+        store(local_client, log_path, memories("NAR_a", [2015, 2016, 2017]))
+        refresh_narrative_records(registry, log_path)
+
+        # Pretend the records were computed while NAR_a was still active
+        data = registry.snapshot()
+        data["computed_year"] = 2018
+        data["narratives"]["NAR_a"]["state"] = "ACTIVE"
+        registry.save(data)
+
+        summary = refresh_narrative_records(registry, log_path)
+        assert summary == {"recomputed": 0, "boundary": 1, "removed": 0, "total": 1}
+        assert registry.get("NAR_a")["state"] == "RESURFACED"
+
+    def test_rebuilt_log_drops_missing(self, local_client, registry, log_path):
+        """Test narratives gone from Qdrant are removed after a log rebuild"""
+        store(local_client, log_path, memories("NAR_a", [2020]))
+        refresh_narrative_records(registry, log_path)
+
+        data = registry.snapshot()
+        data["narratives"]["NAR_gone"] = dict(data["narratives"]["NAR_a"])
+        data["log_offset"] = 10 ** 6  # Past the end: the log was replaced
+        registry.save(data)
+
+        summary = refresh_narrative_records(registry, log_path)
+        assert summary["removed"] == 1
+        assert registry.get("NAR_gone") is None
+        assert registry.get("NAR_a") is not None
+
+    def test_shared_between_instances(self, local_client, registry, log_path):
+        """Test another process sees saved records"""
+        store(local_client, log_path, memories("NAR_a", [2020]))
+        refresh_narrative_records(registry, log_path)
+        assert NarrativeRegistry(registry.path).get("NAR_a")["memory_count"] == 1
+
+    def test_fetch_error_keeps_offset(self, local_client, registry, log_path, monkeypatch):
+        """Test a failed member scan saves nothing, so the next run retries"""
+        store(local_client, log_path, memories("NAR_a", [2020]))
+        refresh_narrative_records(registry, log_path)
+        store(local_client, log_path, memories("NAR_a", [2021]))
+        before = registry.snapshot()
+
+        def failing_scroll(*args, **kwargs):
+            raise ConnectionError("qdrant unavailable")
+
+        monkeypatch.setattr(local_client, "scroll", failing_scroll)
+        with pytest.raises(ConnectionError):
+            refresh_narrative_records(registry, log_path)
+        assert registry.snapshot() == before
+
+        monkeypatch.delattr(local_client, "scroll")  # Qdrant is back
+        summary = refresh_narrative_records(registry, log_path)
+        assert summary["recomputed"] == 1
+        assert registry.get("NAR_a")["memory_count"] == 2
+
+    def test_skips_while_locked(self, local_client, registry, log_path):
+        """Test a non-blocking refresh skips while another process holds the lock"""
+        store(local_client, log_path, memories("NAR_a", [2020]))
+        with file_lock(str(registry.path) + ".lock"):
+            assert refresh_narrative_records(registry, log_path, blocking=False) is None
+        assert registry.get("NAR_a") is None
+
+        assert refresh_narrative_records(registry, log_path, blocking=False)["recomputed"] == 1
+
+
+class TestBoundaries:
+    """Test dormancy boundary crossing"""
+
+    def test_crossings(self):
+        """Test gaps of 2 and 3 years are boundaries"""
+        assert _crossed_boundary(2022, 2023, 2024)      # gap 1 -> 2
+        assert _crossed_boundary(2021, 2023, 2024)      # gap 2 -> 3
+        assert not _crossed_boundary(2015, 2023, 2024)  # long dormant
+        assert not _crossed_boundary(2024, 2024, 2024)  # same year
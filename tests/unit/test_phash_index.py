@@ -0,0 +1,109 @@
+"""
+Test perceptual hashing and the BK-tree index
+"""
+import random
+import pytest
+import numpy as np
+from PIL import Image
+from core.embeddings.perceptual_hash import (
+    phash, hamming_distance, phash_to_hex, phash_from_hex
+)
+from core.memory.phash_index import BKTree, PerceptualHashIndex
+
+
+@pytest.fixture
+def noise_image():
+    """Random RGB image upscaled so it has visual structure"""
+    rng = np.random.default_rng(7)
+    pixels = (rng.random((48, 48, 3)) * 255).astype("uint8")
+    return Image.fromarray(pixels).resize((320, 240))
+
+
+class TestPerceptualHash:
+    """Test pHash robustness"""
+
+    def test_hash_is_64_bit(self, noise_image):
+        """Test hash fits in 64 bits and round-trips through hex"""
+        value = phash(noise_image)
+        assert 0 <= value < 2 ** 64
+        assert phash_from_hex(phash_to_hex(value)) == value
+
+    def test_resized_recompressed_copy_is_close(self, noise_image, tmp_path):
+        """Test a resized, recompressed copy stays within a few bits"""
+        noise_image.save(tmp_path / "orig.jpg", quality=95)
+        noise_image.resize((160, 120)).save(tmp_path / "copy.jpg", quality=35)
+        d = hamming_distance(phash(tmp_path / "orig.jpg"), phash(tmp_path / "copy.jpg"))
+        assert d <= 8
+
+    def test_different_images_are_far(self, noise_image):
+        """Test unrelated images are far apart"""
+        other = Image.fromarray(
+            (np.random.default_rng(99).random((48, 48, 3)) * 255).astype("uint8")
+        ).resize((320, 240))
+        assert hamming_distance(phash(noise_image), phash(other)) > 16
+
+
+class TestBKTree:
+    """Test BK-tree radius search against brute force"""
+
+    def test_matches_brute_force(self):
+        """Test search returns exactly the brute-force neighbours"""
+        rng = random.Random(3)
+        hashes = [rng.getrandbits(64) for _ in range(500)]
+        # Add near-duplicates of the first hash
+        hashes += [hashes[0] ^ (1 << rng.randrange(64)) for _ in range(5)]
+
+        tree = BKTree()
+        for i, h in enumerate(hashes):
+            tree.add(h, i)
+
+        query = hashes[0]
+        expected = sorted(i for i, h in enumerate(hashes) if hamming_distance(query, h) <= 10)
+        found = sorted(item for _, item in tree.search(query, 10))
+        assert found == expected
+        assert len(tree) == len(hashes)
+
+    def test_empty_tree(self):
+        """Test searching an empty tree"""
+        assert BKTree().search(123, 5) == []
+
+
+class TestPerceptualHashIndex:
+    """Test the persisted index"""
+
+    def test_query_filters_collection_and_dedupes(self, tmp_path):
+        """Test collection scoping and one result per point"""
+        index = PerceptualHashIndex(tmp_path / "idx.jsonl")
+        index.add(0b1010, "p1", "image_memory", "NAR_a")
+        index.add(0b1010, "p1", "image_memory", "NAR_a")
+        index.add(0b1011, "p2", "video_memory", "NAR_b")
+
+        hits = index.query(0b1010, collection="image_memory")
+        assert [h["point_id"] for h in hits] == ["p1"]
+        assert hits[0]["narrative_id"] == "NAR_a"
+
+    def test_other_process_writes_are_visible(self, tmp_path):
+        """Test a second index instance tails the shared file"""
+        path = tmp_path / "idx.jsonl"
+        writer, reader = PerceptualHashIndex(path), PerceptualHashIndex(path)
+        assert reader.query(42) == []
+
+        writer.add(42, "p1", "image_memory", "NAR_a")
+        assert [h["point_id"] for h in reader.query(42)] == ["p1"]
+
+    def test_replaced_file_is_reloaded(self, tmp_path):
+        """Test a rebuilt file of the same or larger size replaces the loaded hashes"""
+        path = tmp_path / "idx.jsonl"
+        index = PerceptualHashIndex(path)
+        index.add(42, "p1", "image_memory", "NAR_a")
+        assert len(index) == 1
+
+        # Rebuild as another process does: write a temp file, then rename over
+        rebuilt = PerceptualHashIndex(tmp_path / "idx.jsonl.tmp")
+        rebuilt.add(7, "p2", "image_memory", "NAR_b")
+        rebuilt.add(9, "p3", "image_memory", "NAR_b")
+        (tmp_path / "idx.jsonl.tmp").replace(path)
+
+        assert index.query(42, max_distance=0) == []
+        assert [h["point_id"] for h in index.query(7, max_distance=0)] == ["p2"]
+        assert len(index) == 2
@@ -0,0 +1,137 @@
+"""
+Test offline re-clustering of narrative IDs
+"""
+import numpy as np
+import pytest
+from qdrant_client.http.models import PointStruct
+import core.narratives.recluster as recluster
+from core.narratives.narrative_aliases import NarrativeAliases
+from core.narratives.recluster import plan_merges, recluster_narratives
+from core.vectorstore import NumpyVectorStore
+
+
+def point(pid, vector, narrative_id):
+    return PointStruct(id=pid, vector=vector, payload={"narrative_id": narrative_id})
+
+
+@pytest.fixture(params=["qdrant", "numpy"])
+def local_client(request, memory_store, monkeypatch):
+    client = memory_store(
+        recluster,
+        client=NumpyVectorStore() if request.param == "numpy" else None,
+        collections={"text_memory": 2, "image_memory": 3}
+    )
+    client.upsert("text_memory", points=[
+        # Same story split across two IDs by arrival order
+        point(1, [1.0, 0.0], "NAR_big"),
+        point(2, [1.0, 0.02], "NAR_big"),
+        point(3, [1.0, 0.04], "NAR_big"),
+        point(4, [1.0, 0.06], "NAR_small"),
+        # Unrelated narrative
+        point(5, [0.0, 1.0], "NAR_other"),
+    ])
+    client.upsert("image_memory", points=[
+        point(10, [1.0, 0.0, 0.0], "NAR_img_a"),
+        point(11, [1.0, 0.01, 0.0], "NAR_img_b"),
+    ])
+
+    rebuilds = []
+    monkeypatch.setattr(recluster, "rebuild_event_log", lambda: rebuilds.append(True))
+    client.rebuilds = rebuilds
+    monkeypatch.setattr(recluster, "invalidate_narratives_snapshot", lambda full=False: None)
+    return client
+
+
+@pytest.fixture
+def aliases(tmp_path):
+    return NarrativeAliases(tmp_path / "aliases.json")
+
+
+def narrative_of(client, collection, pid):
+    return client.retrieve(collection, ids=[pid])[0].payload["narrative_id"]
+
+
+class TestPlanMerges:
+    """Test the merge plan"""
+
+    def test_largest_survives(self):
+        """Test each component keeps its largest narrative's ID"""
+        ids = ["A", "B", "C", "D"]
+        sizes = {"A": 1, "B": 5, "C": 2, "D": 1}
+        merges = plan_merges(ids, sizes, np.array([0, 1]), np.array([1, 2]))
+        assert merges == {"A": "B", "C": "B"}
+
+    def test_tie_smallest_id(self):
+        """Test ties are broken by ID so reruns are stable"""
+        merges = plan_merges(["N2", "N1"], {"N1": 1, "N2": 1}, np.array([0]), np.array([1]))
+        assert merges == {"N2": "N1"}
+
+    def test_no_edges(self):
+        """Test unlinked narratives are untouched"""
+        assert plan_merges(["A", "B"], {"A": 1, "B": 1}, np.zeros(0, int), np.zeros(0, int)) == {}
+
+
+class TestRecluster:
+    """Test the end-to-end job on a local collection"""
+
+    def test_merges_and_rewrites(self, local_client, aliases):
+        """Test fragments are merged and payloads rewritten in bulk"""
+        summary = recluster_narratives(threshold=0.95, aliases=aliases)
+
+        assert summary["merges"] == {"NAR_small": "NAR_big", "NAR_img_b": "NAR_img_a"}
+        assert summary["narratives_before"] == 5
+        assert summary["narratives_after"] == 3
+        assert narrative_of(local_client, "text_memory", 4) == "NAR_big"
+        assert narrative_of(local_client, "text_memory", 5) == "NAR_other"
+        assert narrative_of(local_client, "image_memory", 11) == "NAR_img_a"
+        assert aliases.resolve("NAR_small") == "NAR_big"
+        assert local_client.rebuilds == [True]
+        assert summary["applied"] is True
+
+    def test_dry_run(self, local_client, aliases):
+        """Test a dry run writes nothing"""
+        summary = recluster_narratives(threshold=0.95, dry_run=True, aliases=aliases)
+        assert summary["merged"] == 2
+        assert narrative_of(local_client, "text_memory", 4) == "NAR_small"
+        assert aliases.mapping() == {}
+        assert local_client.rebuilds == []
+
+    def test_threshold(self, local_client, aliases):
+        """Test nothing merges above every pair's similarity"""
+        assert recluster_narratives(threshold=0.99999, aliases=aliases)["merged"] == 0
+
+    def test_thresholds_per_collection(self, local_client, aliases, monkeypatch):
+        """Test text and image collections use their own linking thresholds"""
+        monkeypatch.setattr(recluster, "CLUSTER_THRESHOLDS", {"text_memory": 0.95, "image_memory": 0.99999})
+        summary = recluster_narratives(aliases=aliases)
+        assert summary["merges"] == {"NAR_small": "NAR_big"}
+
+    def test_failed_rewrite_records_nothing(self, local_client, aliases, monkeypatch):
+        """Test a failed set_payload stops before aliases and the log rebuild"""
+        def failing_set_payload(*args, **kwargs):
+            raise ConnectionError("store unavailable")
+
+        monkeypatch.setattr(local_client, "set_payload", failing_set_payload)
+        summary = recluster_narratives(threshold=0.95, aliases=aliases)
+
+        assert summary["merged"] == 2
+        assert summary["applied"] is False
+        assert aliases.mapping() == {}
+        assert local_client.rebuilds == []
+
+
+class TestAliases:
+    """Test the alias map"""
+
+    def test_chains_collapse(self, aliases):
+        """Test old IDs follow later merges"""
+        aliases.add({"A": "B"})
+        aliases.add({"B": "C"})
+        assert aliases.resolve("A") == "C"
+        assert aliases.resolve("B") == "C"
+        assert aliases.resolve("C") == "C"
+
+    def test_shared_between_instances(self, aliases):
+        """Test another process sees new aliases"""
+        aliases.add({"A": "B"})
+        assert NarrativeAliases(aliases.path).resolve("A") == "B"
@@ -0,0 +1,106 @@
+"""
+Test content-similarity campaign detection
+"""
+import numpy as np
+import pytest
+from qdrant_client import QdrantClient
+from qdrant_client.http.models import Distance, PointStruct, VectorParams
+import core.analytics.similarity_campaigns as similarity_campaigns
+from core.analytics.similarity_campaigns import (
+    campaign_cohesion,
+    compute_narrative_centroids,
+    detect_similarity_campaigns
+)
+
+
+@pytest.fixture
+def corpus(monkeypatch):
+    """Two tight topic groups of 4 narratives each plus unrelated noise"""
+    rng = np.random.default_rng(11)
+    client = QdrantClient(":memory:")
+    client.create_collection(
+        "text_memory",
+        vectors_config=VectorParams(size=32, distance=Distance.COSINE)
+    )
+
+    topics = rng.standard_normal((2, 32))
+    points, pid = [], 0
+    for t, topic in enumerate(topics):
+        for n in range(4):
+            for m in range(3):
+                points.append(PointStruct(
+                    id=pid,
+                    vector=(topic + 0.1 * rng.standard_normal(32)).tolist(),
+                    payload={"narrative_id": f"T{t}_{n}", "source": f"site{n}", "year": 2020 + m}
+                ))
+                pid += 1
+    for n in range(10):
+        for m in range(2):
+            points.append(PointStruct(
+                id=pid,
+                vector=rng.standard_normal(32).tolist(),
+                payload={"narrative_id": f"NOISE_{n}", "source": "x", "year": 2024}
+            ))
+            pid += 1
+
+    client.upsert("text_memory", points=points)
+    monkeypatch.setattr(similarity_campaigns, "store", client)
+    return client
+
+
+class TestSimilarityCampaigns:
+    """Test centroid kNN campaign detection"""
+
+    def test_centroids(self, corpus):
+        """Test one unit centroid per narrative"""
+        ids, centroids, info = compute_narrative_centroids("text_memory", batch_size=7)
+        assert len(ids) == 18
+        assert np.allclose(np.linalg.norm(centroids, axis=1), 1.0, atol=1e-5)
+        assert info["T0_0"]["count"] == 3
+        assert info["T0_0"]["years"] == {2020, 2021, 2022}
+
+    def test_detects_topic_groups(self, corpus):
+        """Test each topic group becomes one campaign and noise is ignored"""
+        campaigns = detect_similarity_campaigns("text_memory", k=5, threshold=0.8)
+
+        groups = sorted(sorted(c["narrative_ids"]) for c in campaigns)
+        assert groups == [
+            ["T0_0", "T0_1", "T0_2", "T0_3"],
+            ["T1_0", "T1_1", "T1_2", "T1_3"]
+        ]
+        for c in campaigns:
+            assert c["cohesion"] > 0.9
+            assert c["platforms"] == ["site0", "site1", "site2", "site3"]
+
+    def test_large_narratives_see_neighbours(self, monkeypatch):
+        """Test narratives bigger than the overfetch limit still find each other"""
+        rng = np.random.default_rng(5)
+        client = QdrantClient(":memory:")
+        client.create_collection("text_memory", vectors_config=VectorParams(size=32, distance=Distance.COSINE))
+        topic = rng.standard_normal(32)
+        topic /= np.linalg.norm(topic)
+        points, pid = [], 0
+        for n in range(3):
+            # Centroid cosines 0.86-0.88; members far closer to their own centroid
+            center = topic + 0.45 * rng.standard_normal(32) / np.sqrt(32)
+            for _ in range(60):
+                points.append(PointStruct(
+                    id=pid,
+                    vector=(center + 0.02 * rng.standard_normal(32)).tolist(),
+                    payload={"narrative_id": f"BIG_{n}", "source": "site", "year": 2024}
+                ))
+                pid += 1
+        client.upsert("text_memory", points=points)
+        monkeypatch.setattr(similarity_campaigns, "store", client)
+
+        campaigns = detect_similarity_campaigns("text_memory", k=10, threshold=0.8)
+        assert [sorted(c["narrative_ids"]) for c in campaigns] == [["BIG_0", "BIG_1", "BIG_2"]]
+
+    def test_cohesion_matches_pairwise_mean(self):
+        """Test the O(n) cohesion equals the mean pairwise cosine"""
+        rng = np.random.default_rng(3)
+        c = rng.standard_normal((6, 8))
+        c /= np.linalg.norm(c, axis=1, keepdims=True)
+        sims = c @ c.T
+        expected = (sims.sum() - 6) / 30
+        assert campaign_cohesion(c) == pytest.approx(expected)
@@ -0,0 +1,189 @@
+"""
+Test the shared narrative snapshot cache and its delta sync
+"""
+import itertools
+import pytest
+from qdrant_client import QdrantClient
+from qdrant_client.http.models import PointStruct
+import core.narratives.snapshot_cache as snapshot_cache
+from core.narratives.snapshot_cache import NarrativeSnapshotCache
+from core.utils.timestamps import next_ingest_seq
+
+_ids = itertools.count(1)
+
+
+class CountingClient:
+    """In-memory Qdrant that records every scroll"""
+
+    def __init__(self):
+        self.client = QdrantClient(":memory:")
+        self.scrolls = []
+
+    def scroll(self, **kwargs):
+        points, offset = self.client.scroll(**kwargs)
+        self.scrolls.append((kwargs["collection_name"], kwargs.get("scroll_filter") is not None, len(points)))
+        return points, offset
+
+    def __getattr__(self, name):
+        return getattr(self.client, name)
+
+
+@pytest.fixture
+def local_client(memory_store):
+    return memory_store(snapshot_cache, client=CountingClient())
+
+
+@pytest.fixture
+def cache(tmp_path, local_client):
+    return NarrativeSnapshotCache(ttl=60, stamp_path=tmp_path / "snapshot.stamp")
+
+
+def store(client, narrative_id, claim, point_id=None, collection="text_memory"):
+    """Store a point the way the memory stores do"""
+    point_id = point_id or next(_ids)
+    client.upsert(collection, points=[PointStruct(
+        id=point_id,
+        vector=[1.0, 0.0],
+        payload={"narrative_id": narrative_id, "claim": claim, "ingest_seq": next_ingest_seq()}
+    )])
+    return point_id
+
+
+def claims(narratives, narrative_id):
+    return sorted(p["claim"] for p in narratives.get(narrative_id, []))
+
+
+class TestSnapshotCache:
+    """Test hits, expiry and invalidation"""
+
+    def test_cached_between_reads(self, local_client, cache):
+        """Test repeated reads scan once"""
+        store(local_client, "NAR_a", "a")
+        first = cache.get()
+        assert cache.get() is first
+        assert (cache.hits, cache.full_loads) == (1, 1)
+        assert claims(first, "NAR_a") == ["a"]
+
+    def test_limit_keyed(self, local_client, cache):
+        """Test each limit has its own snapshot"""
+        cache.get(10)
+        cache.get(1000)
+        cache.get(10)
+        assert cache.full_loads == 2
+        assert cache.size() == 2
+
+    def test_invalidated_by_other_process(self, tmp_path, local_client, cache):
+        """Test another instance's invalidation reaches this one through the stamp"""
+        writer = NarrativeSnapshotCache(ttl=60, stamp_path=cache.stamp_path)
+        cache.get()
+        store(local_client, "NAR_a", "a")
+        writer.invalidate()
+        assert claims(cache.get(), "NAR_a") == ["a"]
+        assert cache.syncs == 1
+
+    def test_without_stamp(self, local_client):
+        """Test the cache works without a stamp file"""
+        cache = NarrativeSnapshotCache(ttl=60, stamp_path=None)
+        cache.get()
+        store(local_client, "NAR_a", "a")
+        cache.invalidate()
+        assert claims(cache.get(), "NAR_a") == ["a"]
+
+
+class TestDeltaSync:
+    """Test refreshes only read new writes"""
+
+    def test_sync_reads_only_new_points(self, local_client, tmp_path):
+        """Test a sync scrolls the new points, not the corpus"""
+        cache = NarrativeSnapshotCache(ttl=60, stamp_path=tmp_path / "snapshot.stamp", overlap=0)
+        for i in range(20):
+            store(local_client, "NAR_a", f"old {i}")
+        cache.get()
+
+        store(local_client, "NAR_b", "new")
+        local_client.scrolls.clear()
+        cache.invalidate()
+        narratives = cache.get()
+
+        assert claims(narratives, "NAR_b") == ["new"]
+        assert len(narratives["NAR_a"]) == 20
+        assert all(filtered for _, filtered, _ in local_client.scrolls)
+        assert sum(count for _, _, count in local_client.scrolls) == 1
+
+    def test_overlap_not_duplicated(self, local_client, cache):
+        """Test points re-read in the overlap window are merged once"""
+        store(local_client, "NAR_a", "a")
+        cache.get()
+        store(local_client, "NAR_a", "b")
+        cache.invalidate()
+        cache.get()
+        cache.invalidate()
+        assert claims(cache.get(), "NAR_a") == ["a", "b"]
+
+    def test_ttl_expiry_syncs(self, local_client, tmp_path):
+        """Test an expired snapshot is synced, not reloaded"""
+        cache = NarrativeSnapshotCache(ttl=0, stamp_path=tmp_path / "snapshot.stamp")
+        cache.get()
+        store(local_client, "NAR_a", "a")
+        assert claims(cache.get(), "NAR_a") == ["a"]
+        assert (cache.full_loads, cache.syncs) == (1, 1)
+
+    def test_overwrite_replaces(self, local_client, cache):
+        """Test a re-written point moves instead of appearing twice"""
+        point_id = store(local_client, "NAR_a", "first")
+        store(local_client, "NAR_a", "other")
+        cache.get()
+
+        store(local_client, "NAR_b", "moved", point_id=point_id)
+        cache.invalidate()
+        narratives = cache.get()
+        assert claims(narratives, "NAR_a") == ["other"]
+        assert claims(narratives, "NAR_b") == ["moved"]
+
+        store(local_client, "NAR_b", "again", point_id=point_id)
+        cache.invalidate()
+        narratives = cache.get()
+        assert "NAR_a" in narratives
+        assert claims(narratives, "NAR_b") == ["again"]
+
+    def test_emptied_narrative_dropped(self, local_client, cache):
+        """Test a narrative whose only member moved disappears"""
+        point_id = store(local_client, "NAR_a", "only")
+        cache.get()
+        store(local_client, "NAR_b", "only", point_id=point_id)
+        cache.invalidate()
+        assert "NAR_a" not in cache.get()
+
+    def test_readers_keep_their_copy(self, local_client, cache):
+        """Test a sync never mutates a snapshot already handed out"""
+        store(local_client, "NAR_a", "a")
+        before = cache.get()
+        store(local_client, "NAR_a", "b")
+        cache.invalidate()
+        after = cache.get()
+        assert claims(before, "NAR_a") == ["a"]
+        assert claims(after, "NAR_a") == ["a", "b"]
+
+    def test_full_invalidation_reloads(self, local_client, cache):
+        """Test rewritten payloads (recluster) are picked up by a full reload"""
+        point_id = store(local_client, "NAR_a", "a")
+        reader = NarrativeSnapshotCache(ttl=60, stamp_path=cache.stamp_path)
+        reader.get()
+
+        local_client.set_payload("text_memory", payload={"narrative_id": "NAR_b"}, points=[point_id])
+        cache.invalidate(full=True)
+        narratives = reader.get()
+        assert claims(narratives, "NAR_b") == ["a"]
+        assert reader.full_loads == 2
+
+    def test_stale_load_not_cached(self, local_client, cache, monkeypatch):
+        """Test a load racing a full invalidation is returned but not kept"""
+        load = snapshot_cache.load_snapshot
+
+        def racing_load(*args, **kwargs):
+            cache.invalidate(full=True)
+            return load(*args, **kwargs)
+
+        monkeypatch.setattr(snapshot_cache, "load_snapshot", racing_load)
+        cache.get()
+        assert cache.size() == 0
@@ -0,0 +1,50 @@
+"""
+Test sparse lexical embeddings
+"""
+from core.embeddings.sparse_embedder import tokenize, term_id, embed_sparse
+
+
+class TestTokenize:
+    """Test lexical tokenization"""
+
+    def test_keeps_hashtags_and_numbers(self):
+        """Test recycled specifics survive tokenization"""
+        tokens = tokenize("Minister hid 4,312 deaths #DelhiFloods")
+        assert "#delhifloods" in tokens
+        assert "4,312" in tokens
+
+    def test_removes_stopwords(self):
+        """Test common words are dropped"""
+        assert tokenize("the flood in the city") == ["flood", "city"]
+
+    def test_empty_text(self):
+        """Test empty input"""
+        assert tokenize("") == []
+        assert tokenize(None) == []
+
+
+class TestEmbedSparse:
+    """Test sparse vector generation"""
+
+    def test_term_ids_are_stable(self):
+        """Test ids do not depend on Python hash randomization"""
+        assert term_id("flood") == term_id("flood")
+        assert 0 <= term_id("flood") < 2 ** 31
+
+    def test_indices_sorted_and_aligned(self):
+        """Test indices and values line up"""
+        vec = embed_sparse("flood flood photo #delhi")
+        assert vec["indices"] == sorted(vec["indices"])
+        assert len(vec["indices"]) == len(vec["values"]) == 3
+
+    def test_term_frequency_saturates(self):
+        """Test repeated terms weigh more but sub-linearly"""
+        vec = embed_sparse("flood flood photo")
+        weights = dict(zip(vec["indices"], vec["values"]))
+        flood, photo = weights[term_id("flood")], weights[term_id("photo")]
+        assert photo < flood < 2 * photo
+
+    def test_query_weights_are_binary(self):
+        """Test query vectors use unit weights"""
+        vec = embed_sparse("flood flood photo", query=True)
+        assert vec["values"] == [1.0, 1.0]
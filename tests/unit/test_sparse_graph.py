@@ -0,0 +1,82 @@
+"""
+Test the sparse narrative graph
+"""
+import random
+import networkx as nx
+import numpy as np
+import pytest
+from core.graphs.sparse_graph import SparseNarrativeGraph
+
+
+@pytest.fixture
+def narratives():
+    rng = random.Random(5)
+    platforms = ["twitter", "facebook", "whatsapp", "telegram", "reddit", "tiktok"]
+    return {
+        f"NAR_{i}": [
+            {"source": rng.choice(platforms[:3] if i < 10 else platforms[3:]), "type": "text"}
+            for _ in range(rng.randint(1, 6))
+        ] + ([{"type": "image"}] if i % 4 == 0 else [])
+        for i in range(20)
+    }
+
+
+@pytest.fixture
+def graph(narratives):
+    graph = SparseNarrativeGraph.from_narratives(narratives)
+    graph.add_similarity_edges(np.array([0, 2]), np.array([15, 3]), np.array([0.9, 0.85]))
+    return graph
+
+
+class TestSparseNarrativeGraph:
+    """Test sparse graph construction and algorithms"""
+
+    def test_aggregated_edges(self, graph, narratives):
+        """Test platform edges carry memory counts and sourceless memories are skipped"""
+        assert graph.n_narratives == 20
+        assert graph.n_platforms == 6
+        for i, nid in enumerate(graph.narrative_ids):
+            with_source = [m for m in narratives[nid] if m.get("source")]
+            assert graph.incidence[i].sum() == len(with_source)
+            assert graph.memory_counts[i] == len(narratives[nid])
+
+    def test_similarity_is_symmetric(self, graph):
+        """Test similarity edges are stored in both directions"""
+        assert graph.similarity[0, 15] == pytest.approx(0.9)
+        assert graph.similarity[15, 0] == pytest.approx(0.9)
+        assert graph.similarity.diagonal().sum() == 0
+
+    def test_components(self, graph):
+        """Test the similarity edge joins the two platform groups"""
+        n, _, _ = graph.connected_components(include_similarity=False)
+        assert n == 2
+        n, narrative_labels, platform_labels = graph.connected_components()
+        assert n == 1
+
+    def test_pagerank_matches_networkx(self, graph):
+        """Test PageRank equals networkx on the exported graph"""
+        narrative_scores, platform_scores = graph.pagerank(tol=1e-10, max_iter=500)
+        expected = nx.pagerank(graph.to_networkx(), weight="weight", tol=1e-12, max_iter=500)
+
+        assert narrative_scores.sum() + platform_scores.sum() == pytest.approx(1.0)
+        for i, nid in enumerate(graph.narrative_ids):
+            assert narrative_scores[i] == pytest.approx(expected[nid], abs=1e-6)
+        for j, platform in enumerate(graph.platforms):
+            assert platform_scores[j] == pytest.approx(expected[platform], abs=1e-6)
+
+    def test_bipartite_projection(self, graph):
+        """Test narrative projection counts shared platforms"""
+        projection = graph.project_narratives()
+        b = (graph.incidence.toarray() > 0).astype(float)
+        expected = b @ b.T
+        np.fill_diagonal(expected, 0)
+        assert np.allclose(projection.toarray(), expected)
+        assert graph.project_platforms().shape == (6, 6)
+
+    def test_networkx_subgraph(self, graph):
+        """Test exporting a small subgraph"""
+        G = graph.to_networkx(["NAR_0", "NAR_15"])
+        assert G.nodes["NAR_0"]["type"] == "narrative"
+        assert G.edges["NAR_0", "NAR_15"]["type"] == "similar"
+        with pytest.raises(ValueError):
+            graph.to_networkx(max_nodes=3)
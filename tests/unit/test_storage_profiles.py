@@ -0,0 +1,123 @@
+"""
+Test storage profiles in collection setup, search parameters and migration
+"""
+import pytest
+from qdrant_client import QdrantClient
+from qdrant_client.http.models import BinaryQuantization, Disabled, ScalarQuantization
+import core.qdrant.schema as schema
+from core.config import STORAGE_PROFILES, TEXT_EMBEDDING_DIM, IMAGE_EMBEDDING_DIM
+
+
+class RecordingClient:
+    """In-memory Qdrant that records update_collection calls"""
+
+    def __init__(self):
+        self.client = QdrantClient(":memory:")
+        self.updates = []
+
+    def update_collection(self, **kwargs):
+        self.updates.append(kwargs)
+        return True
+
+    def __getattr__(self, name):
+        return getattr(self.client, name)
+
+
+@pytest.fixture
+def local_client(memory_store, monkeypatch):
+    # No collections: the tests create them through schema setup
+    client = memory_store(schema, client=RecordingClient(), collections=())
+    monkeypatch.setattr(schema, "_sparse_support", {})
+    return client
+
+
+def use_profile(monkeypatch, profile, collection=None):
+    """Configure a profile for one collection (or every collection)"""
+    names = [collection] if collection else list(schema.COLLECTION_DIMS)
+    monkeypatch.setattr(schema, "COLLECTION_STORAGE_PROFILES", {name: profile for name in names})
+
+
+class TestStorageProfiles:
+    """Test profile lookup and search parameters"""
+
+    def test_default_profile(self):
+        """Test collections without an override use STORAGE_PROFILE"""
+        name, settings = schema.get_storage_profile("image_memory")
+        assert name == schema.STORAGE_PROFILE
+        assert settings is STORAGE_PROFILES[name]
+
+    def test_collection_override(self, monkeypatch):
+        """Test a per-collection override wins over the default"""
+        use_profile(monkeypatch, "disk-heavy", "image_memory")
+        assert schema.get_storage_profile("image_memory")[0] == "disk-heavy"
+        assert schema.get_storage_profile("text_memory")[0] == schema.STORAGE_PROFILE
+
+    def test_unknown_profile(self):
+        """Test an unknown profile name is rejected"""
+        with pytest.raises(ValueError):
+            schema.get_storage_profile(profile="huge")
+
+    @pytest.mark.parametrize("profile,expected", [
+        ("ram-fast", None),
+        ("balanced", ScalarQuantization),
+        ("disk-heavy", BinaryQuantization),
+    ])
+    def test_quantization_per_profile(self, profile, expected):
+        """Test each profile maps to its quantization config"""
+        config = schema.quantization_config(STORAGE_PROFILES[profile])
+        assert config is None if expected is None else isinstance(config, expected)
+
+    def test_search_params_rescore_quantized(self, monkeypatch):
+        """Test quantized profiles rescore with the configured oversampling"""
+        use_profile(monkeypatch, "disk-heavy")
+        params = schema.search_params("image_memory")
+        assert params.quantization.rescore
+        assert params.quantization.oversampling == STORAGE_PROFILES["disk-heavy"]["oversampling"]
+
+    def test_search_params_unquantized(self, monkeypatch):
+        """Test unquantized profiles add no search parameters"""
+        use_profile(monkeypatch, "ram-fast")
+        assert schema.search_params("text_memory") is None
+
+
+class TestSetupAndMigrate:
+    """Test collections are created and migrated with profile settings"""
+
+    @pytest.mark.parametrize("profile", list(STORAGE_PROFILES))
+    def test_setup_with_profile(self, local_client, monkeypatch, profile):
+        """Test setup creates every collection with the configured sizes"""
+        use_profile(monkeypatch, profile)
+        schema.setup_collections()
+        sizes = {
+            name: local_client.get_collection(name).config.params.vectors.size
+            for name in schema.COLLECTION_DIMS
+        }
+        assert sizes == {
+            "text_memory": TEXT_EMBEDDING_DIM,
+            "image_memory": IMAGE_EMBEDDING_DIM,
+            "video_memory": IMAGE_EMBEDDING_DIM,
+        }
+
+    def test_migrate_sends_profile(self, local_client):
+        """Test migration updates HNSW, placement and quantization in place"""
+        assert schema.migrate_collection("image_memory", "disk-heavy")
+        update = local_client.updates[-1]
+        settings = STORAGE_PROFILES["disk-heavy"]
+        assert update["collection_name"] == "image_memory"
+        assert update["hnsw_config"].on_disk == settings["hnsw"]["on_disk"]
+        assert update["vectors_config"][""].on_disk is True
+        assert isinstance(update["quantization_config"], BinaryQuantization)
+        assert update["collection_params"].on_disk_payload is True
+
+    def test_migrate_to_unquantized_disables(self, local_client):
+        """Test moving to ram-fast switches quantization off"""
+        schema.migrate_collection("image_memory", "ram-fast")
+        assert local_client.updates[-1]["quantization_config"] == Disabled.DISABLED
+
+    def test_migrate_failure_reported(self, local_client, monkeypatch):
+        """Test a rejected update returns False instead of raising"""
+        def fail(**kwargs):
+            raise RuntimeError("collection not found")
+
+        monkeypatch.setattr(local_client, "update_collection", fail)
+        assert schema.migrate_collection("missing", "balanced") is False
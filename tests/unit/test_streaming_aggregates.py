@@ -0,0 +1,114 @@
+"""
+Test incrementally maintained platform and campaign aggregates
+"""
+import random
+import pytest
+from core.analytics.narrative_frame import NarrativeFrame
+from core.analytics.streaming_aggregates import NarrativeAggregates, check_consistency
+from core.analytics.trend_detector import (
+    compute_platform_risk_scores,
+    detect_coordinated_campaigns
+)
+
+
+def make_stream(seed, n_memories=400):
+    """Stored payloads in ingest order, with missing and None sources"""
+    rng = random.Random(seed)
+    stream = []
+    for _ in range(n_memories):
+        payload = {"narrative_id": f"NAR_{rng.randint(0, 40)}"}
+        if rng.random() < 0.9:
+            payload["year"] = rng.choice([2021, 2022, 2023, "2023", None])
+        if rng.random() < 0.9:
+            payload["source"] = rng.choice(["twitter", "facebook", "whatsapp", "telegram", None])
+        stream.append(payload)
+    return stream
+
+
+def group(stream):
+    narratives = {}
+    for payload in stream:
+        narratives.setdefault(payload["narrative_id"], []).append(payload)
+    return narratives
+
+
+def campaign_sets(campaigns):
+    return {(c['year'], c['platform']): set(c['narrative_ids']) for c in campaigns}
+
+
+@pytest.fixture
+def aggregates(tmp_path):
+    return NarrativeAggregates(tmp_path / "aggregates.jsonl")
+
+
+class TestNarrativeAggregates:
+    """Test aggregates match a full recompute"""
+
+    @pytest.mark.parametrize("seed", [0, 1, 2])
+    def test_matches_recompute(self, aggregates, seed):
+        """Test platform scores and campaigns equal the batch results"""
+        stream = make_stream(seed)
+        for payload in stream:
+            aggregates.record(payload)
+        narratives = group(stream)
+
+        assert aggregates.platform_risk_scores() == compute_platform_risk_scores(narratives)
+        assert campaign_sets(aggregates.coordinated_campaigns()) == \
+            campaign_sets(detect_coordinated_campaigns(narratives))
+        assert len(aggregates) == len(stream)
+
+    def test_persisted_and_shared(self, aggregates, tmp_path):
+        """Test a second instance (another process) sees the same state"""
+        stream = make_stream(3)
+        for payload in stream[:200]:
+            aggregates.record(payload)
+
+        other = NarrativeAggregates(tmp_path / "aggregates.jsonl")
+        assert other.platform_risk_scores() == aggregates.platform_risk_scores()
+
+        for payload in stream[200:]:
+            aggregates.record(payload)
+        assert other.platform_risk_scores() == compute_platform_risk_scores(group(stream))
+
+    def test_consistency_checker(self, aggregates):
+        """Test the checker flags drift against a full recompute"""
+        stream = make_stream(4)
+        for payload in stream:
+            aggregates.record(payload)
+        frame = NarrativeFrame.from_narratives(group(stream))
+
+        assert check_consistency(aggregates, frame)["consistent"]
+
+        aggregates.record({"narrative_id": "NAR_extra", "year": 2023, "source": "twitter"})
+        report = check_consistency(aggregates, frame)
+        assert not report["consistent"]
+        assert "twitter" in report["platform_mismatches"]
+
+    def test_restored_point_counts_once(self, aggregates):
+        """Test storing the same point again leaves the aggregates unchanged"""
+        stream = make_stream(5)
+        for i, payload in enumerate(stream):
+            aggregates.record(payload, "text_memory", i)
+        expected = compute_platform_risk_scores(group(stream))
+        assert aggregates.platform_risk_scores() == expected
+
+        for i, payload in enumerate(stream[:50]):
+            aggregates.record(payload, "text_memory", i)
+        assert aggregates.platform_risk_scores() == expected
+        assert len(aggregates) == len(stream)
+        frame = NarrativeFrame.from_narratives(group(stream))
+        assert check_consistency(aggregates, frame)["consistent"]
+
+    def test_overwrite_moves_contribution(self, aggregates):
+        """Test an overwrite with new payload replaces the old contribution"""
+        for i in range(3):
+            aggregates.record({"narrative_id": f"NAR_{i}", "year": 2024, "source": "twitter"}, "text_memory", i)
+        assert len(aggregates.coordinated_campaigns()) == 1
+
+        aggregates.record({"narrative_id": "NAR_2", "year": 2024, "source": "facebook"}, "text_memory", 2)
+        assert aggregates.coordinated_campaigns() == []
+        scores = aggregates.platform_risk_scores()
+        assert scores["twitter"] == compute_platform_risk_scores({
+            "NAR_0": [{"source": "twitter"}], "NAR_1": [{"source": "twitter"}]
+        })["twitter"]
+        assert "facebook" in scores
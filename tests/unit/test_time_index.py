@@ -0,0 +1,161 @@
+"""
+Test time-bucketed narrative counts
+"""
+import random
+from datetime import datetime, timedelta, timezone
+import numpy as np
+import pytest
+from core.analytics.streaming_aggregates import NarrativeAggregates
+from core.analytics.trend_detector import detect_viral_narratives_windowed
+from core.narratives.time_index import TimeBucketIndex, bucket_of, bucket_start
+
+NOW = datetime(2024, 6, 15, 12, 0, tzinfo=timezone.utc)
+
+
+def make_stream(seed, n_memories=300):
+    """Stored payloads with timestamps spread over ~200 days"""
+    rng = random.Random(seed)
+    stream = []
+    for _ in range(n_memories):
+        when = NOW - timedelta(days=rng.uniform(0, 200))
+        payload = {
+            "narrative_id": f"NAR_{rng.randint(0, 15)}",
+            "source": rng.choice(["twitter", "facebook", "telegram", None]),
+            "ingested_at": when.strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+        }
+        if rng.random() < 0.3:
+            payload["observed_at"] = (when - timedelta(days=30)).isoformat()
+        stream.append(payload)
+    return stream
+
+
+def event_time(payload):
+    value = payload.get("observed_at") or payload["ingested_at"]
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+@pytest.fixture
+def index(tmp_path):
+    return TimeBucketIndex(tmp_path / "events.jsonl")
+
+
+class TestBuckets:
+    """Test bucket numbering"""
+
+    @pytest.mark.parametrize("resolution", ["day", "week", "month"])
+    def test_start_round_trip(self, resolution):
+        """Test a bucket's start falls in the same bucket"""
+        for bucket in [0, 1, 100, 19000]:
+            if resolution == "month":
+                bucket += 1970 * 12
+            assert bucket_of(bucket_start(bucket, resolution), resolution) == bucket
+
+    def test_weeks_start_on_monday(self):
+        """Test week buckets change between Sunday and Monday"""
+        sunday = datetime(2024, 6, 16, 23, 59, tzinfo=timezone.utc)
+        monday = datetime(2024, 6, 17, 0, 0, tzinfo=timezone.utc)
+        assert bucket_of(monday, "week") == bucket_of(sunday, "week") + 1
+        assert bucket_start(bucket_of(sunday, "week"), "week").weekday() == 0
+
+    def test_offsets_normalized(self):
+        """Test local times are bucketed by their UTC day"""
+        assert bucket_of("2024-06-15T01:00:00+05:00") == bucket_of("2024-06-14T20:00:00Z")
+
+
+class TestTimeBucketIndex:
+    """Test counts match a brute-force scan"""
+
+    @pytest.mark.parametrize("resolution", ["day", "week", "month"])
+    def test_window_count(self, index, resolution):
+        """Test window counts equal counting the memories directly"""
+        stream = make_stream(0)
+        for payload in stream:
+            index.record(payload)
+
+        start, end = NOW - timedelta(days=90), NOW - timedelta(days=20)
+        first, last = bucket_of(start, resolution), bucket_of(end, resolution)
+        for nid in {p["narrative_id"] for p in stream}:
+            expected = sum(
+                1 for p in stream
+                if p["narrative_id"] == nid and first <= bucket_of(event_time(p), resolution) <= last
+            )
+            assert index.window_count(nid, start, end, resolution) == expected
+
+    def test_matrix_and_series(self, index):
+        """Test the matrix rows match per-narrative series"""
+        stream = make_stream(1)
+        for payload in stream:
+            index.record(payload)
+
+        narrative_ids, buckets, counts = index.matrix("week")
+        assert counts.sum() == len(stream)
+        for row, nid in enumerate(narrative_ids):
+            series_buckets, series = index.series(nid, "week")
+            dense = np.zeros(len(buckets), dtype=np.int64)
+            dense[series_buckets - buckets[0]] = series
+            assert np.array_equal(counts[row], dense)
+
+    def test_windowed_velocity(self, index):
+        """Test recent mentions over a 30-day window"""
+        stream = make_stream(2)
+        for payload in stream:
+            index.record(payload)
+
+        narrative_ids, recent, total, platforms = index.windowed_velocity(30, now=NOW)
+        first = bucket_of(NOW, "day") - 29
+        for i, nid in enumerate(narrative_ids):
+            members = [p for p in stream if p["narrative_id"] == nid]
+            assert total[i] == len(members)
+            assert recent[i] == sum(1 for p in members if bucket_of(event_time(p)) >= first)
+            assert platforms[i] == len({p["source"] for p in members if p["source"]})
+
+    def test_viral_detection(self, index):
+        """Test a narrative spiking inside the window is flagged"""
+        for day in range(5):
+            index.record({
+                "narrative_id": "NAR_spike",
+                "source": ["twitter", "telegram"][day % 2],
+                "ingested_at": (NOW - timedelta(days=day)).isoformat()
+            })
+        index.record({"narrative_id": "NAR_old", "ingested_at": "2023-01-01T00:00:00Z"})
+
+        viral = detect_viral_narratives_windowed(index, time_window_days=7, now=NOW)
+        assert [v["narrative_id"] for v in viral] == ["NAR_spike"]
+        assert viral[0]["recent_mentions"] == 5
+        assert viral[0]["platforms"] == 2
+
+    def test_untimed_events(self, index):
+        """Test memories without timestamps count towards totals only"""
+        index.record({"narrative_id": "NAR_1", "year": 2020})
+        index.record({"narrative_id": "NAR_1", "ingested_at": NOW.isoformat()})
+
+        _, recent, total, _ = index.windowed_velocity(30, now=NOW)
+        assert index.untimed == 1
+        assert recent.tolist() == [1]
+        assert total.tolist() == [2]
+
+    def test_restored_point_counts_once(self, index):
+        """Test storing the same point again moves, not adds, its mention"""
+        payload = {"narrative_id": "NAR_1", "source": "twitter", "ingested_at": NOW.isoformat()}
+        index.record(payload, "text_memory", "p1")
+        index.record(payload, "text_memory", "p1")
+        assert len(index) == 1
+        assert index.window_count("NAR_1", NOW, NOW) == 1
+
+        earlier = NOW - timedelta(days=10)
+        index.record({**payload, "ingested_at": earlier.isoformat()}, "text_memory", "p1")
+        assert index.window_count("NAR_1", NOW, NOW) == 0
+        assert index.window_count("NAR_1", earlier, earlier) == 1
+        _, recent, total, platforms = index.windowed_velocity(30, now=NOW)
+        assert (recent.tolist(), total.tolist(), platforms.tolist()) == ([1], [1], [1])
+
+    def test_shared_event_log(self, tmp_path):
+        """Test indexes folding the same log see each other's records"""
+        path = tmp_path / "events.jsonl"
+        aggregates = NarrativeAggregates(path)
+        index = TimeBucketIndex(path)
+
+        aggregates.record({"narrative_id": "NAR_1", "source": "twitter",
+                           "ingested_at": NOW.isoformat()})
+        assert len(index) == 1
+        assert index.window_count("NAR_1", NOW, NOW) == 1
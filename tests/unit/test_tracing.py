@@ -0,0 +1,145 @@
+"""
+Test tracing spans, export and log correlation
+"""
+import json
+import logging
+import threading
+import pytest
+import core.utils.tracing as tracing
+from core.utils.tracing import (
+    CollectingExporter,
+    JsonLinesExporter,
+    current_trace_id,
+    parse_traceparent,
+    root_span,
+    set_attributes,
+    span,
+    traced
+)
+from core.utils.logger import TraceContextFilter
+
+
+@pytest.fixture
+def exporter():
+    collecting = CollectingExporter()
+    previous = tracing.set_exporter(collecting)
+    yield collecting
+    tracing.set_exporter(previous)
+
+
+def by_name(exporter):
+    return {s.name: s for s in exporter.spans}
+
+
+class TestSpans:
+    """Test nesting and attributes"""
+
+    def test_nesting(self, exporter):
+        """Test child spans share the trace and point at their parent"""
+        with span("request") as parent:
+            with span("embed", batch_size=1) as child:
+                child.set_attribute("dim", 384)
+            assert current_trace_id() == parent.trace_id
+        assert current_trace_id() is None
+
+        spans = by_name(exporter)
+        assert spans["embed"].trace_id == spans["request"].trace_id
+        assert spans["embed"].parent_id == spans["request"].span_id
+        assert spans["request"].parent_id is None
+        assert spans["embed"].attributes == {"batch_size": 1, "dim": 384}
+        assert [s.name for s in exporter.spans] == ["embed", "request"]
+
+    def test_traced_and_set_attributes(self, exporter):
+        """Test decorated functions run in a span and can annotate it"""
+        @traced()
+        def process():
+            set_attributes(result_count=3)
+            return "ok"
+
+        assert process() == "ok"
+        assert exporter.spans[0].name == "process"
+        assert exporter.spans[0].attributes == {"result_count": 3}
+        set_attributes(ignored=True)  # Outside a span: no-op
+
+    def test_error_status(self, exporter):
+        """Test a raising stage is exported with its error"""
+        with pytest.raises(ValueError):
+            with span("store"):
+                raise ValueError("bad payload")
+        assert exporter.spans[0].status == "error"
+        assert exporter.spans[0].error == "ValueError: bad payload"
+
+    def test_root_span_continues_trace(self, exporter):
+        """Test an incoming trace ID is continued and active spans ignored"""
+        with span("unrelated"):
+            with root_span("POST /claims", "a" * 32, "b" * 16):
+                with span("validate"):
+                    pass
+        spans = by_name(exporter)
+        assert spans["validate"].trace_id == "a" * 32
+        assert spans["POST /claims"].parent_id == "b" * 16
+
+    def test_threads_isolated(self, exporter):
+        """Test spans in other threads start their own traces"""
+        seen = []
+        with span("main"):
+            thread = threading.Thread(target=lambda: seen.append(current_trace_id()))
+            thread.start()
+            thread.join()
+        assert seen == [None]
+
+
+class TestExport:
+    """Test exporters and header parsing"""
+
+    def test_json_lines(self, tmp_path):
+        """Test spans are written as one JSON object per line"""
+        path = tmp_path / "traces.jsonl"
+        previous = tracing.set_exporter(JsonLinesExporter(path=path))
+        try:
+            with span("report", result_count=2):
+                pass
+        finally:
+            tracing.set_exporter(previous)
+
+        record = json.loads(path.read_text().splitlines()[0])
+        assert record["name"] == "report"
+        assert record["attributes"] == {"result_count": 2}
+        assert len(record["trace_id"]) == 32 and len(record["span_id"]) == 16
+
+    def test_traceparent(self):
+        """Test W3C traceparent parsing"""
+        header = "00-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-01"
+        assert parse_traceparent(header) == ("0af7651916cd43dd8448eb211c80319c", "b7ad6b7169203331")
+        assert parse_traceparent(None) == (None, None)
+        assert parse_traceparent("00-xyz-b7ad6b7169203331-01") == (None, None)
+        assert parse_traceparent("00-" + "0" * 32 + "-b7ad6b7169203331-01") == (None, None)
+
+    def test_disabled(self, monkeypatch, exporter):
+        """Test disabled tracing is a no-op"""
+        monkeypatch.setattr(tracing, "TRACING_ENABLED", False)
+
+        def work():
+            return 1
+
+        assert traced()(work) is work
+        with span("stage") as s:
+            s.set_attribute("x", 1)
+        assert exporter.spans == []
+
+
+class TestLogCorrelation:
+    """Test trace IDs reach log records"""
+
+    def test_filter(self):
+        """Test records carry the active trace ID"""
+        record = logging.LogRecord("SatyaAI", logging.INFO, __file__, 1, "msg", None, None)
+        log_filter = TraceContextFilter()
+
+        log_filter.filter(record)
+        assert record.trace_id == "-"
+
+        with span("request") as s:
+            log_filter.filter(record)
+        assert record.trace_id == s.trace_id
+        assert record.span_id == s.span_id
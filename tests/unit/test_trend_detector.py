@@ -0,0 +1,180 @@
+"""
+Test the columnar trend analytics against row-by-row reference logic
+"""
+import random
+from collections import defaultdict
+from datetime import datetime
+import pytest
+from core.analytics.narrative_frame import NarrativeFrame
+from core.analytics.trend_detector import (
+    analyze_narrative_clusters,
+    detect_viral_narratives,
+    compute_platform_risk_scores,
+    detect_coordinated_campaigns
+)
+
+
+def reference_clusters(narratives):
+    total = sum(len(v) for v in narratives.values())
+    modality, yearly = defaultdict(int), defaultdict(int)
+    for memories in narratives.values():
+        for m in memories:
+            modality[m.get('type', 'unknown')] += 1
+            year = m.get('year')
+            if year and str(year).isdigit():
+                yearly[int(year)] += 1
+    return {
+        'total_narratives': len(narratives),
+        'total_memories': total,
+        'avg_narrative_size': total / len(narratives),
+        'largest_narrative': max(len(v) for v in narratives.values()),
+        'modality_distribution': dict(modality),
+        'yearly_activity': dict(sorted(yearly.items()))
+    }
+
+
+def reference_viral(narratives, cutoff_year):
+    viral = []
+    for nid, memories in narratives.items():
+        recent = sum(1 for m in memories if m.get('year') and int(m.get('year', 0)) >= cutoff_year)
+        total = len(memories)
+        if total == 0:
+            continue
+        velocity = recent / total
+        platforms = len(set(m.get('source') for m in memories if m.get('source')))
+        risk_score = (velocity * 40) + (platforms * 15) + (min(recent, 10) * 5)
+        if recent >= 3 and velocity > 0.3:
+            viral.append({
+                'narrative_id': nid, 'recent_mentions': recent, 'total_mentions': total,
+                'velocity': velocity, 'platforms': platforms, 'risk_score': round(risk_score, 2)
+            })
+    return sorted(viral, key=lambda x: x['risk_score'], reverse=True)
+
+
+def reference_platform_risk(narratives):
+    stats = defaultdict(lambda: {'n': set(), 'total': 0, 'high': set()})
+    for nid, memories in narratives.items():
+        high = len(memories) >= 3 or len(set(m.get('source') for m in memories)) >= 2
+        for m in memories:
+            s = stats[m.get('source', 'unknown')]
+            s['n'].add(nid)
+            s['total'] += 1
+            if high:
+                s['high'].add(nid)
+    result = {}
+    for platform, s in stats.items():
+        score = len(s['n']) * 10 + len(s['high']) * 25 + min(s['total'], 20) * 2
+        level = ("CRITICAL" if score >= 100 else "HIGH" if score >= 60
+                 else "MEDIUM" if score >= 30 else "LOW")
+        result[platform] = {
+            'unique_narratives': len(s['n']), 'total_mentions': s['total'],
+            'high_risk_count': len(s['high']), 'risk_score': score, 'risk_level': level
+        }
+    return dict(sorted(result.items(), key=lambda x: x[1]['risk_score'], reverse=True))
+
+
+def reference_campaigns(narratives):
+    campaigns_map = defaultdict(lambda: defaultdict(set))
+    for nid, memories in narratives.items():
+        for m in memories:
+            if m.get('year') and m.get('source'):
+                campaigns_map[m.get('year')][m.get('source')].add(nid)
+    campaigns = []
+    for year, platforms in campaigns_map.items():
+        for platform, ids in platforms.items():
+            if len(ids) >= 3:
+                campaigns.append({
+                    'year': year, 'platform': platform, 'narrative_count': len(ids),
+                    'narrative_ids': set(ids), 'coordination_score': len(ids) * 10
+                })
+    return sorted(campaigns, key=lambda x: x['coordination_score'], reverse=True)
+
+
+def make_narratives(seed, n_narratives=60):
+    """Random corpus including missing keys, None values and mixed year types"""
+    rng = random.Random(seed)
+    now = datetime.now().year
+    years = [now, now - 1, now - 2, 2015, str(now), "2019", None, "", 0]
+    sources = ["twitter", "facebook", "whatsapp", "telegram", None, ""]
+    types = ["text", "image", "video", None]
+
+    narratives = {}
+    for i in range(n_narratives):
+        memories = []
+        for _ in range(rng.randint(1, 12)):
+            m = {"claim": f"claim {i}"}
+            if rng.random() < 0.9:
+                m["year"] = rng.choice(years)
+            if rng.random() < 0.85:
+                m["source"] = rng.choice(sources)
+            if rng.random() < 0.9:
+                m["type"] = rng.choice(types)
+            memories.append(m)
+        narratives[f"narr_{i}"] = memories
+    return narratives
+
+
+@pytest.fixture(params=[0, 1, 2, 3])
+def narratives(request):
+    return make_narratives(request.param)
+
+
+class TestNarrativeFrame:
+    """Test the columnar frame"""
+
+    def test_row_layout(self):
+        """Test one row per memory with typed code columns"""
+        frame = NarrativeFrame.from_narratives({
+            "a": [{"year": 2020, "source": "twitter", "type": "text"}],
+            "b": [{"year": "2021", "type": "image"}, {"source": None}]
+        })
+
+        assert len(frame) == 2
+        assert frame.n_rows == 3
+        assert frame.narrative.tolist() == [0, 1, 1]
+        assert frame.year.dtype.name == "int16"
+        assert frame.year.tolist() == [2020, 2021, -1]
+        assert frame.narrative_sizes().tolist() == [1, 2]
+
+    def test_frame_passed_through(self, narratives):
+        """Test analyses accept a prebuilt frame"""
+        frame = NarrativeFrame.from_narratives(narratives)
+        assert analyze_narrative_clusters(frame) == analyze_narrative_clusters(narratives)
+        assert compute_platform_risk_scores(frame) == compute_platform_risk_scores(narratives)
+
+
+class TestTrendDetectorEquivalence:
+    """Test vectorized results match the row-by-row logic"""
+
+    def test_clusters(self, narratives):
+        """Test cluster statistics and key order"""
+        result = analyze_narrative_clusters(narratives)
+        expected = reference_clusters(narratives)
+        assert result == expected
+        assert list(result['modality_distribution']) == list(expected['modality_distribution'])
+
+    def test_empty(self):
+        """Test empty input"""
+        assert analyze_narrative_clusters({})['total_narratives'] == 0
+        assert detect_viral_narratives({}) == []
+        assert compute_platform_risk_scores({}) == {}
+        assert detect_coordinated_campaigns({}) == []
+
+    def test_viral(self, narratives):
+        """Test viral narratives and ordering"""
+        cutoff = datetime.now().year - 1
+        assert detect_viral_narratives(narratives, 365) == reference_viral(narratives, cutoff)
+
+    def test_platform_risk(self, narratives):
+        """Test platform scores and ordering"""
+        result = compute_platform_risk_scores(narratives)
+        expected = reference_platform_risk(narratives)
+        assert result == expected
+        assert list(result) == list(expected)
+
+    def test_campaigns(self, narratives):
+        """Test campaigns and ordering"""
+        result = detect_coordinated_campaigns(narratives)
+        for c in result:
+            c['narrative_ids'] = set(c['narrative_ids'])
+        assert result == reference_campaigns(narratives)
@@ -6,6 +6,7 @@ from core.utils.validators import (
     validate_year,
     validate_claim_text,
     validate_source,
+    validate_timestamp,
     sanitize_filename,
     ValidationError
 )
@@ -35,6 +36,30 @@ class TestYearValidation:
             validate_year("invalid")
 
 
+class TestTimestampValidation:
+    """Test observed-at timestamp validation"""
+    
+    def test_normalized_to_utc(self):
+        """Test ISO strings and epochs become RFC 3339 UTC"""
+        assert validate_timestamp("2024-05-01T12:00:00+02:00") == "2024-05-01T10:00:00.000000Z"
+        assert validate_timestamp("2024-05-01T10:00:00Z") == "2024-05-01T10:00:00.000000Z"
+        assert validate_timestamp(0) == "1970-01-01T00:00:00.000000Z"
+    
+    def test_naive_taken_as_utc(self):
+        """Test timestamps without offset are UTC"""
+        assert validate_timestamp("2024-05-01 10:00") == "2024-05-01T10:00:00.000000Z"
+    
+    def test_invalid_format(self):
+        """Test unparseable timestamps"""
+        with pytest.raises(ValidationError):
+            validate_timestamp("yesterday")
+    
+    def test_future_rejected(self):
+        """Test timestamps in the future"""
+        with pytest.raises(ValidationError):
+            validate_timestamp("2999-01-01T00:00:00Z")
+
+
 class TestClaimValidation:
     """Test claim text validation"""
     
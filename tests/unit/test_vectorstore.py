@@ -0,0 +1,314 @@
+"""
+Conformance tests for the vector store backends (Qdrant and NumPy)
+"""
+import uuid
+import numpy as np
+import pytest
+from qdrant_client import QdrantClient
+from qdrant_client.http.models import (
+    Direction, Distance, FieldCondition, Filter, FilterSelector, HasIdCondition, IsEmptyCondition,
+    MatchAny, MatchValue, OrderBy, PayloadField, PayloadSchemaType, PointStruct, QueryRequest,
+    Range, DatetimeRange, VectorParams
+)
+from core.vectorstore import (
+    NumpyVectorStore, QdrantVectorStore, VectorStore, create_vector_store
+)
+
+DIM = 4
+POINTS = [
+    (1, [1.0, 0.0, 0.0, 0.0], {"narrative_id": "NAR_a", "year": 2019, "source": "twitter",
+                               "ingested_at": "2024-01-01T00:00:00.000000Z"}),
+    (2, [0.9, 0.1, 0.0, 0.0], {"narrative_id": "NAR_a", "year": 2021, "source": "facebook",
+                               "ingested_at": "2024-03-01T00:00:00.000000Z"}),
+    (3, [0.0, 1.0, 0.0, 0.0], {"narrative_id": "NAR_b", "year": 2022, "source": "twitter",
+                               "tags": ["flood", "rescue"]}),
+    (4, [0.0, 0.0, 1.0, 0.0], {"narrative_id": "NAR_c", "year": 2024, "source": "whatsapp"}),
+    (5, [0.5, 0.5, 0.5, 0.0], {"narrative_id": "NAR_c", "year": 2025, "source": "telegram"}),
+]
+
+
+def make_qdrant(tmp_path):
+    return QdrantVectorStore(QdrantClient(":memory:"))
+
+
+def make_numpy(tmp_path):
+    return NumpyVectorStore()
+
+
+def make_numpy_mmap(tmp_path):
+    return NumpyVectorStore(tmp_path / "store")
+
+
+@pytest.fixture(params=[make_qdrant, make_numpy, make_numpy_mmap], ids=["qdrant", "numpy", "numpy-mmap"])
+def store(request, tmp_path):
+    store = request.param(tmp_path)
+    store.create_collection("text_memory", vectors_config=VectorParams(size=DIM, distance=Distance.COSINE))
+    store.create_payload_index("text_memory", "narrative_id", PayloadSchemaType.KEYWORD)
+    store.upsert("text_memory", points=[
+        PointStruct(id=pid, vector=vector, payload=payload) for pid, vector, payload in POINTS
+    ])
+    yield store
+    store.close()
+
+
+def ids(points):
+    return [p.id for p in points]
+
+
+def by_narrative(narrative_id):
+    return Filter(must=[FieldCondition(key="narrative_id", match=MatchValue(value=narrative_id))])
+
+
+class TestSearch:
+    """Test exact nearest-neighbour search"""
+
+    def test_nearest_order_and_scores(self, store):
+        """Test results come best first with cosine scores"""
+        points = store.query_points("text_memory", query=[1.0, 0.05, 0.0, 0.0], limit=3).points
+        assert ids(points) == [1, 2, 5]
+        expected = np.dot([1.0, 0.0, 0.0, 0.0], [1.0, 0.05, 0.0, 0.0]) / np.linalg.norm([1.0, 0.05, 0.0, 0.0])
+        assert points[0].score == pytest.approx(expected, abs=1e-5)
+        assert points[0].payload["narrative_id"] == "NAR_a"
+
+    def test_filter_scopes_search(self, store):
+        """Test the top matches are taken within the filter"""
+        query_filter = Filter(must=[FieldCondition(key="year", range=Range(gte=2022))])
+        points = store.query_points("text_memory", query=[1.0, 0.1, 0.0, 0.0],
+                                    query_filter=query_filter, limit=2).points
+        assert ids(points) == [5, 3]
+
+    def test_score_threshold(self, store):
+        """Test points under the threshold are dropped"""
+        points = store.query_points("text_memory", query=[1.0, 0.0, 0.0, 0.0],
+                                    score_threshold=0.9, limit=10).points
+        assert ids(points) == [1, 2]
+
+    def test_payload_and_vector_selection(self, store):
+        """Test with_payload keys and normalized stored vectors"""
+        point = store.query_points("text_memory", query=[0.0, 0.0, 1.0, 0.0], limit=1,
+                                   with_payload=["year"], with_vectors=True).points[0]
+        assert point.payload == {"year": 2024}
+        assert point.vector == pytest.approx([0.0, 0.0, 1.0, 0.0])
+
+    def test_batch_matches_single_queries(self, store):
+        """Test a batch returns what each query returns on its own"""
+        queries = [[1.0, 0.0, 0.0, 0.0], [0.0, 1.0, 0.2, 0.0]]
+        responses = store.query_batch_points("text_memory", requests=[
+            QueryRequest(query=queries[0], limit=2, with_payload=True),
+            QueryRequest(query=queries[1], limit=2, filter=by_narrative("NAR_c"), with_payload=True),
+        ])
+        assert ids(responses[0].points) == ids(
+            store.query_points("text_memory", query=queries[0], limit=2).points
+        )
+        assert ids(responses[1].points) == ids(store.query_points(
+            "text_memory", query=queries[1], query_filter=by_narrative("NAR_c"), limit=2
+        ).points)
+
+
+class TestFilters:
+    """Test filter conditions evaluate like Qdrant"""
+
+    @pytest.mark.parametrize("query_filter,expected", [
+        (by_narrative("NAR_a"), [1, 2]),
+        (Filter(must=[FieldCondition(key="source", match=MatchAny(any=["whatsapp", "telegram"]))]), [4, 5]),
+        (Filter(must_not=[FieldCondition(key="source", match=MatchValue(value="twitter"))]), [2, 4, 5]),
+        (Filter(should=[by_narrative("NAR_b"), FieldCondition(key="year", range=Range(lt=2020))]), [1, 3]),
+        (Filter(must=[FieldCondition(key="tags", match=MatchValue(value="rescue"))]), [3]),
+        (Filter(must=[HasIdCondition(has_id=[2, 4])]), [2, 4]),
+        (Filter(must=[IsEmptyCondition(is_empty=PayloadField(key="tags"))]), [1, 2, 4, 5]),
+        (Filter(must=[FieldCondition(key="ingested_at", range=DatetimeRange(gt="2024-02-01T00:00:00Z"))]), [2]),
+    ], ids=["match", "any", "must-not", "should", "array", "has-id", "is-empty", "datetime"])
+    def test_condition(self, store, query_filter, expected):
+        """Test each condition selects the expected points"""
+        points, _ = store.scroll("text_memory", scroll_filter=query_filter, limit=10)
+        assert sorted(ids(points)) == expected
+        assert store.count("text_memory", count_filter=query_filter, exact=True).count == len(expected)
+
+
+class TestReadWrite:
+    """Test scroll, retrieve, upsert and set_payload"""
+
+    def test_scroll_pages_cover_all_points(self, store):
+        """Test paging visits every point once and ends with None"""
+        seen, offset = [], None
+        while True:
+            points, offset = store.scroll("text_memory", limit=2, offset=offset)
+            seen.extend(ids(points))
+            if offset is None:
+                break
+        assert sorted(seen) == [1, 2, 3, 4, 5]
+
+    def test_scroll_filtered_pages(self, store):
+        """Test filtered paging stops without an empty trailing page"""
+        points, offset = store.scroll("text_memory", scroll_filter=by_narrative("NAR_c"), limit=1)
+        assert ids(points) == [4] and offset is not None
+        points, offset = store.scroll("text_memory", scroll_filter=by_narrative("NAR_c"), limit=1, offset=offset)
+        assert ids(points) == [5] and offset is None
+
+    def test_scroll_order_by(self, store):
+        """Test scrolls sorted by a numeric payload field, both directions"""
+        newest, next_offset = store.scroll(
+            "text_memory", limit=2, order_by=OrderBy(key="year", direction=Direction.DESC)
+        )
+        assert ids(newest) == [5, 4] and next_offset is None
+        oldest, _ = store.scroll("text_memory", scroll_filter=by_narrative("NAR_a"), limit=5, order_by="year")
+        assert ids(oldest) == [1, 2]
+
+    def test_upsert_overwrites_same_id(self, store):
+        """Test re-upserting an ID replaces its vector and payload"""
+        store.upsert("text_memory", points=[
+            PointStruct(id=4, vector=[1.0, 0.0, 0.0, 0.0], payload={"narrative_id": "NAR_a"})
+        ])
+        assert store.count("text_memory").count == 5
+        assert store.count("text_memory", count_filter=by_narrative("NAR_a")).count == 3
+        assert store.retrieve("text_memory", ids=[4])[0].payload == {"narrative_id": "NAR_a"}
+
+    def test_uuid_ids_and_named_vector(self, store):
+        """Test UUID IDs round-trip and {"": vector} is the default vector"""
+        point_id = str(uuid.uuid5(uuid.NAMESPACE_URL, "claim"))
+        store.upsert("text_memory", points=[
+            PointStruct(id=point_id, vector={"": [0.0, 0.0, 0.0, 1.0]}, payload={"narrative_id": "NAR_u"})
+        ])
+        top = store.query_points("text_memory", query=[0.0, 0.0, 0.0, 1.0], limit=1).points[0]
+        assert top.id == point_id
+        assert store.retrieve("text_memory", ids=[point_id, 99])[0].payload["narrative_id"] == "NAR_u"
+
+    def test_set_payload_by_ids(self, store):
+        """Test payload keys are merged and filters see the new value"""
+        store.set_payload("text_memory", payload={"narrative_id": "NAR_b", "merged": True}, points=[1])
+        payload = store.retrieve("text_memory", ids=[1])[0].payload
+        assert payload["narrative_id"] == "NAR_b" and payload["year"] == 2019 and payload["merged"]
+        assert sorted(ids(store.scroll("text_memory", scroll_filter=by_narrative("NAR_b"))[0])) == [1, 3]
+        assert ids(store.scroll("text_memory", scroll_filter=by_narrative("NAR_a"))[0]) == [2]
+
+    def test_set_payload_by_filter(self, store):
+        """Test a filter selector updates every matching point"""
+        store.set_payload("text_memory", payload={"narrative_id": "NAR_a"},
+                          points=FilterSelector(filter=by_narrative("NAR_c")))
+        assert store.count("text_memory", count_filter=by_narrative("NAR_a")).count == 4
+
+
+class TestCollections:
+    """Test collection management"""
+
+    def test_collection_info(self, store):
+        """Test existence, size and point count are reported"""
+        assert store.collection_exists("text_memory")
+        assert not store.collection_exists("image_memory")
+        info = store.get_collection("text_memory")
+        assert info.points_count == 5
+        assert info.config.params.vectors.size == DIM
+        assert not info.config.params.sparse_vectors
+
+    def test_missing_collection_raises(self, store):
+        """Test reads from a missing collection raise"""
+        with pytest.raises(Exception):
+            store.get_collection("image_memory")
+
+    def test_delete_collection(self, store):
+        """Test a deleted collection is gone"""
+        store.delete_collection("text_memory")
+        assert not store.collection_exists("text_memory")
+
+
+class TestNumpyStore:
+    """Test behaviour specific to the NumPy backend"""
+
+    def test_reopen_restores_points(self, tmp_path):
+        """Test vectors, payloads, updates and indexes survive a reopen"""
+        store = NumpyVectorStore(tmp_path)
+        store.create_collection("text_memory", vectors_config=VectorParams(size=DIM, distance=Distance.COSINE))
+        store.create_payload_index("text_memory", "narrative_id", PayloadSchemaType.KEYWORD)
+        store.upsert("text_memory", points=[PointStruct(id=pid, vector=v, payload=p) for pid, v, p in POINTS])
+        store.set_payload("text_memory", payload={"narrative_id": "NAR_z"}, points=[3])
+        store.close()
+
+        reopened = NumpyVectorStore(tmp_path)
+        assert reopened.count("text_memory").count == 5
+        assert ids(reopened.scroll("text_memory", scroll_filter=by_narrative("NAR_z"))[0]) == [3]
+        top = reopened.query_points("text_memory", query=[0.0, 1.0, 0.0, 0.0], limit=1).points[0]
+        assert top.id == 3 and top.payload["year"] == 2022
+
+    def test_torn_log_line_ignored(self, tmp_path):
+        """Test a partial trailing log entry is dropped on reopen"""
+        store = NumpyVectorStore(tmp_path)
+        store.create_collection("text_memory", vectors_config=VectorParams(size=DIM, distance=Distance.DOT))
+        store.upsert("text_memory", points=[PointStruct(id=1, vector=[1.0, 0.0, 0.0, 0.0])])
+        store.close()
+        with open(tmp_path / "text_memory" / "points.jsonl", "a") as f:
+            f.write('{"r": 1, "id": 2, "p"')
+
+        reopened = NumpyVectorStore(tmp_path)
+        reopened.upsert("text_memory", points=[PointStruct(id=3, vector=[0.0, 2.0, 0.0, 0.0])])
+        assert sorted(ids(reopened.scroll("text_memory")[0])) == [1, 3]
+        assert reopened.query_points("text_memory", query=[0.0, 1.0, 0.0, 0.0], limit=1).points[0].score == 2.0
+
+    @pytest.mark.parametrize("path", [None, "store"])
+    def test_matrix_grows(self, tmp_path, path, monkeypatch):
+        """Test upserts past the preallocated capacity keep every vector"""
+        monkeypatch.setattr("core.vectorstore.numpy_store.INITIAL_CAPACITY", 4)
+        store = NumpyVectorStore(tmp_path / path if path else None)
+        store.create_collection("text_memory", vectors_config=VectorParams(size=DIM, distance=Distance.COSINE))
+        rng = np.random.default_rng(0)
+        vectors = rng.standard_normal((37, DIM))
+        for start in range(0, 37, 5):
+            store.upsert("text_memory", points=[
+                PointStruct(id=i, vector=vectors[i].tolist()) for i in range(start, min(start + 5, 37))
+            ])
+        for i in (0, 17, 36):
+            assert store.query_points("text_memory", query=vectors[i].tolist(), limit=1).points[0].id == i
+        store.close()
+
+    def test_shared_path_between_processes(self, tmp_path, monkeypatch):
+        """Test two stores on one path never reuse rows and see each other's writes"""
+        monkeypatch.setattr("core.vectorstore.numpy_store.INITIAL_CAPACITY", 4)
+        first = NumpyVectorStore(tmp_path)
+        first.create_collection("text_memory", vectors_config=VectorParams(size=DIM, distance=Distance.DOT))
+        second = NumpyVectorStore(tmp_path)  # Opened before anything was written
+        assert second.collection_exists("text_memory")
+
+        vectors = {}
+        for i in range(12):
+            writer = first if i % 2 else second
+            vectors[i] = [float(i + 1), 0.0, 0.0, float(i % 3)]
+            writer.upsert("text_memory", points=[PointStruct(id=i, vector=vectors[i], payload={"n": i})])
+        second.set_payload("text_memory", payload={"seen": True}, points=[1])
+
+        for store in (first, second, NumpyVectorStore(tmp_path)):
+            assert store.count("text_memory").count == 12
+            records = store.retrieve("text_memory", ids=list(range(12)), with_vectors=True)
+            assert {r.id: r.vector for r in records} == vectors
+            assert all(r.payload["n"] == r.id for r in records)
+            assert store.retrieve("text_memory", ids=[1])[0].payload["seen"] is True
+        with pytest.raises(ValueError):
+            second.create_collection("text_memory", vectors_config=VectorParams(size=DIM, distance=Distance.DOT))
+        first.close()
+        second.close()
+
+    def test_unsupported_query_rejected(self):
+        """Test named-vector queries fail loudly instead of searching the wrong vector"""
+        store = NumpyVectorStore()
+        store.create_collection("text_memory", vectors_config=VectorParams(size=DIM, distance=Distance.COSINE))
+        with pytest.raises(ValueError):
+            store.query_points("text_memory", query=[1.0, 0.0, 0.0, 0.0], using="bm25")
+
+
+class TestFactory:
+    """Test backend selection"""
+
+    def test_numpy_backend(self):
+        """Test the numpy backend can run fully in memory"""
+        store = create_vector_store("numpy", ":memory:")
+        assert isinstance(store, NumpyVectorStore) and store.path is None
+
+    def test_backend_from_environment(self, monkeypatch):
+        """Test VECTOR_STORE_BACKEND selects the backend"""
+        monkeypatch.setenv("VECTOR_STORE_BACKEND", "numpy")
+        monkeypatch.setenv("VECTOR_STORE_PATH", ":memory:")
+        assert isinstance(create_vector_store(), VectorStore)
+        assert isinstance(create_vector_store(), NumpyVectorStore)
+
+    def test_unknown_backend(self):
+        """Test an unknown backend is rejected"""
+        with pytest.raises(ValueError):
+            create_vector_store("faiss")
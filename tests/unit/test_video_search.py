@@ -0,0 +1,64 @@
+"""
+Test video frame search against frames stored by store_video
+"""
+import numpy as np
+import pytest
+from PIL import Image
+
+# The search module loads the CLIP embedder on import
+pytest.importorskip("sentence_transformers")
+pytest.importorskip("streamlit")
+
+import core.memory.image_store as image_store  # noqa: E402
+import core.memory.phash_index as phash_index  # noqa: E402
+import core.memory.video_search as video_search  # noqa: E402
+from core.memory.image_store import store_image  # noqa: E402
+from core.memory.phash_index import PerceptualHashIndex  # noqa: E402
+from core.memory.video_search import search_video_frames  # noqa: E402
+
+
+def no_clip(path):
+    raise AssertionError("CLIP should not run when the hash matches")
+
+
+@pytest.fixture
+def frame_path(tmp_path):
+    """Random frame saved as a JPEG"""
+    rng = np.random.default_rng(3)
+    pixels = (rng.random((48, 48, 3)) * 255).astype("uint8")
+    path = tmp_path / "frame.jpg"
+    Image.fromarray(pixels).resize((320, 240)).save(path)
+    return str(path)
+
+
+@pytest.fixture
+def local_client(memory_store, tmp_path, monkeypatch):
+    client = memory_store(image_store, phash_index, video_search)
+    index = PerceptualHashIndex(tmp_path / "phash.jsonl")
+    monkeypatch.setattr(image_store, "get_phash_index", lambda: index)
+    monkeypatch.setattr(phash_index, "get_phash_index", lambda: index)
+    monkeypatch.setattr(image_store, "record_stored_memory", lambda *args, **kwargs: None)
+    monkeypatch.setattr(image_store, "embed_image", no_clip)
+    monkeypatch.setattr(video_search, "embed_image", no_clip)
+    return client
+
+
+class TestVideoFrameSearch:
+    """Test frames are found through the perceptual hash index"""
+
+    def test_stored_frame_found_by_hash(self, local_client, frame_path):
+        """Test a frame stored as store_video does is matched without CLIP"""
+        store_image(frame_path, {"type": "video_frame", "video_source": "clip.mp4", "year": 2024},
+                    vector=[1.0, 0.0])
+        store_image(frame_path, {"type": "image", "year": 2024}, vector=[1.0, 0.0])
+
+        results = search_video_frames(frame_path, limit=5)
+        assert len(results) == 1
+        assert results[0].payload["type"] == "video_frame"
+        assert results[0].payload["video_source"] == "clip.mp4"
+        assert results[0].score == 1.0
+
+    def test_other_types_match_nothing(self, local_client, frame_path):
+        """Test a type scope without video_frame returns no frames"""
+        store_image(frame_path, {"type": "video_frame", "year": 2024}, vector=[1.0, 0.0])
+        assert search_video_frames(frame_path, types=["image"]) == []
@@ -14,7 +14,7 @@ import json
 import matplotlib.pyplot as plt
 from core.narratives.narrative_manager import process_new_claim, process_new_image
 from core.reports.trust_report import generate_trust_report
-from core.narratives.narrative_explorer import get_all_narratives
+from core.narratives.snapshot_cache import get_narratives_snapshot
 from core.reports.risk_engine import calculate_risk
 from core.memory.image_search import search_images
 from core.memory.video_store import store_video
@@ -63,7 +63,7 @@ except ImportError:
 # Auto-load demo data if system is empty
 if 'demo_data_loaded' not in st.session_state:
     try:
-        narratives_check = get_all_narratives(limit=5)
+        narratives_check = get_narratives_snapshot()
         if len(narratives_check) == 0:
             with st.spinner("Loading demo data..."):
                 demo_claims = [
@@ -293,7 +293,7 @@ st.sidebar.markdown("""
 # System Status - Bigger and more readable
 st.sidebar.markdown("### ⚙️ System Status")
 try:
-    all_narratives_check = get_all_narratives(limit=1)
+    all_narratives_check = get_narratives_snapshot()
     st.sidebar.markdown("""
 <div style='background: rgba(34,197,94,0.1); padding: 12px; border-radius: 8px; border-left: 3px solid #22c55e; margin: 8px 0;'>
     <p style='margin: 4px 0; color: #22c55e; font-size: 0.9em;'>✅ <strong>Memory:</strong> Online</p>
@@ -369,7 +369,7 @@ elif mode == "Researcher":
     st.info("Mode: Studying long-term evolution of misinformation.")
 
 try:
-    all_narratives = get_all_narratives()
+    all_narratives = get_narratives_snapshot()
     total_narratives = len(all_narratives)
     total_memories = sum(len(v) for v in all_narratives.values())
 except Exception as e:
@@ -862,7 +862,7 @@ with tab5:
     st.write("Explore all long-term misinformation narratives stored in SatyaAI.")
     
     try:
-        narratives = get_all_narratives()
+        narratives = get_narratives_snapshot()
         
         if not narratives:
             st.info("ℹ️ No narratives found yet. Add some data first.")
@@ -13,11 +13,16 @@ IMPORT_ERROR = None
 
 try:
     from core.analytics.trend_detector import (
+        as_frame,
         detect_viral_narratives,
+        detect_viral_narratives_windowed,
         analyze_narrative_clusters,
         detect_coordinated_campaigns,
         compute_platform_risk_scores
     )
+    from core.analytics.streaming_aggregates import get_narrative_aggregates
+    from core.narratives.time_index import get_time_bucket_index
+    from core.config import VIRAL_WINDOW_DAYS
     ANALYTICS_AVAILABLE = True
 except ImportError as e:
     IMPORT_ERROR = str(e)
@@ -152,11 +157,21 @@ def render_analytics_page(narratives):
     # FULL ANALYTICS WITH DATA
     st.markdown("---")
     
+    # Encode memories once; every analysis below is a group-by over this frame
+    frame = as_frame(narratives)
+    
+    # Platform/campaign aggregates and the time index are maintained at ingest
+    # time. Use them only when the event log holds exactly the memories shown
+    # here, so every section describes one population; otherwise (stores that
+    # predate the log, a capped or stale snapshot) recompute from the frame
+    aggregates = get_narrative_aggregates()
+    use_aggregates = total_memories > 0 and len(aggregates) == total_memories
+    
     # Cluster analysis
     st.header("🧬 Narrative Ecosystem Analysis")
     
     try:
-        cluster_stats = analyze_narrative_clusters(narratives)
+        cluster_stats = analyze_narrative_clusters(frame)
         
         col1, col2, col3, col4 = st.columns(4)
         col1.metric("Total Narratives", cluster_stats.get('total_narratives', 0))
@@ -236,9 +251,15 @@ def render_analytics_page(narratives):
     
     # Viral detection
     st.header("🔥 Viral Narrative Detection")
+    st.caption(f"Window: last {VIRAL_WINDOW_DAYS} days")
     
     try:
-        viral = detect_viral_narratives(narratives, time_window_days=365)
+        time_index = get_time_bucket_index()
+        if use_aggregates and len(time_index) == total_memories and time_index.untimed == 0:
+            # Every memory carries a timestamp: use an exact day window
+            viral = detect_viral_narratives_windowed(time_index, time_window_days=VIRAL_WINDOW_DAYS)
+        else:
+            viral = detect_viral_narratives(frame, time_window_days=VIRAL_WINDOW_DAYS)
         
         if viral and len(viral) > 0:
             st.success(f"🚨 **{len(viral)} viral narratives detected!**")
@@ -272,7 +293,10 @@ def render_analytics_page(narratives):
     st.header("⚠️ Platform Risk Assessment")
     
     try:
-        platform_risks = compute_platform_risk_scores(narratives)
+        if use_aggregates:
+            platform_risks = aggregates.platform_risk_scores()
+        else:
+            platform_risks = compute_platform_risk_scores(frame)
         
         if platform_risks and len(platform_risks) > 0:
             # Risk summary
@@ -315,7 +339,10 @@ def render_analytics_page(narratives):
     st.header("🎯 Coordinated Campaign Detection")
     
     try:
-        campaigns = detect_coordinated_campaigns(narratives)
+        if use_aggregates:
+            campaigns = aggregates.coordinated_campaigns()
+        else:
+            campaigns = detect_coordinated_campaigns(frame)
         
         if campaigns and len(campaigns) > 0:
             st.warning(f"⚠️ **{len(campaigns)} potential campaigns detected!**")